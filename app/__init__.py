@@ -10,3 +10,8 @@ created in :mod:`app.main` and sub-packages are organised as follows:
 - :mod:`app.services` – domain calculation logic
 - :mod:`app.utils`    – shared utility helpers
 """
+
+import time
+
+# Taken before any submodule is imported; app.core.startup reports the import time from here.
+IMPORT_STARTED_NS = time.perf_counter_ns()
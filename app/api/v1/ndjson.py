@@ -0,0 +1,116 @@
+"""
+Newline-delimited JSON (NDJSON) streaming helpers.
+
+Used by the streaming coordinate endpoint to transform unbounded feeds with
+constant memory: the request body is read incrementally, cut into bounded
+micro-batches of lines, and each transformed batch is written to the response as
+soon as it is ready.
+
+Backpressure comes for free from the pull model: the response generator only
+reads more of the request after the previous batch has been handed to the
+server, and the server only accepts it once the client has drained the socket.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+NDJSON = "application/x-ndjson"
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    A :class:`StreamingResponse` whose body is produced while the request is still
+    being read.
+
+    The stock response listens for client disconnects by consuming ``receive()``
+    concurrently, which would swallow request-body messages. Here the body
+    iterator is the only consumer; a disconnect surfaces through
+    :meth:`Request.stream` instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _check_line_size(line: bytes, max_line_bytes: int) -> None:
+    if len(line) > max_line_bytes:
+        raise ValueError(f"Line exceeds {max_line_bytes} bytes.")
+
+
+async def iter_line_batches(chunks: AsyncIterator[bytes], max_rows: int,
+                            max_line_bytes: int) -> AsyncIterator[list[bytes]]:
+    """
+    Regroup a byte stream into batches of complete, non-blank lines.
+
+    A batch is emitted when it reaches ``max_rows`` lines or when the current
+    network chunk is exhausted, so a slow feed is not held back waiting for a
+    full batch.
+
+    Raises
+    ------
+    ValueError
+        If a single line, complete or still being received, grows beyond
+        ``max_line_bytes``.
+    """
+    pending = b""
+    batch: list[bytes] = []
+    async for chunk in chunks:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        _check_line_size(pending, max_line_bytes)
+        for line in lines:
+            _check_line_size(line, max_line_bytes)
+            line = line.strip()
+            if not line:
+                continue
+            batch.append(line)
+            if len(batch) == max_rows:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+            batch = []
+    _check_line_size(pending, max_line_bytes)
+    pending = pending.strip()
+    if pending:
+        yield [pending]
+
+
+def parse_rows(lines: list[bytes]) -> np.ndarray:
+    """
+    Parse lines of ``[c0, c1, c2]`` arrays into an (N, 3) float64 array.
+
+    The lines are joined into a single JSON document so the whole batch is
+    decoded in one call.
+    """
+    try:
+        rows = np.asarray(json.loads(b"[" + b",".join(lines) + b"]"), dtype=np.float64)
+    except (ValueError, TypeError):
+        raise ValueError("Every line must be a JSON array of three numbers.")
+    if rows.ndim != 2 or rows.shape[1] != 3:
+        raise ValueError("Every line must be a JSON array of three numbers.")
+    if not np.isfinite(rows).all():
+        raise ValueError("Coordinates must be finite numbers.")
+    return rows
+
+
+def encode_rows(rows: np.ndarray) -> str:
+    """Serialise an (N, 3) array as NDJSON lines of ``[c0,c1,c2]``."""
+    text = json.dumps(rows.tolist(), separators=(",", ":"))
+    return text[1:-1].replace("],[", "]\n[") + "\n"
+
+
+def encode_line(document: dict) -> str:
+    """Serialise one JSON object as an NDJSON line."""
+    return json.dumps(document) + "\n"
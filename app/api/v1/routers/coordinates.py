@@ -1,16 +1,47 @@
 """
 Coordinates API Router
-This module defines the `/coordinates/transform` endpoint for transforming celestial coordinates between different shapes, planes, and origins.
+This module defines the `/coordinates/transformations` endpoints (single, batch and streaming)
+for transforming celestial coordinates between different shapes, planes, and origins.
 It serves as a universal pipeline that ingests an initial coordinate state (either Rectangular or Spherical) and safely converts it to the requested target state using a 4D homogeneous matrix engine to
 handle rotations and translations.
 """
-from fastapi import APIRouter, status
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
 from typing import Union
 
-from app.models.coordinates_systems import CoordinateTransformRequest, Rectangular, Spherical
-from app.services.calculations.coordinate_conversions import convert_celestial_coordinate
+from app.api.v1 import ndjson, wire_formats
+from app.core.config import get_settings
+from app.core.lazy import lazy_import
+from app.core.metrics import InstrumentedRoute
+from app.models.coordinates_systems import (
+    CoordinateBatchSpec,
+    CoordinateTransformRequest,
+    Rectangular,
+    RectangularColumns,
+    Spherical,
+    SphericalColumns,
+    as_coord,
+    to_model,
+)
+
+# NumPy and the services are loaded on first use (or by the startup pre-warm), which
+# keeps them out of the application import.
+np = lazy_import("numpy")
+coordinate_conversions = lazy_import("app.services.calculations.coordinate_conversions")
+parallel = lazy_import("app.services.parallel")
+result_cache = lazy_import("app.services.result_cache")
 
-router = APIRouter(prefix="/coordinates", tags=["Coordinates"])
+router = APIRouter(prefix="/coordinates", tags=["Coordinates"], route_class=InstrumentedRoute)
+
+# Response header telling whether the result cache served the response (hit / miss).
+CACHE_HEADER = "X-Cache"
 
 
 @router.post("/transformations",
@@ -32,17 +63,218 @@ def create_coordinate_transformation(request: CoordinateTransformRequest):
             - target_origin: The desired output origin (e.g., Heliocentric or Geocentric).
             - physical_state: (Optional) 1 for Points (absolute position), 0 for Vectors (velocity/force). Defaults to 1.
             - translation_vector: (Optional) The (x,y,z) shift required if changing origins. Defaults to (0,0,0).
+            - epoch: (Optional) Julian Date (TDB) at which the built-in ephemeris supplies the shift
+              instead (distances in AU).
 
     Returns:
         Union[Rectangular, Spherical]: The fully transformed coordinates strictly mapped 
         to the requested target Pydantic model.
+
+    When the result cache is enabled (``RESULT_CACHE_ENABLED``), repeated requests
+    are answered from it; the ``X-Cache`` header reports ``hit`` or ``miss``.
     """
-    transformed_coords = convert_celestial_coordinate(
-        input_coords=request.input_coords,
+    cache = result_cache.get_response_cache()
+    if cache is None:
+        return _transform_coordinate(request)
+
+    key = result_cache.request_key("transform", request)
+    body = cache.get(key)
+    if body is None:
+        body = _transform_coordinate(request).model_dump_json().encode()
+        cache.set(key, body)
+        outcome = "miss"
+    else:
+        outcome = "hit"
+    return Response(body, media_type="application/json", headers={CACHE_HEADER: outcome})
+
+
+def _transform_coordinate(request: CoordinateTransformRequest) -> Rectangular | Spherical:
+    transformed_coords = coordinate_conversions.convert_celestial_coordinate(
+        input_coords=as_coord(request.input_coords),
         target_shape=request.target_shape,
         target_plane=request.target_plane,
         target_origin=request.target_origin,
         physical_state=request.physical_state,
-        translation_vector=request.translation_vector
+        translation_vector=request.translation_vector,
+        target_equinox=request.target_equinox,
+        epoch=request.epoch
+    )
+    return to_model(transformed_coords)
+
+
+def _transform_columns(spec: CoordinateBatchSpec, coords: np.ndarray) -> np.ndarray:
+    """
+    Runs a decoded batch through the vectorized pipeline.
+
+    The result is written through a transposed view into a (3, N) buffer, so each
+    output column is contiguous and can be streamed by the wire encoders as-is.
+    Large batches are spread over the worker pool (see :mod:`app.services.parallel`).
+    """
+    columns = np.empty((3, coords.shape[0]))
+    parallel.transform_coordinates(
+        coords,
+        source_shape=spec.input_shape,
+        source_plane=spec.input_plane,
+        source_origin=spec.input_origin,
+        target_shape=spec.target_shape,
+        target_plane=spec.target_plane,
+        target_origin=spec.target_origin,
+        physical_state=spec.physical_state,
+        translation_vector=spec.translation_vector,
+        source_equinox=spec.input_equinox,
+        target_equinox=spec.target_equinox,
+        epoch=spec.epoch,
+        out=columns.T
+    )
+    return columns
+
+
+@router.post("/transformations:batch",
+             response_model=RectangularColumns | SphericalColumns,
+             status_code=status.HTTP_200_OK,
+             openapi_extra={"requestBody": wire_formats.BATCH_REQUEST_BODY})
+async def create_coordinate_transformations_batch(request: Request):
+    """
+    Transforms many celestial coordinates sharing one source and one target state.
+
+    Coordinates travel column-wise (``x``/``y``/``z`` or ``lon_or_ra``/``lat_or_dec``/
+    ``distance``) and are converted in a single vectorized pass, so the per-point
+    cost is array arithmetic instead of model validation and HTTP round-trips.
+
+    The body and the response are content-negotiated (see :mod:`app.api.v1.wire_formats`):
+    JSON by default, or MessagePack, Arrow IPC and raw float64 via the ``Content-Type``
+    and ``Accept`` headers.
+
+    Args:
+        request (Request): A `CoordinateBatchTransformRequest` as JSON, or a
+            `CoordinateBatchSpec` header plus raw columns in a binary format.
+
+    Returns:
+        StreamingResponse: Columnar coordinates shaped like `RectangularColumns` or
+        `SphericalColumns` (in JSON), streamed in chunks.
+
+    With the result cache enabled, batches of at most ``RESULT_CACHE_MAX_BATCH_ROWS``
+    rows are answered from it in one piece (``X-Cache: hit`` or ``miss``); larger
+    batches bypass it and stream as usual.
+    """
+    media_type = wire_formats.negotiate_response_media_type(request.headers.get("accept"))
+    spec, coords = wire_formats.decode_batch_request(
+        await request.body(), request.headers.get("content-type")
+    )
+
+    cache = result_cache.get_response_cache()
+    if cache is None or not cache.accepts(coords.shape[0]):
+        columns = await _run_batch(spec, coords)
+        return wire_formats.columns_response(
+            columns, media_type, spec.target_shape, spec.target_plane, spec.target_origin,
+            spec.target_equinox
+        )
+
+    key = result_cache.batch_key(spec, coords, media_type)
+    body = await run_in_threadpool(cache.get, key)
+    outcome = "hit"
+    if body is None:
+        columns = await _run_batch(spec, coords)
+        body = wire_formats.encode_columns(
+            columns, media_type, spec.target_shape, spec.target_plane, spec.target_origin,
+            spec.target_equinox
+        )
+        await run_in_threadpool(cache.set, key, body)
+        outcome = "miss"
+    return Response(body, media_type=media_type, headers={CACHE_HEADER: outcome})
+
+
+async def _run_batch(spec: CoordinateBatchSpec, coords: np.ndarray) -> np.ndarray:
+    try:
+        return await run_in_threadpool(_transform_columns, spec, coords)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc))
+
+
+def _transform_lines(spec: CoordinateBatchSpec, lines: list) -> str:
+    """Parses, transforms and re-serialises one NDJSON micro-batch."""
+    transformed = coordinate_conversions.convert_celestial_coordinates_batch(
+        ndjson.parse_rows(lines),
+        source_shape=spec.input_shape,
+        source_plane=spec.input_plane,
+        source_origin=spec.input_origin,
+        target_shape=spec.target_shape,
+        target_plane=spec.target_plane,
+        target_origin=spec.target_origin,
+        physical_state=spec.physical_state,
+        translation_vector=spec.translation_vector,
+        source_equinox=spec.input_equinox,
+        target_equinox=spec.target_equinox,
+        epoch=spec.epoch
+    )
+    return ndjson.encode_rows(transformed)
+
+
+async def _iter_transformed_lines(spec: CoordinateBatchSpec, first_lines: list,
+                                  batches: AsyncIterator[list]) -> AsyncIterator[str]:
+    yield ndjson.encode_line({
+        "shape": spec.target_shape.value,
+        "plane": spec.target_plane.value,
+        "origin": spec.target_origin.value,
+        "equinox": spec.target_equinox,
+        "columns": list(wire_formats.COLUMN_NAMES[spec.target_shape]),
+    })
+    try:
+        if first_lines:
+            yield await run_in_threadpool(_transform_lines, spec, first_lines)
+        async for lines in batches:
+            yield await run_in_threadpool(_transform_lines, spec, lines)
+    except ValueError as exc:
+        # The status line is long gone; report the failure in-band and stop.
+        yield ndjson.encode_line({"error": str(exc)})
+    except ClientDisconnect:
+        return
+
+
+@router.post("/transformations:stream",
+             response_class=ndjson.DuplexStreamingResponse,
+             status_code=status.HTTP_200_OK,
+             openapi_extra={"requestBody": {
+                 "required": True,
+                 "content": {ndjson.NDJSON: {"schema": {"type": "string"}}},
+             }})
+async def stream_coordinate_transformations(request: Request):
+    """
+    Transforms an unbounded newline-delimited JSON feed of coordinates.
+
+    The first line is a `CoordinateBatchSpec` object; every following line is one
+    coordinate as a ``[c0, c1, c2]`` array in the input shape. The body is read
+    incrementally and transformed in micro-batches of at most
+    ``STREAM_BATCH_ROWS`` lines, so memory stays constant however long the feed.
+
+    Returns:
+        DuplexStreamingResponse: NDJSON whose first line describes the output state
+        (``shape``, ``plane``, ``origin``, ``columns``), followed by one transformed
+        ``[c0, c1, c2]`` line per input line. A malformed line ends the stream with
+        an ``{"error": ...}`` line.
+    """
+    settings = get_settings()
+    batches = ndjson.iter_line_batches(
+        request.stream(), settings.stream_batch_rows, settings.stream_max_line_bytes
+    )
+    try:
+        first_lines = await anext(batches)
+    except StopAsyncIteration:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="The stream must start with a header line.")
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    try:
+        spec = CoordinateBatchSpec.model_validate_json(first_lines[0])
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False))
+    if any(isinstance(value, list)
+           for value in (spec.input_equinox, spec.target_equinox, spec.epoch)):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                            detail="Per-row equinox and epoch lists are not supported on a stream.")
+
+    return ndjson.DuplexStreamingResponse(
+        _iter_transformed_lines(spec, first_lines[1:], batches),
+        media_type=ndjson.NDJSON,
     )
-    return transformed_coords
@@ -6,9 +6,10 @@ Defines the `/health` endpoint and registers it on an `APIRouter`.
 from fastapi import APIRouter
 
 from app.core.config import get_settings
+from app.core.metrics import InstrumentedRoute
 from app.models.responses import HealthResponse
 
-router = APIRouter(tags=["health"])
+router = APIRouter(tags=["health"], route_class=InstrumentedRoute)
 
 settings = get_settings()
 
@@ -0,0 +1,131 @@
+"""
+Jobs router.
+
+Defines the `/jobs` endpoints, which run calculations too long for a single
+request (catalog propagation, dense ephemeris tables) in the background: submit a
+job, poll its progress, then page through its result. See
+:mod:`app.services.jobs` for scheduling, spooling and cancellation.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.v1 import wire_formats
+from app.core.config import get_settings
+from app.core.lazy import lazy_import
+from app.core.metrics import InstrumentedRoute
+from app.models.jobs import JobInfo, JobRequest, JobResultChunk
+
+# Loaded on first use or by the startup pre-warm.
+np = lazy_import("numpy")
+jobs = lazy_import("app.services.jobs")
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=InstrumentedRoute)
+
+# Media types a result chunk can be downloaded in.
+_RESULT_MEDIA_TYPES = (wire_formats.JSON, wire_formats.FLOAT64)
+
+
+def _get(job_id: str) -> jobs.Job:
+    try:
+        return jobs.get_job_manager().get(job_id)
+    except jobs.JobNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+
+@router.post("", response_model=JobInfo, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(request: JobRequest, response: Response):
+    """
+    Queues a background job and returns at once.
+
+    Args:
+        request (JobRequest): A `PropagationJobRequest` (``kind: "propagation"``) or
+            an `EphemerisJobRequest` (``kind: "ephemeris"``), with an optional
+            ``priority`` from -100 to 100; higher priorities run first.
+
+    Returns:
+        JobInfo: The queued job; its URL is in the ``Location`` header.
+    """
+    try:
+        job = await jobs.get_job_manager().submit(request.kind, request, request.priority)
+    except jobs.JobQueueFullError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc),
+                            headers={"Retry-After": "10"})
+    response.headers["Location"] = f"{get_settings().api_v1_prefix}/jobs/{job.id}"
+    return job.info()
+
+
+@router.get("/{job_id}", response_model=JobInfo)
+async def get_job(job_id: str):
+    """Reports a job's status and progress, and the shape of its result once it succeeded."""
+    return _get(job_id).info()
+
+
+@router.post("/{job_id}:cancel", response_model=JobInfo)
+async def cancel_job(job_id: str):
+    """
+    Cancels a job. A queued job is cancelled at once; a running one stops at its
+    next chunk, so its status may still read ``running`` in the response.
+    """
+    _get(job_id)
+    return jobs.get_job_manager().cancel(job_id).info()
+
+
+@router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_job(job_id: str):
+    """Discards a finished job and its result."""
+    _get(job_id)
+    try:
+        jobs.get_job_manager().delete(job_id)
+    except jobs.JobStateError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{job_id}/result", response_model=JobResultChunk,
+            responses={200: {"content": {wire_formats.FLOAT64: {}}}})
+async def get_job_result(request: Request, job_id: str,
+                         offset: int = Query(default=0, ge=0),
+                         limit: int | None = Query(default=None, ge=1)):
+    """
+    Downloads a chunk of a succeeded job's result.
+
+    Results are arrays whose first axis is paged: ``offset`` is the first row and
+    ``limit`` the number of rows, at most ``JOBS_DOWNLOAD_ROWS``. Follow
+    ``next_offset`` until it is null to fetch everything.
+
+    Returns:
+        JobResultChunk: The rows as nested JSON lists, or, with
+        ``Accept: application/vnd.celestial.float64``, as raw little-endian
+        float64 after a ``b"CCF1"`` JSON header carrying the same metadata.
+    """
+    media_type = wire_formats.negotiate_response_media_type(request.headers.get("accept"),
+                                                            _RESULT_MEDIA_TYPES)
+    job = _get(job_id)
+    max_rows = get_settings().jobs_download_rows
+    limit = min(limit or max_rows, max_rows)
+    try:
+        # The result is read from disk, off the event loop.
+        rows = await run_in_threadpool(jobs.get_job_manager().read_result, job_id, offset, limit)
+    except jobs.JobStateError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc))
+
+    total = job.result.shape[0]
+    count = rows.shape[0]
+    metadata = {
+        "offset": offset,
+        "count": count,
+        "total": total,
+        "next_offset": offset + count if offset + count < total else None,
+        "shape": list(rows.shape),
+        "columns": job.result.columns,
+    }
+    if media_type == wire_formats.FLOAT64:
+        body = (wire_formats.encode_float64_header(metadata)
+                + np.ascontiguousarray(rows, dtype="<f8").tobytes())
+        return Response(body, media_type=wire_formats.FLOAT64)
+    return JobResultChunk(**metadata, data=rows.tolist())
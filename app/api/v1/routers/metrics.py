@@ -0,0 +1,31 @@
+"""Metrics router.
+
+Defines the `/metrics` endpoint, which serves the latency histograms recorded by
+`app.core.metrics`, the startup timings from `app.core.startup`, and the response
+cache counters when the cache is enabled, in the Prometheus text exposition format.
+"""
+
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from app.core import metrics, startup
+from app.core.lazy import lazy_import
+
+result_cache = lazy_import("app.services.result_cache")
+
+router = APIRouter(tags=["health"], route_class=metrics.InstrumentedRoute)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, summary="Prometheus metrics")
+async def get_metrics() -> PlainTextResponse:
+    """
+    Return latency histograms, startup timings and response cache figures in the
+    Prometheus text format.
+    """
+    text = metrics.registry.render() + startup.render_metrics()
+    cache = result_cache.get_response_cache()
+    if cache is not None:
+        # A shared backend answers over the network.
+        text += await run_in_threadpool(cache.render_metrics)
+    return PlainTextResponse(text, media_type=metrics.PROMETHEUS_CONTENT_TYPE)
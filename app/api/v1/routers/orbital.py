@@ -0,0 +1,141 @@
+"""
+Orbital router.
+
+Defines the `/orbital` endpoints: batch orbit determination, which fits
+heliocentric orbits to many astrometric tracklets in one vectorized pass (see
+:mod:`app.services.calculations.orbit_determination`), and porkchop grids of
+Lambert transfers (see :mod:`app.services.calculations.porkchop`).
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.v1 import wire_formats
+from app.core.lazy import lazy_import
+from app.core.metrics import InstrumentedRoute
+from app.models.orbital import (
+    OrbitDeterminationRequest,
+    OrbitDeterminationResponse,
+    OrbitSolution,
+    PorkchopRequest,
+    PorkchopResponse,
+)
+
+# Loaded on first use or by the startup pre-warm.
+np = lazy_import("numpy")
+orbit_determination = lazy_import("app.services.calculations.orbit_determination")
+porkchop = lazy_import("app.services.calculations.porkchop")
+
+router = APIRouter(prefix="/orbital", tags=["Orbital"], route_class=InstrumentedRoute)
+
+# Media types a porkchop grid can be downloaded in.
+_PORKCHOP_MEDIA_TYPES = (wire_formats.JSON, wire_formats.FLOAT64)
+
+
+def _finite_or_none(values: np.ndarray):
+    return values.tolist() if np.isfinite(values).all() else None
+
+
+def _determine(request: OrbitDeterminationRequest) -> OrbitDeterminationResponse:
+    tracklets = request.tracklets
+    fit = orbit_determination.determine_orbits(
+        [tracklet.jd for tracklet in tracklets],
+        [tracklet.lon_or_ra for tracklet in tracklets],
+        [tracklet.lat_or_dec for tracklet in tracklets],
+        sigma=[tracklet.sigma_arcsec for tracklet in tracklets],
+        observer=[tracklet.observer for tracklet in tracklets],
+        max_iterations=request.max_iterations,
+    )
+    return OrbitDeterminationResponse(orbits=[
+        OrbitSolution(
+            converged=bool(fit.converged[k]),
+            epoch=float(fit.epoch[k]),
+            state=_finite_or_none(fit.state[k]),
+            elements=_finite_or_none(fit.elements[k]),
+            covariance=_finite_or_none(fit.covariance[k]),
+            rms_arcsec=float(fit.rms_arcsec[k]) if np.isfinite(fit.rms_arcsec[k]) else None,
+            iterations=int(fit.iterations[k]),
+        )
+        for k in range(len(tracklets))
+    ])
+
+
+@router.post("/determinations:batch", response_model=OrbitDeterminationResponse,
+             status_code=status.HTTP_200_OK)
+async def create_orbit_determinations_batch(request: OrbitDeterminationRequest):
+    """
+    Fits heliocentric orbits to many independent tracklets at once.
+
+    Each tracklet gets an initial orbit by Gauss's method from three of its
+    observations, refined by weighted least squares against all of them; the
+    whole batch is solved together as stacked normal equations.
+
+    Args:
+        request (OrbitDeterminationRequest): The tracklets (epochs, J2000 RA/Dec in
+            degrees, optional astrometric sigmas and observatory offsets) and the
+            iteration limit.
+
+    Returns:
+        OrbitDeterminationResponse: One `OrbitSolution` per tracklet, in order.
+        Check ``converged`` and ``rms_arcsec`` before trusting a solution.
+    """
+    try:
+        return await run_in_threadpool(_determine, request)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc))
+
+
+def _porkchop(request: PorkchopRequest) -> porkchop.PorkchopGrid:
+    axes = [(axis.start, axis.stop, axis.step) for axis in (request.departure, request.arrival)]
+    return porkchop.porkchop(request.departure_body, request.arrival_body, *axes,
+                             prograde=request.prograde)
+
+
+def _nullable(grid: np.ndarray) -> list:
+    return np.where(np.isfinite(grid), grid, None).ravel().tolist()
+
+
+@router.post("/porkchop", response_model=PorkchopResponse, status_code=status.HTTP_200_OK,
+             responses={200: {"content": {wire_formats.FLOAT64: {}}}})
+async def create_porkchop(request: Request, body: PorkchopRequest):
+    """
+    Computes a porkchop plot: transfer cost over departure × arrival dates.
+
+    Each cell is a Lambert transfer between the two planets; the grids hold the
+    launch energy C3, the hyperbolic excess speeds at both ends and their sum.
+    Planetary states are computed once per axis and cached, so grids sharing an
+    axis with an earlier request skip that work.
+
+    Args:
+        body (PorkchopRequest): The bodies (``earth``, ``mars``, …), the
+            ``departure`` and ``arrival`` date axes and the transfer direction.
+
+    Returns:
+        PorkchopResponse: Row-major grids as JSON lists, or, with
+        ``Accept: application/vnd.celestial.float64``, a ``b"CCF1"`` JSON header
+        carrying the same metadata (plus ``grids``, the grid names in order)
+        followed by the grids as raw little-endian float64, NaN where null.
+    """
+    media_type = wire_formats.negotiate_response_media_type(request.headers.get("accept"),
+                                                            _PORKCHOP_MEDIA_TYPES)
+    try:
+        grid = await run_in_threadpool(_porkchop, body)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc))
+
+    metadata = {
+        "departure_body": body.departure_body,
+        "arrival_body": body.arrival_body,
+        "departure": grid.departure.tolist(),
+        "arrival": grid.arrival.tolist(),
+        "shape": list(grid.c3.shape),
+    }
+    if media_type == wire_formats.FLOAT64:
+        names = porkchop.GRID_NAMES
+        data = np.stack([getattr(grid, name) for name in names]).astype("<f8", copy=False)
+        return Response(wire_formats.encode_float64_header({**metadata, "grids": list(names)})
+                        + data.tobytes(), media_type=wire_formats.FLOAT64)
+    return PorkchopResponse(**metadata, **{name: _nullable(getattr(grid, name))
+                                           for name in porkchop.GRID_NAMES})
@@ -7,9 +7,13 @@ that is applied in ``app.main``.
 from fastapi import APIRouter
 
 # Import routers from the `routers` package
-from app.api.v1.routers import health
+from app.api.v1.routers import coordinates, health, jobs, metrics, orbital
 
 router = APIRouter()
 
 # include per-domain routers here (prefixes/tags are set on each router file)
 router.include_router(health.router)
+router.include_router(metrics.router)
+router.include_router(coordinates.router)
+router.include_router(jobs.router)
+router.include_router(orbital.router)
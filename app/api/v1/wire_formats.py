@@ -0,0 +1,414 @@
+"""
+Wire formats for columnar coordinate payloads.
+
+The batch coordinate endpoints negotiate their request and response encodings from
+the ``Content-Type`` and ``Accept`` headers:
+
+- ``application/json``                      – columnar JSON (default, streamed)
+- ``application/msgpack``                   – MessagePack map, columns as float64 ``bin``
+- ``application/vnd.apache.arrow.stream``   – Apache Arrow IPC stream, one float64 column each
+- ``application/vnd.celestial.float64``     – raw little-endian float64 with a JSON header
+
+Binary payloads carry their metadata (a :class:`CoordinateBatchSpec` for requests,
+the output state for responses) next to the raw columns, so both ends can view the
+numbers as NumPy arrays without parsing text.
+
+Raw float64 layout::
+
+    b"CCF1" | uint32 LE header length | UTF-8 JSON header (space padded) | float64 LE columns
+
+The header is padded so the column data starts on an 8-byte boundary; columns are
+stored one after another (``x`` then ``y`` then ``z``, or ``lon_or_ra`` then
+``lat_or_dec`` then ``distance``), each ``count`` values long.
+
+MessagePack and Arrow support are optional (``pip install msgpack pyarrow``).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import struct
+from collections.abc import Collection, Iterator
+
+from fastapi import HTTPException, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.core.lazy import lazy_import
+from app.models.coordinates_systems import (
+    CoordinateBatchSpec,
+    CoordinateBatchTransformRequest,
+    Origin,
+    Plane,
+    Shape,
+    SphericalColumns,
+)
+
+np = lazy_import("numpy")
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+FLOAT64 = "application/vnd.celestial.float64"
+
+# Aliases seen in the wild, mapped onto the canonical media type.
+_MEDIA_TYPE_ALIASES = {
+    JSON: JSON,
+    MSGPACK: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    ARROW: ARROW,
+    FLOAT64: FLOAT64,
+    "application/octet-stream": FLOAT64,
+}
+
+COLUMN_NAMES = {
+    Shape.RECTANGULAR: ("x", "y", "z"),
+    Shape.SPHERICAL: ("lon_or_ra", "lat_or_dec", "distance"),
+}
+
+FLOAT64_MAGIC = b"CCF1"
+_FLOAT64_PREFIX = struct.Struct("<4sI")
+
+# Number of values serialised per streamed chunk of a JSON response.
+_JSON_CHUNK_VALUES = 8192
+# Number of bytes per streamed chunk of a binary response.
+_BINARY_CHUNK_BYTES = 1 << 20
+
+# OpenAPI description of the request bodies accepted by batch endpoints.
+BATCH_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        JSON: {"schema": CoordinateBatchTransformRequest.model_json_schema()},
+        MSGPACK: {"schema": {"type": "string", "format": "binary"}},
+        ARROW: {"schema": {"type": "string", "format": "binary"}},
+        FLOAT64: {"schema": {"type": "string", "format": "binary"}},
+    },
+}
+
+
+# ==========================================
+# CONTENT NEGOTIATION
+# ==========================================
+def _media_type(header_value: str) -> str:
+    return header_value.split(";", 1)[0].strip().lower()
+
+
+def request_media_type(content_type: str | None) -> str:
+    """
+    Resolve the request ``Content-Type`` to a supported media type.
+
+    A missing header is treated as JSON. Raises HTTP 415 for anything else.
+    """
+    if not content_type:
+        return JSON
+    media_type = _MEDIA_TYPE_ALIASES.get(_media_type(content_type))
+    if media_type is None:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail=f"Unsupported Content-Type '{content_type}'.")
+    return media_type
+
+
+# Optional packages backing each media type (JSON and raw float64 need none).
+_OPTIONAL_PACKAGES = {MSGPACK: "msgpack", ARROW: "pyarrow"}
+
+
+def _is_available(media_type: str) -> bool:
+    package = _OPTIONAL_PACKAGES.get(media_type)
+    return package is None or importlib.util.find_spec(package) is not None
+
+
+def negotiate_response_media_type(accept: str | None,
+                                  supported: Collection[str] | None = None) -> str:
+    """
+    Pick the response media type from an ``Accept`` header, honouring q-values.
+
+    Wildcards and a missing header select JSON; media types whose optional package
+    is not installed, or that are not in ``supported`` when given, are skipped.
+    Raises HTTP 406 when nothing in the header is supported.
+    """
+    if not accept:
+        return JSON
+
+    candidates = []
+    for position, item in enumerate(accept.split(",")):
+        media_range, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        candidates.append((-quality, position, media_range.lower()))
+
+    for negative_quality, _, media_range in sorted(candidates):
+        if negative_quality == 0.0:
+            break
+        if media_range in ("*/*", "application/*"):
+            return JSON
+        media_type = _MEDIA_TYPE_ALIASES.get(media_range)
+        if (media_type is not None and _is_available(media_type)
+                and (supported is None or media_type in supported)):
+            return media_type
+
+    raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE,
+                        detail=f"None of the media types in '{accept}' are supported.")
+
+
+def _require(module_name: str, http_status: int):
+    try:
+        return __import__(module_name)
+    except ImportError:
+        raise HTTPException(status_code=http_status,
+                            detail=f"The '{module_name}' package is required for this media type.")
+
+
+# ==========================================
+# REQUEST DECODING
+# ==========================================
+def _validate_spec(metadata) -> CoordinateBatchSpec:
+    try:
+        return CoordinateBatchSpec.model_validate(metadata)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False))
+
+
+def _bad_payload(message: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+
+
+def _decode_json(body: bytes) -> tuple[CoordinateBatchSpec, np.ndarray]:
+    try:
+        request = CoordinateBatchTransformRequest.model_validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False))
+
+    input_coords = request.input_coords
+    spec = CoordinateBatchSpec(
+        input_shape=(Shape.SPHERICAL if isinstance(input_coords, SphericalColumns)
+                     else Shape.RECTANGULAR),
+        input_plane=input_coords.plane,
+        input_origin=input_coords.origin,
+        target_shape=request.target_shape,
+        target_plane=request.target_plane,
+        target_origin=request.target_origin,
+        physical_state=request.physical_state,
+        translation_vector=request.translation_vector,
+        input_equinox=input_coords.equinox,
+        target_equinox=request.target_equinox,
+        epoch=request.epoch,
+    )
+    return spec, input_coords.to_numpy()
+
+
+def _decode_float64(body: bytes) -> tuple[CoordinateBatchSpec, np.ndarray]:
+    if len(body) < _FLOAT64_PREFIX.size:
+        raise _bad_payload("Payload is too short for a float64 header.")
+    magic, header_length = _FLOAT64_PREFIX.unpack_from(body)
+    if magic != FLOAT64_MAGIC:
+        raise _bad_payload("Payload does not start with the float64 magic bytes.")
+
+    data_offset = _FLOAT64_PREFIX.size + header_length
+    try:
+        header = json.loads(body[_FLOAT64_PREFIX.size:data_offset])
+        count = int(header.pop("count"))
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise _bad_payload("Malformed float64 header.")
+    spec = _validate_spec(header)
+
+    if count < 0 or len(body) - data_offset != 3 * 8 * count:
+        raise _bad_payload("Column data length does not match the header count.")
+    columns = np.frombuffer(body, dtype="<f8", count=3 * count, offset=data_offset)
+    return spec, columns.reshape(3, count).T
+
+
+def _decode_msgpack(body: bytes) -> tuple[CoordinateBatchSpec, np.ndarray]:
+    msgpack = _require("msgpack", status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+    try:
+        payload = msgpack.unpackb(body, raw=False)
+        raw_columns = payload.pop("columns")
+    except (ValueError, KeyError, TypeError, AttributeError, msgpack.ExtraData):
+        raise _bad_payload("Malformed MessagePack payload.")
+    spec = _validate_spec(payload)
+
+    columns = []
+    for name in COLUMN_NAMES[spec.input_shape]:
+        column = raw_columns.get(name) if isinstance(raw_columns, dict) else None
+        if isinstance(column, (bytes, bytearray)):
+            if len(column) % 8:
+                raise _bad_payload(f"Column '{name}' is not a whole number of float64 values.")
+            columns.append(np.frombuffer(column, dtype="<f8"))
+        elif isinstance(column, list):
+            columns.append(np.asarray(column, dtype=np.float64))
+        else:
+            raise _bad_payload(f"Missing or invalid column '{name}'.")
+    return spec, _stack_columns(columns)
+
+
+def _decode_arrow(body: bytes) -> tuple[CoordinateBatchSpec, np.ndarray]:
+    pa = _require("pyarrow", status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+        metadata = json.loads(table.schema.metadata[b"spec"])
+    except (pa.ArrowException, KeyError, TypeError, ValueError):
+        raise _bad_payload("Malformed Arrow IPC payload.")
+    spec = _validate_spec(metadata)
+
+    columns = []
+    for name in COLUMN_NAMES[spec.input_shape]:
+        if name not in table.column_names:
+            raise _bad_payload(f"Missing column '{name}'.")
+        column = table.column(name)
+        if column.null_count:
+            raise _bad_payload(f"Column '{name}' contains nulls.")
+        # Zero-copy for a single-chunk float64 column, which is what writers emit.
+        columns.append(column.to_numpy().astype(np.float64, copy=False))
+    return spec, _stack_columns(columns)
+
+
+def _stack_columns(columns) -> np.ndarray:
+    if not len(columns[0]) == len(columns[1]) == len(columns[2]):
+        raise _bad_payload("All columns must have the same length.")
+    return np.stack(columns).T
+
+
+_DECODERS = {
+    JSON: _decode_json,
+    MSGPACK: _decode_msgpack,
+    ARROW: _decode_arrow,
+    FLOAT64: _decode_float64,
+}
+
+
+def decode_batch_request(body: bytes,
+                         content_type: str | None) -> tuple[CoordinateBatchSpec, np.ndarray]:
+    """
+    Decode a batch transformation request body.
+
+    Returns:
+    --------
+    tuple
+        The shared :class:`CoordinateBatchSpec` and an (N, 3) float64 array of
+        input coordinates. For binary formats the array is a view over the body.
+    """
+    spec, coords = _DECODERS[request_media_type(content_type)](body)
+    if not np.isfinite(coords).all():
+        raise _bad_payload("Coordinates must be finite numbers.")
+    return spec, coords
+
+
+# ==========================================
+# RESPONSE ENCODING
+# ==========================================
+def _response_header(columns: np.ndarray, shape: Shape, plane: Plane, origin: Origin,
+                     equinox=None) -> dict:
+    return {
+        "shape": shape.value,
+        "plane": plane.value,
+        "origin": origin.value,
+        "equinox": equinox,
+        "count": int(columns.shape[1]),
+        "columns": list(COLUMN_NAMES[shape]),
+    }
+
+
+def _iter_json(columns: np.ndarray, shape: Shape, plane: Plane, origin: Origin,
+               equinox=None) -> Iterator[str]:
+    yield json.dumps({"plane": plane.value, "origin": origin.value, "equinox": equinox})[:-1]
+    for name, column in zip(COLUMN_NAMES[shape], columns):
+        yield f', "{name}": ['
+        for start in range(0, column.shape[0], _JSON_CHUNK_VALUES):
+            if start:
+                yield ", "
+            yield json.dumps(column[start:start + _JSON_CHUNK_VALUES].tolist())[1:-1]
+        yield "]"
+    yield "}"
+
+
+def _iter_buffer(prefix: bytes, buffer) -> Iterator[bytes]:
+    yield prefix
+    view = memoryview(buffer).cast("B")
+    for start in range(0, len(view), _BINARY_CHUNK_BYTES):
+        yield view[start:start + _BINARY_CHUNK_BYTES]
+
+
+def encode_float64_header(header: dict) -> bytes:
+    """Build the magic, length and padded JSON header of a raw float64 payload."""
+    text = json.dumps(header).encode()
+    padding = -(_FLOAT64_PREFIX.size + len(text)) % 8
+    text += b" " * padding
+    return _FLOAT64_PREFIX.pack(FLOAT64_MAGIC, len(text)) + text
+
+
+def _iter_float64(columns, shape, plane, origin, equinox=None) -> Iterator[bytes]:
+    header = encode_float64_header(_response_header(columns, shape, plane, origin, equinox))
+    return _iter_buffer(header, np.ascontiguousarray(columns, dtype="<f8"))
+
+
+def _iter_msgpack(columns, shape, plane, origin, equinox=None) -> Iterator[bytes]:
+    msgpack = _require("msgpack", status.HTTP_406_NOT_ACCEPTABLE)
+    columns = np.ascontiguousarray(columns, dtype="<f8")
+    payload = _response_header(columns, shape, plane, origin, equinox)
+    payload["columns"] = {name: memoryview(column)
+                          for name, column in zip(COLUMN_NAMES[shape], columns)}
+    return iter((msgpack.packb(payload, use_bin_type=True),))
+
+
+def _iter_arrow(columns, shape, plane, origin, equinox=None) -> Iterator[bytes]:
+    pa = _require("pyarrow", status.HTTP_406_NOT_ACCEPTABLE)
+    header = _response_header(columns, shape, plane, origin, equinox)
+    batch = pa.record_batch(
+        [pa.array(np.ascontiguousarray(column)) for column in columns],
+        names=list(COLUMN_NAMES[shape]),
+    )
+    batch = batch.replace_schema_metadata({"spec": json.dumps(header)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return _iter_buffer(b"", sink.getvalue())
+
+
+_ENCODERS = {
+    JSON: _iter_json,
+    MSGPACK: _iter_msgpack,
+    ARROW: _iter_arrow,
+    FLOAT64: _iter_float64,
+}
+
+
+def columns_response(columns: np.ndarray, media_type: str, shape: Shape,
+                     plane: Plane, origin: Origin, equinox=None) -> StreamingResponse:
+    """
+    Stream a (3, N) array of result columns in the negotiated media type.
+
+    Parameters:
+    -----------
+    columns : np.ndarray
+        The result, one row per output column. C-contiguous float64 input is
+        streamed straight from its buffer for the binary formats.
+    media_type : str
+        One of the canonical media types returned by
+        :func:`negotiate_response_media_type`.
+    shape, plane, origin, equinox :
+        The output state, echoed into the payload metadata.
+    """
+    # Encoders resolve their optional dependencies eagerly, so a missing package
+    # surfaces as an HTTP error before the response has started.
+    body = _ENCODERS[media_type](columns, shape, plane, origin, equinox)
+    return StreamingResponse(body, media_type=media_type)
+
+
+def encode_columns(columns: np.ndarray, media_type: str, shape: Shape,
+                   plane: Plane, origin: Origin, equinox=None) -> bytes:
+    """
+    Encode a (3, N) array of result columns into one buffer.
+
+    Same payload as :func:`columns_response`, materialised for bodies that are kept
+    after the response is sent (the result cache); meant for small batches only.
+    """
+    return b"".join(chunk.encode() if isinstance(chunk, str) else bytes(chunk)
+                    for chunk in _ENCODERS[media_type](columns, shape, plane, origin, equinox))
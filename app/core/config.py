@@ -11,7 +11,7 @@ from functools import lru_cache
 import json
 
 from dotenv import load_dotenv
-from pydantic import field_validator
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Load environment variables from a `.env` file in the project root. We call
@@ -43,6 +43,65 @@ class Settings(BaseSettings):
         Comma-separated list of origins allowed by the CORS middleware.
     api_v1_prefix : str
         URL prefix for all v1 routes, e.g. ``/api/v1``.
+    worker_processes : int
+        Size of the process pool used for large batch jobs. ``0`` means one
+        worker per CPU core; ``1`` keeps every job in-process.
+    parallel_min_rows : int
+        Batches with fewer rows than this run in-process, skipping the pool.
+    parallel_chunk_rows : int
+        Number of rows handed to a worker process per task.
+    stream_batch_rows : int
+        Maximum number of lines transformed per micro-batch by the NDJSON
+        streaming endpoint.
+    stream_max_line_bytes : int
+        Longest accepted line in an NDJSON stream; bounds per-line buffering.
+    metrics_enabled : bool
+        Record request and stage latency histograms, served in the Prometheus
+        text format at ``/api/v1/metrics``.
+    prewarm_enabled : bool
+        Load the deferred modules and build the ephemeris and precession caches
+        during application startup (see :mod:`app.core.startup`), so the first
+        request does not pay for them.
+    precession_table_start : float
+        First Julian Date (TT) of the precomputed precession-nutation table.
+    precession_table_end : float
+        Last Julian Date (TT) of the table; epochs outside the window are
+        evaluated from the series directly.
+    precession_table_step : float
+        Spacing of the table in days.
+    ephemeris_segment_days : float
+        Length in days of the Chebyshev segments fitted to the planetary ephemeris.
+    ephemeris_cache_segments : int
+        Maximum number of ephemeris segments kept in memory, across all bodies.
+    result_cache_enabled : bool
+        Memoize coordinate transformation responses (see
+        :mod:`app.services.result_cache`).
+    result_cache_backend : str
+        Where cached responses live: ``memory`` (per process) or ``redis``
+        (shared), or a backend added with ``register_backend``.
+    result_cache_url : str
+        Connection URL of a shared backend.
+    result_cache_max_entries : int
+        Maximum number of responses kept by the ``memory`` backend.
+    result_cache_max_bytes : int
+        Maximum total size of the responses kept by the ``memory`` backend.
+    result_cache_ttl_seconds : float
+        Lifetime of a cached response; ``0`` keeps it until evicted.
+    result_cache_max_batch_rows : int
+        Batch requests with more rows bypass the cache.
+    jobs_max_concurrent : int
+        Background jobs running at the same time.
+    jobs_max_queued : int
+        Background jobs allowed to wait; further submissions get HTTP 503.
+    jobs_spool_dir : str
+        Directory for job results; empty uses a ``celestial-jobs`` directory
+        under the system temporary directory.
+    jobs_retention_seconds : float
+        How long finished jobs and their results are kept.
+    jobs_chunk_rows : int
+        Result rows computed between progress updates and cancellation checks.
+    jobs_download_rows : int
+        Largest number of result rows returned per download request.
     """
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
@@ -67,6 +126,47 @@ class Settings(BaseSettings):
     # API
     api_v1_prefix: str = "/api/v1"
 
+    # Parallel execution of large batch jobs
+    worker_processes: int = Field(default=0, ge=0)
+    parallel_min_rows: int = Field(default=250_000, ge=0)
+    parallel_chunk_rows: int = Field(default=100_000, ge=1)
+
+    # NDJSON streaming
+    stream_batch_rows: int = Field(default=4096, ge=1)
+    stream_max_line_bytes: int = Field(default=65_536, ge=64)
+
+    # Instrumentation
+    metrics_enabled: bool = True
+
+    # Startup: warm the deferred modules and caches before serving
+    prewarm_enabled: bool = True
+
+    # Precession-nutation rotation table (Julian Dates, TT): 1900-01-01 to 2100-01-01
+    precession_table_start: float = 2415020.5
+    precession_table_end: float = 2488069.5
+    precession_table_step: float = Field(default=1.0, gt=0)
+
+    # Analytic planetary ephemeris: Chebyshev segment length (days) and LRU size
+    ephemeris_segment_days: float = Field(default=16.0, gt=0)
+    ephemeris_cache_segments: int = Field(default=4096, ge=1)
+
+    # Memoization of transformation responses
+    result_cache_enabled: bool = False
+    result_cache_backend: str = "memory"
+    result_cache_url: str = "redis://localhost:6379/0"
+    result_cache_max_entries: int = Field(default=10_000, ge=1)
+    result_cache_max_bytes: int = Field(default=64 * 1024 * 1024, ge=1)
+    result_cache_ttl_seconds: float = Field(default=3600.0, ge=0)
+    result_cache_max_batch_rows: int = Field(default=1000, ge=0)
+
+    # Background jobs
+    jobs_max_concurrent: int = Field(default=2, ge=1)
+    jobs_max_queued: int = Field(default=64, ge=1)
+    jobs_spool_dir: str = ""
+    jobs_retention_seconds: float = Field(default=86_400.0, gt=0)
+    jobs_chunk_rows: int = Field(default=100_000, ge=1)
+    jobs_download_rows: int = Field(default=10_000, ge=1)
+
     @field_validator("cors_origins", mode="before")
     @classmethod
     def _parse_cors_origins(cls, v):
@@ -2,3 +2,9 @@ import math
 
 # Obliquity of the Ecliptic: 23°26'21.406"
 EPSILON_RAD = math.radians(23 + (26 / 60) + (21.406 / 3600))
+
+# Astronomical unit [m] (IAU 2012 Resolution B2)
+AU_M = 1.495_978_707e11
+
+# Standard gravitational parameter for the Sun [m³ s⁻²]
+GM_SUN = 1.327_124_400_41e20
@@ -0,0 +1,85 @@
+"""
+Deferred imports.
+
+:func:`lazy_import` returns a stand-in module that imports the real one the first
+time one of its attributes is read. Modules that are only needed to serve
+requests – NumPy and the calculation services behind the routers – are bound
+this way, so importing :mod:`app.main` stays cheap for scale-to-zero deployments,
+and the lifespan pre-warm (:mod:`app.core.startup`) loads them before the first
+request arrives::
+
+    np = lazy_import("numpy")
+    ...
+    np.asarray(values)  # NumPy is imported here, once
+
+Attribute writes go through to the real module, so tests can monkeypatch a
+service through either object. Reading an attribute through the stand-in costs
+one extra function call; hot loops should live in the loaded modules, which
+import their dependencies normally.
+"""
+
+import importlib
+import sys
+import types
+
+# Names of every module bound with `lazy_import`, in registration order.
+_REGISTERED: dict[str, None] = {}
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__.get("_module")
+        if module is None:
+            # The import system serialises concurrent first imports of a module.
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self._load(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._load(), name)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if is_loaded(self) else "deferred"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Bind ``name`` without importing it.
+
+    Returns the module itself when it is already imported, otherwise a
+    :class:`LazyModule` that imports it on first use.
+    """
+    _REGISTERED.setdefault(name)
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def is_loaded(module: types.ModuleType | str) -> bool:
+    """Whether a module (or a lazy stand-in for it) has been imported yet."""
+    name = module if isinstance(module, str) else module.__name__
+    return name in sys.modules
+
+
+def deferred() -> list[str]:
+    """Modules bound with :func:`lazy_import` that have not been imported yet."""
+    return [name for name in _REGISTERED if not is_loaded(name)]
+
+
+def load_all() -> list[str]:
+    """Import every module bound with :func:`lazy_import`; return the ones it loaded."""
+    pending = deferred()
+    for name in pending:
+        importlib.import_module(name)
+    return pending
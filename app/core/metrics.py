@@ -0,0 +1,357 @@
+"""
+In-process latency metrics, exported in the Prometheus text format.
+
+Two histogram families are recorded:
+
+- ``http_request_duration_seconds{method, route, status}`` – wall time of every
+  request, measured by :class:`MetricsMiddleware` until the last body chunk is sent.
+- ``request_stage_duration_seconds{route, stage}`` – time per stage of a request:
+  ``parse`` (body read and validation), ``endpoint`` and ``serialize`` from
+  :class:`InstrumentedRoute`, plus whatever stages the services record with
+  :func:`record` while serving the route (e.g. ``normalize``, ``matrix``,
+  ``apply`` and ``reshape`` in the coordinate pipeline).
+
+Service code times a stage as::
+
+    mark = metrics.now()
+    ...                                   # the stage
+    mark = metrics.record("normalize", mark)
+
+``record`` attributes the time to the route being served, found through a
+context variable, and costs well under a microsecond. Outside a request (scripts,
+benchmarks, worker processes) no route is set and it only reads the clock.
+"""
+
+import functools
+import inspect
+import threading
+from bisect import bisect_left
+from collections.abc import Callable
+from contextvars import ContextVar
+from time import perf_counter_ns
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bucket bounds in seconds: 1 µs to 10 s in 1-2.5-5 steps.
+DEFAULT_BUCKETS = tuple(
+    mantissa * 10.0 ** exponent for exponent in range(-6, 1) for mantissa in (1.0, 2.5, 5.0)
+) + (10.0,)
+
+REQUEST_DURATION = "http_request_duration_seconds"
+STAGE_DURATION = "request_stage_duration_seconds"
+
+_HELP = {
+    REQUEST_DURATION: "Wall time of HTTP requests, until the last body chunk is sent.",
+    STAGE_DURATION: "Time spent per stage of a request.",
+}
+
+# Route template of the request being served, or None outside a request.
+_current_route: ContextVar[str | None] = ContextVar("metrics_route", default=None)
+
+
+class Histogram:
+    """
+    Cumulative-bucket latency histogram.
+
+    Each thread counts into its own shard, so :meth:`observe_ns` takes no lock;
+    the shards are summed when the histogram is read.
+
+    Parameters
+    ----------
+    buckets : tuple of float
+        Sorted upper bounds in seconds; an implicit ``+Inf`` bucket follows.
+    """
+
+    __slots__ = ("buckets", "_bounds_ns", "_local", "_shards", "_lock")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._bounds_ns = [round(bound * 1e9) for bound in buckets]
+        self._local = threading.local()
+        self._shards: list[list[int]] = []
+        self._lock = threading.Lock()
+
+    def _new_shard(self) -> list[int]:
+        # One count per bucket plus +Inf, then the running sum in nanoseconds.
+        shard = [0] * (len(self.buckets) + 2)
+        with self._lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def observe_ns(self, elapsed_ns: int) -> None:
+        """Record one duration in nanoseconds."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[bisect_left(self._bounds_ns, elapsed_ns)] += 1
+        shard[-1] += elapsed_ns
+
+    def snapshot(self) -> tuple[list[int], int, float]:
+        """Return ``(cumulative bucket counts, count, sum in seconds)``."""
+        with self._lock:
+            shards = [list(shard) for shard in self._shards]
+        totals = [sum(column) for column in zip(*shards)] or [0] * (len(self.buckets) + 2)
+        cumulative, running = [], 0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, running, totals[-1] / 1e9
+
+
+class MetricsRegistry:
+    """Thread-safe collection of histograms keyed by metric name and label values."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms: dict[tuple[str, tuple[tuple[str, str], ...]], Histogram] = {}
+        # Hot-path index of STAGE_DURATION histograms by (route, stage).
+        self._stages: dict[tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        """Return the histogram for ``name`` and ``labels``, creating it on first use."""
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(self.buckets))
+        return histogram
+
+    def stage(self, route: str, stage: str) -> Histogram:
+        """Shortcut for ``histogram(STAGE_DURATION, route=route, stage=stage)``."""
+        histogram = self._stages.get((route, stage))
+        if histogram is None:
+            histogram = self.histogram(STAGE_DURATION, route=route, stage=stage)
+            self._stages[(route, stage)] = histogram
+        return histogram
+
+    def clear(self) -> None:
+        """Drop every histogram."""
+        with self._lock:
+            self._histograms.clear()
+            self._stages.clear()
+
+    def render(self) -> str:
+        """Serialise every histogram in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._histograms.items(), key=lambda item: item[0])
+        lines: list[str] = []
+        family = None
+        for (name, labels), histogram in items:
+            if name != family:
+                family = name
+                lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+            cumulative, count, total = histogram.snapshot()
+            bounds = [_format_float(bound) for bound in histogram.buckets] + ["+Inf"]
+            for bound, value in zip(bounds, cumulative):
+                lines.append(f"{name}_bucket{_format_labels(labels, le=bound)} {value}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_float(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def render_samples(name: str, kind: str, help_text: str,
+                   samples: list[tuple[dict[str, str], float | None]]) -> str:
+    """
+    Serialise one counter or gauge family in the Prometheus text exposition format.
+
+    For figures owned by other components (e.g. cache occupancy) and read when
+    ``/metrics`` is scraped; samples whose value is ``None`` are left out.
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if value is not None:
+            label_text = _format_labels(tuple(sorted(labels.items()))) if labels else ""
+            lines.append(f"{name}{label_text} {_format_float(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...], **extra: str) -> str:
+    pairs = list(labels) + list(extra.items())
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in pairs) + "}"
+
+
+registry = MetricsRegistry()
+
+
+# ---------------------------------------------------------------------------
+# Service-level timers
+# ---------------------------------------------------------------------------
+
+now = perf_counter_ns
+
+
+def record(stage: str, start_ns: int) -> int:
+    """
+    Record the time since ``start_ns`` as ``stage`` of the current route.
+
+    Returns the current clock reading, to be used as the start of the next stage.
+    """
+    end_ns = perf_counter_ns()
+    route = _current_route.get()
+    if route is not None:
+        registry.stage(route, stage).observe_ns(end_ns - start_ns)
+    return end_ns
+
+
+# ---------------------------------------------------------------------------
+# Route and middleware instrumentation
+# ---------------------------------------------------------------------------
+
+class _StageClock:
+    __slots__ = ("endpoint_start", "endpoint_end")
+
+    def __init__(self) -> None:
+        self.endpoint_start = self.endpoint_end = 0
+
+
+# Scope key under which InstrumentedRoute leaves the route label for the middleware.
+_SCOPE_LABEL = "metrics.route"
+
+# Set per request by InstrumentedRoute; stamped by the wrapped endpoint.
+_stage_clock: ContextVar[_StageClock | None] = ContextVar("metrics_stage_clock", default=None)
+
+
+def _stamp_endpoint(endpoint: Callable) -> Callable:
+    """Wrap ``endpoint`` so it records when it starts and returns."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            clock = _stage_clock.get()
+            if clock is not None:
+                clock.endpoint_start = perf_counter_ns()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if clock is not None:
+                    clock.endpoint_end = perf_counter_ns()
+    else:
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            # Sync endpoints run in the threadpool, which copies the request's context.
+            clock = _stage_clock.get()
+            if clock is not None:
+                clock.endpoint_start = perf_counter_ns()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                if clock is not None:
+                    clock.endpoint_end = perf_counter_ns()
+    return timed
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    :class:`APIRoute` that times the ``parse``, ``endpoint`` and ``serialize``
+    stages of every request and makes the route template available to
+    :func:`record`.
+
+    Use it as ``APIRouter(route_class=InstrumentedRoute)``; the class is kept
+    when the router is included under a prefix. The route label is the full path
+    template, prefixes included (e.g. ``/api/v1/coordinates/transformations``).
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _stamp_endpoint(endpoint), **kwargs)
+        self._label: str | None = None
+
+    def metrics_label(self, request: Request) -> str:
+        """Full path template of this route, resolved from the first request it serves."""
+        if self._label is None:
+            # Depending on the FastAPI version, routes of included routers either
+            # carry the full path or only the path relative to their prefix.
+            # Find the prefix as the part of the URL the route's own pattern
+            # does not account for.
+            path = request.scope["path"]
+            prefix = next((path[:i] for i in range(len(path))
+                           if path[i] == "/" and self.path_regex.match(path[i:])), "")
+            self._label = prefix + self.path_format
+        return self._label
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        if not get_settings().metrics_enabled:
+            return handler
+
+        async def instrumented_handler(request: Request):
+            start = perf_counter_ns()
+            route = self.metrics_label(request)
+            request.scope[_SCOPE_LABEL] = route
+            clock = _StageClock()
+            clock_token = _stage_clock.set(clock)
+            route_token = _current_route.set(route)
+            try:
+                response = await handler(request)
+            finally:
+                _current_route.reset(route_token)
+                _stage_clock.reset(clock_token)
+            end = perf_counter_ns()
+            if clock.endpoint_end:
+                for stage, elapsed in (("parse", clock.endpoint_start - start),
+                                       ("endpoint", clock.endpoint_end - clock.endpoint_start),
+                                       ("serialize", end - clock.endpoint_end)):
+                    registry.stage(route, stage).observe_ns(elapsed)
+            return response
+
+        return instrumented_handler
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording :data:`REQUEST_DURATION` for every HTTP request.
+
+    Requests that match no route are grouped under ``route="<unmatched>"`` to
+    keep label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter_ns()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                self._observe(scope, status, perf_counter_ns() - start)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            self._observe(scope, 500, perf_counter_ns() - start)
+            raise
+
+    @staticmethod
+    def _observe(scope: Scope, status: int, elapsed_ns: int) -> None:
+        route = scope.get(_SCOPE_LABEL) or getattr(scope.get("route"), "path_format", None)
+        registry.histogram(
+            REQUEST_DURATION,
+            method=scope["method"],
+            route=route or "<unmatched>",
+            status=str(status),
+        ).observe_ns(elapsed_ns)
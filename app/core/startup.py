@@ -0,0 +1,173 @@
+"""
+Startup timing and pre-warming.
+
+A cold start costs the application import plus whatever the first requests build
+on demand. This module measures both and moves the second out of the request path:
+
+- :func:`mark_imported` records how long importing the application took, from
+  the first import of the :mod:`app` package to the end of :mod:`app.main`.
+- :func:`prewarm` runs the pre-warm steps in order and times each one: by default
+  it imports the modules bound with :func:`app.core.lazy.lazy_import`, fits the
+  planetary ephemeris segments around the current date and builds the
+  precession-nutation tables. The application lifespan calls it before serving
+  when ``PREWARM_ENABLED`` is set; more steps are added with :func:`register_prewarm`.
+- :func:`render_metrics` exports the timings as Prometheus gauges, served at
+  ``/api/v1/metrics``.
+- :func:`import_breakdown` imports the application in a fresh interpreter with
+  ``python -X importtime`` and totals the time per package::
+
+      python -m app.core.startup [--module app.main] [--top 15]
+"""
+
+import argparse
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+
+import app
+from app.core import lazy, metrics
+from app.models.coordinates_systems import Plane
+
+planetary_ephemeris = lazy.lazy_import("app.services.calculations.planetary_ephemeris")
+precession = lazy.lazy_import("app.services.calculations.precession")
+
+# Julian Date of the Unix epoch.
+_UNIX_EPOCH_JD = 2440587.5
+
+_lock = threading.Lock()
+_import_seconds: float | None = None
+_prewarm_seconds: dict[str, float] = {}
+
+
+def _load_modules() -> None:
+    lazy.load_all()
+
+
+def _fit_ephemeris() -> None:
+    # Origin changes near the present are the common case; fit those segments.
+    jd = _UNIX_EPOCH_JD + time.time() / 86_400.0
+    cache = planetary_ephemeris.ephemeris_cache()
+    for body in planetary_ephemeris.BODIES:
+        cache.positions(body, jd)
+
+
+def _build_precession_tables() -> None:
+    for plane in Plane:
+        precession.rotation_table(plane)
+
+
+# Pre-warm steps by name, run in insertion order.
+_PREWARM_STEPS: dict[str, Callable[[], None]] = {
+    "modules": _load_modules,
+    "ephemeris": _fit_ephemeris,
+    "precession": _build_precession_tables,
+}
+
+
+def register_prewarm(name: str, step: Callable[[], None]) -> None:
+    """Add (or replace) a pre-warm step; it runs after the ones already registered."""
+    _PREWARM_STEPS[name] = step
+
+
+def mark_imported() -> float:
+    """Record the application import as finished; return its duration in seconds."""
+    global _import_seconds
+    seconds = (time.perf_counter_ns() - app.IMPORT_STARTED_NS) / 1e9
+    with _lock:
+        _import_seconds = seconds
+    return seconds
+
+
+def prewarm() -> dict[str, float]:
+    """
+    Run every pre-warm step and return the seconds each one took.
+
+    Blocking: the lifespan runs it in a worker thread before the first request.
+    """
+    timings = {}
+    for name, step in list(_PREWARM_STEPS.items()):
+        start = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - start
+        with _lock:
+            _prewarm_seconds[name] = timings[name]
+    return timings
+
+
+def report() -> dict:
+    """Return the recorded startup timings and the modules still deferred."""
+    with _lock:
+        prewarm_seconds = dict(_prewarm_seconds)
+        import_seconds = _import_seconds
+    return {
+        "import_seconds": import_seconds,
+        "prewarm_seconds": prewarm_seconds,
+        "deferred_modules": lazy.deferred(),
+    }
+
+
+def render_metrics() -> str:
+    """Serialise :func:`report` in the Prometheus text exposition format."""
+    startup = report()
+    prewarm_seconds = startup["prewarm_seconds"]
+    families = [
+        ("app_startup_seconds", "gauge", "Time spent importing and pre-warming the application.",
+         [({"phase": "import"}, startup["import_seconds"]),
+          ({"phase": "prewarm"}, sum(prewarm_seconds.values()) if prewarm_seconds else None)]),
+        ("app_prewarm_step_seconds", "gauge", "Time taken by each pre-warm step.",
+         [({"step": name}, seconds) for name, seconds in prewarm_seconds.items()]),
+        ("app_deferred_modules", "gauge", "Lazily imported modules not loaded yet.",
+         [({}, len(startup["deferred_modules"]))]),
+    ]
+    return "".join(metrics.render_samples(*family) for family in families)
+
+
+def _package(module: str) -> str:
+    # Application modules are grouped one level deeper (app.api, app.services, ...).
+    parts = module.split(".")
+    return ".".join(parts[:2]) if parts[0] == "app" else parts[0]
+
+
+def import_breakdown(module: str = "app.main") -> list[tuple[str, float]]:
+    """
+    Import ``module`` in a fresh interpreter and total the import time per package.
+
+    Returns
+    -------
+    list of (str, float)
+        ``(package, seconds)`` pairs, slowest first. Each module's own import
+        time counts towards its top-level package (second level for ``app``).
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, check=True)
+    totals: defaultdict[str, float] = defaultdict(float)
+    for line in completed.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        totals[_package(fields[2].strip())] += int(fields[0]) / 1e6
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time breakdown per package.")
+    parser.add_argument("--module", default="app.main", help="module to import")
+    parser.add_argument("--top", type=int, default=15, help="packages listed")
+    args = parser.parse_args()
+
+    breakdown = import_breakdown(args.module)
+    total = sum(seconds for _, seconds in breakdown)
+    print(f"import {args.module}: {total * 1e3:.0f} ms")
+    for package, seconds in breakdown[:args.top]:
+        print(f"  {package:<32} {seconds * 1e3:8.1f} ms  {seconds / total:6.1%}")
+    rest = sum(seconds for _, seconds in breakdown[args.top:])
+    if rest:
+        print(f"  {'(other)':<32} {rest * 1e3:8.1f} ms  {rest / total:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,52 @@
 Application factory for the Celestial Mechanics Calculations API.
 
 This module creates and configures the FastAPI application instance, registers
-middleware (CORS), mounts the versioned API routers, and exposes a root
-endpoint that returns a welcome message with links to the interactive docs.
+middleware (CORS, request metrics), mounts the versioned API routers, and
+exposes a root endpoint that returns a welcome message with links to the
+interactive docs.
+
+NumPy and the calculation services are imported lazily (see :mod:`app.core.lazy`),
+so importing this module stays fast; the lifespan pre-warms them before serving.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.routes import router as v1_router
+from app.core import startup
 from app.core.config import get_settings
+from app.core.lazy import is_loaded, lazy_import
+from app.core.metrics import MetricsMiddleware
 from app.models.responses import RootResponse
 
+jobs = lazy_import("app.services.jobs")
+parallel = lazy_import("app.services.parallel")
+result_cache = lazy_import("app.services.result_cache")
+
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Pre-warm the deferred modules and caches on startup, and release process-wide
+    resources (jobs, batch worker pool, result cache) on shutdown.
+    """
+    if settings.prewarm_enabled:
+        await run_in_threadpool(startup.prewarm)
+    yield
+    # A service that was never imported has nothing to release.
+    if is_loaded(jobs):
+        await jobs.shutdown_job_manager()
+    if is_loaded(parallel):
+        parallel.shutdown_worker_pool()
+    if is_loaded(result_cache):
+        result_cache.shutdown_response_cache()
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
@@ -25,6 +58,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -35,6 +69,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(v1_router, prefix=settings.api_v1_prefix)
 
 
@@ -46,3 +83,6 @@ async def root() -> RootResponse:
         docs="/docs",
         version=settings.app_version,
     )
+
+
+startup.mark_imported()
@@ -5,9 +5,13 @@ It also includes the request model for the coordinate transformation endpoint, w
 """
 
 from enum import Enum, IntEnum
-from typing import Tuple, Union
-from pydantic import BaseModel, ConfigDict, ConfigDict
-import numpy as np
+from typing import NamedTuple, Tuple, Union
+from pydantic import BaseModel, ConfigDict, ConfigDict, model_validator
+
+from app.core.lazy import lazy_import
+
+# Only the array conversions need NumPy; defer it until one is called.
+np = lazy_import("numpy")
 
 
 class Plane(str, Enum):
@@ -31,6 +35,7 @@ class Rectangular(BaseModel):
     z: float
     plane: Plane
     origin: Origin
+    equinox: float | None = None  # Julian Date (TT) of a frame of date; None = J2000
 
     def to_numpy(self):
         return np.array([self.x, self.y, self.z])
@@ -43,6 +48,65 @@ class Spherical(BaseModel):
     distance: float
     plane: Plane
     origin: Origin
+    equinox: float | None = None  # Julian Date (TT) of a frame of date; None = J2000
+
+
+# ==========================================
+# Lean internal representations for the service layer
+# ==========================================
+
+class RectangularCoord(NamedTuple):
+    """
+    Validation-free counterpart of `Rectangular`, used inside the service layer.
+
+    A plain tuple: building one costs a tuple allocation instead of a Pydantic
+    validation pass. Convert at the API boundary with `as_coord` and `to_model`.
+    """
+    x: float
+    y: float
+    z: float
+    plane: Plane
+    origin: Origin
+    equinox: float | None = None
+
+    def to_numpy(self):
+        return np.array([self.x, self.y, self.z])
+
+
+class SphericalCoord(NamedTuple):
+    """Validation-free counterpart of `Spherical` (see `RectangularCoord`)."""
+    lon_or_ra: float
+    lat_or_dec: float
+    distance: float
+    plane: Plane
+    origin: Origin
+    equinox: float | None = None
+
+    def to_numpy(self):
+        return np.array([self.lon_or_ra, self.lat_or_dec, self.distance])
+
+
+def as_coord(coords: Rectangular | Spherical | RectangularCoord | SphericalCoord
+             ) -> RectangularCoord | SphericalCoord:
+    """Returns the lean tuple for a Pydantic coordinate; lean tuples pass through."""
+    if isinstance(coords, tuple):
+        return coords
+    if isinstance(coords, Spherical):
+        return SphericalCoord(coords.lon_or_ra, coords.lat_or_dec, coords.distance,
+                              coords.plane, coords.origin, coords.equinox)
+    return RectangularCoord(coords.x, coords.y, coords.z,
+                            coords.plane, coords.origin, coords.equinox)
+
+
+def to_model(coords: RectangularCoord | SphericalCoord) -> Rectangular | Spherical:
+    """
+    Wraps a lean tuple in its Pydantic model without re-validating it.
+
+    The values come from the service layer, so `model_construct` skips validation;
+    FastAPI still checks the model against the route's `response_model`.
+    """
+    model = Spherical if isinstance(coords, SphericalCoord) else Rectangular
+    return model.model_construct(**coords._asdict())
 
 
 class PhysicalState(IntEnum):
@@ -58,6 +122,12 @@ class PhysicalState(IntEnum):
 # Request model for coordinate transformation endpoint
 # ==========================================
 
+def check_translation_source(translation_vector, epoch) -> None:
+    """Rejects an explicit translation combined with an epoch-derived one."""
+    if epoch is not None and any(translation_vector):
+        raise ValueError("Pass either a translation_vector or an epoch, not both.")
+
+
 class CoordinateTransformRequest(BaseModel):
     input_coords: Union[Rectangular, Spherical]
     target_shape: Shape
@@ -65,3 +135,110 @@ class CoordinateTransformRequest(BaseModel):
     target_origin: Origin
     physical_state: PhysicalState = PhysicalState.POINT
     translation_vector: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    target_equinox: float | None = None
+    epoch: float | None = None  # Julian Date (TDB) for ephemeris-derived translations
+
+    @model_validator(mode="after")
+    def _check_translation(self):
+        check_translation_source(self.translation_vector, self.epoch)
+        return self
+
+
+# ==========================================
+# Columnar models for the batch transformation endpoint
+# ==========================================
+
+def _check_equinox_length(equinox, rows: int, name: str = "equinox") -> None:
+    if isinstance(equinox, list) and len(equinox) != rows:
+        raise ValueError(f"A per-row {name} list must have one entry per coordinate.")
+
+
+class RectangularColumns(BaseModel):
+    """Many Rectangular coordinates sharing one plane and origin, stored column-wise."""
+    model_config = ConfigDict(allow_inf_nan=False)
+    x: list[float]
+    y: list[float]
+    z: list[float]
+    plane: Plane
+    origin: Origin
+    equinox: float | list[float] | None = None  # shared or per-row Julian Dates (TT)
+
+    @model_validator(mode="after")
+    def _check_lengths(self):
+        if not len(self.x) == len(self.y) == len(self.z):
+            raise ValueError("Columns x, y and z must have the same length.")
+        _check_equinox_length(self.equinox, len(self.x))
+        return self
+
+    def to_numpy(self):
+        return np.column_stack((self.x, self.y, self.z))
+
+
+class SphericalColumns(BaseModel):
+    """Many Spherical coordinates sharing one plane and origin, stored column-wise."""
+    model_config = ConfigDict(allow_inf_nan=False)
+    lon_or_ra: list[float]
+    lat_or_dec: list[float]
+    distance: list[float]
+    plane: Plane
+    origin: Origin
+    equinox: float | list[float] | None = None  # shared or per-row Julian Dates (TT)
+
+    @model_validator(mode="after")
+    def _check_lengths(self):
+        if not len(self.lon_or_ra) == len(self.lat_or_dec) == len(self.distance):
+            raise ValueError("Columns lon_or_ra, lat_or_dec and distance "
+                             "must have the same length.")
+        _check_equinox_length(self.equinox, len(self.distance))
+        return self
+
+    def to_numpy(self):
+        return np.column_stack((self.lon_or_ra, self.lat_or_dec, self.distance))
+
+
+class CoordinateBatchTransformRequest(BaseModel):
+    input_coords: RectangularColumns | SphericalColumns
+    target_shape: Shape
+    target_plane: Plane
+    target_origin: Origin
+    physical_state: PhysicalState = PhysicalState.POINT
+    translation_vector: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    target_equinox: float | list[float] | None = None
+    epoch: float | list[float] | None = None  # shared or per-row Julian Dates (TDB)
+
+    @model_validator(mode="after")
+    def _check_per_row_lengths(self):
+        columns = self.input_coords
+        rows = len(columns.x if isinstance(columns, RectangularColumns) else columns.distance)
+        _check_equinox_length(self.target_equinox, rows)
+        _check_equinox_length(self.epoch, rows, "epoch")
+        check_translation_source(self.translation_vector, self.epoch)
+        return self
+
+
+class CoordinateBatchSpec(BaseModel):
+    """
+    Shared source and target state of a batch whose columns travel out-of-band.
+
+    Binary wire formats (MessagePack, Arrow IPC, raw float64) carry this object as
+    their metadata header, next to the raw coordinate columns. The equinoxes are
+    Julian Dates (TT) of frames of date and `epoch` the Julian Date (TDB) at which
+    the built-in ephemeris supplies the origin translation; each is shared by the
+    batch or listed per row.
+    """
+    input_shape: Shape
+    input_plane: Plane
+    input_origin: Origin
+    target_shape: Shape
+    target_plane: Plane
+    target_origin: Origin
+    physical_state: PhysicalState = PhysicalState.POINT
+    translation_vector: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    input_equinox: float | list[float] | None = None
+    target_equinox: float | list[float] | None = None
+    epoch: float | list[float] | None = None
+
+    @model_validator(mode="after")
+    def _check_translation(self):
+        check_translation_source(self.translation_vector, self.epoch)
+        return self
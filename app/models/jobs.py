@@ -0,0 +1,126 @@
+"""
+Background job schemas.
+
+Request bodies for ``POST /api/v1/jobs`` – one model per job kind, told apart by
+their ``kind`` field – and the job status and result chunk responses.
+"""
+
+import math
+from datetime import datetime
+from enum import Enum
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from app.core.constants import GM_SUN
+from app.core.lazy import lazy_import
+from app.models.coordinates_systems import Plane
+
+# Needs NumPy, so only loaded once a request is validated.
+planetary_ephemeris = lazy_import("app.services.calculations.planetary_ephemeris")
+
+# Largest ephemeris table a single job may produce, in epochs.
+MAX_EPHEMERIS_EPOCHS = 50_000_000
+
+# Largest propagation result a single job may produce, in states (objects × epochs).
+MAX_PROPAGATION_STATES = 25_000_000
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class _JobRequest(BaseModel):
+    model_config = ConfigDict(allow_inf_nan=False)
+    # Higher runs first; jobs of equal priority run in submission order.
+    priority: int = Field(default=0, ge=-100, le=100)
+
+
+class PropagationJobRequest(_JobRequest):
+    """Two-body propagation of an element catalog to many epochs."""
+    kind: Literal["propagation"] = "propagation"
+    elements: list[tuple[float, float, float, float, float, float]] = Field(min_length=1)
+    epoch: float | list[float]  # epoch of the elements, shared or one per object
+    epochs: list[float] = Field(min_length=1)
+    gm: float = Field(default=GM_SUN, gt=0)
+
+    @model_validator(mode="after")
+    def _check_counts(self):
+        if isinstance(self.epoch, list) and len(self.epoch) != len(self.elements):
+            raise ValueError(f"Expected one epoch per object ({len(self.elements)}), "
+                             f"got {len(self.epoch)}.")
+        states = len(self.elements) * len(self.epochs)
+        if states > MAX_PROPAGATION_STATES:
+            raise ValueError(f"The result would have {states} states; "
+                             f"at most {MAX_PROPAGATION_STATES} are allowed.")
+        return self
+
+
+class EphemerisJobRequest(_JobRequest):
+    """A table of heliocentric positions of one body at evenly spaced epochs."""
+    kind: Literal["ephemeris"] = "ephemeris"
+    body: str
+    start: float  # Julian Date (TDB) of the first row
+    stop: float  # last epoch included, if it falls on the step grid
+    step: float = Field(gt=0)  # days
+    plane: Plane = Plane.ECLIPTIC
+
+    @field_validator("body")
+    @classmethod
+    def _check_body(cls, body: str) -> str:
+        bodies = planetary_ephemeris.BODIES
+        if body not in bodies:
+            raise ValueError(f"Unknown body {body!r}; expected one of {', '.join(bodies)}.")
+        return body
+
+    @model_validator(mode="after")
+    def _check_span(self):
+        if self.stop < self.start:
+            raise ValueError("stop must not precede start.")
+        if self.count > MAX_EPHEMERIS_EPOCHS:
+            raise ValueError(f"The table would have {self.count} epochs; "
+                             f"at most {MAX_EPHEMERIS_EPOCHS} are allowed.")
+        return self
+
+    @property
+    def count(self) -> int:
+        """Number of epochs in the table."""
+        # Tolerate rounding so a stop on the grid is included.
+        return math.floor((self.stop - self.start) / self.step * (1 + 1e-12)) + 1
+
+
+JobRequest = Annotated[PropagationJobRequest | EphemerisJobRequest, Field(discriminator="kind")]
+
+
+class JobResult(BaseModel):
+    """Layout of a finished job's result array."""
+    shape: list[int]  # rows first; downloads are paged over rows
+    columns: list[str]  # names of the last axis
+    bytes: int
+
+
+class JobInfo(BaseModel):
+    id: str
+    kind: str
+    status: JobStatus
+    priority: int
+    progress: float  # fraction of the work done, 0 to 1
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+    result: JobResult | None = None
+
+
+class JobResultChunk(BaseModel):
+    offset: int  # first row of the chunk
+    count: int  # rows in the chunk
+    total: int  # rows in the whole result
+    next_offset: int | None  # offset of the next chunk, None after the last one
+    shape: list[int]  # shape of `data`
+    columns: list[str]
+    data: list
@@ -0,0 +1,144 @@
+"""
+Orbital mechanics schemas.
+
+Request and response bodies of the ``/orbital`` endpoints: batch orbit
+determination from astrometric tracklets, and porkchop grids of transfer cost.
+"""
+
+import math
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from app.core.lazy import lazy_import
+
+# Needs NumPy, so only loaded once a porkchop request is validated.
+porkchop = lazy_import("app.services.calculations.porkchop")
+
+# Largest batch a single orbit-determination request may carry.
+MAX_TRACKLETS = 10_000
+MAX_OBSERVATIONS_PER_TRACKLET = 1_000
+
+# Largest porkchop grid a single request may ask for, in cells.
+MAX_PORKCHOP_CELLS = 2_000_000
+
+
+class Tracklet(BaseModel):
+    """
+    Astrometric observations of one object.
+
+    Positions are right ascension and declination on the J2000 equator in degrees,
+    seen from the geocentre unless ``observer`` gives the observatory's
+    geocentric position (AU, J2000 equatorial) at each epoch.
+    """
+    model_config = ConfigDict(allow_inf_nan=False)
+    jd: list[float] = Field(min_length=3, max_length=MAX_OBSERVATIONS_PER_TRACKLET)  # TDB
+    lon_or_ra: list[float]
+    lat_or_dec: list[float]
+    sigma_arcsec: float | list[float] = Field(default=1.0)  # shared or per observation
+    observer: list[tuple[float, float, float]] | None = None
+
+    @model_validator(mode="after")
+    def _check_columns(self):
+        rows = len(self.jd)
+        if not len(self.lon_or_ra) == len(self.lat_or_dec) == rows:
+            raise ValueError("Columns jd, lon_or_ra and lat_or_dec must have the same length.")
+        if any(abs(dec) > 90.0 for dec in self.lat_or_dec):
+            raise ValueError("Declinations must be within ±90°.")
+        sigmas = self.sigma_arcsec if isinstance(self.sigma_arcsec, list) else [self.sigma_arcsec]
+        if isinstance(self.sigma_arcsec, list) and len(sigmas) != rows:
+            raise ValueError("A per-observation sigma_arcsec list needs one entry per epoch.")
+        if any(sigma <= 0 for sigma in sigmas):
+            raise ValueError("sigma_arcsec must be positive.")
+        if self.observer is not None and len(self.observer) != rows:
+            raise ValueError("observer needs one position per epoch.")
+        return self
+
+
+class OrbitDeterminationRequest(BaseModel):
+    model_config = ConfigDict(allow_inf_nan=False)
+    tracklets: list[Tracklet] = Field(min_length=1, max_length=MAX_TRACKLETS)
+    max_iterations: int = Field(default=50, ge=1, le=200)
+
+
+class OrbitSolution(BaseModel):
+    """
+    Fitted heliocentric orbit of one tracklet.
+
+    ``state`` is (x, y, z, vx, vy, vz) in AU and AU/day on the J2000 equator at
+    ``epoch``; ``elements`` are (a, e, i, raan, argp, mean_anomaly) on the J2000
+    ecliptic, angles in radians; ``covariance`` is the 6×6 covariance of the
+    state. All three are null when no initial orbit could be found.
+    """
+    converged: bool
+    epoch: float  # Julian Date (TDB)
+    state: list[float] | None = None
+    elements: list[float] | None = None
+    covariance: list[list[float]] | None = None
+    rms_arcsec: float | None = None
+    iterations: int
+
+
+class OrbitDeterminationResponse(BaseModel):
+    orbits: list[OrbitSolution]  # one per tracklet, in request order
+
+
+class DateAxis(BaseModel):
+    """Evenly spaced epochs from ``start`` to ``stop`` (included if on the step grid)."""
+    model_config = ConfigDict(allow_inf_nan=False)
+    start: float  # Julian Date (TDB)
+    stop: float
+    step: float = Field(gt=0)  # days
+
+    @model_validator(mode="after")
+    def _check_span(self):
+        if self.stop < self.start:
+            raise ValueError("stop must not precede start.")
+        return self
+
+    @property
+    def count(self) -> int:
+        return math.floor((self.stop - self.start) / self.step + 1e-9) + 1
+
+
+class PorkchopRequest(BaseModel):
+    model_config = ConfigDict(allow_inf_nan=False)
+    departure_body: str = "earth"
+    arrival_body: str = "mars"
+    departure: DateAxis
+    arrival: DateAxis
+    prograde: bool = True
+
+    @field_validator("departure_body", "arrival_body")
+    @classmethod
+    def _check_body(cls, body: str) -> str:
+        if body not in porkchop.BODIES:
+            raise ValueError(f"Unknown body {body!r}; expected one of "
+                             f"{', '.join(porkchop.BODIES)}.")
+        return body
+
+    @model_validator(mode="after")
+    def _check_size(self):
+        cells = self.departure.count * self.arrival.count
+        if cells > MAX_PORKCHOP_CELLS:
+            raise ValueError(f"The grid would have {cells} cells; "
+                             f"at most {MAX_PORKCHOP_CELLS} are allowed.")
+        return self
+
+
+class PorkchopResponse(BaseModel):
+    """
+    Transfer cost over the departure × arrival grid.
+
+    Each grid is flattened row-major over ``shape`` = (departures, arrivals):
+    ``c3`` in km² s⁻², the excess speeds and their sum ``delta_v`` in km s⁻¹.
+    Cells with no transfer (arrival not after departure) are null.
+    """
+    departure_body: str
+    arrival_body: str
+    departure: list[float]  # Julian Dates (TDB)
+    arrival: list[float]
+    shape: list[int]
+    c3: list[float | None]
+    v_inf_departure: list[float | None]
+    v_inf_arrival: list[float | None]
+    delta_v: list[float | None]
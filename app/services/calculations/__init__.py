@@ -3,6 +3,16 @@ Calculations services package.
 
 Provides pure-Python implementations of celestial mechanics algorithms:
 
-- :mod:`app.services.calculations.orbital_mechanics`    – Keplerian orbit helpers
-- :mod:`app.services.calculations.coordinate_conversions` – coordinate-system transforms (stub)
+- :mod:`app.services.calculations.orbital_mechanics`
+  – Keplerian orbit helpers and Kepler's equation
+- :mod:`app.services.calculations.orbital_elements`
+  – elements ↔ state vectors, batch propagation
+- :mod:`app.services.calculations.coordinate_conversions`
+  – coordinate-system transforms (scalar and batch)
+- :mod:`app.services.calculations.frame_registry`
+  – cached frame-pair transformation matrices
+- :mod:`app.services.calculations.precession`
+  – precession-nutation rotations to frames of date
+- :mod:`app.services.calculations.planetary_ephemeris`
+  – analytic planet/Earth positions, Chebyshev-cached
 """
@@ -0,0 +1,390 @@
+"""
+Conjunction screening.
+
+Finds every pair of objects in a catalog of two-body orbits that pass within a
+threshold distance of each other during a time window, without comparing all N²
+pairs at every epoch:
+
+- :func:`candidate_pairs` – uniform-grid spatial hashing of one epoch's positions
+- :func:`apsis_filter` – rejects pairs whose radial ranges never overlap
+- :func:`geometry_filter` – rejects pairs whose orbits pass too far apart near the
+  line where their planes intersect
+- :func:`screen` – the full pipeline, returning each close approach with its time
+  of closest approach (TCA) and miss distance
+
+The window is sampled every ``step``. No two objects close faster than ``v_max``,
+the sum of the two largest perigee speeds in the catalog, so a pair that comes
+within ``threshold`` during a step is within ``threshold + v_max·step/2`` at the
+nearest sample. That distance is the grid's cell size: only objects in the same
+or adjacent cells are compared, which costs O(N log N) per sample. The pairs found
+are run through the two orbit filters, which are conservative – they never reject
+a pair that can meet – and the TCA is refined by bisection on the range rate only
+for the pairs that survive.
+
+Units follow ``gm``: with the default
+:data:`~app.services.calculations.orbital_mechanics.GM_EARTH` in SI units,
+semi-major axes and distances are in metres and times in seconds. Element arrays
+are ordered as :data:`~app.services.calculations.orbital_elements.ELEMENT_NAMES`;
+only elliptic orbits are supported.
+"""
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.services.calculations.orbital_elements import elements_to_state, propagate_elements
+from app.services.calculations.orbital_mechanics import GM_EARTH
+
+# The 13 neighbouring cells that follow a cell in (x, y, z) order. Together with
+# the cell itself they cover each pair of adjacent cells exactly once.
+_NEIGHBOUR_OFFSETS = tuple((dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                           for dz in (-1, 0, 1) if (dx, dy, dz) > (0, 0, 0))
+
+# The default step is at most this fraction of the shortest orbital period, so the
+# range rate changes sign at most once per step and bisection finds every minimum.
+_MIN_SAMPLES_PER_ORBIT = 16
+
+# Below this sine of the mutual inclination the planes are treated as coplanar and
+# the geometry filter passes the pair.
+_COPLANAR_TOLERANCE = 1e-12
+
+
+class ScreeningStats(NamedTuple):
+    objects: int
+    epochs: int  # samples of the window
+    step: float
+    cell_size: float
+    grid_candidates: int  # (pair, sample) combinations found by the grid
+    pairs: int  # distinct pairs among them
+    apsis_survivors: int
+    geometry_survivors: int
+    refined: int  # (pair, step) combinations whose TCA was refined
+    events: int
+
+
+class ScreeningResult(NamedTuple):
+    """Close approaches sorted by TCA; ``first < second`` index the catalog."""
+    first: np.ndarray
+    second: np.ndarray
+    tca: np.ndarray
+    miss_distance: np.ndarray
+    relative_speed: np.ndarray
+    stats: ScreeningStats
+
+
+def candidate_pairs(positions: ArrayLike, radius: float) -> np.ndarray:
+    """
+    Find all pairs of points within ``radius`` of each other.
+
+    Points are hashed into cubic cells of side ``radius``; a pair within ``radius``
+    lies in the same or in adjacent cells, so only those are compared. Cells are
+    found by sorting the cell keys and searching the sorted array, which keeps the
+    cost near O(N log N) for catalogs that are not packed into a few cells.
+
+    Parameters
+    ----------
+    positions : array_like
+        ``(n, 3)`` positions.
+    radius : float
+        Largest separation reported.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n_pairs, 2)`` int64 array of point indices, each row ascending.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if positions.ndim != 2 or positions.shape[1] != 3:
+        raise ValueError(f"Expected an (n, 3) position array, got {positions.shape}.")
+    if not radius > 0.0:
+        raise ValueError("radius must be positive.")
+    if positions.shape[0] < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    cells = np.floor(positions / radius).astype(np.int64)
+    # One empty layer of cells on each side, so neighbour keys never wrap around.
+    cells -= cells.min(axis=0) - 1
+    dims = cells.max(axis=0) + 2
+    if math.prod(int(d) for d in dims) >= 2 ** 62:
+        raise ValueError("radius is too small for the extent of the positions.")
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    order = np.argsort(keys, kind="stable")
+    cell_keys, first, count = np.unique(keys[order], return_index=True, return_counts=True)
+
+    found_a, found_b = [], []
+    for dx, dy, dz in ((0, 0, 0),) + _NEIGHBOUR_OFFSETS:
+        shift = (dx * dims[1] + dy) * dims[2] + dz
+        if shift == 0:
+            cell_a = cell_b = np.flatnonzero(count > 1)
+        else:
+            target = cell_keys + shift
+            index = np.minimum(np.searchsorted(cell_keys, target), cell_keys.size - 1)
+            cell_a = np.flatnonzero(cell_keys[index] == target)
+            cell_b = index[cell_a]
+        count_a, count_b = count[cell_a], count[cell_b]
+        sizes = count_a * count_b
+        if not sizes.size:
+            continue
+
+        # Enumerate every (member of cell a, member of cell b) combination.
+        owner = np.repeat(np.arange(sizes.size), sizes)
+        local = np.arange(owner.size) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        a = first[cell_a][owner] + local // count_b[owner]
+        b = first[cell_b][owner] + local % count_b[owner]
+        if shift == 0:
+            a, b = a[a < b], b[a < b]
+        found_a.append(order[a])
+        found_b.append(order[b])
+
+    if not found_a:
+        return np.empty((0, 2), dtype=np.int64)
+    a, b = np.concatenate(found_a), np.concatenate(found_b)
+    separation = positions[a] - positions[b]
+    close = np.einsum("ij,ij->i", separation, separation) <= radius * radius
+    a, b = a[close], b[close]
+    return np.stack([np.minimum(a, b), np.maximum(a, b)], axis=1)
+
+
+def apsis_filter(elements: ArrayLike, first: ArrayLike, second: ArrayLike,
+                 threshold: float) -> np.ndarray:
+    """
+    Perigee/apogee filter: keep pairs whose radial ranges come within ``threshold``.
+
+    Two objects are never closer than the gap between their ranges of orbital
+    radius, ``max(q₁, q₂) - min(Q₁, Q₂)``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean mask, True for the pairs that may come within ``threshold``.
+    """
+    elements = np.asarray(elements, dtype=np.float64)
+    a, e = elements[:, 0], elements[:, 1]
+    perigee, apogee = a * (1.0 - e), a * (1.0 + e)
+    gap = (np.maximum(perigee[first], perigee[second])
+           - np.minimum(apogee[first], apogee[second]))
+    return gap <= threshold
+
+
+def _orbit_axes(elements: np.ndarray):
+    """Unit vectors towards pericentre and along the angular momentum, ``(n, 3)`` each."""
+    i, raan, argp = elements[:, 2], elements[:, 3], elements[:, 4]
+    cos_o, sin_o = np.cos(raan), np.sin(raan)
+    cos_w, sin_w = np.cos(argp), np.sin(argp)
+    cos_i, sin_i = np.cos(i), np.sin(i)
+    pericentre = np.stack([cos_o * cos_w - sin_o * sin_w * cos_i,
+                           sin_o * cos_w + cos_o * sin_w * cos_i,
+                           sin_w * sin_i], axis=1)
+    normal = np.stack([sin_o * sin_i, -cos_o * sin_i, cos_i], axis=1)
+    return pericentre, normal
+
+
+def _radius_range(semi_latus: np.ndarray, e: np.ndarray, nu: np.ndarray, width: np.ndarray):
+    """Smallest and largest orbital radius for true anomalies within ``width`` of ``nu``."""
+    nu = np.abs(np.remainder(nu + np.pi, 2.0 * np.pi) - np.pi)  # folded to [0, π]
+    cos_low, cos_high = np.cos(np.minimum(nu + width, np.pi)), np.cos(np.maximum(nu - width, 0.0))
+    return semi_latus / (1.0 + e * cos_high), semi_latus / (1.0 + e * cos_low)
+
+
+def geometry_filter(elements: ArrayLike, first: ArrayLike, second: ArrayLike,
+                    threshold: float) -> np.ndarray:
+    """
+    Orbit-path filter: keep pairs whose orbits may pass within ``threshold``.
+
+    A point of orbit 1 at an angle ``u`` from the line of nodes shared with
+    orbit 2 lies ``r |sin u| sin Δi`` from the plane of orbit 2, Δi being the
+    mutual inclination. Both objects must therefore be within
+    ``δ = arcsin(threshold / (q sin Δi))`` of the same node, where their
+    separation is at least the difference of their radii. A pair is rejected
+    when, at both nodes, the radius ranges the two orbits cover within δ are
+    more than ``threshold`` apart.
+
+    Pairs in nearly coplanar orbits, or with windows too wide for the two nodes
+    to be told apart (``δ₁ + δ₂ >= π/2``), are always kept.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean mask, True for the pairs that may come within ``threshold``.
+    """
+    elements = np.asarray(elements, dtype=np.float64)
+    first, second = np.asarray(first), np.asarray(second)
+    pericentre, normal = _orbit_axes(elements)
+    a, e = elements[:, 0], elements[:, 1]
+    semi_latus, perigee = a * (1.0 - e * e), a * (1.0 - e)
+
+    node = np.cross(normal[first], normal[second])
+    sin_di = np.linalg.norm(node, axis=1)
+    coplanar = sin_di < _COPLANAR_TOLERANCE
+    node /= np.where(coplanar, 1.0, sin_di)[:, None]
+
+    gaps = []
+    windows = []
+    for index in (first, second):
+        with np.errstate(divide="ignore"):
+            ratio = threshold / (perigee[index] * sin_di)
+        width = np.arcsin(np.minimum(ratio, 1.0))
+        # Angle from the node line to pericentre, in the orbit's direction of motion.
+        ahead = np.cross(normal[index], node)
+        argp = np.arctan2(np.einsum("ij,ij->i", pericentre[index], ahead),
+                          np.einsum("ij,ij->i", pericentre[index], node))
+        windows.append(width)
+        gaps.append([_radius_range(semi_latus[index], e[index], nu, width)
+                     for nu in (-argp, np.pi - argp)])
+
+    separable = ~coplanar & (windows[0] + windows[1] < 0.5 * np.pi)
+    keep = ~separable
+    for (low_1, high_1), (low_2, high_2) in zip(*gaps):
+        keep |= np.maximum(low_1, low_2) - np.minimum(high_1, high_2) <= threshold
+    return keep
+
+
+def _states(elements: np.ndarray, epoch: np.ndarray, t: np.ndarray, gm: float) -> np.ndarray:
+    a, e, i, raan, argp, mean_anomaly = elements.T
+    mean_anomaly = mean_anomaly + np.sqrt(gm / a ** 3) * (t - epoch)
+    return elements_to_state(a, e, i, raan, argp, mean_anomaly, gm=gm)
+
+
+def _default_step(a: np.ndarray, e: np.ndarray, threshold: float, v_max: float,
+                  gm: float) -> float:
+    """
+    A step whose cells hold about one neighbour per object for a uniformly spread
+    catalog, balancing the number of samples against the candidates per sample.
+    """
+    volume = 4.0 / 3.0 * np.pi * (np.max(a * (1.0 + e)) ** 3 - np.min(a * (1.0 - e)) ** 3)
+    cell = max(2.0 * threshold, float(np.cbrt(3.0 * volume / (2.0 * np.pi * a.size))))
+    shortest_period = 2.0 * np.pi * math.sqrt(float(np.min(a)) ** 3 / gm)
+    return min(2.0 * (cell - threshold) / v_max, shortest_period / _MIN_SAMPLES_PER_ORBIT)
+
+
+def screen(elements: ArrayLike, epoch: ArrayLike, start: float, end: float,
+           threshold: float, step: float | None = None, gm: float = GM_EARTH,
+           time_tolerance: float = 1e-3) -> ScreeningResult:
+    """
+    Find every close approach within ``threshold`` between ``start`` and ``end``.
+
+    Parameters
+    ----------
+    elements : array_like
+        ``(n_objects, 6)`` elliptic elements ordered as :data:`ELEMENT_NAMES`.
+    epoch : array_like
+        Epoch of the elements, a scalar or one value per object.
+    start, end : float
+        The screening window, in the time unit of ``gm``.
+    threshold : float
+        Largest miss distance reported.
+    step : float, optional
+        Sampling interval. Should stay well below the shortest orbital period;
+        by default it is chosen from the catalog's density and speeds.
+    gm : float
+        Standard gravitational parameter (μ = GM) of the central body.
+    time_tolerance : float
+        Width of the bracket at which TCA bisection stops.
+
+    Returns
+    -------
+    ScreeningResult
+        One entry per local minimum of the separation within ``threshold``, plus
+        approaches still closing at ``end`` or opening at ``start``.
+    """
+    elements = np.asarray(elements, dtype=np.float64)
+    if elements.ndim != 2 or elements.shape[1] != 6:
+        raise ValueError(f"Expected an (n_objects, 6) element array, got {elements.shape}.")
+    n = elements.shape[0]
+    epoch = np.broadcast_to(np.asarray(epoch, dtype=np.float64), (n,))
+    a, e = elements[:, 0], elements[:, 1]
+    if np.any((e < 0.0) | (e >= 1.0)) or np.any(a <= 0.0):
+        raise ValueError("Only elliptic orbits (0 <= e < 1, a > 0) can be screened.")
+    if not end > start:
+        raise ValueError("end must be after start.")
+    if not threshold > 0.0:
+        raise ValueError("threshold must be positive.")
+    if step is not None and not step > 0.0:
+        raise ValueError("step must be positive.")
+
+    empty = np.empty(0)
+    if n < 2:
+        stats = ScreeningStats(n, 0, step or 0.0, 0.0, 0, 0, 0, 0, 0, 0)
+        return ScreeningResult(empty.astype(np.int64), empty.astype(np.int64), empty, empty,
+                               empty, stats)
+
+    perigee_speed = np.sqrt(gm * (1.0 + e) / (a * (1.0 - e)))
+    v_max = float(np.sum(np.partition(perigee_speed, n - 2)[-2:]))
+    if step is None:
+        step = _default_step(a, e, threshold, v_max, gm)
+    cell = threshold + 0.5 * v_max * step
+
+    # Sample k covers [edges[k], edges[k + 1]]; shared edges keep each minimum in
+    # exactly one step.
+    samples = start + step * np.arange(math.ceil((end - start) / step) + 1)
+    edges = np.clip(np.append(samples - 0.5 * step, samples[-1] + 0.5 * step), start, end)
+
+    # 1. Candidate pairs from the grid, one sample at a time.
+    # A single epoch per call, so the whole catalog is propagated as one block.
+    states = np.empty((n, 1, 6))
+    keys, steps = [], []
+    for k, t in enumerate(samples):
+        propagate_elements(elements, epoch, (t,), gm=gm, out=states, chunk_objects=n)
+        pairs = candidate_pairs(states[:, 0, :3], cell)
+        keys.append(pairs[:, 0] * n + pairs[:, 1])
+        steps.append(np.full(pairs.shape[0], k))
+    keys, steps = np.concatenate(keys), np.concatenate(steps)
+
+    # 2. Orbit filters, once per distinct pair.
+    pair_keys, inverse = np.unique(keys, return_inverse=True)
+    first, second = np.divmod(pair_keys, n)
+    survives = apsis_filter(elements, first, second, threshold)
+    apsis_survivors = int(survives.sum())
+    survives[survives] = geometry_filter(elements, first[survives], second[survives], threshold)
+
+    # 3. TCA refinement of the surviving (pair, step) combinations.
+    refine = survives[inverse]
+    first, second, steps = first[inverse][refine], second[inverse][refine], steps[refine]
+    pair_elements = (elements[first], epoch[first], elements[second], epoch[second])
+
+    def relative_state(t: np.ndarray, subset=slice(None)) -> np.ndarray:
+        el_1, ep_1, el_2, ep_2 = (v[subset] for v in pair_elements)
+        return _states(el_2, ep_2, t, gm) - _states(el_1, ep_1, t, gm)
+
+    def range_rate(t: np.ndarray, subset=slice(None)) -> np.ndarray:
+        relative = relative_state(t, subset)
+        return np.einsum("ij,ij->i", relative[:, :3], relative[:, 3:])
+
+    low, high = edges[steps], edges[steps + 1]
+    rate_low, rate_high = range_rate(low), range_rate(high)
+    opening = (rate_low >= 0.0) & (low == start)  # separation grows from the start
+    closing = (rate_high < 0.0) & (high == end)  # still shrinking at the end
+    bracketed = np.flatnonzero((rate_low < 0.0) & (rate_high >= 0.0))
+
+    low, high = low[bracketed], high[bracketed]
+    rate_low, rate_high = rate_low[bracketed], rate_high[bracketed]
+    while low.size and np.max(high - low) > time_tolerance:
+        middle = 0.5 * (low + high)
+        rate = range_rate(middle, bracketed)
+        before = rate < 0.0
+        low, rate_low = np.where(before, middle, low), np.where(before, rate, rate_low)
+        high, rate_high = np.where(before, high, middle), np.where(before, rate_high, rate)
+    # Finish with a secant step across the final bracket.
+    slope = rate_high - rate_low
+    tca = np.where(slope > 0.0, low - rate_low * (high - low) / np.where(slope > 0.0, slope, 1.0),
+                   low)
+
+    index = np.concatenate([bracketed, np.flatnonzero(opening), np.flatnonzero(closing)])
+    tca = np.concatenate([tca, np.full(int(opening.sum()), start),
+                          np.full(int(closing.sum()), end)])
+    relative = relative_state(tca, index)
+    miss = np.linalg.norm(relative[:, :3], axis=1)
+    hit = miss <= threshold
+    order = np.flatnonzero(hit)[np.argsort(tca[hit], kind="stable")]
+    index, tca, relative, miss = index[order], tca[order], relative[order], miss[order]
+
+    stats = ScreeningStats(
+        objects=n, epochs=samples.size, step=float(step), cell_size=float(cell),
+        grid_candidates=int(keys.size), pairs=int(pair_keys.size),
+        apsis_survivors=apsis_survivors, geometry_survivors=int(survives.sum()),
+        refined=int(steps.size), events=int(tca.size))
+    return ScreeningResult(first[index], second[index], tca, miss,
+                           np.linalg.norm(relative[:, 3:], axis=1), stats)
@@ -1,23 +1,39 @@
 """
 Coordinate conversion service.
 
-Placeholder module for coordinate-system transformations used in
-celestial mechanics:
+Transforms celestial coordinates between shapes, planes and origins:
 - Cartesian ↔ Spherical (RA/Dec)
-- Equatorial ↔ Ecliptic
-- Geocentric ↔ Heliocentric
+- Equatorial ↔ Ecliptic, in J2000 or a frame of date (precession and nutation)
+- Geocentric ↔ Heliocentric, by a given translation or the built-in ephemeris
+
+Every conversion runs the same three stages (normalize to rectangular, apply
+one 4x4 master matrix, format to the target shape), either for one coordinate
+in pure Python (`convert_celestial_coordinate`) or for a whole (N, 3) array at
+once (`convert_celestial_coordinates_batch`). The master matrices are composed
+once per frame pair and cached in `frame_registry`. Covariances can be carried
+along, linearly or by Monte Carlo sampling
+(`convert_celestial_coordinates_with_uncertainty`).
 """
 import math
 import numpy as np
 from enum import IntEnum
+from app.core import metrics
 from app.core.constants import EPSILON_RAD
-from app.models.coordinates_systems import PhysicalState, Plane, Origin, Shape, Rectangular, Spherical
+from app.services.calculations import planetary_ephemeris, precession, uncertainty
+from app.services.calculations.frame_registry import FrameTransformRegistry
+from app.services.calculations.uncertainty import (
+    DEFAULT_SAMPLES, MONTE_CARLO_CHUNK_POINTS, Estimate, Uncertainty,
+)
+from app.models.coordinates_systems import (
+    PhysicalState, Plane, Origin, Shape, Rectangular, Spherical,
+    RectangularCoord, SphericalCoord, as_coord, check_translation_source,
+)
 from typing import Union
 
 # ==========================================
 # INTERNAL MATH: NON-LINEAR (TRIGONOMETRY)
 # ==========================================
-def _spherical_to_rectangular(lon_or_ra: float, lat_or_dec: float, distance: float) -> dict:
+def _spherical_to_rectangular(lon_or_ra: float, lat_or_dec: float, distance: float) -> tuple:
     """
     Converts spherical coordinates (longitude/latitude or RA/Dec) to rectangular (x, y, z).
     
@@ -29,6 +45,11 @@ def _spherical_to_rectangular(lon_or_ra: float, lat_or_dec: float, distance: flo
         Latitude (for Ecliptic) or Declination (for Equatorial) in degrees.
     distance : float
         The radial distance from the origin to the point.
+
+    Returns:
+    --------
+    tuple
+        The (x, y, z) coordinates.
     """
     # Convert degrees to radians
     lon_rad = math.radians(lon_or_ra)
@@ -39,13 +60,9 @@ def _spherical_to_rectangular(lon_or_ra: float, lat_or_dec: float, distance: flo
     y = distance * math.cos(lat_rad) * math.sin(lon_rad)
     z = distance * math.sin(lat_rad)
 
-    return {
-        "x": x,
-        "y": y,
-        "z": z
-    }
+    return x, y, z
 
-def _rectangular_to_spherical(x: float, y: float, z: float) -> dict:
+def _rectangular_to_spherical(x: float, y: float, z: float) -> tuple:
     """
     Converts rectangular coordinates (x, y, z) to spherical (longitude/latitude or RA/Dec).
     
@@ -56,8 +73,8 @@ def _rectangular_to_spherical(x: float, y: float, z: float) -> dict:
         
     Returns:
     --------
-    dict
-        A dictionary containing 'lon_or_ra', 'lat_or_dec', and 'distance'.
+    tuple
+        The (lon_or_ra, lat_or_dec, distance) coordinates, angles in degrees.
     """
     # Equivalent to distance = sqrt(x^2 + y^2 + z^2), but more numerically stable for large values
     distance = math.hypot(x, y, z)
@@ -76,11 +93,7 @@ def _rectangular_to_spherical(x: float, y: float, z: float) -> dict:
     lon_or_ra = math.degrees(lon_rad)
     lat_or_dec = math.degrees(lat_rad)
 
-    return {
-        "lon_or_ra": lon_or_ra,
-        "lat_or_dec": lat_or_dec,
-        "distance": distance
-    }
+    return lon_or_ra, lat_or_dec, distance
 
 
 # ==========================================
@@ -144,9 +157,45 @@ def _get_translation_matrix(tx: float, ty: float, tz: float) -> np.ndarray:
         [0, 0, 0, 1]
     ])
     
-def _apply_transform(x: float, y: float, z: float,
-                    transformation_matrix: np.ndarray,
-                    state: PhysicalState = PhysicalState.POINT) -> dict:
+def _get_frame_rotation(plane: Plane, equinox: float | None = None) -> np.ndarray:
+    """
+    Returns the 3x3 rotation from the J2000 equatorial frame to a (plane, equinox) frame.
+
+    Parameters:
+    -----------
+    plane : Plane
+        The fundamental plane of the frame.
+    equinox : float, optional
+        Julian Date (TT) of the equator/ecliptic and equinox. None selects the fixed
+        J2000 frames used throughout the pipeline (ecliptic tilted by `EPSILON_RAD`);
+        a date selects the true equator or ecliptic of that date, including
+        precession and nutation (see `precession`).
+    """
+    if equinox is not None:
+        return precession.rotation_matrix(plane, float(equinox))
+    if plane == Plane.ECLIPTIC:
+        return _get_equatorial_ecliptic_rotation(True)[:3, :3]
+    return np.eye(3)
+
+
+def _get_frame_rotations(plane: Plane, equinox, rows: int) -> np.ndarray:
+    """
+    Batch counterpart of `_get_frame_rotation`.
+
+    Returns a single 3x3 matrix when `equinox` is None or a scalar, and an (N, 3, 3)
+    stack when it holds one epoch per row. Distinct epochs are looked up once in
+    the precomputed precession table.
+    """
+    if equinox is None or np.ndim(equinox) == 0:
+        return _get_frame_rotation(plane, equinox)
+    equinox = np.asarray(equinox, dtype=np.float64)
+    if equinox.shape != (rows,):
+        raise ValueError(f"Expected one equinox per row ({rows}), got shape {equinox.shape}.")
+    return precession.rotation_matrices(plane, equinox)
+
+
+def _apply_transform(x: float, y: float, z: float, rows: tuple,
+                    state: PhysicalState = PhysicalState.POINT) -> tuple:
     """
     Applies a 4x4 projective transformation matrix to a 3D physical entity.
     
@@ -154,38 +203,280 @@ def _apply_transform(x: float, y: float, z: float,
     -----------
     x, y, z : float
         The 3D rectangular coordinates of the entity.
-    transformation_matrix : np.ndarray
-        The 4x4 homogeneous matrix (usually a combined rotation dot translation matrix).
+    rows : tuple
+        The top three rows of the 4x4 homogeneous matrix (usually a combined rotation
+        dot translation matrix) as tuples of floats, see `FrameTransform.rows`. The
+        bottom row of a frame transform is always (0, 0, 0, 1).
     state : PhysicalState, default PhysicalState.POINT
         Defines whether the entity is a POINT (w=1) or a VECTOR (w=0).
         
     Returns:
     --------
-    dict
-        The newly transformed 3D rectangular coordinates and its physical classification.
-    """
-    # 1. Project into 4D space by appending the physical state as the w-component
-    entity_4d = np.array([x, y, z, state.value])
-
-    # 2. Apply the linear algebra transformation (Rotation and/or Translation)
-    transformed_4d = transformation_matrix.dot(entity_4d)
-
-    # 3. Project back down to our 3D universe
-    return {
-        "x": transformed_4d[0],
-        "y": transformed_4d[1],
-        "z": transformed_4d[2],
-        "type": "Point" if state == PhysicalState.POINT else "Vector"
-    }
+    tuple
+        The newly transformed (x, y, z) coordinates.
+    """
+    # The entity is (x, y, z, w) with the physical state as w; for a single entity,
+    # plain float arithmetic beats building and multiplying NumPy arrays.
+    w = float(state.value)
+    (a0, a1, a2, a3), (b0, b1, b2, b3), (c0, c1, c2, c3) = rows
+    return (a0 * x + a1 * y + a2 * z + a3 * w,
+            b0 * x + b1 * y + b2 * z + b3 * w,
+            c0 * x + c1 * y + c2 * z + c3 * w)
     
+# ==========================================
+# INTERNAL MATH: VECTORIZED (BATCH)
+# ==========================================
+def _spherical_to_rectangular_batch(lon_or_ra: np.ndarray, lat_or_dec: np.ndarray,
+                                    distance: np.ndarray) -> np.ndarray:
+    """
+    Array counterpart of `_spherical_to_rectangular`.
+
+    Parameters:
+    -----------
+    lon_or_ra, lat_or_dec : np.ndarray
+        Longitudes/RAs and latitudes/declinations in degrees, shape (N,).
+    distance : np.ndarray
+        Radial distances, shape (N,).
+
+    Returns:
+    --------
+    np.ndarray
+        The rectangular coordinates as an (N, 3) array.
+    """
+    lon_rad = np.radians(lon_or_ra)
+    lat_rad = np.radians(lat_or_dec)
+
+    # Same evaluation order as the scalar path so both agree to the last bit
+    # wherever NumPy's trig kernels agree with libm.
+    rho = distance * np.cos(lat_rad)
+    rect = np.empty((lon_rad.shape[0], 3))
+    np.multiply(rho, np.cos(lon_rad), out=rect[:, 0])
+    np.multiply(rho, np.sin(lon_rad), out=rect[:, 1])
+    np.multiply(distance, np.sin(lat_rad), out=rect[:, 2])
+    return rect
+
+
+def _rectangular_to_spherical_batch(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                                    out: np.ndarray) -> np.ndarray:
+    """
+    Array counterpart of `_rectangular_to_spherical`, writing into `out`.
+
+    Parameters:
+    -----------
+    x, y, z : np.ndarray
+        The rectangular coordinates, shape (N,).
+    out : np.ndarray
+        Destination (N, 3) array receiving lon_or_ra, lat_or_dec and distance.
+
+    Raises:
+    -------
+    ValueError
+        If any point sits exactly on the origin.
+    """
+    distance = np.hypot(np.hypot(x, y), z)
+
+    if not np.all(distance):
+        raise ValueError("Distance cannot be zero for spherical conversion.")
+
+    z_ratio = np.clip(z / distance, -1.0, 1.0)
+
+    np.degrees(np.arctan2(y, x), out=out[:, 0])
+    np.degrees(np.arcsin(z_ratio), out=out[:, 1])
+    out[:, 2] = distance
+    return out
+
+
+def _build_master_matrix(source_plane: Plane, source_origin: Origin,
+                         target_plane: Plane, target_origin: Origin,
+                         translation_vector: tuple = (0.0, 0.0, 0.0),
+                         source_equinox: float | None = None,
+                         target_equinox: float | None = None) -> np.ndarray:
+    """
+    Composes the 4x4 homogeneous matrix taking the source frame to the target frame.
+
+    The translation is applied first (in the source plane), followed by the plane
+    rotation, i.e. ``M = R . T``. When either side has an equinox, the rotation goes
+    through the J2000 equatorial frame: ``R = F_target . F_source^T``.
+    """
+    master_matrix = np.eye(4)
+
+    if source_equinox is None and target_equinox is None:
+        if source_plane != target_plane:
+            to_ecliptic = (target_plane == Plane.ECLIPTIC)
+            rotation = _get_equatorial_ecliptic_rotation(to_ecliptic)
+            master_matrix = master_matrix.dot(rotation)
+    elif (source_plane, source_equinox) != (target_plane, target_equinox):
+        rotation = np.eye(4)
+        rotation[:3, :3] = (_get_frame_rotation(target_plane, target_equinox)
+                            .dot(_get_frame_rotation(source_plane, source_equinox).T))
+        master_matrix = master_matrix.dot(rotation)
+
+    if source_origin != target_origin:
+        translation = _get_translation_matrix(*translation_vector)
+        master_matrix = master_matrix.dot(translation)
+
+    return master_matrix
+
+
+def _apply_transform_batch(rect: np.ndarray, transformation_matrix: np.ndarray,
+                           state: PhysicalState = PhysicalState.POINT) -> np.ndarray:
+    """
+    Applies a 4x4 homogeneous matrix to an (N, 3) array of entities at once.
+
+    Rather than lifting every row into 4D, the matrix is split into its 3x3 linear
+    block and its translation column; the latter only contributes for Points (w=1).
+    """
+    transformed = rect @ transformation_matrix[:3, :3].T
+    if state == PhysicalState.POINT:
+        transformed += transformation_matrix[:3, 3]
+    return transformed
+
+
+def _apply_frame_rotations_batch(rect: np.ndarray,
+                                 source_plane: Plane, source_equinox,
+                                 target_plane: Plane, target_equinox,
+                                 translation: np.ndarray | None = None) -> np.ndarray:
+    """
+    Applies per-row frame rotations, for batches whose rows carry their own equinox.
+
+    Equivalent to `_apply_transform_batch` with one master matrix per row: the
+    optional translation is added first, then each row is rotated by
+    ``F_target . F_source^T`` (see `_get_frame_rotations`).
+    """
+    rows = rect.shape[0]
+    source = _get_frame_rotations(source_plane, source_equinox, rows)
+    target = _get_frame_rotations(target_plane, target_equinox, rows)
+    rotation = target @ np.swapaxes(source, -1, -2)
+    if translation is not None:
+        rect = rect + translation
+    if rotation.ndim == 2:
+        return rect @ rotation.T
+    return np.einsum("nij,nj->ni", rotation, rect)
+
+
+def _ephemeris_translation(source_plane: Plane, source_origin: Origin, source_equinox,
+                           epoch, rows: int = 1) -> np.ndarray:
+    """
+    Translation vector for an origin change at `epoch`, from the built-in ephemeris.
+
+    Moving from the Sun to the Earth translates by minus the Earth's heliocentric
+    position, and back by plus it (see `_get_translation_matrix`). The vector is
+    expressed in the source frame, where the master matrix applies it, in AU.
+
+    Returns a (3,) vector when `epoch` and `source_equinox` are shared, and an
+    (N, 3) array when either is given per row.
+    """
+    earth = planetary_ephemeris.heliocentric_position("earth", epoch, Plane.EQUATORIAL)
+    sign = -1.0 if source_origin == Origin.HELIOCENTRIC else 1.0
+    rotation = _get_frame_rotations(source_plane, source_equinox, rows)
+    if earth.ndim == 1 and rotation.ndim == 2:
+        return sign * rotation.dot(earth)
+    return sign * np.einsum("...ij,...j->...i", rotation, earth)
+
+
+# ==========================================
+# INTERNAL MATH: JACOBIANS (UNCERTAINTY)
+# ==========================================
+def _spherical_to_rectangular_jacobian(coords: np.ndarray) -> np.ndarray:
+    """
+    Jacobian of `_spherical_to_rectangular_batch`, with the angles in degrees.
+
+    Parameters:
+    -----------
+    coords : np.ndarray
+        (N, 3) rows of (lon_or_ra, lat_or_dec, distance).
+
+    Returns:
+    --------
+    np.ndarray
+        (N, 3, 3) matrices d(x, y, z) / d(lon_or_ra, lat_or_dec, distance).
+    """
+    lon_rad = np.radians(coords[:, 0])
+    lat_rad = np.radians(coords[:, 1])
+    cos_lon, sin_lon = np.cos(lon_rad), np.sin(lon_rad)
+    cos_lat, sin_lat = np.cos(lat_rad), np.sin(lat_rad)
+    scaled = np.radians(coords[:, 2])  # distance per degree of arc
+
+    jacobian = np.empty((coords.shape[0], 3, 3))
+    jacobian[:, 0, 0] = -scaled * cos_lat * sin_lon
+    jacobian[:, 1, 0] = scaled * cos_lat * cos_lon
+    jacobian[:, 2, 0] = 0.0
+    jacobian[:, 0, 1] = -scaled * sin_lat * cos_lon
+    jacobian[:, 1, 1] = -scaled * sin_lat * sin_lon
+    jacobian[:, 2, 1] = scaled * cos_lat
+    jacobian[:, 0, 2] = cos_lat * cos_lon
+    jacobian[:, 1, 2] = cos_lat * sin_lon
+    jacobian[:, 2, 2] = sin_lat
+    return jacobian
+
+
+def _rectangular_to_spherical_jacobian(rect: np.ndarray) -> np.ndarray:
+    """
+    Jacobian of `_rectangular_to_spherical_batch`, with the angles in degrees.
+
+    Parameters:
+    -----------
+    rect : np.ndarray
+        (N, 3) rows of (x, y, z).
+
+    Returns:
+    --------
+    np.ndarray
+        (N, 3, 3) matrices d(lon_or_ra, lat_or_dec, distance) / d(x, y, z). The
+        longitude row is not finite on the poles, where the longitude is undefined.
+    """
+    x, y, z = rect[:, 0], rect[:, 1], rect[:, 2]
+    rho_sq = x * x + y * y
+    rho = np.sqrt(rho_sq)
+    distance_sq = rho_sq + z * z
+    distance = np.sqrt(distance_sq)
+
+    jacobian = np.empty((rect.shape[0], 3, 3))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        jacobian[:, 0, 0] = np.degrees(-y / rho_sq)
+        jacobian[:, 0, 1] = np.degrees(x / rho_sq)
+        jacobian[:, 0, 2] = 0.0
+        tilt = np.degrees(-z / (distance_sq * rho))
+        jacobian[:, 1, 0] = tilt * x
+        jacobian[:, 1, 1] = tilt * y
+        jacobian[:, 1, 2] = np.degrees(rho / distance_sq)
+        jacobian[:, 2, :] = rect / distance[:, None]
+    return jacobian
+
+
+def _linear_block(source_plane: Plane, source_origin: Origin, source_equinox,
+                  target_plane: Plane, target_origin: Origin, target_equinox,
+                  rows: int) -> np.ndarray:
+    """
+    Jacobian of the matrix stage: the 3x3 linear block of the master matrix.
+
+    The translation only shifts the points, so it drops out; what remains is the
+    plane rotation, shared by the batch (3, 3) or given per row (N, 3, 3).
+    """
+    if np.ndim(source_equinox) or np.ndim(target_equinox):
+        source = _get_frame_rotations(source_plane, source_equinox, rows)
+        target = _get_frame_rotations(target_plane, target_equinox, rows)
+        return target @ np.swapaxes(source, -1, -2)
+    return frame_registry.get(
+        source_plane, source_origin, target_plane, target_origin, (0.0, 0.0, 0.0),
+        None if source_equinox is None else float(source_equinox),
+        None if target_equinox is None else float(target_equinox)
+    ).rotation
+
+
+# Composed matrices for every frame pair, built once and shared by the scalar
+# and batch pipelines.
+frame_registry = FrameTransformRegistry(_build_master_matrix)
+
+
 # ==========================================
 # PUBLIC FACADE: The Universal Pipeline
 # ==========================================
 
 
 def convert_celestial_coordinate(
-    # Input is now strictly typed to your Pydantic models
-    input_coords: Union[Rectangular, Spherical],
+    # Lean service-layer tuples; Pydantic models are accepted and converted on entry
+    input_coords: Union[RectangularCoord, SphericalCoord, Rectangular, Spherical],
 
     # Target State parameters
     target_shape: Shape,
@@ -194,60 +485,345 @@ def convert_celestial_coordinate(
 
     # Dynamic Physics Parameters
     physical_state: PhysicalState = PhysicalState.POINT,
-    translation_vector: tuple = (0.0, 0.0, 0.0)
-) -> Union[Rectangular, Spherical]:
+    translation_vector: tuple = (0.0, 0.0, 0.0),
+
+    # Frame of date (Julian Date, TT); None keeps the fixed J2000 frame
+    target_equinox: float | None = None,
+
+    # Epoch (Julian Date, TDB) at which the ephemeris supplies the translation
+    epoch: float | None = None,
+
+    # Uncertainty mode: a 3x3 input covariance switches it on
+    covariance=None,
+    method: Uncertainty = Uncertainty.LINEAR,
+    samples: int = DEFAULT_SAMPLES,
+    seed=None
+) -> Union[RectangularCoord, SphericalCoord, Estimate]:
     """
-    Universal pipeline to transform any celestial Pydantic coordinate model into any other state.
+    Universal pipeline to transform any celestial coordinate into any other state.
+
+    Works on the lean `RectangularCoord` / `SphericalCoord` tuples end to end, so a
+    call allocates a few tuples rather than validating Pydantic models; the API
+    layer converts at its boundary with `as_coord` and `to_model`.
+
+    The source equinox comes from `input_coords.equinox`; a frame with an equinox is
+    the true equator or ecliptic of that date (precession and nutation applied).
+
+    With an `epoch`, a heliocentric <-> geocentric change takes the Earth's position
+    from the built-in planetary ephemeris instead of `translation_vector`; distances
+    must then be in AU. Passing both raises a ValueError.
+
+    With a `covariance` (3x3, in the units of the input: degrees for the angles
+    of spherical coordinates), the call returns an `Estimate` of the converted
+    coordinate and its 3x3 covariance instead, propagated by `method` (see
+    `convert_celestial_coordinates_with_uncertainty`).
     """
 
+    stage_start = metrics.now()
+    input_coords = as_coord(input_coords)
+    if covariance is not None:
+        return _convert_with_uncertainty(input_coords, target_shape, target_plane,
+                                         target_origin, physical_state, translation_vector,
+                                         target_equinox, epoch, covariance, method, samples,
+                                         seed)
+    check_translation_source(translation_vector, epoch)
+    if epoch is not None and input_coords.origin != target_origin:
+        translation_vector = tuple(_ephemeris_translation(
+            input_coords.plane, input_coords.origin, input_coords.equinox, float(epoch)
+        ).tolist())
+
     # --- STAGE 1: NORMALIZE TO RECTANGULAR ---
-    if isinstance(input_coords, Spherical):
-        rect_dict = _spherical_to_rectangular(
+    if isinstance(input_coords, SphericalCoord):
+        x, y, z = _spherical_to_rectangular(
             input_coords.lon_or_ra,
             input_coords.lat_or_dec,
             input_coords.distance
         )
     else:
-        # It is already Rectangular, just extract the dictionary for the matrix math
-        rect_dict = {"x": input_coords.x,
-                     "y": input_coords.y, "z": input_coords.z}
+        x, y, z = input_coords.x, input_coords.y, input_coords.z
+    stage_start = metrics.record("normalize", stage_start)
 
     # --- STAGE 2: BUILD AND APPLY THE MASTER MATRIX ---
-    master_matrix = np.eye(4)
-
     # The input inherently knows its own plane and origin
-    if input_coords.plane != target_plane:
-        to_ecliptic = (target_plane == Plane.ECLIPTIC)
-        rotation = _get_equatorial_ecliptic_rotation(to_ecliptic)
-        master_matrix = master_matrix.dot(rotation)
+    transform = frame_registry.get(
+        input_coords.plane, input_coords.origin,
+        target_plane, target_origin, translation_vector,
+        input_coords.equinox, target_equinox
+    )
+    stage_start = metrics.record("matrix", stage_start)
 
-    if input_coords.origin != target_origin:
-        translation = _get_translation_matrix(*translation_vector)
-        master_matrix = master_matrix.dot(translation)
+    if not transform.is_identity:
+        x, y, z = _apply_transform(x, y, z, transform.rows, physical_state)
+    stage_start = metrics.record("apply", stage_start)
 
-    if not np.array_equal(master_matrix, np.eye(4)):
-        rect_dict = _apply_transform(
-            rect_dict['x'], rect_dict['y'], rect_dict['z'],
-            master_matrix, physical_state
+    # --- STAGE 3: FORMAT TO TARGET SHAPE ---
+    if target_shape == Shape.SPHERICAL:
+        lon_or_ra, lat_or_dec, distance = _rectangular_to_spherical(x, y, z)
+        result = SphericalCoord(lon_or_ra, lat_or_dec, distance,
+                                target_plane, target_origin, target_equinox)
+    else:
+        result = RectangularCoord(x, y, z, target_plane, target_origin, target_equinox)
+    metrics.record("reshape", stage_start)
+    return result
+
+
+def _convert_with_uncertainty(input_coords: RectangularCoord | SphericalCoord,
+                              target_shape: Shape, target_plane: Plane, target_origin: Origin,
+                              physical_state: PhysicalState, translation_vector: tuple,
+                              target_equinox, epoch, covariance, method: Uncertainty,
+                              samples: int, seed) -> Estimate:
+    """The uncertainty mode of `convert_celestial_coordinate`, as a one-row batch."""
+    source_shape = (Shape.SPHERICAL if isinstance(input_coords, SphericalCoord)
+                    else Shape.RECTANGULAR)
+    estimate = convert_celestial_coordinates_with_uncertainty(
+        np.array([input_coords[:3]], dtype=np.float64), np.asarray(covariance)[None],
+        source_shape, input_coords.plane, input_coords.origin,
+        target_shape, target_plane, target_origin, physical_state, translation_vector,
+        input_coords.equinox, target_equinox, epoch, method, samples, seed
+    )
+    model = SphericalCoord if target_shape == Shape.SPHERICAL else RectangularCoord
+    coord = model(*estimate.mean[0].tolist(), target_plane, target_origin, target_equinox)
+    return Estimate(coord, estimate.covariance[0])
+
+
+def convert_celestial_coordinates_batch(
+    coords: np.ndarray,
+
+    # Source State parameters (shared by every row)
+    source_shape: Shape,
+    source_plane: Plane,
+    source_origin: Origin,
+
+    # Target State parameters
+    target_shape: Shape,
+    target_plane: Plane,
+    target_origin: Origin,
+
+    # Dynamic Physics Parameters
+    physical_state: PhysicalState = PhysicalState.POINT,
+    translation_vector: tuple = (0.0, 0.0, 0.0),
+
+    # Frames of date (Julian Dates, TT): None, one epoch, or one epoch per row
+    source_equinox=None,
+    target_equinox=None,
+
+    # Ephemeris epoch(s) (Julian Dates, TDB) replacing the translation vector
+    epoch=None,
+    out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Vectorized counterpart of `convert_celestial_coordinate` for whole catalogs.
+
+    Runs the same three stages (normalize, matrix, format) as array operations over
+    every row at once, so the cost per coordinate is a handful of floating point
+    operations rather than a Pydantic round-trip.
+
+    Parameters:
+    -----------
+    coords : np.ndarray
+        An (N, 3) array. Rows are (x, y, z) when `source_shape` is RECTANGULAR and
+        (lon_or_ra, lat_or_dec, distance) in degrees when it is SPHERICAL.
+    source_shape, source_plane, source_origin :
+        The state shared by every input row.
+    target_shape, target_plane, target_origin :
+        The requested output state.
+    physical_state : PhysicalState, default PhysicalState.POINT
+        Whether the rows are Points (translated) or Vectors (immune to translation).
+    translation_vector : tuple, default (0.0, 0.0, 0.0)
+        The (x, y, z) shift used when the origin changes.
+    source_equinox, target_equinox : float or np.ndarray, optional
+        Julian Date (TT) of the source and target frames of date, either shared by
+        the batch or given per row as an (N,) array. None keeps the J2000 frame.
+    epoch : float or np.ndarray, optional
+        Julian Date (TDB) at which the built-in ephemeris supplies the translation
+        for a heliocentric <-> geocentric change, shared or per row. Distances must
+        be in AU. Mutually exclusive with a non-zero `translation_vector`.
+    out : np.ndarray, optional
+        A preallocated (N, 3) float64 array for the result.
+
+    Returns:
+    --------
+    np.ndarray
+        An (N, 3) array laid out like `coords`, but in the target shape.
+
+    Raises:
+    -------
+    ValueError
+        If `coords` is not (N, 3), an equinox or epoch array does not have one entry
+        per row, both `epoch` and `translation_vector` are given, or a spherical
+        output is requested for a point sitting on the origin.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] != 3:
+        raise ValueError(f"Expected an (N, 3) array of coordinates, got shape {coords.shape}.")
+
+    if out is None:
+        out = np.empty(coords.shape)
+
+    check_translation_source(translation_vector, epoch)
+    translation = None
+    if source_origin != target_origin and epoch is not None:
+        if np.ndim(epoch) and np.shape(epoch) != (coords.shape[0],):
+            raise ValueError(f"Expected one epoch per row ({coords.shape[0]}), "
+                             f"got shape {np.shape(epoch)}.")
+        translation = _ephemeris_translation(source_plane, source_origin, source_equinox,
+                                             epoch, coords.shape[0])
+        if translation.ndim == 1:
+            translation_vector = tuple(translation.tolist())
+
+    # --- STAGE 1: NORMALIZE TO RECTANGULAR ---
+    if source_shape == Shape.SPHERICAL:
+        rect = _spherical_to_rectangular_batch(coords[:, 0], coords[:, 1], coords[:, 2])
+    else:
+        rect = coords
+
+    # --- STAGE 2: BUILD AND APPLY THE MASTER MATRIX ---
+    if np.ndim(source_equinox) or np.ndim(target_equinox) or np.ndim(epoch):
+        # One frame of date or ephemeris epoch per row: rotations come from the
+        # precession table and translations from the ephemeris.
+        if source_origin == target_origin or physical_state != PhysicalState.POINT:
+            translation = None
+        elif translation is None:
+            translation = np.asarray(translation_vector, dtype=np.float64)
+        rect = _apply_frame_rotations_batch(rect, source_plane, source_equinox,
+                                            target_plane, target_equinox, translation)
+    else:
+        transform = frame_registry.get(
+            source_plane, source_origin, target_plane, target_origin, translation_vector,
+            None if source_equinox is None else float(source_equinox),
+            None if target_equinox is None else float(target_equinox)
         )
 
+        if not transform.is_identity:
+            rect = _apply_transform_batch(rect, transform.matrix, physical_state)
+
     # --- STAGE 3: FORMAT TO TARGET SHAPE ---
     if target_shape == Shape.SPHERICAL:
-        spherical_dict = _rectangular_to_spherical(
-            rect_dict['x'], rect_dict['y'], rect_dict['z']
-        )
-        return Spherical(
-            lon_or_ra=spherical_dict['lon_or_ra'],
-            lat_or_dec=spherical_dict['lat_or_dec'],
-            distance=spherical_dict['distance'],
-            plane=target_plane,
-            origin=target_origin
-        )
+        return _rectangular_to_spherical_batch(rect[:, 0], rect[:, 1], rect[:, 2], out)
 
-    return Rectangular(
-        x=rect_dict['x'],
-        y=rect_dict['y'],
-        z=rect_dict['z'],
-        plane=target_plane,
-        origin=target_origin
-    )
+    out[...] = rect
+    return out
+
+
+def convert_celestial_coordinates_with_uncertainty(
+    coords: np.ndarray,
+    covariance: np.ndarray,
+
+    # Source State parameters (shared by every row)
+    source_shape: Shape,
+    source_plane: Plane,
+    source_origin: Origin,
+
+    # Target State parameters
+    target_shape: Shape,
+    target_plane: Plane,
+    target_origin: Origin,
+
+    # Dynamic Physics Parameters
+    physical_state: PhysicalState = PhysicalState.POINT,
+    translation_vector: tuple = (0.0, 0.0, 0.0),
+    source_equinox=None,
+    target_equinox=None,
+    epoch=None,
+
+    # Uncertainty mode
+    method: Uncertainty = Uncertainty.LINEAR,
+    samples: int = DEFAULT_SAMPLES,
+    seed=None,
+    chunk_points: int = MONTE_CARLO_CHUNK_POINTS
+) -> Estimate:
+    """
+    Carries per-row covariances through `convert_celestial_coordinates_batch`.
+
+    In LINEAR mode the covariance goes through the analytic Jacobian of each
+    stage: spherical -> rectangular, the rotation of the master matrix (the
+    translation drops out) and rectangular -> spherical. In MONTE_CARLO mode
+    `samples` draws per row are transformed by the batch pipeline itself, in
+    blocks of about `chunk_points` rows, and summarized by their mean and
+    covariance; this also captures the curvature the linear mode neglects, at
+    the cost of sampling noise.
+
+    Parameters:
+    -----------
+    coords : np.ndarray
+        An (N, 3) array laid out as for `convert_celestial_coordinates_batch`.
+    covariance : np.ndarray
+        A (3, 3) covariance shared by every row, or (N, 3, 3) per row, in the units
+        of `coords` (degrees for the angles of spherical rows).
+    source_shape, ..., epoch :
+        As for `convert_celestial_coordinates_batch`. The translation, whether
+        given or from the ephemeris, is treated as exact.
+    method : Uncertainty, default Uncertainty.LINEAR
+        LINEAR or MONTE_CARLO propagation.
+    samples : int, default DEFAULT_SAMPLES
+        Draws per row in MONTE_CARLO mode.
+    seed : int or np.random.Generator, optional
+        Seeds the MONTE_CARLO draws, for reproducible results.
+    chunk_points : int, default MONTE_CARLO_CHUNK_POINTS
+        Sample rows transformed per MONTE_CARLO block.
+
+    Returns:
+    --------
+    Estimate
+        The (N, 3) transformed values (the sample mean in MONTE_CARLO mode) and
+        their (N, 3, 3) covariances, in the target shape. Spherical longitudes
+        of the sample mean are averaged around the transformed input, so they do
+        not break at the +-180 degree seam.
+
+    Raises:
+    -------
+    ValueError
+        For the reasons of `convert_celestial_coordinates_batch`, or if the
+        covariances do not match `coords` or are not positive semi-definite.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] != 3:
+        raise ValueError(f"Expected an (N, 3) array of coordinates, got shape {coords.shape}.")
+    covariance = uncertainty.check_covariance(covariance, coords.shape)
+    per_row = dict(source_equinox=source_equinox, target_equinox=target_equinox, epoch=epoch)
+
+    # The nominal transform also validates the options for both modes.
+    rect = convert_celestial_coordinates_batch(
+        coords, source_shape, source_plane, source_origin,
+        Shape.RECTANGULAR, target_plane, target_origin,
+        physical_state, translation_vector, **per_row)
+    values = rect.copy()
+    if target_shape == Shape.SPHERICAL:
+        _rectangular_to_spherical_batch(rect[:, 0], rect[:, 1], rect[:, 2], values)
+
+    if Uncertainty(method) == Uncertainty.LINEAR:
+        jacobian = _linear_block(source_plane, source_origin, source_equinox,
+                                 target_plane, target_origin, target_equinox, coords.shape[0])
+        if source_shape == Shape.SPHERICAL:
+            jacobian = jacobian @ _spherical_to_rectangular_jacobian(coords)
+        if target_shape == Shape.SPHERICAL:
+            jacobian = _rectangular_to_spherical_jacobian(rect) @ jacobian
+        return Estimate(values, uncertainty.linear_covariance(jacobian, covariance))
+
+    samples = uncertainty.check_samples(samples)
+    rng = np.random.default_rng(seed)
+    mean = np.empty(coords.shape)
+    spread = np.empty(covariance.shape)
+    rows = max(1, chunk_points // samples)
+    for first in range(0, coords.shape[0], rows):
+        block = slice(first, first + rows)
+        drawn = uncertainty.draw_samples(coords[block], covariance[block], samples, rng)
+        # Per-row equinoxes and epochs follow their row into each of its draws.
+        block_per_row = {name: np.repeat(np.asarray(value)[block], samples)
+                         if np.ndim(value) else value for name, value in per_row.items()}
+        transformed = convert_celestial_coordinates_batch(
+            drawn.reshape(-1, 3), source_shape, source_plane, source_origin,
+            target_shape, target_plane, target_origin,
+            physical_state, translation_vector, **block_per_row
+        ).reshape(drawn.shape)
+        # Deviations from the nominal value, longitudes wrapped to within 180 degrees.
+        transformed -= values[block, None, :]
+        if target_shape == Shape.SPHERICAL:
+            turns = np.rint(transformed[..., 0] * (1.0 / 360.0))
+            turns *= 360.0
+            transformed[..., 0] -= turns
+        offset, spread[block] = uncertainty.deviation_statistics(transformed)
+        mean[block] = values[block] + offset
+    if target_shape == Shape.SPHERICAL:
+        mean[:, 0] = np.remainder(mean[:, 0] + 180.0, 360.0) - 180.0
+    return Estimate(mean, spread)
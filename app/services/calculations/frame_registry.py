@@ -0,0 +1,158 @@
+"""
+Frame-transform registry.
+
+Caches the composed 4x4 homogeneous matrix for every (source plane, source origin,
+target plane, target origin, translation, equinoxes) combination so that the
+conversion pipeline does not rebuild and re-multiply matrices on every call.
+
+- Translation-independent frame pairs (same origin, fixed J2000 frames) are
+  precomputed eagerly and never evicted.
+- Translation- or epoch-dependent entries (origin changes, frames of date) are
+  kept in a bounded LRU.
+"""
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import NamedTuple
+
+import numpy as np
+
+from app.models.coordinates_systems import Origin, Plane
+
+# Default number of translation-dependent entries kept before the LRU evicts.
+DEFAULT_MAXSIZE = 1024
+
+MatrixBuilder = Callable[..., np.ndarray]
+
+
+class FrameTransform(NamedTuple):
+    """
+    A cached frame transformation.
+
+    Attributes:
+    -----------
+    matrix : np.ndarray
+        The read-only 4x4 homogeneous matrix.
+    rotation : np.ndarray
+        Read-only view of the 3x3 linear block.
+    offset : np.ndarray
+        Read-only view of the translation column (applied to Points only).
+    is_identity : bool
+        True when applying the transform would be a no-op.
+    rows : tuple
+        The top three rows of `matrix` as tuples of Python floats, for scalar
+        math without NumPy call overhead.
+    """
+    matrix: np.ndarray
+    rotation: np.ndarray
+    offset: np.ndarray
+    is_identity: bool
+    rows: tuple[tuple[float, float, float, float], ...]
+
+
+def _freeze(matrix: np.ndarray) -> FrameTransform:
+    matrix = np.array(matrix, dtype=np.float64)
+    matrix.flags.writeable = False
+    return FrameTransform(
+        matrix=matrix,
+        rotation=matrix[:3, :3],
+        offset=matrix[:3, 3],
+        is_identity=bool(np.array_equal(matrix, np.eye(4))),
+        rows=tuple(tuple(row) for row in matrix[:3].tolist()),
+    )
+
+
+class FrameTransformRegistry:
+    """
+    Thread-safe registry of precomputed frame transforms with hit/miss counters.
+
+    Parameters:
+    -----------
+    builder : callable
+        ``builder(source_plane, source_origin, target_plane, target_origin, translation)``
+        returning the 4x4 matrix for a combination. Only invoked on a miss; entries
+        with an equinox also pass ``source_equinox`` and ``target_equinox``.
+    maxsize : int, default DEFAULT_MAXSIZE
+        Maximum number of translation- or epoch-dependent entries kept in the LRU.
+    """
+
+    def __init__(self, builder: MatrixBuilder, maxsize: int = DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self._builder = builder
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._dynamic: OrderedDict[tuple, FrameTransform] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+        # Same-origin pairs never depend on the translation vector, so the full
+        # set is small and known up-front.
+        self._static = {
+            (source_plane, origin, target_plane, origin): _freeze(
+                builder(source_plane, origin, target_plane, origin, (0.0, 0.0, 0.0))
+            )
+            for source_plane in Plane
+            for target_plane in Plane
+            for origin in Origin
+        }
+
+    def get(self, source_plane: Plane, source_origin: Origin,
+            target_plane: Plane, target_origin: Origin,
+            translation_vector: tuple[float, float, float] = (0.0, 0.0, 0.0),
+            source_equinox: float | None = None,
+            target_equinox: float | None = None) -> FrameTransform:
+        """Return the cached transform for a frame pair, building it on a miss."""
+        dated = source_equinox is not None or target_equinox is not None
+        if source_origin == target_origin and not dated:
+            entry = self._static[(source_plane, source_origin, target_plane, target_origin)]
+            with self._lock:
+                self._hits += 1
+            return entry
+
+        # Same-origin entries ignore the translation, so it is left out of the key.
+        translation = (tuple(translation_vector) if source_origin != target_origin
+                       else (0.0, 0.0, 0.0))
+        key = (source_plane, source_origin, target_plane, target_origin, translation,
+               source_equinox, target_equinox)
+        with self._lock:
+            entry = self._dynamic.get(key)
+            if entry is not None:
+                self._dynamic.move_to_end(key)
+                self._hits += 1
+                return entry
+            self._misses += 1
+
+        # Build outside the lock; a concurrent miss on the same key just builds twice.
+        if dated:
+            matrix = self._builder(source_plane, source_origin, target_plane, target_origin,
+                                   translation, source_equinox=source_equinox,
+                                   target_equinox=target_equinox)
+        else:
+            matrix = self._builder(source_plane, source_origin, target_plane, target_origin,
+                                   translation)
+        entry = _freeze(matrix)
+        with self._lock:
+            self._dynamic[key] = entry
+            self._dynamic.move_to_end(key)
+            while len(self._dynamic) > self._maxsize:
+                self._dynamic.popitem(last=False)
+        return entry
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "static_entries": len(self._static),
+                "dynamic_entries": len(self._dynamic),
+                "maxsize": self._maxsize,
+            }
+
+    def clear(self) -> None:
+        """Drop every translation-dependent entry and reset the counters."""
+        with self._lock:
+            self._dynamic.clear()
+            self._hits = 0
+            self._misses = 0
@@ -0,0 +1,182 @@
+"""
+Horizon coordinates for an observer on the Earth.
+
+- :func:`earth_rotation_angle` – the IAU 2000 Earth rotation angle
+- :func:`sidereal_time` – Greenwich or local apparent sidereal time
+- :func:`equatorial_to_horizontal` – azimuth and altitude from RA/Dec of date
+- :func:`to_horizontal` – azimuth and altitude for coordinates in any frame of the
+  coordinate pipeline, converted to the geocentric equator of date first
+
+Azimuths are measured from the north through the east, altitudes from the
+astronomical horizon; both are geometric (no refraction, no diurnal parallax,
+so positions are geocentric). An :class:`ObserverSite` takes the geodetic
+latitude and the east longitude in degrees.
+
+Epochs here are Julian Dates in UT1, the time scale of the Earth's rotation.
+Precession and nutation need Terrestrial Time; TT = UT1 + ``delta_t`` seconds,
+which defaults to :data:`DELTA_T`. ΔT drifts by under a second a year, so the
+default costs arcseconds over the 2020s; pass the current value for older or
+later epochs.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.models.coordinates_systems import Origin, Plane, Shape
+from app.services.calculations import precession
+from app.services.calculations.coordinate_conversions import convert_celestial_coordinates_batch
+from app.utils.math_helpers import wrap_angle_deg, wrap_angle_rad
+
+# TT − UT1 in seconds, as observed in 2025.
+DELTA_T = 69.2
+
+SECONDS_PER_DAY = 86_400.0
+
+# Sidereal days per UT1 day, as in the IAU 2000 Earth rotation angle.
+SIDEREAL_RATE = 1.00273781191135448
+
+_ARCSEC = np.pi / (180.0 * 3600.0)
+
+
+class ObserverSite(NamedTuple):
+    latitude: float  # geodetic latitude in degrees, north positive
+    longitude: float  # degrees, east positive
+
+
+def _check_site(site: ObserverSite) -> None:
+    if not -90.0 <= site.latitude <= 90.0:
+        raise ValueError(f"Site latitude must be within ±90°, got {site.latitude}.")
+
+
+def earth_rotation_angle(jd: ArrayLike) -> np.ndarray:
+    """
+    Earth rotation angle (IAU 2000).
+
+    Parameters
+    ----------
+    jd : array_like
+        Julian Date (UT1).
+
+    Returns
+    -------
+    numpy.ndarray
+        θ in radians, in ``[0, 2π)``.
+    """
+    days = np.asarray(jd, dtype=np.float64) - precession.J2000_JD
+    # The fractional day is split off first to keep the turns exact for large `days`.
+    turns = np.mod(days, 1.0) + 0.7790572732640 + (SIDEREAL_RATE - 1.0) * days
+    return wrap_angle_rad(2.0 * np.pi * turns)
+
+
+def sidereal_time(jd: ArrayLike, longitude: float = 0.0,
+                  delta_t: float = DELTA_T) -> np.ndarray:
+    """
+    Apparent sidereal time: the hour angle of the true equinox of date.
+
+    Parameters
+    ----------
+    jd : array_like
+        Julian Date (UT1).
+    longitude : float, default 0.0
+        East longitude in degrees; 0 gives Greenwich apparent sidereal time.
+    delta_t : float, default DELTA_T
+        TT − UT1 in seconds.
+
+    Returns
+    -------
+    numpy.ndarray
+        Sidereal time in radians, in ``[0, 2π)``.
+    """
+    jd = np.asarray(jd, dtype=np.float64)
+    tt = jd + delta_t / SECONDS_PER_DAY
+    t = (tt - precession.J2000_JD) / precession.DAYS_PER_CENTURY
+    # IAU 2006 GMST − ERA, then the equation of equinoxes Δψ cos ε_A.
+    polynomial = (0.014506 + t * (4612.156534 + t * (1.3915817 + t * (
+        -0.00000044 + t * (-0.000029956 - 0.0000000368 * t))))) * _ARCSEC
+    d_psi, _ = precession.nutation(tt)
+    angle = (earth_rotation_angle(jd) + polynomial + d_psi * np.cos(precession.mean_obliquity(tt))
+             + np.radians(longitude))
+    return wrap_angle_rad(angle)
+
+
+def equatorial_to_horizontal(ra: ArrayLike, dec: ArrayLike, jd: ArrayLike, site: ObserverSite,
+                             delta_t: float = DELTA_T) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Azimuth and altitude of directions given on the true equator of date.
+
+    Parameters
+    ----------
+    ra, dec : array_like
+        Right ascension and declination of date in degrees.
+    jd : array_like
+        Julian Date (UT1), broadcast against ``ra`` and ``dec``.
+    site : ObserverSite
+        The observer.
+    delta_t : float, default DELTA_T
+        TT − UT1 in seconds.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(azimuth, altitude)`` in degrees, azimuth in ``[0, 360)``.
+    """
+    _check_site(site)
+    hour_angle = sidereal_time(jd, site.longitude, delta_t) - np.radians(ra)
+    dec = np.radians(dec)
+    phi = np.radians(site.latitude)
+    sin_dec, cos_dec = np.sin(dec), np.cos(dec)
+    cos_ha = np.cos(hour_angle)
+    altitude = np.arcsin(np.clip(np.sin(phi) * sin_dec + np.cos(phi) * cos_dec * cos_ha,
+                                 -1.0, 1.0))
+    azimuth = np.arctan2(-cos_dec * np.sin(hour_angle),
+                         sin_dec * np.cos(phi) - cos_dec * cos_ha * np.sin(phi))
+    return wrap_angle_deg(np.degrees(azimuth)), np.degrees(altitude)
+
+
+def to_horizontal(
+    coords: np.ndarray,
+    jd: ArrayLike,
+    site: ObserverSite,
+    source_shape: Shape,
+    source_plane: Plane,
+    source_origin: Origin,
+    source_equinox=None,
+    delta_t: float = DELTA_T,
+) -> np.ndarray:
+    """
+    Horizon coordinates of a batch of positions in any frame of the pipeline.
+
+    The rows are converted with ``convert_celestial_coordinates_batch`` to the
+    geocentric true equator of date, then to the horizon of ``site``.
+    Heliocentric rows take the Earth's position from the built-in ephemeris at
+    ``jd`` and must be in AU.
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        An (N, 3) array laid out as in ``convert_celestial_coordinates_batch``.
+    jd : float or np.ndarray
+        Julian Date (UT1) of the observation, shared or one per row.
+    site : ObserverSite
+        The observer.
+    source_shape, source_plane, source_origin, source_equinox :
+        The state of the input rows.
+    delta_t : float, default DELTA_T
+        TT − UT1 in seconds.
+
+    Returns
+    -------
+    np.ndarray
+        An (N, 3) array of (azimuth, altitude, distance), angles in degrees.
+    """
+    _check_site(site)
+    tt = np.asarray(jd, dtype=np.float64) + delta_t / SECONDS_PER_DAY
+    epoch = tt if source_origin != Origin.GEOCENTRIC else None
+    of_date = convert_celestial_coordinates_batch(
+        coords, source_shape, source_plane, source_origin,
+        Shape.SPHERICAL, Plane.EQUATORIAL, Origin.GEOCENTRIC,
+        source_equinox=source_equinox, target_equinox=tt, epoch=epoch)
+    azimuth, altitude = equatorial_to_horizontal(of_date[:, 0], of_date[:, 1], jd, site, delta_t)
+    return np.column_stack([azimuth, altitude, of_date[:, 2]])
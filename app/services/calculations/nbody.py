@@ -0,0 +1,468 @@
+"""
+Numerical N-body integration.
+
+Propagates bodies under their mutual Newtonian gravity, for perturbations that
+the two-body solutions of :mod:`orbital_elements` leave out:
+
+- :func:`accelerations` – vectorized gravitational accelerations
+- :func:`propagate` – adaptive Runge–Kutta–Fehlberg 4(5) integration with dense output
+- :func:`planetary_perturbers` – the Sun and the major planets as massive bodies
+
+Bodies are split into a few *massive* bodies, which attract everything and each
+other, and any number of massless *test particles* (asteroids, comets,
+spacecraft), which feel the massive bodies but not each other. Test-particle
+accelerations are evaluated over blocks of (massive body, particle) pairs, so a
+step costs O(N_test × N_massive) arithmetic instead of O(N²) and memory stays
+linear in the number of particles.
+
+Units are those of the gravitational parameters: with GM in AU³ day⁻² (see
+:data:`planetary_ephemeris.GM_SUN_AU_DAY`), positions are in AU, velocities in
+AU day⁻¹ and times in days. States are ``(n, 6)`` arrays of
+(x, y, z, vx, vy, vz), massive bodies first.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.services.calculations.planetary_ephemeris import (
+    GM_SUN_AU_DAY,
+    MASS_RATIOS,
+    planet_states,
+)
+
+# Planets used by default as perturbers, with the Sun as body 0.
+PERTURBERS = tuple(MASS_RATIOS)
+
+# Test particles whose accelerations are computed together; bounds the temporaries
+# to a few ``n_massive × PARTICLE_BLOCK`` arrays.
+PARTICLE_BLOCK = 8192
+
+# Fehlberg 4(5) tableau: stage coefficients, and the weights of the fifth-order
+# solution (propagated) and of its difference to the fourth-order one. The system
+# is autonomous, so the nodes c_i are not needed.
+_A = (
+    (),
+    (1 / 4,),
+    (3 / 32, 9 / 32),
+    (1932 / 2197, -7200 / 2197, 7296 / 2197),
+    (439 / 216, -8.0, 3680 / 513, -845 / 4104),
+    (-8 / 27, 2.0, -3544 / 2565, 1859 / 4104, -11 / 40),
+)
+_B5 = np.array([16 / 135, 0.0, 6656 / 12825, 28561 / 56430, -9 / 50, 2 / 55])
+_B4 = np.array([25 / 216, 0.0, 1408 / 2565, 2197 / 4104, -1 / 5, 0.0])
+_E = _B5 - _B4
+
+# Step-size controller: safety factor and bounds on the change per step.
+_SAFETY = 0.9
+_MIN_FACTOR = 0.2
+_MAX_FACTOR = 5.0
+
+
+def accelerations(positions: ArrayLike, gm: ArrayLike, softening: float = 0.0,
+                  out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Gravitational accelerations of massive bodies and test particles.
+
+    Parameters
+    ----------
+    positions : array_like
+        ``(n, 3)`` positions; the first ``len(gm)`` rows are the massive bodies,
+        the rest massless test particles.
+    gm : array_like
+        ``(n_massive,)`` gravitational parameters of the massive bodies.
+    softening : float
+        Plummer softening length, added in quadrature to every separation to
+        keep close encounters finite. ``0`` gives exact Newtonian gravity.
+    out : numpy.ndarray, optional
+        Preallocated ``(n, 3)`` float64 array for the result.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n, 3)`` accelerations.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    gm = np.asarray(gm, dtype=np.float64).reshape(-1)
+    n_massive = gm.shape[0]
+    if positions.ndim != 2 or positions.shape[1] != 3 or positions.shape[0] < n_massive:
+        raise ValueError(f"Expected an (n, 3) position array with at least {n_massive} rows, "
+                         f"got {positions.shape}.")
+    if out is None:
+        out = np.empty(positions.shape)
+    eps2 = softening * softening
+
+    # Massive bodies: all pairs, a few dozen at most.
+    massive = positions[:n_massive]
+    separation = massive[np.newaxis, :, :] - massive[:, np.newaxis, :]
+    distance2 = np.einsum("ijk,ijk->ij", separation, separation) + eps2
+    np.fill_diagonal(distance2, np.inf)
+    weights = gm * distance2 ** -1.5
+    np.einsum("ijk,ij->ik", separation, weights, out=out[:n_massive])
+
+    # Test particles: every (massive body, particle) pair of a block at once, with
+    # components in the leading axis so each product runs over contiguous memory.
+    particles = positions[n_massive:]
+    for start in range(0, particles.shape[0], PARTICLE_BLOCK):
+        block = np.ascontiguousarray(particles[start:start + PARTICLE_BLOCK].T)
+        separation = massive.T[:, :, np.newaxis] - block[:, np.newaxis, :]
+        distance2 = np.einsum("kij,kij->ij", separation, separation)
+        distance2 += eps2
+        # GM / r³, computed in place.
+        weights = distance2 * np.sqrt(distance2)
+        np.divide(gm[:, np.newaxis], weights, out=weights)
+        out[n_massive + start:n_massive + start + block.shape[1]] = np.einsum(
+            "kij,ij->kj", separation, weights).T
+    return out
+
+
+class DenseOutput:
+    """
+    Continuous solution over every accepted step.
+
+    Positions are interpolated with the quintic Hermite polynomial matching
+    position, velocity and acceleration at both ends of a step, and velocities
+    with its derivative, so the interpolant is as accurate as the steps.
+
+    Parameters
+    ----------
+    times : numpy.ndarray
+        ``(s + 1,)`` step boundaries, monotonic in the direction of integration.
+    states : numpy.ndarray
+        ``(s + 1, n, 6)`` states at the boundaries.
+    accelerations : numpy.ndarray
+        ``(s + 1, n, 3)`` accelerations at the boundaries.
+    """
+
+    def __init__(self, times: np.ndarray, states: np.ndarray, accelerations: np.ndarray):
+        self.times = times
+        self.states = states
+        self.accelerations = accelerations
+        self._sign = 1.0 if times[-1] >= times[0] else -1.0
+
+    @property
+    def span(self) -> tuple[float, float]:
+        """First and last time covered."""
+        return float(self.times[0]), float(self.times[-1])
+
+    def __call__(self, t: ArrayLike) -> np.ndarray:
+        """
+        States at time(s) ``t`` within :attr:`span`.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(n, 6)`` for a scalar ``t``, otherwise ``(m, n, 6)``.
+        """
+        t = np.asarray(t, dtype=np.float64)
+        flat = t.reshape(-1)
+        low, high = sorted(self.span)
+        if np.any((flat < low) | (flat > high)):
+            raise ValueError(f"Times must lie within the integrated span {self.span}.")
+        # Steps are searched on a monotonically increasing axis.
+        index = np.searchsorted(self._sign * self.times, self._sign * flat, side="right") - 1
+        index = np.clip(index, 0, self.times.shape[0] - 2)
+        states = _hermite(self.times[index], self.times[index + 1],
+                          self.states[index], self.states[index + 1],
+                          self.accelerations[index], self.accelerations[index + 1], flat)
+        return states[0] if t.ndim == 0 else states
+
+
+def _hermite(t0: np.ndarray, t1: np.ndarray, y0: np.ndarray, y1: np.ndarray,
+             a0: np.ndarray, a1: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Quintic Hermite interpolation of ``(m, n, 6)`` states between step boundaries."""
+    h = (t1 - t0)[:, np.newaxis, np.newaxis]
+    s = ((t - t0) / (t1 - t0))[:, np.newaxis, np.newaxis]
+    s2 = s * s
+    s3 = s2 * s
+    s4 = s3 * s
+    s5 = s4 * s
+    p0, v0, p1, v1 = y0[..., :3], y0[..., 3:], y1[..., :3], y1[..., 3:]
+
+    h00 = 1 - 10 * s3 + 15 * s4 - 6 * s5
+    h10 = s - 6 * s3 + 8 * s4 - 3 * s5
+    h20 = 0.5 * (s2 - 3 * s3 + 3 * s4 - s5)
+    h11 = -4 * s3 + 7 * s4 - 3 * s5
+    h21 = 0.5 * (s3 - 2 * s4 + s5)
+    d00 = -30 * s2 + 60 * s3 - 30 * s4
+    d10 = 1 - 18 * s2 + 32 * s3 - 15 * s4
+    d20 = s - 4.5 * s2 + 6 * s3 - 2.5 * s4
+    d11 = -12 * s2 + 28 * s3 - 15 * s4
+    d21 = 1.5 * s2 - 4 * s3 + 2.5 * s4
+
+    out = np.empty(np.broadcast_shapes(s.shape, y0.shape))
+    out[..., :3] = (h00 * p0 + (1 - h00) * p1 + h * (h10 * v0 + h11 * v1)
+                    + h * h * (h20 * a0 + h21 * a1))
+    out[..., 3:] = ((d00 * (p0 - p1)) / h + d10 * v0 + d11 * v1
+                    + h * (d20 * a0 + d21 * a1))
+    return out
+
+
+class NBodySolution(NamedTuple):
+    """
+    Result of :func:`propagate`.
+
+    Attributes
+    ----------
+    times : numpy.ndarray
+        ``(m,)`` output times: ``t_eval``, or the start and end of the integration.
+    states : numpy.ndarray
+        ``(m, n, 6)`` states at ``times``, massive bodies first.
+    n_massive : int
+        Number of massive bodies.
+    steps : int
+        Accepted steps.
+    rejected : int
+        Rejected step attempts.
+    evaluations : int
+        Force evaluations.
+    dense : DenseOutput or None
+        Continuous solution, when requested.
+    """
+    times: np.ndarray
+    states: np.ndarray
+    n_massive: int
+    steps: int
+    rejected: int
+    evaluations: int
+    dense: DenseOutput | None
+
+    @property
+    def massive(self) -> np.ndarray:
+        """``(m, n_massive, 6)`` states of the massive bodies."""
+        return self.states[:, :self.n_massive]
+
+    @property
+    def particles(self) -> np.ndarray:
+        """``(m, n_test, 6)`` states of the test particles."""
+        return self.states[:, self.n_massive:]
+
+    def relative_to(self, body: int = 0) -> np.ndarray:
+        """States relative to one massive body, e.g. heliocentric with the Sun as body 0."""
+        return self.states - self.states[:, body:body + 1]
+
+
+def _error_scale(y0: np.ndarray, y1: np.ndarray, rtol: float, atol: float) -> np.ndarray:
+    """Per-body tolerance on position and velocity, from the larger of the two states."""
+    scale = np.empty(y0.shape[:1] + (2,))
+    for column, part in enumerate((slice(0, 3), slice(3, 6))):
+        norm = np.maximum(np.linalg.norm(y0[:, part], axis=1),
+                          np.linalg.norm(y1[:, part], axis=1))
+        scale[:, column] = atol + rtol * norm
+    return scale
+
+
+def _error_norm(error: np.ndarray, scale: np.ndarray) -> float:
+    """Largest error of any body, in units of its tolerance."""
+    position = np.linalg.norm(error[:, :3], axis=1) / scale[:, 0]
+    velocity = np.linalg.norm(error[:, 3:], axis=1) / scale[:, 1]
+    return float(max(position.max(), velocity.max()))
+
+
+class _System:
+    """Right-hand side ``dy/dt = (v, a(r))`` with counted, buffered evaluations."""
+
+    def __init__(self, gm: np.ndarray, softening: float, n: int):
+        self.gm = gm
+        self.softening = softening
+        self.evaluations = 0
+        self._acceleration = np.empty((n, 3))
+
+    def __call__(self, y: np.ndarray, out: np.ndarray) -> np.ndarray:
+        self.evaluations += 1
+        out[:, :3] = y[:, 3:]
+        accelerations(y[:, :3], self.gm, self.softening, out=self._acceleration)
+        out[:, 3:] = self._acceleration
+        return out
+
+
+def _initial_step(system: _System, y0: np.ndarray, f0: np.ndarray, direction: float,
+                  span: float, rtol: float, atol: float) -> float:
+    """Starting step size (Hairer, Nørsett & Wanner, *Solving ODEs I*, II.4)."""
+    scale = _error_scale(y0, y0, rtol, atol)
+    d0 = _error_norm(y0, scale)
+    d1 = _error_norm(f0, scale)
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    h0 = min(h0, span)
+    f1 = system(y0 + direction * h0 * f0, np.empty_like(y0))
+    d2 = _error_norm(f1 - f0, scale) / h0
+    if max(d1, d2) <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / 5)
+    return min(100 * h0, h1, span)
+
+
+def propagate(massive_states: ArrayLike, gm: ArrayLike, t_span: tuple[float, float],
+              test_states: ArrayLike | None = None, t_eval: ArrayLike | None = None,
+              rtol: float = 1e-10, atol: float = 1e-12, softening: float = 0.0,
+              first_step: float | None = None, max_steps: int = 1_000_000,
+              dense_output: bool = False) -> NBodySolution:
+    """
+    Integrate massive bodies and test particles with an adaptive RKF45 scheme.
+
+    Every step takes six force evaluations and estimates its local error from
+    the difference of the embedded fourth- and fifth-order solutions; the
+    fifth-order one is kept (local extrapolation). A step is accepted when the
+    error of every body is within ``atol + rtol * |r|`` in position and the
+    same on velocity, and the next step size is adapted from the error.
+
+    Parameters
+    ----------
+    massive_states : array_like
+        ``(n_massive, 6)`` initial states of the massive bodies.
+    gm : array_like
+        ``(n_massive,)`` gravitational parameters of the massive bodies.
+    t_span : tuple of float
+        Start and end time; the end may precede the start to integrate backwards.
+    test_states : array_like, optional
+        ``(n_test, 6)`` initial states of massless test particles.
+    t_eval : array_like, optional
+        Output times within ``t_span``, in the direction of integration. Defaults
+        to the start and end of the span.
+    rtol, atol : float
+        Relative and absolute tolerances on the per-step error.
+    softening : float
+        Plummer softening length (see :func:`accelerations`).
+    first_step : float, optional
+        Size of the first step attempt; estimated when omitted.
+    max_steps : int
+        Maximum number of accepted steps before giving up.
+    dense_output : bool
+        Keep every step to return a :class:`DenseOutput` in the solution. Costs
+        ``9 n`` floats per step, so it is off by default.
+
+    Returns
+    -------
+    NBodySolution
+        The states at the output times, step statistics and the optional dense output.
+    """
+    massive_states = np.asarray(massive_states, dtype=np.float64)
+    gm = np.asarray(gm, dtype=np.float64).reshape(-1)
+    if massive_states.ndim != 2 or massive_states.shape != (gm.shape[0], 6):
+        raise ValueError(f"Expected ({gm.shape[0]}, 6) massive states to match gm, "
+                         f"got {massive_states.shape}.")
+    if gm.shape[0] == 0:
+        raise ValueError("At least one massive body is required.")
+    if test_states is None:
+        y = massive_states.copy()
+    else:
+        test_states = np.asarray(test_states, dtype=np.float64)
+        if test_states.ndim != 2 or test_states.shape[1] != 6:
+            raise ValueError(f"Expected (n_test, 6) test states, got {test_states.shape}.")
+        y = np.concatenate([massive_states, test_states])
+
+    t0, t_end = (float(t) for t in t_span)
+    direction = 1.0 if t_end >= t0 else -1.0
+    if t_eval is None:
+        t_eval = np.array([t0, t_end])
+    else:
+        t_eval = np.asarray(t_eval, dtype=np.float64).reshape(-1)
+        along = direction * (t_eval - t0)
+        if np.any(along < 0) or np.any(along > abs(t_end - t0)) or np.any(np.diff(along) < 0):
+            raise ValueError("t_eval must lie within t_span, ordered in the direction "
+                             "of integration.")
+    if rtol <= 0 or atol <= 0:
+        raise ValueError("rtol and atol must be positive.")
+
+    system = _System(gm, softening, y.shape[0])
+    stages = np.empty((6,) + y.shape)
+    system(y, stages[0])
+    output = np.empty(t_eval.shape + y.shape)
+    emitted = np.searchsorted(direction * (t_eval - t0), 0.0, side="right")
+    output[:emitted] = y
+
+    nodes_t, nodes_y, nodes_a = [t0], [y.copy()], [stages[0][:, 3:].copy()]
+    span = abs(t_end - t0)
+    if span == 0.0:
+        return NBodySolution(t_eval, output, gm.shape[0], 0, 0, system.evaluations,
+                             DenseOutput(np.array(nodes_t), np.array(nodes_y),
+                                         np.array(nodes_a)) if dense_output else None)
+
+    h = abs(first_step) if first_step else _initial_step(system, y, stages[0], direction,
+                                                         span, rtol, atol)
+    t = t0
+    steps = rejected = 0
+    trial = np.empty_like(y)
+    while direction * (t_end - t) > 0:
+        if steps >= max_steps:
+            raise RuntimeError(f"N-body integration did not reach t={t_end} "
+                               f"within {max_steps} steps.")
+        h = min(h, abs(t_end - t))
+        signed = direction * h
+        for stage in range(1, 6):
+            np.copyto(trial, y)
+            for weight, k in zip(_A[stage], stages):
+                trial += (signed * weight) * k
+            system(trial, stages[stage])
+        error = signed * np.tensordot(_E, stages, axes=1)
+        y_new = y + signed * np.tensordot(_B5, stages, axes=1)
+        norm = _error_norm(error, _error_scale(y, y_new, rtol, atol))
+
+        if norm > 1.0:
+            rejected += 1
+            h *= max(_MIN_FACTOR, _SAFETY * norm ** -0.2)
+            if t + direction * h == t:
+                raise RuntimeError(f"N-body step size underflow at t={t}.")
+            continue
+
+        # Accepted: the derivative at the new point is the next step's first stage.
+        t_new = t_end if h == abs(t_end - t) else t + signed
+        f_new = system(y_new, np.empty_like(y))
+        pending = t_eval[emitted:]
+        count = int(np.searchsorted(direction * (pending - t_new), 0.0, side="right"))
+        if count:
+            output[emitted:emitted + count] = _hermite(
+                np.full(count, t), np.full(count, t_new), y[np.newaxis], y_new[np.newaxis],
+                stages[0][np.newaxis, :, 3:], f_new[np.newaxis, :, 3:], pending[:count]
+            )
+            emitted += count
+        t, y = t_new, y_new
+        stages[0] = f_new
+        steps += 1
+        if dense_output:
+            nodes_t.append(t)
+            nodes_y.append(y.copy())
+            nodes_a.append(f_new[:, 3:].copy())
+        h *= min(_MAX_FACTOR, _SAFETY * norm ** -0.2) if norm > 0 else _MAX_FACTOR
+
+    # Output times at the very end are exact, not interpolated.
+    output[np.asarray(t_eval) == t_end] = y
+    dense = (DenseOutput(np.array(nodes_t), np.array(nodes_y), np.array(nodes_a))
+             if dense_output else None)
+    return NBodySolution(t_eval, output, gm.shape[0], steps, rejected, system.evaluations, dense)
+
+
+def planetary_perturbers(jd: float, bodies: tuple[str, ...] = PERTURBERS
+                         ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The Sun and the major planets as massive bodies for :func:`propagate`.
+
+    The states are heliocentric at ``jd``, with the Sun at rest at the origin: an
+    inertial frame, so test particles given heliocentric states at the same epoch
+    can be integrated with them directly, and heliocentric results read back with
+    :meth:`NBodySolution.relative_to`. Planet states come from the mean elements
+    of :mod:`planetary_ephemeris`, so the perturbations are approximate at the
+    level of those elements.
+
+    Parameters
+    ----------
+    jd : float
+        Julian Date (TDB) of the initial states; integration times are then in days.
+    bodies : tuple of str
+        Planets to include, from :data:`PERTURBERS`.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(1 + len(bodies), 6)`` states in AU and AU day⁻¹ (J2000 ecliptic) and the
+        matching GM values in AU³ day⁻², the Sun first.
+    """
+    states = np.zeros((1 + len(bodies), 6))
+    gm = np.empty(1 + len(bodies))
+    gm[0] = GM_SUN_AU_DAY
+    for row, body in enumerate(bodies, start=1):
+        states[row] = planet_states(body, jd)
+        gm[row] = GM_SUN_AU_DAY / MASS_RATIOS[body]
+    return states, gm
@@ -0,0 +1,503 @@
+"""
+Orbit determination from optical tracklets.
+
+- :func:`gauss_initial_orbits` – Gauss's method: candidate heliocentric states at
+  the middle of three observations
+- :func:`differential_correction` – weighted least-squares refinement of those
+  states against every observation of their tracklet
+- :func:`determine_orbits` – both, for a batch of tracklets
+
+A tracklet is a short series of astrometric positions of one object: right
+ascension and declination on the J2000 equator, in degrees, seen from the
+geocentre (or from an observatory, given its geocentric offset). Epochs are
+Julian Dates (TDB); distances are in AU and times in days, so ``gm`` defaults to
+the Gaussian :data:`~app.services.calculations.planetary_ephemeris.GM_SUN_AU_DAY`.
+
+Thousands of tracklets are fitted in one call. Tracklets are grouped by length,
+each group is padded to a common length with zero-weight rows (so one long
+tracklet does not widen every short one), Gauss's eighth-degree polynomial is solved
+for every tracklet with one batched companion-matrix eigenvalue call, and every
+candidate root is refined at once: each Levenberg–Marquardt step propagates all
+candidate states with :func:`~app.services.calculations.orbital_mechanics.propagate_universal`,
+forms the analytic Jacobians and solves a stack of 6×6 normal equations.
+Candidates that have converged drop out of the active set.
+"""
+
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.core.constants import AU_M, EPSILON_RAD
+from app.models.coordinates_systems import Plane
+from app.services.calculations import planetary_ephemeris
+from app.services.calculations.orbital_elements import state_to_elements
+from app.services.calculations.orbital_mechanics import propagate_universal
+from app.utils.math_helpers import wrap_angle_rad
+
+GM_SUN_AU_DAY = planetary_ephemeris.GM_SUN_AU_DAY
+
+# Speed of light [AU d⁻¹]
+C_AU_PER_DAY = 299_792_458.0 * 86_400.0 / AU_M
+
+# Astrometric uncertainty assumed when none is given, in arcseconds.
+DEFAULT_SIGMA_ARCSEC = 1.0
+
+DEFAULT_MAX_ITERATIONS = 50
+
+# A fit has converged once a step changes χ² by less than this fraction of the
+# number of observations (or of χ² itself, if larger).
+CONVERGENCE_TOLERANCE = 1e-8
+
+# Levenberg–Marquardt damping: start, growth on a rejected step, and the value
+# past which a candidate is abandoned.
+_INITIAL_DAMPING = 1e-3
+_DAMPING_FACTOR = 10.0
+_MAX_DAMPING = 1e12
+
+_ARCSEC = np.pi / (180.0 * 3600.0)
+
+
+class Tracklets(NamedTuple):
+    """A batch of tracklets padded to a common length."""
+    jd: np.ndarray  # (B, N) epochs, sorted within each tracklet
+    directions: np.ndarray  # (B, N, 3) observed unit vectors, J2000 equatorial
+    observer: np.ndarray  # (B, N, 3) heliocentric observer positions in AU
+    weight: np.ndarray  # (B, N) 1/σ² in rad⁻²; zero on padding rows
+    count: np.ndarray  # (B,) observations per tracklet
+
+
+class InitialOrbits(NamedTuple):
+    tracklet: np.ndarray  # (C,) index of the tracklet of each candidate
+    epoch: np.ndarray  # (C,) epoch of the state, the middle observation
+    state: np.ndarray  # (C, 6) heliocentric position and velocity, J2000 equatorial
+
+
+class Correction(NamedTuple):
+    state: np.ndarray  # (C, 6) refined states
+    covariance: np.ndarray  # (C, 6, 6) inverse of the undamped normal matrix
+    chi2: np.ndarray  # (C,) weighted sum of squared residuals; inf if the fit failed
+    residuals: np.ndarray  # (C, N, 2) (Δα cos δ, Δδ) in radians
+    converged: np.ndarray  # (C,) bool
+    iterations: np.ndarray  # (C,) Levenberg–Marquardt steps taken
+
+
+class OrbitFit(NamedTuple):
+    epoch: np.ndarray  # (B,) Julian Date (TDB) of the state
+    state: np.ndarray  # (B, 6) AU and AU/day, heliocentric J2000 equatorial
+    elements: np.ndarray  # (B, 6) in ELEMENT_NAMES order, heliocentric J2000 ecliptic
+    covariance: np.ndarray  # (B, 6, 6) of the state
+    rms_arcsec: np.ndarray  # (B,) root mean square of the residuals
+    converged: np.ndarray  # (B,) bool
+    iterations: np.ndarray  # (B,) Levenberg–Marquardt steps taken
+
+
+def pack_tracklets(jd: Sequence[ArrayLike], ra: Sequence[ArrayLike], dec: Sequence[ArrayLike],
+                   sigma: Sequence[ArrayLike] | None = None,
+                   observer: Sequence[ArrayLike] | None = None) -> Tracklets:
+    """
+    Validate ragged tracklets and pad them into one :class:`Tracklets` batch.
+
+    Parameters
+    ----------
+    jd, ra, dec : sequence of array_like
+        One array per tracklet: epochs (TDB), right ascensions and declinations
+        in degrees.
+    sigma : sequence of array_like, optional
+        Astrometric uncertainty per tracklet (shared or per observation) in
+        arcseconds; :data:`DEFAULT_SIGMA_ARCSEC` when omitted.
+    observer : sequence of array_like, optional
+        ``(n, 3)`` geocentric observatory positions in AU (J2000 equatorial) per
+        tracklet, or ``None`` entries for the geocentre.
+
+    Returns
+    -------
+    Tracklets
+
+    Raises
+    ------
+    ValueError
+        If a tracklet has fewer than three observations, mismatched lengths, a
+        declination outside ±90°, a non-positive sigma, or no time span.
+    """
+    if not len(jd) == len(ra) == len(dec):
+        raise ValueError("jd, ra and dec need one entry per tracklet.")
+    if not len(jd):
+        raise ValueError("At least one tracklet is required.")
+    counts = np.array([np.size(times) for times in jd])
+    if (counts < 3).any():
+        raise ValueError(f"Tracklet {int(np.argmax(counts < 3))} has fewer than three "
+                         "observations.")
+    batch, width = counts.size, int(counts.max())
+    mask = np.arange(width) < counts[:, None]
+
+    def pad(columns, name, fill=0.0):
+        if any(np.size(column) != count for column, count in zip(columns, counts)):
+            raise ValueError(f"{name} needs one value per observation.")
+        out = np.full((batch, width), fill)
+        out[mask] = np.concatenate([np.ravel(column) for column in columns])
+        return out
+
+    times = pad(jd, "jd")
+    # Padding repeats the first epoch, so the ephemeris is never asked for JD 0.
+    times = np.where(mask, times, times[:, :1])
+    order = np.argsort(np.where(mask, times, np.inf), axis=1, kind="stable")
+    rows = np.arange(batch)[:, None]
+    times = times[rows, order]
+    if (times[np.arange(batch), counts - 1] <= times[:, 0]).any():
+        raise ValueError("Every tracklet must span a non-zero time interval.")
+
+    alpha = np.radians(pad(ra, "ra"))[rows, order]
+    delta = np.radians(pad(dec, "dec"))[rows, order]
+    if (np.abs(delta) > np.pi / 2).any():
+        raise ValueError("Declinations must be within ±90°.")
+    directions = np.stack([np.cos(delta) * np.cos(alpha), np.cos(delta) * np.sin(alpha),
+                           np.sin(delta)], axis=-1)
+
+    if sigma is None:
+        sigmas = np.full((batch, width), DEFAULT_SIGMA_ARCSEC)
+    else:
+        sigmas = pad([np.broadcast_to(s, (n,)) for s, n in zip(sigma, counts)], "sigma", 1.0)
+        sigmas = sigmas[rows, order]
+        if (sigmas <= 0).any():
+            raise ValueError("Astrometric uncertainties must be positive.")
+    weight = np.where(mask, 1.0 / (sigmas * _ARCSEC) ** 2, 0.0)
+
+    earth = planetary_ephemeris.heliocentric_position("earth", times.ravel(), Plane.EQUATORIAL)
+    positions = earth.reshape(batch, width, 3)
+    if observer is not None:
+        offsets = np.zeros((batch, width, 3))
+        for index, (offset, count) in enumerate(zip(observer, counts)):
+            if offset is not None:
+                offset = np.asarray(offset, dtype=np.float64)
+                if offset.shape != (count, 3):
+                    raise ValueError("observer needs one (x, y, z) offset per observation.")
+                offsets[index, :count] = offset
+        positions = positions + offsets[rows, order]
+    return Tracklets(times, directions, positions, weight, counts)
+
+
+def gauss_initial_orbits(tracklets: Tracklets, gm: float = GM_SUN_AU_DAY) -> InitialOrbits:
+    """
+    Candidate orbits by Gauss's method (Curtis 2014, Algorithm 5.5).
+
+    The first, last and most central observations of each tracklet fix the
+    geometry. Every positive real root of Gauss's distance polynomial that puts
+    the object in front of the observer yields a candidate, so one tracklet can
+    give up to three; the least-squares fit decides between them.
+
+    Parameters
+    ----------
+    tracklets : Tracklets
+        The batch, as returned by :func:`pack_tracklets`.
+    gm : float
+        Gravitational parameter of the Sun in AU³ d⁻².
+
+    Returns
+    -------
+    InitialOrbits
+        Candidates grouped by tracklet; tracklets without a root have none.
+    """
+    jd, rho_hat, observer = tracklets.jd, tracklets.directions, tracklets.observer
+    batch = jd.shape[0]
+    rows = np.arange(batch)
+    first, last = np.zeros(batch, dtype=np.int64), tracklets.count - 1
+    interior = np.arange(jd.shape[1]) < last[:, None]
+    interior[:, 0] = False
+    middle = np.argmin(np.where(interior, np.abs(jd - 0.5 * (jd[:, :1] + jd[rows, last, None])),
+                                np.inf), axis=1)
+    picks = np.stack([first, middle, last], axis=1)
+    t = jd[rows[:, None], picks]
+    u = rho_hat[rows[:, None], picks]
+    big_r = observer[rows[:, None], picks]
+
+    tau1, tau3 = t[:, 0] - t[:, 1], t[:, 2] - t[:, 1]
+    tau = tau3 - tau1
+    p = np.stack([np.cross(u[:, 1], u[:, 2]), np.cross(u[:, 0], u[:, 2]),
+                  np.cross(u[:, 0], u[:, 1])], axis=1)
+    d0 = np.einsum("bi,bi->b", u[:, 0], p[:, 0])
+    d = np.einsum("bri,bpi->brp", big_r, p)  # d[:, i, j] = R_i · p_j
+    e_coef = np.einsum("bi,bi->b", big_r[:, 1], u[:, 1])
+    r2_sq = np.einsum("bi,bi->b", big_r[:, 1], big_r[:, 1])
+
+    # r⁸ + a r⁶ + b r³ + c = 0, as the eigenvalues of its companion matrices.
+    # Great-circle motion gives d0 = 0; those tracklets end up non-finite and
+    # are skipped below.
+    companion = np.zeros((batch, 8, 8))
+    companion[:, 1:, :-1] = np.eye(7)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a_coef = (-d[:, 0, 1] * tau3 / tau + d[:, 1, 1] + d[:, 2, 1] * tau1 / tau) / d0
+        b_coef = (d[:, 0, 1] * (tau3 ** 2 - tau ** 2) * tau3 / tau
+                  + d[:, 2, 1] * (tau ** 2 - tau1 ** 2) * tau1 / tau) / (6.0 * d0)
+        companion[:, 0, 1] = a_coef ** 2 + 2.0 * a_coef * e_coef + r2_sq
+        companion[:, 0, 4] = 2.0 * gm * b_coef * (a_coef + e_coef)
+        companion[:, 0, 7] = (gm * b_coef) ** 2
+    solvable = np.isfinite(companion).all(axis=(1, 2))
+    roots = np.full((batch, 8), np.nan, dtype=np.complex128)
+    roots[solvable] = np.linalg.eigvals(companion[solvable])
+    r = roots.real
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho2 = a_coef[:, None] + gm * b_coef[:, None] / r ** 3
+        valid = (np.abs(roots.imag) <= 1e-8 * np.abs(roots)) & (r > 0) & (rho2 > 0)
+
+    tracklet, root = np.nonzero(valid)
+    r = r[tracklet, root]
+    rho2 = rho2[tracklet, root]
+    d, d0, u, big_r = d[tracklet], d0[tracklet], u[tracklet], big_r[tracklet]
+    tau1, tau3, tau = tau1[tracklet], tau3[tracklet], tau[tracklet]
+
+    r3 = r ** 3
+    rho1 = ((6.0 * (d[:, 2, 0] * tau1 / tau3 + d[:, 1, 0] * tau / tau3) * r3
+             + gm * d[:, 2, 0] * (tau ** 2 - tau1 ** 2) * tau1 / tau3)
+            / (6.0 * r3 + gm * (tau ** 2 - tau3 ** 2)) - d[:, 0, 0]) / d0
+    rho3 = ((6.0 * (d[:, 0, 2] * tau3 / tau1 - d[:, 1, 2] * tau / tau1) * r3
+             + gm * d[:, 0, 2] * (tau ** 2 - tau3 ** 2) * tau3 / tau1)
+            / (6.0 * r3 + gm * (tau ** 2 - tau1 ** 2)) - d[:, 2, 2]) / d0
+    r1 = big_r[:, 0] + rho1[:, None] * u[:, 0]
+    r2 = big_r[:, 1] + rho2[:, None] * u[:, 1]
+    r3_vec = big_r[:, 2] + rho3[:, None] * u[:, 2]
+
+    # Truncated Lagrange coefficients around the middle epoch.
+    f1 = 1.0 - 0.5 * gm * tau1 ** 2 / r3
+    f3 = 1.0 - 0.5 * gm * tau3 ** 2 / r3
+    g1 = tau1 - gm * tau1 ** 3 / (6.0 * r3)
+    g3 = tau3 - gm * tau3 ** 3 / (6.0 * r3)
+    v2 = (f1[:, None] * r3_vec - f3[:, None] * r1) / (f1 * g3 - f3 * g1)[:, None]
+
+    epoch = tracklets.jd[tracklet, middle[tracklet]]
+    return InitialOrbits(tracklet, epoch, np.concatenate([r2, v2], axis=1))
+
+
+def _observe(state: np.ndarray, epoch: np.ndarray, tracklets: Tracklets, index: np.ndarray,
+             gm: float):
+    """Residuals (rad) and their Jacobian for candidates of the tracklets in ``index``."""
+    dt = tracklets.jd[index] - epoch[:, None]
+    # One light-time iteration from the geometric distance leaves an error of
+    # (v/c)·τ, well under a second, and keeps χ² a function of the state alone.
+    geometric = propagate_universal(state[:, None, :3], state[:, None, 3:], dt, gm).position
+    light_time = np.linalg.norm(geometric - tracklets.observer[index], axis=-1) / C_AU_PER_DAY
+    propagated = propagate_universal(state[:, None, :3], state[:, None, 3:], dt - light_time, gm,
+                                     partials=True)
+    rho = propagated.position - tracklets.observer[index]
+    x, y, z = rho[..., 0], rho[..., 1], rho[..., 2]
+    planar_sq = x * x + y * y
+    planar = np.sqrt(planar_sq)
+    distance = np.sqrt(planar_sq + z * z)
+
+    observed = tracklets.directions[index]
+    obs_dec = np.arcsin(np.clip(observed[..., 2], -1.0, 1.0))
+    residuals = np.stack([
+        wrap_angle_rad(np.arctan2(observed[..., 1], observed[..., 0]) - np.arctan2(y, x),
+                       signed=True) * np.cos(obs_dec),
+        obs_dec - np.arctan2(z, planar),
+    ], axis=-1)
+
+    # ∂(α cos δ, δ)/∂ρ, then through the state transition matrix.
+    zeros = np.zeros_like(x)
+    d_angles = np.stack([
+        np.stack([-y, x, zeros], axis=-1) / (planar * distance)[..., None],
+        np.stack([-x * z, -y * z, planar_sq], axis=-1) / (distance ** 2 * planar)[..., None],
+    ], axis=-2)
+    jacobian = np.concatenate([d_angles @ propagated.dr_dr0, d_angles @ propagated.dr_dv0],
+                              axis=-1)
+    return residuals, jacobian
+
+
+def differential_correction(tracklets: Tracklets, initial: InitialOrbits,
+                            gm: float = GM_SUN_AU_DAY,
+                            max_iterations: int = DEFAULT_MAX_ITERATIONS,
+                            tol: float = CONVERGENCE_TOLERANCE) -> Correction:
+    """
+    Refine candidate states by Levenberg–Marquardt weighted least squares.
+
+    Residuals are ``(Δα cos δ, Δδ)`` against every observation of the candidate's
+    tracklet, with the object's position taken at the light-emission epoch.
+    Their Jacobian with respect to the epoch state is the analytic
+    ``∂(α cos δ, δ)/∂ρ`` times the two-body state transition matrix; the normal
+    equations of all active candidates are stacked into one ``(C, 6, 6)`` solve.
+
+    Parameters
+    ----------
+    tracklets : Tracklets
+        The observations.
+    initial : InitialOrbits
+        Starting states, e.g. from :func:`gauss_initial_orbits`.
+    gm : float
+        Gravitational parameter of the Sun in AU³ d⁻².
+    max_iterations : int
+        Step limit per candidate.
+    tol : float
+        Convergence threshold, see :data:`CONVERGENCE_TOLERANCE`.
+
+    Returns
+    -------
+    Correction
+        One row per candidate.
+    """
+    state = initial.state.copy()
+    count = initial.tracklet.size
+    weight = tracklets.weight[initial.tracklet]
+    n_obs = tracklets.count[initial.tracklet].astype(np.float64)
+    damping = np.full(count, _INITIAL_DAMPING)
+    converged = np.zeros(count, dtype=bool)
+    iterations = np.zeros(count, dtype=np.int64)
+
+    def evaluate(active, states):
+        with np.errstate(all="ignore"):
+            residuals, jacobian = _observe(states, initial.epoch[active], tracklets,
+                                           initial.tracklet[active], gm)
+            chi2 = np.einsum("cn,cnk,cnk->c", weight[active], residuals, residuals)
+        chi2[~np.isfinite(jacobian).all(axis=(1, 2, 3))] = np.inf
+        chi2[np.isnan(chi2)] = np.inf
+        return residuals, jacobian, chi2
+
+    residuals, jacobian, chi2 = evaluate(np.arange(count), state)
+    active = np.nonzero(np.isfinite(chi2))[0]
+    for _ in range(max_iterations):
+        if active.size == 0:
+            break
+        w = weight[active]
+        normal = np.einsum("cn,cnki,cnkj->cij", w, jacobian[active], jacobian[active])
+        gradient = np.einsum("cn,cnki,cnk->ci", w, jacobian[active], residuals[active])
+        damped = normal + np.einsum("c,ci,ij->cij", damping[active],
+                                    np.einsum("cii->ci", normal), np.eye(6))
+        trial = state[active] + _batched(np.linalg.solve, damped, gradient[..., None])[..., 0]
+        iterations[active] += 1
+
+        t_residuals, t_jacobian, t_chi2 = evaluate(active, trial)
+        previous = chi2[active]
+        accept = t_chi2 < previous
+        # Either way round: near the minimum, rounding can reject a negligible step.
+        done = np.abs(previous - t_chi2) <= tol * np.maximum(previous, n_obs[active])
+
+        accepted = active[accept]
+        state[accepted] = trial[accept]
+        chi2[accepted] = t_chi2[accept]
+        residuals[accepted] = t_residuals[accept]
+        jacobian[accepted] = t_jacobian[accept]
+        damping[accepted] = damping[accepted] / _DAMPING_FACTOR
+        damping[active[~accept]] *= _DAMPING_FACTOR
+        converged[active[done]] = True
+        active = active[~done & (damping[active] <= _MAX_DAMPING)]
+
+    normal = np.einsum("cn,cnki,cnkj->cij", weight, jacobian, jacobian)
+    covariance = np.full((count, 6, 6), np.nan)
+    finite = np.isfinite(chi2)
+    if finite.any():
+        covariance[finite] = _batched(np.linalg.inv, normal[finite])
+    return Correction(state, covariance, chi2, residuals, converged, iterations)
+
+
+def _batched(function, matrices: np.ndarray, *args: np.ndarray) -> np.ndarray:
+    """Apply a stacked linear-algebra ``function``; singular matrices give NaN rows."""
+    with np.errstate(all="ignore"):
+        try:
+            return function(matrices, *args)
+        except np.linalg.LinAlgError:
+            pass
+        results = []
+        for matrix, *rest in zip(matrices, *args):
+            try:
+                results.append(function(matrix, *rest))
+            except np.linalg.LinAlgError:
+                results.append(np.full(rest[0].shape if rest else matrix.shape, np.nan))
+        return np.stack(results)
+
+
+def _ecliptic(vectors: np.ndarray) -> np.ndarray:
+    """Rotate ``(..., 3)`` J2000 equatorial vectors onto the J2000 ecliptic."""
+    cos_eps, sin_eps = np.cos(EPSILON_RAD), np.sin(EPSILON_RAD)
+    x, y, z = vectors[..., 0], vectors[..., 1], vectors[..., 2]
+    return np.stack([x, cos_eps * y + sin_eps * z, -sin_eps * y + cos_eps * z], axis=-1)
+
+
+def determine_orbits(jd: Sequence[ArrayLike], ra: Sequence[ArrayLike], dec: Sequence[ArrayLike],
+                     sigma: Sequence[ArrayLike] | None = None,
+                     observer: Sequence[ArrayLike] | None = None,
+                     gm: float = GM_SUN_AU_DAY,
+                     max_iterations: int = DEFAULT_MAX_ITERATIONS) -> OrbitFit:
+    """
+    Fit heliocentric orbits to a batch of independent tracklets.
+
+    Gauss's method supplies one to three candidate states per tracklet; they are
+    refined by :func:`differential_correction`, one call per group of tracklets
+    of similar length, and the converged candidate with the lowest χ² is kept.
+
+    Parameters
+    ----------
+    jd, ra, dec, sigma, observer :
+        The tracklets, as in :func:`pack_tracklets`.
+    gm : float
+        Gravitational parameter of the Sun in AU³ d⁻².
+    max_iterations : int
+        Least-squares step limit per candidate.
+
+    Returns
+    -------
+    OrbitFit
+        One row per tracklet, in input order. Tracklets without an initial orbit
+        (e.g. great-circle motion that leaves Gauss's method degenerate) have NaN
+        states and ``converged`` False.
+    """
+    if not len(jd) == len(ra) == len(dec):
+        raise ValueError("jd, ra and dec need one entry per tracklet.")
+    if not len(jd):
+        raise ValueError("At least one tracklet is required.")
+    counts = np.array([np.size(times) for times in jd])
+    if (counts < 3).any():
+        raise ValueError(f"Tracklet {int(np.argmax(counts < 3))} has fewer than three "
+                         "observations.")
+
+    # Groups of tracklets within a factor of two in length, padded and fitted
+    # separately: padding costs at most as much as the observations themselves.
+    width = np.ceil(np.log2(counts)).astype(np.int64)
+    groups = [np.nonzero(width == w)[0] for w in np.unique(width)]
+    fits = []
+    for group in groups:
+        picked = [None if values is None else [values[k] for k in group]
+                  for values in (jd, ra, dec, sigma, observer)]
+        fits.append(_fit_tracklets(pack_tracklets(*picked), gm, max_iterations))
+    inverse = np.argsort(np.concatenate(groups))
+    return OrbitFit(*(np.concatenate(columns)[inverse] for columns in zip(*fits)))
+
+
+def _fit_tracklets(tracklets: Tracklets, gm: float, max_iterations: int) -> OrbitFit:
+    """:func:`determine_orbits` for one packed batch."""
+    batch = tracklets.count.size
+    initial = gauss_initial_orbits(tracklets, gm)
+    correction = differential_correction(tracklets, initial, gm, max_iterations)
+    chi2, converged = correction.chi2, correction.converged
+
+    # Best candidate per tracklet: converged first, then the lowest χ².
+    order = np.lexsort((chi2, ~converged, initial.tracklet))
+    tracklet, first = np.unique(initial.tracklet[order], return_index=True)
+    best = order[first]
+
+    fit = OrbitFit(
+        epoch=tracklets.jd[np.arange(batch), tracklets.count // 2].copy(),
+        state=np.full((batch, 6), np.nan),
+        elements=np.full((batch, 6), np.nan),
+        covariance=np.full((batch, 6, 6), np.nan),
+        rms_arcsec=np.full(batch, np.nan),
+        converged=np.zeros(batch, dtype=bool),
+        iterations=np.zeros(batch, dtype=np.int64),
+    )
+    fit.epoch[tracklet] = initial.epoch[best]
+    fit.converged[tracklet] = converged[best]
+    fit.iterations[tracklet] = correction.iterations[best]
+    finite = np.isfinite(chi2[best])
+    usable, best = tracklet[finite], best[finite]
+    fit.state[usable] = correction.state[best]
+    fit.covariance[usable] = correction.covariance[best]
+
+    # Unweighted RMS over both coordinates; padding rows hold zero weight.
+    squares = np.einsum("cnk,cnk->cn", correction.residuals[best], correction.residuals[best])
+    squares[tracklets.weight[usable] == 0] = 0.0
+    fit.rms_arcsec[usable] = np.sqrt(squares.sum(axis=1)
+                                     / (2.0 * tracklets.count[usable])) / _ARCSEC
+
+    if usable.size:
+        fit.elements[usable] = state_to_elements(_ecliptic(fit.state[usable, :3]),
+                                                 _ecliptic(fit.state[usable, 3:]), gm)
+    return fit
@@ -0,0 +1,398 @@
+"""
+Keplerian elements ↔ Cartesian state vectors.
+
+Converts between classical orbital elements and position/velocity, and propagates
+whole catalogs of two-body orbits to grids of epochs:
+
+- :func:`elements_to_state` – (a, e, i, Ω, ω, M) → (x, y, z, vx, vy, vz)
+- :func:`state_to_elements` – the inverse conversion
+- :func:`propagate_elements` – (n_objects, n_epochs, 6) ephemeris arrays
+- :func:`elements_jacobian` – ∂state/∂elements, for linear covariance mapping
+- :func:`propagate_elements_with_uncertainty` – propagated state covariances
+
+Element arrays are laid out as ``[..., 6]`` in the order of :data:`ELEMENT_NAMES`.
+Angles are in radians. Lengths, times and ``gm`` must use one consistent unit
+system; the default ``gm`` is :data:`~app.services.calculations.orbital_mechanics.GM_SUN`
+in SI units, so ``a`` is in metres, epochs in seconds and velocities in m s⁻¹.
+
+Elliptic (0 <= e < 1, a > 0) and hyperbolic (e > 1, a < 0) orbits are supported.
+Parabolic orbits have no finite semi-major axis and are rejected.
+"""
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.services.calculations import uncertainty
+from app.services.calculations.orbital_mechanics import (
+    GM_SUN,
+    mean_anomaly_from_true,
+    true_anomaly_from_mean,
+)
+from app.services.calculations.uncertainty import (
+    DEFAULT_SAMPLES,
+    MONTE_CARLO_CHUNK_POINTS,
+    Estimate,
+    Uncertainty,
+)
+
+ELEMENT_NAMES = ("a", "e", "i", "raan", "argp", "mean_anomaly")
+
+# Objects propagated per block, bounding the temporaries to a few of these rows
+# times the number of epochs.
+PROPAGATION_CHUNK_OBJECTS = 1024
+
+# Below this |h_xy| / |h| the orbit is treated as equatorial and Ω is set to 0.
+_EQUATORIAL_TOLERANCE = 1e-15
+
+# Below this eccentricity the pericentre direction is numerical noise, so the
+# current position is taken as pericentre (ν = 0).
+_CIRCULAR_TOLERANCE = 1e-11
+
+
+def _validate_conic(a: np.ndarray, e: np.ndarray) -> None:
+    if np.any(e < 0.0):
+        raise ValueError("Eccentricity must be non-negative.")
+    if np.any(e == 1.0):
+        raise ValueError("Parabolic orbits (e = 1) have no semi-major axis.")
+    if np.any((e < 1.0) & (a <= 0.0)) or np.any((e > 1.0) & (a >= 0.0)):
+        raise ValueError("Semi-major axis must be positive for e < 1 and negative for e > 1.")
+
+
+def _perifocal_basis(i: np.ndarray, raan: np.ndarray, argp: np.ndarray):
+    """Unit vectors P (towards pericentre) and Q (90° ahead in the orbit plane)."""
+    cos_o, sin_o = np.cos(raan), np.sin(raan)
+    cos_w, sin_w = np.cos(argp), np.sin(argp)
+    cos_i, sin_i = np.cos(i), np.sin(i)
+
+    p = (cos_o * cos_w - sin_o * sin_w * cos_i,
+         sin_o * cos_w + cos_o * sin_w * cos_i,
+         sin_w * sin_i)
+    q = (-cos_o * sin_w - sin_o * cos_w * cos_i,
+         -sin_o * sin_w + cos_o * cos_w * cos_i,
+         cos_w * sin_i)
+    return p, q
+
+
+def elements_to_state(a: ArrayLike, e: ArrayLike, i: ArrayLike, raan: ArrayLike,
+                      argp: ArrayLike, mean_anomaly: ArrayLike, gm: float = GM_SUN,
+                      out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Convert Keplerian elements to Cartesian position and velocity.
+
+    All element arguments are broadcast against each other, so a column of
+    per-object elements (shape ``(n, 1)``) combined with a grid of mean anomalies
+    (shape ``(n, m)``) yields ``(n, m, 6)`` states.
+
+    Parameters
+    ----------
+    a : array_like
+        Semi-major axis (negative for hyperbolic orbits).
+    e : array_like
+        Eccentricity.
+    i, raan, argp : array_like
+        Inclination, longitude of the ascending node and argument of pericentre, in radians.
+    mean_anomaly : array_like
+        Mean anomaly in radians.
+    gm : float
+        Standard gravitational parameter (μ = GM) of the central body.
+    out : numpy.ndarray, optional
+        Preallocated float64 array of shape ``broadcast_shape + (6,)``.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``[..., 6]`` array of (x, y, z, vx, vy, vz).
+    """
+    a, e, i, raan, argp, mean_anomaly = (np.asarray(v, dtype=np.float64)
+                                         for v in (a, e, i, raan, argp, mean_anomaly))
+    _validate_conic(a, e)
+
+    shape = np.broadcast_shapes(a.shape, e.shape, i.shape, raan.shape, argp.shape,
+                                mean_anomaly.shape)
+    if out is None:
+        out = np.empty(shape + (6,))
+    elif out.shape != shape + (6,):
+        raise ValueError(f"out must have shape {shape + (6,)}, got {out.shape}.")
+
+    nu = true_anomaly_from_mean(mean_anomaly, e)
+    cos_nu, sin_nu = np.cos(nu), np.sin(nu)
+
+    semi_latus = a * (1.0 - e * e)
+    radius = semi_latus / (1.0 + e * cos_nu)
+    speed_scale = np.sqrt(gm / semi_latus)
+
+    # In-plane (perifocal) coordinates.
+    x_pf, y_pf = radius * cos_nu, radius * sin_nu
+    vx_pf, vy_pf = -speed_scale * sin_nu, speed_scale * (e + cos_nu)
+
+    p, q = _perifocal_basis(i, raan, argp)
+    for axis in range(3):
+        np.multiply(x_pf, p[axis], out=out[..., axis])
+        out[..., axis] += y_pf * q[axis]
+        np.multiply(vx_pf, p[axis], out=out[..., axis + 3])
+        out[..., axis + 3] += vy_pf * q[axis]
+    return out
+
+
+def elements_jacobian(elements: ArrayLike, gm: float = GM_SUN) -> np.ndarray:
+    """
+    Partial derivatives of the Cartesian state with respect to the elements.
+
+    Every column is in closed form: ``a`` scales the orbit (r ∝ a, v ∝ |a|^-½),
+    ``M`` moves along it (∂/∂M = (1/n) d/dt), the three angles rotate it about
+    the node line, the pole and the orbit normal, and ``e`` reshapes it in its
+    plane at fixed ``a`` and ``M``.
+
+    Parameters
+    ----------
+    elements : array_like
+        ``[..., 6]`` elements ordered as :data:`ELEMENT_NAMES`.
+    gm : float
+        Standard gravitational parameter (μ = GM) of the central body.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``[..., 6, 6]`` Jacobians ∂(x, y, z, vx, vy, vz)/∂(a, e, i, Ω, ω, M).
+    """
+    return _state_and_jacobian(np.asarray(elements, dtype=np.float64), gm)[1]
+
+
+def _state_and_jacobian(elements: np.ndarray, gm: float):
+    a, e, i, raan, argp, mean_anomaly = np.moveaxis(elements, -1, 0)
+    state = elements_to_state(a, e, i, raan, argp, mean_anomaly, gm=gm)
+    position, velocity = state[..., :3], state[..., 3:]
+    jacobian = np.empty(elements.shape + (6,))
+
+    jacobian[..., :3, 0] = position / a[..., None]
+    jacobian[..., 3:, 0] = velocity / (-2.0 * a[..., None])
+
+    # Eccentricity: differentiate the perifocal state, with ∂ν/∂e at fixed M.
+    nu = true_anomaly_from_mean(mean_anomaly, e)
+    cos_nu, sin_nu = np.cos(nu), np.sin(nu)
+    one_minus_e2 = 1.0 - e * e
+    semi_latus = a * one_minus_e2
+    denominator = 1.0 + e * cos_nu
+    radius = semi_latus / denominator
+    speed_scale = np.sqrt(gm / semi_latus)
+    d_nu = sin_nu * (2.0 + e * cos_nu) / one_minus_e2
+    d_radius = (-2.0 * a * e - radius * (cos_nu - e * sin_nu * d_nu)) / denominator
+    d_speed_scale = speed_scale * e / one_minus_e2
+    d_perifocal = (
+        (d_radius * cos_nu - radius * sin_nu * d_nu,
+         d_radius * sin_nu + radius * cos_nu * d_nu),
+        (-d_speed_scale * sin_nu - speed_scale * cos_nu * d_nu,
+         d_speed_scale * (e + cos_nu) + speed_scale * (1.0 - sin_nu * d_nu)),
+    )
+    p, q = _perifocal_basis(i, raan, argp)
+    for axis in range(3):
+        jacobian[..., axis, 1] = d_perifocal[0][0] * p[axis] + d_perifocal[0][1] * q[axis]
+        jacobian[..., axis + 3, 1] = d_perifocal[1][0] * p[axis] + d_perifocal[1][1] * q[axis]
+
+    # The angles rotate the orbit: ∂x/∂θ = k × x about each rotation axis k.
+    zeros = np.zeros_like(raan)
+    node = np.stack([np.cos(raan), np.sin(raan), zeros], axis=-1)
+    pole = np.stack([zeros, zeros, zeros + 1.0], axis=-1)
+    normal = np.stack([np.sin(raan) * np.sin(i), -np.cos(raan) * np.sin(i), np.cos(i)],
+                      axis=-1)
+    for column, axis in ((2, node), (3, pole), (4, normal)):
+        jacobian[..., :3, column] = np.cross(axis, position)
+        jacobian[..., 3:, column] = np.cross(axis, velocity)
+
+    mean_motion = np.sqrt(gm / np.abs(a) ** 3)[..., None]
+    radius_cubed = np.linalg.norm(position, axis=-1)[..., None] ** 3
+    jacobian[..., :3, 5] = velocity / mean_motion
+    jacobian[..., 3:, 5] = -gm * position / (radius_cubed * mean_motion)
+    return state, jacobian
+
+
+def state_to_elements(position: ArrayLike, velocity: ArrayLike,
+                      gm: float = GM_SUN) -> np.ndarray:
+    """
+    Convert Cartesian position and velocity to Keplerian elements.
+
+    Parameters
+    ----------
+    position, velocity : array_like
+        ``[..., 3]`` arrays of position and velocity.
+    gm : float
+        Standard gravitational parameter (μ = GM) of the central body.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``[..., 6]`` array ordered as :data:`ELEMENT_NAMES`. Ω, ω and elliptic mean
+        anomalies are wrapped to [0, 2π). Ω is 0 for equatorial orbits, and circular
+        orbits place the pericentre at the current position (ν = 0).
+    """
+    r_vec = np.asarray(position, dtype=np.float64)
+    v_vec = np.asarray(velocity, dtype=np.float64)
+
+    r = np.linalg.norm(r_vec, axis=-1)
+    v2 = np.einsum("...k,...k->...", v_vec, v_vec)
+    r_dot_v = np.einsum("...k,...k->...", r_vec, v_vec)
+
+    h_vec = np.cross(r_vec, v_vec)
+    h = np.linalg.norm(h_vec, axis=-1)
+    h_xy = np.hypot(h_vec[..., 0], h_vec[..., 1])
+
+    e_vec = ((v2 - gm / r)[..., None] * r_vec - r_dot_v[..., None] * v_vec) / gm
+    e = np.linalg.norm(e_vec, axis=-1)
+    a = 1.0 / (2.0 / r - v2 / gm)
+    i = np.arctan2(h_xy, h_vec[..., 2])
+
+    equatorial = h_xy <= _EQUATORIAL_TOLERANCE * h
+    raan = np.where(equatorial, 0.0, np.arctan2(h_vec[..., 0], -h_vec[..., 1]))
+
+    # Argument of latitude, measured in the orbit plane from the node line.
+    node = np.stack([np.cos(raan), np.sin(raan), np.zeros_like(raan)], axis=-1)
+    in_plane = np.cross(h_vec / h[..., None], node)
+    u = np.arctan2(np.einsum("...k,...k->...", r_vec, in_plane),
+                   np.einsum("...k,...k->...", r_vec, node))
+
+    semi_latus = h * h / gm
+    nu = np.where(e < _CIRCULAR_TOLERANCE, 0.0,
+                  np.arctan2(h * r_dot_v / gm, semi_latus - r))
+
+    two_pi = 2.0 * np.pi
+    mean_anomaly = mean_anomaly_from_true(nu, e)
+    mean_anomaly = np.where(e < 1.0, np.remainder(mean_anomaly, two_pi), mean_anomaly)
+
+    return np.stack([a, e, i, np.remainder(raan, two_pi), np.remainder(u - nu, two_pi),
+                     mean_anomaly], axis=-1)
+
+
+def propagate_elements(elements: ArrayLike, epoch: ArrayLike, epochs: ArrayLike,
+                       gm: float = GM_SUN, out: np.ndarray | None = None,
+                       chunk_objects: int = PROPAGATION_CHUNK_OBJECTS) -> np.ndarray:
+    """
+    Propagate many two-body orbits to many epochs at once.
+
+    The mean anomaly advances as ``M(t) = M₀ + n (t - t₀)`` with the mean motion
+    ``n = sqrt(μ / |a|³)``; every (object, epoch) pair is then converted with
+    :func:`elements_to_state`. Objects are processed in blocks of ``chunk_objects``
+    written straight into ``out``, so memory stays bounded and the cost grows
+    linearly with both the number of objects and the number of epochs.
+
+    Parameters
+    ----------
+    elements : array_like
+        ``(n_objects, 6)`` elements ordered as :data:`ELEMENT_NAMES`.
+    epoch : array_like
+        Epoch of the elements, a scalar or one value per object.
+    epochs : array_like
+        ``(n_epochs,)`` output epochs, in the same time unit as ``gm``.
+    gm : float
+        Standard gravitational parameter (μ = GM) of the central body.
+    out : numpy.ndarray, optional
+        Preallocated float64 array of shape ``(n_objects, n_epochs, 6)``.
+    chunk_objects : int
+        Number of objects converted per block.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n_objects, n_epochs, 6)`` array of (x, y, z, vx, vy, vz).
+    """
+    elements = np.asarray(elements, dtype=np.float64)
+    if elements.ndim != 2 or elements.shape[1] != 6:
+        raise ValueError(f"Expected an (n_objects, 6) element array, got {elements.shape}.")
+    epochs = np.asarray(epochs, dtype=np.float64).reshape(-1)
+    n_objects, n_epochs = elements.shape[0], epochs.shape[0]
+    epoch = np.broadcast_to(np.asarray(epoch, dtype=np.float64), (n_objects,))
+    _validate_conic(elements[:, 0], elements[:, 1])
+
+    if out is None:
+        out = np.empty((n_objects, n_epochs, 6))
+    elif out.shape != (n_objects, n_epochs, 6):
+        raise ValueError(f"out must have shape {(n_objects, n_epochs, 6)}, got {out.shape}.")
+
+    for start in range(0, n_objects, chunk_objects):
+        block = elements[start:start + chunk_objects, :, None]
+        a, e, i, raan, argp, mean_anomaly = block.transpose(1, 0, 2)
+        mean_motion = np.sqrt(gm / np.abs(a) ** 3)
+        elapsed = epochs[None, :] - epoch[start:start + chunk_objects, None]
+        elements_to_state(a, e, i, raan, argp, mean_anomaly + mean_motion * elapsed,
+                          gm=gm, out=out[start:start + chunk_objects])
+    return out
+
+
+def propagate_elements_with_uncertainty(elements: ArrayLike, covariance: ArrayLike,
+                                        epoch: ArrayLike, epochs: ArrayLike,
+                                        gm: float = GM_SUN,
+                                        method: Uncertainty = Uncertainty.LINEAR,
+                                        samples: int = DEFAULT_SAMPLES, seed=None,
+                                        chunk_points: int = MONTE_CARLO_CHUNK_POINTS
+                                        ) -> Estimate:
+    """
+    :func:`propagate_elements` for uncertain elements.
+
+    In linear mode the element covariance is advanced exactly, only the mean
+    anomaly drifting (∂M/∂a = -3n(t - t₀)/2a), and mapped to the state with
+    :func:`elements_jacobian`. In Monte Carlo mode ``samples`` element sets are
+    drawn per object and propagated together by :func:`propagate_elements`, in
+    blocks of about ``chunk_points`` states.
+
+    Parameters
+    ----------
+    elements : array_like
+        ``(n_objects, 6)`` elements ordered as :data:`ELEMENT_NAMES`.
+    covariance : array_like
+        ``(6, 6)`` or ``(n_objects, 6, 6)`` covariance of the elements.
+    epoch, epochs, gm :
+        As for :func:`propagate_elements`.
+    method : Uncertainty, default Uncertainty.LINEAR
+        Linear or Monte Carlo propagation.
+    samples : int
+        Draws per object in Monte Carlo mode.
+    seed : int or numpy.random.Generator, optional
+        Seeds the Monte Carlo draws.
+    chunk_points : int
+        States propagated per Monte Carlo block.
+
+    Returns
+    -------
+    Estimate
+        ``(n_objects, n_epochs, 6)`` states (the sample mean in Monte Carlo mode)
+        and their ``(n_objects, n_epochs, 6, 6)`` covariances.
+
+    Raises
+    ------
+    ValueError
+        If the inputs are malformed, or a Monte Carlo draw is no longer a valid
+        conic (e.g. e < 0 around a near-circular orbit); propagate the state
+        with the universal variable in that case.
+    """
+    elements = np.asarray(elements, dtype=np.float64)
+    if elements.ndim != 2 or elements.shape[1] != 6:
+        raise ValueError(f"Expected an (n_objects, 6) element array, got {elements.shape}.")
+    covariance = uncertainty.check_covariance(covariance, elements.shape)
+    epochs = np.asarray(epochs, dtype=np.float64).reshape(-1)
+    n_objects = elements.shape[0]
+    epoch = np.broadcast_to(np.asarray(epoch, dtype=np.float64), (n_objects,))
+    _validate_conic(elements[:, 0], elements[:, 1])
+
+    if Uncertainty(method) == Uncertainty.LINEAR:
+        elapsed = epochs[None, :] - epoch[:, None]
+        mean_motion = np.sqrt(gm / np.abs(elements[:, 0]) ** 3)
+        drifted = np.repeat(elements[:, None, :], epochs.size, axis=1)
+        drifted[..., 5] += mean_motion[:, None] * elapsed
+        state, jacobian = _state_and_jacobian(drifted, gm)
+        # Φ = I + (∂M/∂a) e₅ e₀ᵀ, so J Φ only changes the semi-major axis column.
+        jacobian[..., 0] += (jacobian[..., 5] * (-1.5 * mean_motion / elements[:, 0])[:, None, None]
+                             * elapsed[..., None])
+        return Estimate(state, uncertainty.linear_covariance(jacobian, covariance[:, None]))
+
+    samples = uncertainty.check_samples(samples)
+    rng = np.random.default_rng(seed)
+    mean = np.empty((n_objects, epochs.size, 6))
+    spread = np.empty((n_objects, epochs.size, 6, 6))
+    rows = max(1, chunk_points // (samples * epochs.size))
+    for start in range(0, n_objects, rows):
+        block = slice(start, start + rows)
+        drawn = uncertainty.draw_samples(elements[block], covariance[block], samples, rng)
+        states = propagate_elements(drawn.reshape(-1, 6), np.repeat(epoch[block], samples),
+                                    epochs, gm=gm)
+        states = states.reshape(drawn.shape[:2] + (epochs.size, 6)).swapaxes(1, 2)
+        mean[block], spread[block] = uncertainty.sample_statistics(states)
+    return Estimate(mean, spread)
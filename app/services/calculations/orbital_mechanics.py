@@ -1,23 +1,35 @@
 """
 Orbital mechanics calculation service.
 
-Placeholder module for Keplerian orbit calculations:
+Keplerian orbit calculations:
 - Orbital period (Kepler's third law)
 - Orbital velocity (vis-viva equation)
 - Orbital energy
 - Eccentricity vector
-- True anomaly from mean anomaly (Kepler's equation)
+- True anomaly from mean anomaly (Kepler's equation), vectorized over NumPy arrays
+- Universal-variable propagation of Cartesian states, with its partial derivatives
+  and linear or Monte Carlo covariance propagation
 
 All physical constants use SI units unless otherwise noted.
 """
 
 import math
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+# Standard gravitational parameter for the Sun; defined with the other constants so
+# request models can use it without importing NumPy.
+from app.core.constants import GM_SUN
+from app.services.calculations import uncertainty
+from app.services.calculations.uncertainty import DEFAULT_SAMPLES, Estimate, Uncertainty
 
 # Gravitational constant [m³ kg⁻¹ s⁻²]
 G: float = 6.674_30e-11
 
-# Standard gravitational parameter for the Sun [m³ s⁻²]
-GM_SUN: float = 1.327_124_400_41e20
+# Standard gravitational parameter for the Earth [m³ s⁻²]
+GM_EARTH: float = 3.986_004_418e14
 
 
 def orbital_period(semi_major_axis: float, gm: float = GM_SUN) -> float:
@@ -58,3 +70,657 @@ def orbital_velocity(semi_major_axis: float, distance: float, gm: float = GM_SUN
         Orbital speed in m s⁻¹.
     """
     return math.sqrt(gm * (2.0 / distance - 1.0 / semi_major_axis))
+
+
+# ---------------------------------------------------------------------------
+# Kepler's equation
+# ---------------------------------------------------------------------------
+
+# Default absolute tolerance on the anomaly, in radians.
+KEPLER_TOLERANCE: float = 1e-14
+
+# Iteration cap for the Halley loops; the starters below converge in far fewer.
+KEPLER_MAX_ITERATIONS: int = 50
+
+
+def _halley(anomaly: np.ndarray, mean: np.ndarray, ecc: np.ndarray, hyperbolic: bool,
+            tol: float, max_iter: int) -> np.ndarray:
+    """
+    Refine ``anomaly`` in place with Halley steps until every element converges.
+
+    Only the still-active elements are evaluated on each pass, so converged
+    elements cost nothing. An element stops once its step is below ``tol`` or its
+    residual is at roundoff level: near e = 1 and M = 0 cancellation in f keeps
+    the steps above ``tol`` although the anomaly cannot get any better. Returns
+    the number of iterations used per element.
+    """
+    iterations = np.zeros(anomaly.shape, dtype=np.int64)
+    active = np.arange(anomaly.size)
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        x = anomaly[active]
+        e = ecc[active]
+        if hyperbolic:
+            # f(H) = e sinh H - H - M
+            f2 = e * np.sinh(x)
+            f = f2 - x - mean[active]
+            f1 = e * np.cosh(x) - 1.0
+        else:
+            # f(E) = E - e sin E - M
+            f2 = e * np.sin(x)
+            f = x - f2 - mean[active]
+            f1 = 1.0 - e * np.cos(x)
+        step = f / (f1 - 0.5 * f * f2 / f1)
+        anomaly[active] = x - step
+        iterations[active] += 1
+        moving = np.abs(step) > tol * np.maximum(1.0, np.abs(x))
+        moving &= np.abs(f) > tol * np.maximum(1.0, mean[active])
+        active = active[moving]
+
+    return iterations
+
+
+def _solve_elliptic(mean: np.ndarray, ecc: np.ndarray, tol: float, max_iter: int):
+    # Reduce to [-π, π] and solve for |M| in [0, π], where f is convex. Only reduce
+    # where needed: M + π - π would round small M to a multiple of ulp(π), an error
+    # that 1/(1 - e) amplifies near pericentre.
+    reduced = np.where(np.abs(mean) <= np.pi, mean,
+                       np.remainder(mean + np.pi, 2.0 * np.pi) - np.pi)
+    sign = np.where(reduced < 0.0, -1.0, 1.0)
+    m = np.abs(reduced)
+
+    # E = M + e sin E bounds the root by M + e; near pericentre of very eccentric
+    # orbits the cubic (6M)^(1/3) is the tighter bound. Both sit right of the root,
+    # so the Halley iteration approaches it monotonically.
+    anomaly = np.minimum(np.minimum(m + ecc, np.cbrt(6.0 * m)), np.pi)
+    iterations = _halley(anomaly, m, ecc, False, tol, max_iter)
+
+    return mean - reduced + sign * anomaly, iterations
+
+
+def _solve_hyperbolic(mean: np.ndarray, ecc: np.ndarray, tol: float, max_iter: int):
+    sign = np.where(mean < 0.0, -1.0, 1.0)
+    m = np.abs(mean)
+
+    # Large |M|: H ≈ ln(2M/e); small |M| near e = 1: H ≈ (6M/e)^(1/3); otherwise
+    # the linear term M/(e - 1) dominates. The smallest estimate is the closest.
+    with np.errstate(divide="ignore"):
+        anomaly = np.minimum(np.log(2.0 * m / ecc + 1.8),
+                             np.minimum(np.cbrt(6.0 * m / ecc), m / (ecc - 1.0)))
+    iterations = _halley(anomaly, m, ecc, True, tol, max_iter)
+
+    return sign * anomaly, iterations
+
+
+def eccentric_anomaly_from_mean(mean_anomaly: ArrayLike, eccentricity: ArrayLike,
+                                tol: float = KEPLER_TOLERANCE,
+                                max_iter: int = KEPLER_MAX_ITERATIONS,
+                                return_iterations: bool = False):
+    """
+    Solve Kepler's equation for arrays of (M, e) pairs without a Python-level loop.
+
+    The orbit type is chosen per element:
+
+    - elliptic (e < 1):   M = E - e sin E, returns the eccentric anomaly E
+    - parabolic (e = 1):  M = D + D³/3 (Barker), returns D = tan(ν/2) in closed form
+    - hyperbolic (e > 1): M = e sinh H - H, returns the hyperbolic anomaly H
+
+    Elliptic and hyperbolic elements start from a bracketing estimate and are
+    refined with Halley's method; each element stops iterating as soon as its
+    own step falls below ``tol``.
+
+    Parameters
+    ----------
+    mean_anomaly : array_like
+        Mean anomaly in radians (the parabolic mean anomaly for e = 1).
+    eccentricity : array_like
+        Eccentricity, ``e >= 0``. Broadcast against ``mean_anomaly``.
+    tol : float
+        Absolute convergence tolerance on the anomaly, relative once it exceeds 1.
+    max_iter : int
+        Maximum number of Halley iterations.
+    return_iterations : bool
+        Also return the number of iterations used per element.
+
+    Returns
+    -------
+    numpy.ndarray or tuple of numpy.ndarray
+        The anomaly (E, D or H) in radians, with the broadcast shape of the inputs.
+        Elliptic solutions keep the revolution count of ``mean_anomaly``. With
+        ``return_iterations`` the per-element iteration counts follow.
+    """
+    mean, ecc = np.broadcast_arrays(np.asarray(mean_anomaly, dtype=np.float64),
+                                    np.asarray(eccentricity, dtype=np.float64))
+    if np.any(ecc < 0.0):
+        raise ValueError("Eccentricity must be non-negative.")
+
+    anomaly = np.empty(mean.shape)
+    iterations = np.zeros(mean.shape, dtype=np.int64)
+
+    elliptic = ecc < 1.0
+    hyperbolic = ecc > 1.0
+    parabolic = ~(elliptic | hyperbolic)
+
+    for mask, solver in ((elliptic, _solve_elliptic), (hyperbolic, _solve_hyperbolic)):
+        if mask.any():
+            anomaly[mask], iterations[mask] = solver(mean[mask], ecc[mask], tol, max_iter)
+
+    if parabolic.any():
+        anomaly[parabolic] = 2.0 * np.sinh(np.arcsinh(1.5 * mean[parabolic]) / 3.0)
+
+    if return_iterations:
+        return anomaly, iterations
+    return anomaly
+
+
+def true_anomaly_from_eccentric(anomaly: ArrayLike, eccentricity: ArrayLike) -> np.ndarray:
+    """
+    Convert the eccentric (E), parabolic (D) or hyperbolic (H) anomaly to the true anomaly.
+
+    Parameters
+    ----------
+    anomaly : array_like
+        Anomaly as returned by :func:`eccentric_anomaly_from_mean`.
+    eccentricity : array_like
+        Eccentricity, broadcast against ``anomaly``.
+
+    Returns
+    -------
+    numpy.ndarray
+        True anomaly ν in radians.
+    """
+    anomaly, ecc = np.broadcast_arrays(np.asarray(anomaly, dtype=np.float64),
+                                       np.asarray(eccentricity, dtype=np.float64))
+    nu = np.empty(anomaly.shape)
+
+    elliptic = ecc < 1.0
+    hyperbolic = ecc > 1.0
+    parabolic = ~(elliptic | hyperbolic)
+
+    e = ecc[elliptic]
+    half = 0.5 * anomaly[elliptic]
+    # Keep the revolution count: atan2 only resolves ν modulo 2π.
+    turns = np.round(anomaly[elliptic] / (2.0 * np.pi))
+    nu[elliptic] = 2.0 * np.arctan2(np.sqrt(1.0 + e) * np.sin(half),
+                                    np.sqrt(1.0 - e) * np.cos(half))
+    nu[elliptic] += 2.0 * np.pi * turns
+
+    e = ecc[hyperbolic]
+    nu[hyperbolic] = 2.0 * np.arctan(np.sqrt((e + 1.0) / (e - 1.0))
+                                     * np.tanh(0.5 * anomaly[hyperbolic]))
+
+    nu[parabolic] = 2.0 * np.arctan(anomaly[parabolic])
+    return nu
+
+
+def mean_anomaly_from_true(true_anomaly: ArrayLike, eccentricity: ArrayLike) -> np.ndarray:
+    """
+    Convert the true anomaly to the mean anomaly (the inverse of Kepler's equation).
+
+    Parameters
+    ----------
+    true_anomaly : array_like
+        True anomaly ν in radians. For hyperbolic orbits |ν| must stay below the
+        asymptote angle ``arccos(-1/e)``.
+    eccentricity : array_like
+        Eccentricity, broadcast against ``true_anomaly``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Mean anomaly in radians (the parabolic mean anomaly for e = 1).
+    """
+    nu, ecc = np.broadcast_arrays(np.asarray(true_anomaly, dtype=np.float64),
+                                  np.asarray(eccentricity, dtype=np.float64))
+    mean = np.empty(nu.shape)
+
+    elliptic = ecc < 1.0
+    hyperbolic = ecc > 1.0
+    parabolic = ~(elliptic | hyperbolic)
+
+    e = ecc[elliptic]
+    half = 0.5 * nu[elliptic]
+    turns = np.round(nu[elliptic] / (2.0 * np.pi))
+    anomaly = 2.0 * np.arctan2(np.sqrt(1.0 - e) * np.sin(half), np.sqrt(1.0 + e) * np.cos(half))
+    mean[elliptic] = anomaly - e * np.sin(anomaly) + 2.0 * np.pi * turns
+
+    e = ecc[hyperbolic]
+    anomaly = 2.0 * np.arctanh(np.sqrt((e - 1.0) / (e + 1.0)) * np.tan(0.5 * nu[hyperbolic]))
+    mean[hyperbolic] = e * np.sinh(anomaly) - anomaly
+
+    d = np.tan(0.5 * nu[parabolic])
+    mean[parabolic] = d + d**3 / 3.0
+    return mean
+
+
+def true_anomaly_from_mean(mean_anomaly: ArrayLike, eccentricity: ArrayLike,
+                           tol: float = KEPLER_TOLERANCE,
+                           max_iter: int = KEPLER_MAX_ITERATIONS) -> np.ndarray:
+    """
+    True anomaly from mean anomaly (Kepler's equation), for any conic.
+
+    Parameters
+    ----------
+    mean_anomaly : array_like
+        Mean anomaly in radians (the parabolic mean anomaly for e = 1).
+    eccentricity : array_like
+        Eccentricity, broadcast against ``mean_anomaly``.
+    tol, max_iter :
+        Passed to :func:`eccentric_anomaly_from_mean`.
+
+    Returns
+    -------
+    numpy.ndarray
+        True anomaly ν in radians.
+    """
+    anomaly = eccentric_anomaly_from_mean(mean_anomaly, eccentricity, tol, max_iter)
+    return true_anomaly_from_eccentric(anomaly, eccentricity)
+
+
+# ---------------------------------------------------------------------------
+# Universal variables
+# ---------------------------------------------------------------------------
+
+# |z| below which the Stumpff functions are summed as series; the closed forms
+# cancel catastrophically near z = 0.
+_STUMPFF_SERIES_LIMIT: float = 0.1
+
+# Order of the Laguerre–Conway iteration for the universal Kepler equation.
+_LAGUERRE_ORDER: int = 5
+
+
+def stumpff(z: ArrayLike, order: int = 3) -> tuple[np.ndarray, ...]:
+    """
+    Stumpff functions c₀(z) … c_order(z), vectorized.
+
+    ``c_k(z) = Σ (−z)ʲ / (k + 2j)!``; for ``z > 0`` (ellipses) c₂ = (1 − cos √z)/z
+    and c₃ = (√z − sin √z)/z^(3/2), for ``z < 0`` (hyperbolas) the hyperbolic
+    counterparts. Higher orders follow from the recurrence ``z c_{k+2} = 1/k! − c_k``;
+    near ``z = 0`` every function is summed as a series instead.
+
+    Parameters
+    ----------
+    z : array_like
+        Argument, ``α χ²`` in the universal formulation.
+    order : int, default 3
+        Highest function returned.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(c0, c1, …, c_order)``, each with the shape of ``z``.
+    """
+    z = np.asarray(z, dtype=np.float64)
+    c = [np.empty(z.shape) for _ in range(max(order, 1) + 1)]
+    small = np.abs(z) < _STUMPFF_SERIES_LIMIT
+    large = ~small
+
+    zs = z[large]
+    root = np.sqrt(np.abs(zs))
+    elliptic = zs > 0.0
+    c[0][large] = np.where(elliptic, np.cos(root), np.cosh(root))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        c[1][large] = np.where(elliptic, np.sin(root), np.sinh(root)) / root
+    for k in range(2, len(c)):
+        # z c_k = 1/(k−2)! − c_{k−2}
+        c[k][large] = (1.0 / math.factorial(k - 2) - c[k - 2][large]) / zs
+
+    zs = z[small]
+    for k in range(len(c)):
+        # Eight terms keep the truncation error below 1e-17 for |z| < 0.1.
+        total = np.zeros(zs.shape)
+        for j in range(7, -1, -1):
+            total = 1.0 / math.factorial(k + 2 * j) - zs * total
+        c[k][small] = total
+    return tuple(c[:order + 1])
+
+
+class UniversalState(NamedTuple):
+    position: np.ndarray  # (..., 3)
+    velocity: np.ndarray  # (..., 3)
+    dr_dr0: np.ndarray | None  # (..., 3, 3) ∂r/∂r₀, or None
+    dr_dv0: np.ndarray | None  # (..., 3, 3) ∂r/∂v₀, or None
+    dv_dr0: np.ndarray | None = None  # (..., 3, 3) ∂v/∂r₀, or None
+    dv_dv0: np.ndarray | None = None  # (..., 3, 3) ∂v/∂v₀, or None
+
+
+def propagate_universal(position: ArrayLike, velocity: ArrayLike, dt: ArrayLike,
+                        gm: float = GM_SUN, partials: bool = False,
+                        tol: float = KEPLER_TOLERANCE,
+                        max_iter: int = KEPLER_MAX_ITERATIONS) -> UniversalState:
+    """
+    Two-body propagation of Cartesian states with the universal variable χ.
+
+    One formulation covers ellipses, parabolas and hyperbolas, so fitted states
+    can cross between conic types between iterations. The universal Kepler
+    equation is solved with the Laguerre–Conway method, which converges from the
+    crude starter for every conic; every element stops on its own step, or once
+    its residual is down to rounding noise.
+
+    Parameters
+    ----------
+    position, velocity : array_like
+        ``(..., 3)`` initial states.
+    dt : array_like
+        Time since the initial state, broadcast against the leading dimensions.
+    gm : float
+        Standard gravitational parameter in units matching the states.
+    partials : bool, default False
+        Also return the state transition matrix, ``∂r/∂r₀``, ``∂r/∂v₀``,
+        ``∂v/∂r₀`` and ``∂v/∂v₀``, in closed form (Battin 1999, §9.7).
+    tol : float
+        Convergence tolerance on χ, relative once ``|χ| > 1``.
+    max_iter : int
+        Maximum number of Laguerre iterations.
+
+    Returns
+    -------
+    UniversalState
+        Propagated position and velocity, and the partials when requested.
+        Elements whose χ has not converged within ``max_iter`` are NaN.
+    """
+    r0_vec = np.asarray(position, dtype=np.float64)
+    v0_vec = np.asarray(velocity, dtype=np.float64)
+    dt = np.asarray(dt, dtype=np.float64)
+    shape = np.broadcast_shapes(r0_vec.shape[:-1], v0_vec.shape[:-1], dt.shape)
+    r0_vec = np.broadcast_to(r0_vec, shape + (3,))
+    v0_vec = np.broadcast_to(v0_vec, shape + (3,))
+    dt = np.broadcast_to(dt, shape)
+
+    sqrt_mu = math.sqrt(gm)
+    r0 = np.linalg.norm(r0_vec, axis=-1)
+    sigma0 = np.einsum("...i,...i->...", r0_vec, v0_vec) / sqrt_mu
+    alpha = 2.0 / r0 - np.einsum("...i,...i->...", v0_vec, v0_vec) / gm
+    target = sqrt_mu * dt
+
+    # χ ≈ √μ Δt / r₀ is exact to first order in Δt and serves ellipses well, as
+    # Laguerre's method is insensitive to the starter (Conway 1986). Hyperbolas
+    # start from the asymptotic estimate instead (Vallado 2013, Algorithm 8): far
+    # along them the linear guess is off by orders of magnitude.
+    chi = target / r0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sign = np.sign(dt)
+        semi = 1.0 / alpha
+        asymptotic = sign * np.sqrt(-semi) * np.log(
+            -2.0 * gm * alpha * dt
+            / (sqrt_mu * sigma0 + sign * np.sqrt(-gm * semi) * (1.0 - r0 * alpha)))
+    far = (alpha < 0.0) & np.isfinite(asymptotic)
+    chi = np.where(far, asymptotic, chi).ravel()
+    r0_flat, sigma_flat, alpha_flat, target_flat = (
+        np.ravel(r0), np.ravel(sigma0), np.ravel(alpha), np.ravel(target))
+    active = np.arange(chi.size)
+    failed = np.zeros(chi.size, dtype=bool)
+    n = _LAGUERRE_ORDER
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        x = chi[active]
+        a, s, r = alpha_flat[active], sigma_flat[active], r0_flat[active]
+        u0, c1, c2, c3 = stumpff(a * x * x)
+        u1, u2, u3 = x * c1, x * x * c2, x ** 3 * c3
+        f = r * u1 + s * u2 + u3 - target_flat[active]
+        f1 = r * u0 + s * u1 + u2
+        f2 = (1.0 - a * r) * u1 + s * u0
+        root = np.sqrt(np.abs((n - 1) ** 2 * f1 * f1 - n * (n - 1) * f * f2))
+        step = n * f / (f1 + np.copysign(root, f1))
+        chi[active] = x - step
+        # On tight hyperbolas the terms of f cancel, so χ can stall in rounding
+        # noise above tol. Stop there, and give up on the element if that noise
+        # still amounts to more than √tol of the flight time.
+        moving = np.abs(step) > tol * np.maximum(1.0, np.abs(x))
+        noise = np.abs(f) <= tol * (r * np.abs(u1) + np.abs(s * u2) + np.abs(u3))
+        failed[active[moving & noise]] = (np.abs(f) > math.sqrt(tol)
+                                          * np.abs(target_flat[active]))[moving & noise]
+        active = active[moving & ~noise]
+    failed[active] = True
+    chi[failed] = np.nan
+    chi = chi.reshape(shape)
+
+    z = alpha * chi * chi
+    u0, c1, c2, c3, c4, c5 = stumpff(z, order=5)
+    u1, u2, u3 = chi * c1, chi * chi * c2, chi ** 3 * c3
+    r = r0 * u0 + sigma0 * u1 + u2
+
+    f = 1.0 - u2 / r0
+    g = dt - u3 / sqrt_mu
+    f_dot = -sqrt_mu * u1 / (r * r0)
+    g_dot = 1.0 - u2 / r
+    r_vec = f[..., None] * r0_vec + g[..., None] * v0_vec
+    v_vec = f_dot[..., None] * r0_vec + g_dot[..., None] * v0_vec
+    if not partials:
+        return UniversalState(r_vec, v_vec, None, None)
+
+    u4, u5 = chi ** 4 * c4, chi ** 5 * c5
+    big_c = (3.0 * u5 - chi * u4 - target * u2) / sqrt_mu
+    dv = v_vec - v0_vec
+    dr = r_vec - r0_vec
+    eye = np.eye(3)
+
+    def outer(a, b):
+        return a[..., :, None] * b[..., None, :]
+
+    dr_dr0 = (
+        (r / gm)[..., None, None] * outer(dv, dv)
+        + (1.0 / r0 ** 3)[..., None, None] * (
+            (r0 * (1.0 - f))[..., None, None] * outer(r_vec, r0_vec)
+            + big_c[..., None, None] * outer(v_vec, r0_vec))
+        + f[..., None, None] * eye
+    )
+    dr_dv0 = (
+        (r0 / gm * (1.0 - f))[..., None, None] * (
+            outer(dr, v0_vec) - outer(dv, r0_vec))
+        + (big_c / gm)[..., None, None] * outer(v_vec, v0_vec)
+        + g[..., None, None] * eye
+    )
+    r_sq = r * r
+    along = np.einsum("...i,...i->...", r_vec, v_vec)[..., None] * r_vec - r_sq[..., None] * v_vec
+    dv_dr0 = (
+        -(1.0 / r0 ** 2)[..., None, None] * outer(dv, r0_vec)
+        - (1.0 / r_sq)[..., None, None] * outer(r_vec, dv)
+        + f_dot[..., None, None] * (
+            eye - outer(r_vec, r_vec) / r_sq[..., None, None]
+            + outer(along, dv) / (gm * r)[..., None, None])
+        - (gm * big_c / (r ** 3 * r0 ** 3))[..., None, None] * outer(r_vec, r0_vec)
+    )
+    dv_dv0 = (
+        (r0 / gm)[..., None, None] * outer(dv, dv)
+        + (1.0 / r ** 3)[..., None, None] * (
+            (r0 * (1.0 - f))[..., None, None] * outer(r_vec, r0_vec)
+            - big_c[..., None, None] * outer(r_vec, v0_vec))
+        + g_dot[..., None, None] * eye
+    )
+    return UniversalState(r_vec, v_vec, dr_dr0, dr_dv0, dv_dr0, dv_dv0)
+
+
+def propagate_universal_with_uncertainty(position: ArrayLike, velocity: ArrayLike,
+                                         covariance: ArrayLike, dt: ArrayLike,
+                                         gm: float = GM_SUN,
+                                         method: Uncertainty = Uncertainty.LINEAR,
+                                         samples: int = DEFAULT_SAMPLES,
+                                         seed=None) -> Estimate:
+    """
+    :func:`propagate_universal` for uncertain states.
+
+    In linear mode the covariance is mapped by the closed-form state transition
+    matrix, ``P(t) = Φ P₀ Φᵀ``. In Monte Carlo mode ``samples`` states are drawn
+    around every input and all of them are propagated in one call; the sample
+    mean and covariance then also reflect the curved along-track spread that
+    long arcs develop and the linear mode misses.
+
+    Parameters
+    ----------
+    position, velocity : array_like
+        ``(..., 3)`` initial states.
+    covariance : array_like
+        ``(6, 6)`` or ``(..., 6, 6)`` covariance of (x, y, z, vx, vy, vz).
+    dt : array_like
+        Time since the initial state, broadcast against the leading dimensions.
+    gm : float
+        Standard gravitational parameter in units matching the states.
+    method : Uncertainty, default Uncertainty.LINEAR
+        Linear or Monte Carlo propagation.
+    samples : int
+        Draws per state in Monte Carlo mode.
+    seed : int or numpy.random.Generator, optional
+        Seeds the Monte Carlo draws.
+
+    Returns
+    -------
+    Estimate
+        ``(..., 6)`` propagated states (the sample mean in Monte Carlo mode) and
+        their ``(..., 6, 6)`` covariances.
+    """
+    state = np.concatenate(np.broadcast_arrays(np.asarray(position, dtype=np.float64),
+                                               np.asarray(velocity, dtype=np.float64)),
+                           axis=-1)
+    covariance = uncertainty.check_covariance(covariance, state.shape)
+    dt = np.asarray(dt, dtype=np.float64)
+
+    if Uncertainty(method) == Uncertainty.LINEAR:
+        propagated = propagate_universal(state[..., :3], state[..., 3:], dt, gm, partials=True)
+        transition = np.concatenate([
+            np.concatenate([propagated.dr_dr0, propagated.dr_dv0], axis=-1),
+            np.concatenate([propagated.dv_dr0, propagated.dv_dv0], axis=-1),
+        ], axis=-2)
+        mean = np.concatenate([propagated.position, propagated.velocity], axis=-1)
+        return Estimate(mean, uncertainty.linear_covariance(transition, covariance))
+
+    samples = uncertainty.check_samples(samples)
+    drawn = uncertainty.draw_samples(state, covariance, samples, np.random.default_rng(seed))
+    propagated = propagate_universal(drawn[..., :3], drawn[..., 3:], dt[..., None], gm)
+    return uncertainty.sample_statistics(
+        np.concatenate([propagated.position, propagated.velocity], axis=-1))
+
+
+# ---------------------------------------------------------------------------
+# Lambert's problem
+# ---------------------------------------------------------------------------
+
+# Iteration cap for the safeguarded Newton iteration on z.
+LAMBERT_MAX_ITERATIONS: int = 60
+
+# Upper end of z for single-revolution transfers: 4π², where c₂ vanishes.
+_Z_MAX: float = 4.0 * math.pi ** 2
+
+# Most negative z tried when bracketing; √−z beyond ~700 overflows cosh.
+_Z_MIN: float = -4.0e5
+
+
+def _lambert_time(z: np.ndarray, a: np.ndarray, r_sum: np.ndarray, sqrt_mu_t: np.ndarray):
+    """F(z) and F'(z) of the universal-variable Lambert equation, and y(z)."""
+    _, _, c2, c3, c4, c5 = stumpff(z, order=5)
+    dc2 = 0.5 * (2.0 * c4 - c3)
+    dc3 = 0.5 * (3.0 * c5 - c4)
+    sqrt_c2 = np.sqrt(c2)
+    y = r_sum + a * (z * c3 - 1.0) / sqrt_c2
+    dy = a * ((c3 + z * dc3) / sqrt_c2 - 0.5 * (z * c3 - 1.0) * dc2 / (c2 * sqrt_c2))
+    with np.errstate(invalid="ignore"):
+        ratio = y / c2
+        sqrt_y = np.sqrt(y)
+        f = ratio * np.sqrt(ratio) * c3 + a * sqrt_y - sqrt_mu_t
+        df = (1.5 * np.sqrt(ratio) * (dy / c2 - y * dc2 / c2 ** 2) * c3
+              + ratio * np.sqrt(ratio) * dc3 + 0.5 * a * dy / sqrt_y)
+    return f, df, y
+
+
+def lambert(r1: ArrayLike, r2: ArrayLike, tof: ArrayLike, gm: float = GM_SUN,
+            prograde: bool = True, tol: float = KEPLER_TOLERANCE,
+            max_iter: int = LAMBERT_MAX_ITERATIONS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solve Lambert's problem for whole arrays of transfers (zero revolutions).
+
+    Uses the universal-variable formulation (Bate, Mueller & White 1971; Curtis
+    2014, §5.3). The time-of-flight equation F(z) = 0 increases monotonically in
+    z on the single-revolution branch, so every element is bracketed between
+    the hyperbolic limit and z = 4π² and solved by Newton steps that fall back
+    to bisection whenever they leave the bracket. Elements stop iterating on
+    their own, so a porkchop grid costs a handful of array passes.
+
+    Parameters
+    ----------
+    r1, r2 : array_like
+        ``(..., 3)`` departure and arrival positions, broadcast together.
+    tof : array_like
+        Time of flight, broadcast against the leading dimensions; non-positive
+        values have no solution.
+    gm : float
+        Standard gravitational parameter in units matching the inputs.
+    prograde : bool, default True
+        Pick the transfer with angular momentum along +z of the input frame
+        (the short way for prograde motion); False gives the retrograde one.
+    tol : float
+        Convergence tolerance on z, relative once ``|z| > 1``.
+    max_iter : int
+        Maximum number of iterations.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(v1, v2)``, the ``(..., 3)`` velocities at departure and arrival.
+        Transfers without a solution (non-positive ``tof``, collinear positions
+        180° apart, or beyond the hyperbolic bracket) are NaN.
+    """
+    r1 = np.asarray(r1, dtype=np.float64)
+    r2 = np.asarray(r2, dtype=np.float64)
+    tof = np.asarray(tof, dtype=np.float64)
+    shape = np.broadcast_shapes(r1.shape[:-1], r2.shape[:-1], tof.shape)
+    r1 = np.broadcast_to(r1, shape + (3,))
+    r2 = np.broadcast_to(r2, shape + (3,))
+    tof = np.broadcast_to(tof, shape)
+
+    norm1 = np.linalg.norm(r1, axis=-1)
+    norm2 = np.linalg.norm(r2, axis=-1)
+    cos_dnu = np.clip(np.einsum("...i,...i->...", r1, r2) / (norm1 * norm2), -1.0, 1.0)
+    normal_z = r1[..., 0] * r2[..., 1] - r1[..., 1] * r2[..., 0]
+    long_way = (normal_z < 0.0) if prograde else (normal_z >= 0.0)
+    sin_dnu = np.sqrt(1.0 - cos_dnu ** 2) * np.where(long_way, -1.0, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = sin_dnu * np.sqrt(norm1 * norm2 / (1.0 - cos_dnu))
+    sqrt_mu = math.sqrt(gm)
+
+    flat = [np.ravel(values) for values in (a, norm1 + norm2, sqrt_mu * tof)]
+    z = np.zeros(flat[0].size)
+    solvable = (flat[2] > 0.0) & np.isfinite(flat[0]) & (flat[0] != 0.0)
+    lower = np.full(z.size, -4.0 * _Z_MAX)
+    upper = np.full(z.size, _Z_MAX)
+
+    # Walk the lower end down until F < 0 there (or y < 0, which lies below the root).
+    pending = np.nonzero(solvable)[0]
+    while pending.size:
+        f, _, y = _lambert_time(lower[pending], *(values[pending] for values in flat))
+        pending = pending[(y >= 0.0) & ~(f < 0.0)]
+        lower[pending] *= 4.0
+        beyond = lower[pending] < _Z_MIN
+        solvable[pending[beyond]] = False
+        pending = pending[~beyond]
+
+    active = np.nonzero(solvable)[0]
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        x = z[active]
+        f, df, y = _lambert_time(x, *(values[active] for values in flat))
+        below = (y < 0.0) | (f < 0.0)
+        lower[active] = np.where(below, x, lower[active])
+        upper[active] = np.where(below, upper[active], x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = x - f / df
+        lo, hi = lower[active], upper[active]
+        bisect = ~((step > lo) & (step < hi))
+        step[bisect] = 0.5 * (lo[bisect] + hi[bisect])
+        z[active] = step
+        active = active[np.abs(step - x) > tol * np.maximum(1.0, np.abs(x))]
+    z[~solvable] = np.nan
+
+    z = z.reshape(shape)
+    _, _, c2, c3 = stumpff(z)
+    y = norm1 + norm2 + a * (z * c3 - 1.0) / np.sqrt(c2)
+    f = 1.0 - y / norm1
+    g = a * np.sqrt(y / gm)
+    g_dot = 1.0 - y / norm2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v1 = (r2 - f[..., None] * r1) / g[..., None]
+        v2 = (g_dot[..., None] * r2 - r1) / g[..., None]
+    return v1, v2
@@ -0,0 +1,145 @@
+"""
+Porkchop plots: launch energy and arrival speed over a grid of transfer dates.
+
+Every (departure, arrival) pair of the grid is a Lambert problem between the two
+planets' heliocentric positions. The planetary states depend on one axis only,
+so they are evaluated once per axis (m + n epochs, not m × n) and kept in a small
+LRU keyed by the axis; a grid that shares an axis with an earlier one, as when a
+user pans along the arrival dates, reuses it. The Lambert problems themselves
+are solved by :func:`~app.services.calculations.orbital_mechanics.lambert` in
+blocks of departure rows, so memory stays bounded for 10⁶-cell grids.
+
+Planetary states come from the mean elements of
+:func:`~app.services.calculations.planetary_ephemeris.planet_states`, which is
+ample for mission-design surveys; ``earth`` stands for the Earth–Moon
+barycenter.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from app.core.constants import AU_M
+from app.services.calculations import planetary_ephemeris
+from app.services.calculations.orbital_mechanics import lambert
+
+GM_SUN_AU_DAY = planetary_ephemeris.GM_SUN_AU_DAY
+
+# Bodies with mean elements; "earth" is an alias of the Earth–Moon barycenter.
+_ALIASES = {"earth": "earth-moon-barycenter"}
+BODIES = tuple(planetary_ephemeris.MASS_RATIOS) + tuple(_ALIASES)
+
+# Grid cells solved per block.
+PORKCHOP_CHUNK_CELLS = 65_536
+
+# Planetary state axes kept, across bodies.
+AXIS_CACHE_SIZE = 64
+
+# AU/day to km/s.
+KM_S_PER_AU_DAY = AU_M / 1e3 / 86_400.0
+
+GRID_NAMES = ("c3", "v_inf_departure", "v_inf_arrival", "delta_v")
+
+
+class PorkchopGrid(NamedTuple):
+    departure: np.ndarray  # (m,) Julian Dates (TDB)
+    arrival: np.ndarray  # (n,) Julian Dates (TDB)
+    c3: np.ndarray  # (m, n) launch energy |v∞|² at departure [km² s⁻²]
+    v_inf_departure: np.ndarray  # (m, n) hyperbolic excess speed at departure [km s⁻¹]
+    v_inf_arrival: np.ndarray  # (m, n) hyperbolic excess speed at arrival [km s⁻¹]
+    delta_v: np.ndarray  # (m, n) sum of both excess speeds [km s⁻¹]
+
+
+def axis_epochs(start: float, stop: float, step: float) -> np.ndarray:
+    """Epochs ``start, start + step, …`` up to and including ``stop`` (to 1e-9 of a step)."""
+    if step <= 0:
+        raise ValueError("step must be positive.")
+    if stop < start:
+        raise ValueError("stop must not precede start.")
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return start + step * np.arange(count)
+
+
+@lru_cache(maxsize=AXIS_CACHE_SIZE)
+def _axis_states(body: str, start: float, step: float, count: int) -> np.ndarray:
+    states = planetary_ephemeris.planet_states(body, start + step * np.arange(count))
+    states.flags.writeable = False
+    return states
+
+
+def axis_states(body: str, start: float, step: float, count: int) -> np.ndarray:
+    """
+    Heliocentric states of ``body`` along one grid axis, cached per axis.
+
+    Parameters
+    ----------
+    body : str
+        One of :data:`BODIES`.
+    start, step : float
+        First epoch (JD, TDB) and spacing in days.
+    count : int
+        Number of epochs.
+
+    Returns
+    -------
+    numpy.ndarray
+        Read-only ``(count, 6)`` positions [AU] and velocities [AU day⁻¹],
+        J2000 ecliptic.
+    """
+    if body not in BODIES:
+        raise ValueError(f"Unknown body {body!r}; expected one of {', '.join(BODIES)}.")
+    return _axis_states(_ALIASES.get(body, body), float(start), float(step), int(count))
+
+
+def axis_cache_info():
+    """Hit and miss counters of the planetary state cache."""
+    return _axis_states.cache_info()
+
+
+def porkchop(departure_body: str, arrival_body: str,
+             departure: tuple[float, float, float], arrival: tuple[float, float, float],
+             prograde: bool = True,
+             chunk_cells: int = PORKCHOP_CHUNK_CELLS) -> PorkchopGrid:
+    """
+    Transfer cost over a grid of departure and arrival dates.
+
+    Parameters
+    ----------
+    departure_body, arrival_body : str
+        Planets of :data:`BODIES`.
+    departure, arrival : tuple of float
+        ``(start, stop, step)`` of each axis: Julian Dates (TDB) and days.
+    prograde : bool, default True
+        Solve for prograde transfers (angular momentum along the ecliptic pole).
+    chunk_cells : int
+        Cells per Lambert block.
+
+    Returns
+    -------
+    PorkchopGrid
+        Grids indexed ``[departure, arrival]``. Cells whose arrival does not
+        follow the departure, or without a Lambert solution, are NaN.
+    """
+    departure_jd = axis_epochs(*departure)
+    arrival_jd = axis_epochs(*arrival)
+    start_states = axis_states(departure_body, departure[0], departure[2], departure_jd.size)
+    end_states = axis_states(arrival_body, arrival[0], arrival[2], arrival_jd.size)
+
+    shape = (departure_jd.size, arrival_jd.size)
+    v_inf_departure = np.empty(shape)
+    v_inf_arrival = np.empty(shape)
+    rows = max(1, chunk_cells // arrival_jd.size)
+    for first in range(0, shape[0], rows):
+        block = slice(first, first + rows)
+        tof = arrival_jd[None, :] - departure_jd[block, None]
+        with np.errstate(invalid="ignore"):
+            v1, v2 = lambert(start_states[block, None, :3], end_states[None, :, :3], tof,
+                             GM_SUN_AU_DAY, prograde)
+        v_inf_departure[block] = np.linalg.norm(v1 - start_states[block, None, 3:], axis=-1)
+        v_inf_arrival[block] = np.linalg.norm(v2 - end_states[None, :, 3:], axis=-1)
+
+    v_inf_departure *= KM_S_PER_AU_DAY
+    v_inf_arrival *= KM_S_PER_AU_DAY
+    return PorkchopGrid(departure_jd, arrival_jd, v_inf_departure ** 2, v_inf_departure,
+                        v_inf_arrival, v_inf_departure + v_inf_arrival)
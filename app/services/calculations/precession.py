@@ -0,0 +1,308 @@
+"""
+Precession, nutation and the obliquity of date.
+
+Provides the rotations from the fixed J2000 equatorial frame (treated as the
+GCRS) to the *true* equator and equinox of date, and to the ecliptic of date:
+
+- :func:`mean_obliquity` – IAU 2006 mean obliquity of the ecliptic
+- :func:`nutation` – nutation in longitude and obliquity (Δψ, Δε)
+- :func:`rotation_matrix` – one 3x3 frame rotation, memoized per epoch
+- :func:`rotation_matrices` – an ``(n, 3, 3)`` stack for an array of epochs
+
+Precession uses the IAU 2006 Fukushima-Williams angles (frame bias included);
+nutation uses the leading terms of the IAU 1980 series, good to a few
+milliarcseconds. The rotations follow the passive convention of the rest of the
+coordinate pipeline: ``v_of_date = R @ v_j2000``.
+
+Epochs are Julian Dates in Terrestrial Time (TT). Evaluating the series is
+comparatively expensive, so rotations inside the configured window
+(``PRECESSION_TABLE_*`` settings) come from a table of matrices precomputed on a
+regular grid and interpolated with cubic splines. The table is built on first
+use; at the default one-day spacing the interpolation error stays below 5×10⁻⁹ rad
+(1 mas), smaller than the truncation of the nutation series.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.core.config import get_settings
+from app.models.coordinates_systems import Plane
+
+# Julian Date of the J2000.0 epoch and days per Julian century.
+J2000_JD = 2451545.0
+DAYS_PER_CENTURY = 36525.0
+
+_ARCSEC = np.pi / (180.0 * 3600.0)
+
+# Leading terms of the IAU 1980 nutation series. Each row holds the multipliers of
+# the fundamental arguments (D, M, M', F, Ω), then Δψ = (S + S_t T) sin(arg) and
+# Δε = (C + C_t T) cos(arg) in units of 0.0001".
+_NUTATION_TERMS = np.array([
+    # D   M   M'  F   Ω        S      S_t       C     C_t
+    [0,   0,  0,  0,  1, -171996, -174.2,  92025,  8.9],
+    [-2,  0,  0,  2,  2,  -13187,   -1.6,   5736, -3.1],
+    [0,   0,  0,  2,  2,   -2274,   -0.2,    977, -0.5],
+    [0,   0,  0,  0,  2,    2062,    0.2,   -895,  0.5],
+    [0,   1,  0,  0,  0,    1426,   -3.4,     54, -0.1],
+    [0,   0,  1,  0,  0,     712,    0.1,     -7,  0.0],
+    [-2,  1,  0,  2,  2,    -517,    1.2,    224, -0.6],
+    [0,   0,  0,  2,  1,    -386,   -0.4,    200,  0.0],
+    [0,   0,  1,  2,  2,    -301,    0.0,    129, -0.1],
+    [-2, -1,  0,  2,  2,     217,   -0.5,    -95,  0.3],
+    [-2,  0,  1,  0,  0,    -158,    0.0,      0,  0.0],
+    [-2,  0,  0,  2,  1,     129,    0.1,    -70,  0.0],
+    [0,   0, -1,  2,  2,     123,    0.0,    -53,  0.0],
+    [2,   0,  0,  0,  0,      63,    0.0,      0,  0.0],
+    [0,   0,  1,  0,  1,      63,    0.1,    -33,  0.0],
+    [2,   0, -1,  2,  2,     -59,    0.0,     26,  0.0],
+    [0,   0, -1,  0,  1,     -58,   -0.1,     32,  0.0],
+    [0,   0,  1,  2,  1,     -51,    0.0,     27,  0.0],
+    [-2,  0,  2,  0,  0,      48,    0.0,      0,  0.0],
+    [0,   0, -2,  2,  1,      46,    0.0,    -24,  0.0],
+    [2,   0,  0,  2,  2,     -38,    0.0,     16,  0.0],
+    [0,   0,  2,  2,  2,     -31,    0.0,     13,  0.0],
+    [0,   0,  2,  0,  0,      29,    0.0,      0,  0.0],
+    [-2,  0,  1,  2,  2,      29,    0.0,    -12,  0.0],
+    [0,   0,  0,  2,  0,      26,    0.0,      0,  0.0],
+    [-2,  0,  0,  2,  0,     -22,    0.0,      0,  0.0],
+    [0,   0, -1,  2,  1,      21,    0.0,    -10,  0.0],
+    [0,   2,  0,  0,  0,      17,   -0.1,      0,  0.0],
+    [2,   0, -1,  0,  1,      16,    0.0,     -8,  0.0],
+    [-2,  2,  0,  2,  2,     -16,    0.1,      7,  0.0],
+    [0,   1,  0,  0,  1,     -15,    0.0,      9,  0.0],
+    [-2,  0,  1,  0,  1,     -13,    0.0,      7,  0.0],
+    [0,  -1,  0,  0,  1,     -12,    0.0,      6,  0.0],
+    [0,   0,  2, -2,  0,      11,    0.0,      0,  0.0],
+    [2,   0, -1,  2,  1,     -10,    0.0,      5,  0.0],
+    [2,   0,  1,  2,  2,      -8,    0.0,      3,  0.0],
+    [0,   1,  0,  2,  2,       7,    0.0,     -3,  0.0],
+    [-2,  1,  1,  0,  0,      -7,    0.0,      0,  0.0],
+    [0,  -1,  0,  2,  2,      -7,    0.0,      3,  0.0],
+    [2,   0,  0,  2,  1,      -7,    0.0,      3,  0.0],
+])
+
+
+def _centuries(jd: np.ndarray) -> np.ndarray:
+    return (jd - J2000_JD) / DAYS_PER_CENTURY
+
+
+def _polynomial(coefficients: tuple, t: np.ndarray) -> np.ndarray:
+    # Horner evaluation; coefficients in increasing powers of t.
+    result = np.full_like(t, coefficients[-1])
+    for coefficient in coefficients[-2::-1]:
+        result = result * t + coefficient
+    return result
+
+
+def mean_obliquity(jd: ArrayLike) -> np.ndarray:
+    """
+    Mean obliquity of the ecliptic of date (IAU 2006).
+
+    Parameters
+    ----------
+    jd : array_like
+        Julian Date (TT).
+
+    Returns
+    -------
+    numpy.ndarray
+        ε_A in radians.
+    """
+    t = _centuries(np.asarray(jd, dtype=np.float64))
+    return _polynomial((84381.406, -46.836769, -0.0001831, 0.00200340,
+                        -0.000000576, -0.0000000434), t) * _ARCSEC
+
+
+def nutation(jd: ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Nutation in longitude and obliquity.
+
+    Parameters
+    ----------
+    jd : array_like
+        Julian Date (TT).
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (Δψ, Δε) in radians.
+    """
+    t = _centuries(np.asarray(jd, dtype=np.float64))
+    fundamental = np.radians(np.stack([
+        _polynomial((297.85036, 445267.111480, -0.0019142, 1.0 / 189474.0), t),   # D
+        _polynomial((357.52772, 35999.050340, -0.0001603, -1.0 / 300000.0), t),   # M
+        _polynomial((134.96298, 477198.867398, 0.0086972, 1.0 / 56250.0), t),     # M'
+        _polynomial((93.27191, 483202.017538, -0.0036825, 1.0 / 327270.0), t),    # F
+        _polynomial((125.04452, -1934.136261, 0.0020708, 1.0 / 450000.0), t),     # Ω
+    ], axis=-1))
+
+    argument = fundamental @ _NUTATION_TERMS[:, :5].T
+    t = t[..., None]
+    sine = _NUTATION_TERMS[:, 5] + _NUTATION_TERMS[:, 6] * t
+    cosine = _NUTATION_TERMS[:, 7] + _NUTATION_TERMS[:, 8] * t
+    scale = 1e-4 * _ARCSEC
+    return ((sine * np.sin(argument)).sum(axis=-1) * scale,
+            (cosine * np.cos(argument)).sum(axis=-1) * scale)
+
+
+def _rot_x(angle: np.ndarray) -> np.ndarray:
+    c, s = np.cos(angle), np.sin(angle)
+    one, zero = np.ones_like(angle), np.zeros_like(angle)
+    return np.stack([np.stack([one, zero, zero], -1),
+                     np.stack([zero, c, s], -1),
+                     np.stack([zero, -s, c], -1)], -2)
+
+
+def _rot_z(angle: np.ndarray) -> np.ndarray:
+    c, s = np.cos(angle), np.sin(angle)
+    one, zero = np.ones_like(angle), np.zeros_like(angle)
+    return np.stack([np.stack([c, s, zero], -1),
+                     np.stack([-s, c, zero], -1),
+                     np.stack([zero, zero, one], -1)], -2)
+
+
+def evaluate_rotations(plane: Plane, jd: ArrayLike) -> np.ndarray:
+    """
+    Evaluate the rotation from J2000 equatorial to ``plane`` of date from the series.
+
+    This is the exact (table-free) path; :func:`rotation_matrices` is the fast one.
+
+    Parameters
+    ----------
+    plane : Plane
+        ``EQUATORIAL`` for the true equator and equinox of date, ``ECLIPTIC`` for
+        the ecliptic and true equinox of date.
+    jd : array_like
+        Julian Date (TT).
+
+    Returns
+    -------
+    numpy.ndarray
+        ``jd.shape + (3, 3)`` rotation matrices.
+    """
+    jd = np.asarray(jd, dtype=np.float64)
+    t = _centuries(jd)
+    # Fukushima-Williams angles, in arcseconds.
+    gamma = _polynomial((-0.052928, 10.556378, 0.4932044, -0.00031238,
+                         -0.000002788, 0.0000000260), t) * _ARCSEC
+    phi = _polynomial((84381.412819, -46.811016, 0.0511268, 0.00053289,
+                       -0.000000440, -0.0000000176), t) * _ARCSEC
+    psi = _polynomial((-0.041775, 5038.481484, 1.5584175, -0.00018522,
+                       -0.000026452, -0.0000000148), t) * _ARCSEC
+    d_psi, d_eps = nutation(jd)
+
+    # Rz(γ̄) then Rx(φ̄) brings the frame onto the ecliptic of date; Rz(-ψ) sets
+    # the true equinox. Tilting by the true obliquity gives the equator of date.
+    ecliptic = _rot_z(-(psi + d_psi)) @ _rot_x(phi) @ _rot_z(gamma)
+    if plane == Plane.ECLIPTIC:
+        return ecliptic
+    return _rot_x(-(mean_obliquity(jd) + d_eps)) @ ecliptic
+
+
+class RotationTable:
+    """
+    Frame rotations precomputed on a regular grid of epochs.
+
+    Parameters
+    ----------
+    plane : Plane
+        Target plane of the tabulated rotations.
+    start, end : float
+        First and last Julian Date (TT) of the grid.
+    step : float
+        Grid spacing in days.
+    """
+
+    def __init__(self, plane: Plane, start: float, end: float, step: float):
+        if not end > start or not step > 0:
+            raise ValueError("The rotation table needs end > start and a positive step.")
+        self.plane = plane
+        self.start = start
+        self.step = step
+        self.size = int(np.ceil((end - start) / step)) + 1
+        self.end = start + (self.size - 1) * step
+        # One extra node on either side gives every interval its four cubic neighbours.
+        self.matrices = evaluate_rotations(plane, start + step * np.arange(-1, self.size + 1))
+        self.matrices.flags.writeable = False
+
+    def interpolate(self, jd: np.ndarray) -> np.ndarray:
+        """
+        Interpolate rotations for epochs inside the grid.
+
+        Epochs outside ``[start, end]`` fall back to :func:`evaluate_rotations`.
+        """
+        jd = np.asarray(jd, dtype=np.float64)
+        out = np.empty(jd.shape + (3, 3))
+        inside = (jd >= self.start) & (jd <= self.end)
+        if not inside.all():
+            out[~inside] = evaluate_rotations(self.plane, jd[~inside])
+
+        # Cubic (Catmull-Rom) interpolation through the four surrounding nodes.
+        position = (jd[inside] - self.start) / self.step
+        index = np.minimum(position.astype(np.intp), self.size - 2)
+        t = (position - index)[:, None, None]
+        t2, t3 = t * t, t * t * t
+        weights = (0.5 * (-t + 2.0 * t2 - t3), 0.5 * (2.0 - 5.0 * t2 + 3.0 * t3),
+                   0.5 * (t + 4.0 * t2 - 3.0 * t3), 0.5 * (t3 - t2))
+        # Node k of the grid is row k + 1 of the padded matrix stack.
+        result = np.zeros((index.shape[0], 3, 3))
+        for offset, weight in enumerate(weights):
+            result += weight * self.matrices[index + offset]
+        out[inside] = result
+        return out
+
+
+@lru_cache
+def rotation_table(plane: Plane) -> RotationTable:
+    """Return the process-wide :class:`RotationTable` for ``plane``, sized from the settings."""
+    settings = get_settings()
+    return RotationTable(plane, settings.precession_table_start,
+                         settings.precession_table_end, settings.precession_table_step)
+
+
+def rotation_matrices(plane: Plane, jd: ArrayLike) -> np.ndarray:
+    """
+    Rotations from J2000 equatorial to ``plane`` of date for many epochs.
+
+    Repeated epochs are looked up once, so a batch spanning ``k`` distinct epochs
+    costs ``k`` table interpolations however many rows it has.
+
+    Parameters
+    ----------
+    plane : Plane
+        Target plane, as in :func:`evaluate_rotations`.
+    jd : array_like
+        Julian Dates (TT), any shape.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``jd.shape + (3, 3)`` rotation matrices.
+    """
+    jd = np.asarray(jd, dtype=np.float64)
+    unique, inverse = np.unique(jd, return_inverse=True)
+    return rotation_table(plane).interpolate(unique)[inverse.reshape(jd.shape)]
+
+
+@lru_cache(maxsize=4096)
+def rotation_matrix(plane: Plane, jd: float) -> np.ndarray:
+    """
+    Read-only rotation from J2000 equatorial to ``plane`` of date, memoized per epoch.
+
+    Parameters
+    ----------
+    plane : Plane
+        Target plane, as in :func:`evaluate_rotations`.
+    jd : float
+        Julian Date (TT).
+
+    Returns
+    -------
+    numpy.ndarray
+        3x3 rotation matrix.
+    """
+    matrix = rotation_table(plane).interpolate(np.array([float(jd)]))[0]
+    matrix.flags.writeable = False
+    return matrix
@@ -0,0 +1,158 @@
+"""
+Uncertainty propagation helpers shared by the transform and propagation services.
+
+Two modes carry a Gaussian uncertainty through a calculation:
+
+- :attr:`Uncertainty.LINEAR` pushes the covariance through the Jacobian of the
+  calculation, ``C' = J C Jᵀ``; the callers supply analytic Jacobians.
+- :attr:`Uncertainty.MONTE_CARLO` draws samples from the input distribution, runs
+  all of them through the vectorized calculation as one array and reports their
+  mean and covariance, which also captures the non-linear part.
+
+This module only holds the mode-independent pieces: validating covariances,
+drawing samples, and reducing them back to a mean and covariance.
+"""
+
+from enum import Enum
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+# Samples per input drawn by the Monte Carlo mode unless the caller asks otherwise.
+DEFAULT_SAMPLES = 1000
+
+# Samples transformed per block by the Monte Carlo mode: big enough to amortize
+# the per-call overhead, small enough to keep the temporaries in the low 100 MB.
+MONTE_CARLO_CHUNK_POINTS = 1 << 20
+
+# Relative size of the negative eigenvalues tolerated as round-off.
+_PSD_TOLERANCE = 1e-10
+
+
+class Uncertainty(str, Enum):
+    LINEAR = "linear"
+    MONTE_CARLO = "monte_carlo"
+
+
+class Estimate(NamedTuple):
+    mean: np.ndarray  # (..., d) nominal value (LINEAR) or sample mean (MONTE_CARLO)
+    covariance: np.ndarray  # (..., d, d)
+
+
+def check_covariance(covariance: ArrayLike, shape: tuple) -> np.ndarray:
+    """
+    Validates and broadcasts covariances for values of the given shape.
+
+    Parameters
+    ----------
+    covariance : array_like
+        ``(d, d)`` shared by every value, or ``(..., d, d)`` per value.
+    shape : tuple
+        Shape ``(..., d)`` of the values.
+
+    Returns
+    -------
+    numpy.ndarray
+        The covariances broadcast to ``shape + (d,)``.
+
+    Raises
+    ------
+    ValueError
+        If the covariances do not match the values, are not finite, or are not
+        symmetric positive semi-definite.
+    """
+    covariance = np.asarray(covariance, dtype=np.float64)
+    size = shape[-1]
+    try:
+        broadcast = np.broadcast_to(covariance, shape + (size,))
+    except ValueError:
+        raise ValueError(f"Expected ({size}, {size}) covariances for values of shape "
+                         f"{shape}, got shape {covariance.shape}.") from None
+    # Checked before broadcasting, so a shared covariance is decomposed only once.
+    if not np.isfinite(covariance).all():
+        raise ValueError("Covariances must be finite.")
+    scale = np.abs(covariance).max(initial=0.0)
+    if not np.allclose(covariance, np.swapaxes(covariance, -1, -2), rtol=0.0,
+                       atol=_PSD_TOLERANCE * scale):
+        raise ValueError("Covariances must be symmetric.")
+    eigenvalues = np.linalg.eigvalsh(covariance)
+    floor = -_PSD_TOLERANCE * np.abs(eigenvalues).max(axis=-1, keepdims=True)
+    if (eigenvalues < floor).any():
+        raise ValueError("Covariances must be positive semi-definite.")
+    return broadcast
+
+
+def _square_root(covariance: np.ndarray) -> np.ndarray:
+    """
+    Factors ``C = L Lᵀ`` from the eigendecomposition.
+
+    Unlike a Cholesky factor this also works for singular covariances, such as a
+    position known only in direction; eigenvalues that :func:`check_covariance`
+    let through as round-off are clipped to zero.
+    """
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))[..., None, :]
+
+
+def draw_samples(mean: ArrayLike, covariance: ArrayLike, samples: int,
+                 rng: np.random.Generator) -> np.ndarray:
+    """
+    Draws Gaussian samples around every value.
+
+    Parameters
+    ----------
+    mean : array_like
+        ``(..., d)`` values.
+    covariance : array_like
+        Matching ``(..., d, d)`` covariances, already validated.
+    samples : int
+        Samples per value.
+    rng : numpy.random.Generator
+        Source of the standard normal deviates.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(..., samples, d)`` samples.
+    """
+    mean = np.asarray(mean, dtype=np.float64)
+    factor = _square_root(np.asarray(covariance, dtype=np.float64))
+    deviates = rng.standard_normal(mean.shape[:-1] + (samples, mean.shape[-1]))
+    drawn = deviates @ np.swapaxes(factor, -1, -2)
+    drawn += mean[..., None, :]
+    return drawn
+
+
+def deviation_statistics(deviations: np.ndarray) -> Estimate:
+    """
+    Mean and unbiased covariance of ``(..., K, d)`` deviations from a reference point.
+
+    The covariance comes from the raw second moments in one matrix product, with
+    no centred copy of the samples; that is accurate as long as the reference is
+    close to the mean compared with the spread, e.g. the nominal result.
+    """
+    count = deviations.shape[-2]
+    offset = deviations.mean(axis=-2)
+    covariance = np.swapaxes(deviations, -1, -2) @ deviations
+    covariance -= count * offset[..., :, None] * offset[..., None, :]
+    covariance /= count - 1
+    return Estimate(offset, covariance)
+
+
+def sample_statistics(samples: np.ndarray) -> Estimate:
+    """Mean and unbiased covariance over the second-to-last axis of ``(..., K, d)`` samples."""
+    reference = samples[..., :1, :]
+    offset, covariance = deviation_statistics(samples - reference)
+    return Estimate(reference[..., 0, :] + offset, covariance)
+
+
+def linear_covariance(jacobian: np.ndarray, covariance: np.ndarray) -> np.ndarray:
+    """First-order propagation ``J C Jᵀ`` over stacks of matrices."""
+    return jacobian @ covariance @ np.swapaxes(jacobian, -1, -2)
+
+
+def check_samples(samples: int) -> int:
+    if int(samples) < 2:
+        raise ValueError("Monte Carlo propagation needs at least two samples.")
+    return int(samples)
@@ -0,0 +1,306 @@
+"""
+Rise, set and transit times and visibility windows.
+
+For a catalog of fixed targets (J2000 RA/Dec) seen from one site over a span of
+nights, :func:`visibility` returns every rise, set and upper transit, and the
+windows in which each target is above an altitude threshold – optionally only
+while the Sun is below a twilight limit.
+
+Every event is a sign change of a dot product. With ``u`` a target's J2000 unit
+vector, ``Z(t)`` the site's zenith and ``E(t)`` its east point, both expressed in
+J2000 equatorial, the target is above altitude ``h₀`` where ``u·Z − sin h₀ ≥ 0``,
+and it transits where ``u·E`` turns from positive (east of the meridian) to
+negative. The axes are computed once per sample of a coarse time grid, so the
+whole targets × samples table is one matrix product, evaluated a block of
+targets at a time.
+
+Each sign change brackets one event. Inside a bracket the precession-nutation
+rotation is frozen at its value at the bracket start (it moves by milliarcseconds
+per step) and the sidereal angle advances linearly, so the dot products are a
+few trigonometric terms; all brackets are bisected together to ``tolerance``.
+The Sun moves, so its direction of date is interpolated linearly across the
+bracket instead.
+
+Events closer together than ``step`` can be missed in pairs: a target peaking
+less than a step's worth of altitude above ``h₀`` may show no window at all.
+Times are Julian Dates in UT1 (see :mod:`app.services.calculations.horizon`);
+refraction is not modelled, so pass ``h₀ = −0.5667°`` for the apparent rise and
+set of a star, and ``max_sun_altitude = −18`` for astronomical night.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.models.coordinates_systems import Plane
+from app.services.calculations import planetary_ephemeris, precession
+from app.services.calculations.horizon import (
+    DELTA_T,
+    SECONDS_PER_DAY,
+    ObserverSite,
+    _check_site,
+    sidereal_time,
+)
+
+# Default grid spacing and event tolerance, in days.
+DEFAULT_STEP = 10.0 / 1440.0
+DEFAULT_TOLERANCE = 1.0 / SECONDS_PER_DAY
+
+# Entries of the targets × samples table evaluated at once.
+_BLOCK_ENTRIES = 1 << 22
+
+
+class Events(NamedTuple):
+    """Events sorted by target, then time."""
+    target: np.ndarray
+    time: np.ndarray
+    altitude: np.ndarray  # degrees
+
+
+class Windows(NamedTuple):
+    """Intervals ``[start, end]`` sorted by target, then start."""
+    target: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+
+
+class VisibilityResult(NamedTuple):
+    rises: Events
+    sets: Events
+    transits: Events
+    windows: Windows
+
+
+class _Grid(NamedTuple):
+    """The coarse time grid and the site's axes at every sample."""
+    times: np.ndarray
+    rotation: np.ndarray  # J2000 → true equator of date
+    theta: np.ndarray  # unwrapped local sidereal angle
+    zenith: np.ndarray  # J2000 unit vectors
+    east: np.ndarray
+
+
+class _Brackets(NamedTuple):
+    """Sign changes between samples ``k`` and ``k + 1``; ``v`` are directions of date."""
+    target: np.ndarray
+    sample: np.ndarray
+    v_lo: np.ndarray
+    v_hi: np.ndarray
+    rising: np.ndarray
+
+
+def _grid(site: ObserverSite, start: float, end: float, step: float,
+          delta_t: float) -> _Grid:
+    times = np.append(start + step * np.arange(int(np.ceil((end - start) / step))), end)
+    rotation = precession.rotation_matrices(Plane.EQUATORIAL, times + delta_t / SECONDS_PER_DAY)
+    theta = np.unwrap(sidereal_time(times, site.longitude, delta_t))
+    phi = np.radians(site.latitude)
+    zenith = np.column_stack([np.cos(phi) * np.cos(theta), np.cos(phi) * np.sin(theta),
+                              np.full_like(theta, np.sin(phi))])
+    east = np.column_stack([-np.sin(theta), np.cos(theta), np.zeros_like(theta)])
+    # Axes of date back to J2000: R⁻¹ = Rᵀ.
+    return _Grid(times, rotation, theta, np.einsum("kji,kj->ki", rotation, zenith),
+                 np.einsum("kji,kj->ki", rotation, east))
+
+
+def _sign_changes(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rows, columns and directions of the sign changes between adjacent columns."""
+    positive = values >= 0.0
+    row, column = np.nonzero(positive[:, :-1] != positive[:, 1:])
+    return row, column, positive[row, column + 1]
+
+
+def _brackets(directions: np.ndarray, grid: _Grid, row: np.ndarray, column: np.ndarray,
+              rising: np.ndarray, moving: bool = False) -> _Brackets:
+    if moving:
+        u_lo, u_hi = directions[column], directions[column + 1]
+    else:
+        u_lo = u_hi = directions[row]
+    return _Brackets(row, column, np.einsum("kij,kj->ki", grid.rotation[column], u_lo),
+                     np.einsum("kij,kj->ki", grid.rotation[column + 1], u_hi), rising)
+
+
+def _sine_altitude(v: np.ndarray, theta: np.ndarray, phi: float) -> np.ndarray:
+    return (np.cos(phi) * (v[:, 0] * np.cos(theta) + v[:, 1] * np.sin(theta))
+            + np.sin(phi) * v[:, 2])
+
+
+def _east(v: np.ndarray, theta: np.ndarray) -> np.ndarray:
+    return v[:, 1] * np.cos(theta) - v[:, 0] * np.sin(theta)
+
+
+def _refine(brackets: _Brackets, grid: _Grid, function, offset: float,
+            tolerance: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bisect every bracket at once for the root of ``function(v, θ) − offset``.
+
+    Returns the event times, with the direction of date and the sidereal angle at
+    each of them.
+    """
+    k = brackets.sample
+    t_lo, span = grid.times[k], grid.times[k + 1] - grid.times[k]
+    theta_lo, sweep = grid.theta[k], grid.theta[k + 1] - grid.theta[k]
+    lo, hi = np.zeros(k.size), np.ones(k.size)
+    # Inside the bracket the function rises through zero for rising brackets.
+    sign = np.where(brackets.rising, 1.0, -1.0)
+    iterations = int(np.ceil(np.log2(max(span.max(initial=0.0) / tolerance, 1.0))))
+    for _ in range(iterations):
+        middle = 0.5 * (lo + hi)
+        v = brackets.v_lo + middle[:, None] * (brackets.v_hi - brackets.v_lo)
+        above = sign * (function(v, theta_lo + middle * sweep) - offset) >= 0.0
+        hi = np.where(above, middle, hi)
+        lo = np.where(above, lo, middle)
+    fraction = 0.5 * (lo + hi)
+    v = brackets.v_lo + fraction[:, None] * (brackets.v_hi - brackets.v_lo)
+    return t_lo + fraction * span, v, theta_lo + fraction * sweep
+
+
+def _windows(target: np.ndarray, above_start: np.ndarray, above_end: np.ndarray,
+             rise_target: np.ndarray, rise_time: np.ndarray,
+             set_target: np.ndarray, set_time: np.ndarray,
+             start: float, end: float) -> Windows:
+    """Pair the up- and down-crossings of each target into intervals."""
+    opened = np.flatnonzero(above_start)
+    closed = np.flatnonzero(above_end)
+    starts_target = np.concatenate([target[opened], rise_target])
+    starts = np.concatenate([np.full(opened.size, start), rise_time])
+    ends_target = np.concatenate([target[closed], set_target])
+    ends = np.concatenate([np.full(closed.size, end), set_time])
+    # Up- and down-crossings alternate on the grid, so sorted they pair one to one.
+    first = np.lexsort((starts, starts_target))
+    last = np.lexsort((ends, ends_target))
+    return Windows(starts_target[first], starts[first], ends[last])
+
+
+def _intersect(windows: Windows, night: Windows) -> Windows:
+    """Intersect each window with the (sorted, disjoint) night intervals."""
+    first = np.searchsorted(night.end, windows.start, side="right")
+    count = np.maximum(np.searchsorted(night.start, windows.end, side="left") - first, 0)
+    owner = np.repeat(np.arange(count.size), count)
+    index = np.repeat(first, count) + np.arange(owner.size) - np.repeat(np.cumsum(count) - count,
+                                                                       count)
+    start = np.maximum(windows.start[owner], night.start[index])
+    end = np.minimum(windows.end[owner], night.end[index])
+    keep = end > start
+    return Windows(windows.target[owner][keep], start[keep], end[keep])
+
+
+def _sun_directions(times: np.ndarray, delta_t: float) -> np.ndarray:
+    earth = planetary_ephemeris.heliocentric_position(
+        "earth", times + delta_t / SECONDS_PER_DAY, Plane.EQUATORIAL)
+    return -earth / np.linalg.norm(earth, axis=1, keepdims=True)
+
+
+def _nights(grid: _Grid, phi: float, max_sun_altitude: float, start: float, end: float,
+            tolerance: float, delta_t: float) -> Windows:
+    sun = _sun_directions(grid.times, delta_t)
+    offset = np.sin(np.radians(max_sun_altitude))
+    # Night is where the Sun is *below* the limit: track the negated altitude function.
+    dark = (offset - np.einsum("ki,ki->k", sun, grid.zenith))[None]
+    row, column, rising = _sign_changes(dark)
+    brackets = _brackets(sun, grid, row, column, rising, moving=True)
+    time, _, _ = _refine(brackets, grid, lambda v, theta: -_sine_altitude(v, theta, phi),
+                         -offset, tolerance)
+    return _windows(np.zeros(1, dtype=np.int64), dark[:, 0] >= 0.0, dark[:, -1] >= 0.0,
+                    row[rising], time[rising], row[~rising], time[~rising], start, end)
+
+
+def visibility(
+    ra: ArrayLike,
+    dec: ArrayLike,
+    site: ObserverSite,
+    start: float,
+    end: float,
+    min_altitude: float = 0.0,
+    max_sun_altitude: float | None = None,
+    step: float = DEFAULT_STEP,
+    tolerance: float = DEFAULT_TOLERANCE,
+    delta_t: float = DELTA_T,
+) -> VisibilityResult:
+    """
+    Rise, set and transit times and visibility windows of fixed targets.
+
+    Parameters
+    ----------
+    ra, dec : array_like
+        ``(n,)`` J2000 right ascensions and declinations in degrees.
+    site : ObserverSite
+        The observer.
+    start, end : float
+        Julian Dates (UT1) bounding the search.
+    min_altitude : float, default 0.0
+        Altitude threshold in degrees; rises and sets are its crossings.
+    max_sun_altitude : float, optional
+        When given, windows are clipped to the times the Sun is below this
+        altitude in degrees. Events are reported regardless.
+    step : float, default DEFAULT_STEP
+        Spacing of the coarse grid in days (10 minutes).
+    tolerance : float, default DEFAULT_TOLERANCE
+        Bracket width at which the bisection stops, in days (1 second).
+    delta_t : float, default DELTA_T
+        TT − UT1 in seconds.
+
+    Returns
+    -------
+    VisibilityResult
+        Rises, sets and upper transits with the altitude at each, and the windows
+        above ``min_altitude``. Targets are indexed by their position in ``ra``.
+    """
+    ra = np.radians(np.atleast_1d(np.asarray(ra, dtype=np.float64)))
+    dec = np.radians(np.atleast_1d(np.asarray(dec, dtype=np.float64)))
+    if ra.ndim != 1 or ra.shape != dec.shape or not ra.size:
+        raise ValueError(f"Expected matching non-empty (n,) ra and dec, "
+                         f"got {ra.shape} and {dec.shape}.")
+    _check_site(site)
+    if not end > start:
+        raise ValueError("end must be after start.")
+    if not step > 0.0 or not tolerance > 0.0:
+        raise ValueError("step and tolerance must be positive.")
+    if not -90.0 < min_altitude < 90.0:
+        raise ValueError(f"min_altitude must be within ±90°, got {min_altitude}.")
+
+    grid = _grid(site, start, end, step, delta_t)
+    phi = np.radians(site.latitude)
+    offset = np.sin(np.radians(min_altitude))
+    targets = np.column_stack([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)])
+    targets_block = max(1, _BLOCK_ENTRIES // grid.times.size)
+
+    crossings, meridian = [], []
+    above_start, above_end = [], []
+    for first in range(0, targets.shape[0], targets_block):
+        block = targets[first:first + targets_block]
+        altitude = block @ grid.zenith.T - offset
+        above_start.append(altitude[:, 0] >= 0.0)
+        above_end.append(altitude[:, -1] >= 0.0)
+        row, column, rising = _sign_changes(altitude)
+        crossings.append((row + first, column, rising))
+        row, column, rising = _sign_changes(block @ grid.east.T)
+        # Upper transits only: east of the meridian to west of it.
+        meridian.append((row[~rising] + first, column[~rising], rising[~rising]))
+
+    row, column, rising = (np.concatenate(parts) for parts in zip(*crossings))
+    brackets = _brackets(targets, grid, row, column, rising)
+    time, v, theta = _refine(brackets, grid, lambda v, theta: _sine_altitude(v, theta, phi),
+                             offset, tolerance)
+    altitude = np.degrees(np.arcsin(np.clip(_sine_altitude(v, theta, phi), -1.0, 1.0)))
+    events = []
+    for mask in (rising, ~rising):
+        order = np.lexsort((time[mask], row[mask]))
+        events.append(Events(row[mask][order], time[mask][order], altitude[mask][order]))
+    rises, sets = events
+
+    row, column, rising = (np.concatenate(parts) for parts in zip(*meridian))
+    brackets = _brackets(targets, grid, row, column, rising)
+    time, v, theta = _refine(brackets, grid, _east, 0.0, tolerance)
+    altitude = np.degrees(np.arcsin(np.clip(_sine_altitude(v, theta, phi), -1.0, 1.0)))
+    order = np.lexsort((time, row))
+    transits = Events(row[order], time[order], altitude[order])
+
+    windows = _windows(np.arange(targets.shape[0]), np.concatenate(above_start),
+                       np.concatenate(above_end), rises.target, rises.time,
+                       sets.target, sets.time, start, end)
+    if max_sun_altitude is not None:
+        windows = _intersect(windows, _nights(grid, phi, max_sun_altitude, start, end,
+                                              tolerance, delta_t))
+    return VisibilityResult(rises, sets, transits, windows)
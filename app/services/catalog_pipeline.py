@@ -0,0 +1,410 @@
+"""
+Chunked transformation of catalog files.
+
+Streams a star or asteroid catalog from disk through the same coordinate and
+orbit services the API uses, and writes the result to disk, a chunk of rows at a
+time, so catalogs larger than memory go through in bounded memory:
+
+- :func:`read_chunks` – ``(rows, columns)`` float64 chunks from a CSV, Parquet or
+  ``.npy`` file; ``.npy`` inputs are memory-mapped, CSV and Parquet are streamed
+- :func:`coordinate_transform` / :func:`propagation_transform` – the per-chunk
+  computation, a :class:`CatalogTransform`
+- :func:`open_writer` – a ``.npy`` or Parquet writer for the output columns
+- :func:`run` – the pipeline; a reader thread parses the next chunks while the
+  current one is computed and written
+
+A ``.npy`` output is a structured array with one float64 field per output
+column, written sequentially and finished by rewriting its header, so it opens
+memory-mapped with ``np.load(path, mmap_mode="r")``. Parquet input and output
+need the optional ``pyarrow`` package. The command line entry point is
+``transform_catalog.py`` in the project root.
+"""
+
+import csv
+import itertools
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from app.models.coordinates_systems import Origin, Plane, Shape
+from app.services import parallel
+from app.services.calculations.orbital_elements import ELEMENT_NAMES
+from app.services.calculations.orbital_mechanics import GM_SUN
+from app.utils.math_helpers import deg_to_rad
+
+# Rows per chunk: a few megabytes per column, and enough work per chunk for the
+# worker pool to pay off.
+DEFAULT_CHUNK_ROWS = 262_144
+
+# Chunks the reader thread may parse ahead of the computation.
+DEFAULT_PREFETCH = 2
+
+SUFFIXES = (".csv", ".parquet", ".npy")
+
+# Output column names per target shape of a coordinate transform.
+COORDINATE_COLUMNS = {
+    Shape.RECTANGULAR: ("x", "y", "z"),
+    Shape.SPHERICAL: ("lon_or_ra", "lat_or_dec", "distance"),
+}
+
+STATE_COLUMNS = ("x", "y", "z", "vx", "vy", "vz")
+
+# Element angles (i, Ω, ω, M) in ELEMENT_NAMES order.
+_ANGLE_COLUMNS = slice(2, 6)
+
+# .npy format 1.0: magic string and version, then a little-endian uint16 header length.
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_NPY_ALIGNMENT = 64
+
+
+class CatalogTransform(NamedTuple):
+    """Maps an ``(n, len(inputs))`` chunk to an ``(n, len(outputs))`` one."""
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+    function: Callable[[np.ndarray], np.ndarray]
+
+
+class PipelineStats(NamedTuple):
+    rows: int
+    chunks: int
+    seconds: float
+    read_wait_seconds: float  # time the computation spent waiting for the reader
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _suffix(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix not in SUFFIXES:
+        raise ValueError(f"Unsupported catalog format '{path.suffix}'; "
+                         f"expected one of {', '.join(SUFFIXES)}.")
+    return suffix
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("The 'pyarrow' package is required for Parquet files.") from None
+    return pyarrow
+
+
+def _missing(columns: Sequence[str], available: Sequence[str]) -> None:
+    missing = [name for name in columns if name not in available]
+    if missing:
+        raise ValueError(f"Columns not in the catalog: {', '.join(missing)}; "
+                         f"available: {', '.join(available)}.")
+
+
+def _read_csv(path: Path, columns: Sequence[str], chunk_rows: int) -> Iterator[np.ndarray]:
+    with open(path, newline="") as file:
+        header = next(csv.reader([file.readline()]), [])
+        names = [name.strip() for name in header]
+        _missing(columns, names)
+        usecols = [names.index(name) for name in columns]
+        while lines := list(itertools.islice(file, chunk_rows)):
+            chunk = np.loadtxt(lines, delimiter=",", usecols=usecols, dtype=np.float64,
+                               ndmin=2, quotechar='"')
+            if chunk.shape[0]:
+                yield chunk
+
+
+def _read_parquet(path: Path, columns: Sequence[str], chunk_rows: int) -> Iterator[np.ndarray]:
+    pa = _require_pyarrow()
+    parquet = pa.parquet.ParquetFile(path)
+    _missing(columns, parquet.schema_arrow.names)
+    for batch in parquet.iter_batches(batch_size=chunk_rows, columns=list(columns)):
+        chunk = np.empty((batch.num_rows, len(columns)))
+        for index, name in enumerate(columns):
+            column = batch.column(name)
+            if column.null_count:
+                raise ValueError(f"Column '{name}' contains nulls.")
+            chunk[:, index] = column.to_numpy(zero_copy_only=False)
+        yield chunk
+
+
+def _read_npy(path: Path, columns: Sequence[str], chunk_rows: int) -> Iterator[np.ndarray]:
+    array = np.load(path, mmap_mode="r")
+    if array.dtype.names:
+        _missing(columns, array.dtype.names)
+    elif array.ndim == 2:
+        # Plain 2-D arrays have no names; columns are given by position.
+        _missing(columns, [str(index) for index in range(array.shape[1])])
+        usecols = [int(name) for name in columns]
+    else:
+        raise ValueError(f"Expected a structured or 2-D .npy array, got shape {array.shape}.")
+    for start in range(0, array.shape[0], chunk_rows):
+        # Only the pages of this chunk are read from disk.
+        rows = array[start:start + chunk_rows]
+        if array.dtype.names:
+            yield np.column_stack([rows[name] for name in columns]).astype(np.float64)
+        else:
+            yield rows[:, usecols].astype(np.float64)
+
+
+_READERS = {".csv": _read_csv, ".parquet": _read_parquet, ".npy": _read_npy}
+
+
+def read_chunks(path: str | Path, columns: Sequence[str],
+                chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[np.ndarray]:
+    """
+    Read columns of a catalog file a chunk of rows at a time.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        A ``.csv`` (comma separated, one header line), ``.parquet`` or ``.npy``
+        (structured, or 2-D with columns named ``"0"``, ``"1"``, ...) file.
+    columns : sequence of str
+        Names of the numeric columns to read, in output order.
+    chunk_rows : int
+        Rows per chunk; the last chunk may be shorter.
+
+    Returns
+    -------
+    iterator of numpy.ndarray
+        ``(rows, len(columns))`` float64 chunks.
+
+    Raises
+    ------
+    ValueError
+        For an unsupported format, a missing column, or a value that is not a
+        number (raised when the chunk holding it is read).
+    """
+    path = Path(path)
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be positive.")
+    return _READERS[_suffix(path)](path, list(columns), chunk_rows)
+
+
+def coordinate_transform(source_shape: Shape, source_plane: Plane, source_origin: Origin,
+                         target_shape: Shape, target_plane: Plane, target_origin: Origin,
+                         source_equinox: float | None = None,
+                         target_equinox: float | None = None,
+                         epoch: float | None = None) -> CatalogTransform:
+    """
+    Coordinate conversion of three input columns, as in the batch API.
+
+    Inputs are the columns of ``source_shape`` (see :data:`COORDINATE_COLUMNS`);
+    the arguments are those of
+    :func:`~app.services.parallel.transform_coordinates`, shared by every row.
+    """
+    def function(chunk: np.ndarray) -> np.ndarray:
+        return parallel.transform_coordinates(
+            chunk, source_shape, source_plane, source_origin,
+            target_shape, target_plane, target_origin,
+            source_equinox=source_equinox, target_equinox=target_equinox, epoch=epoch)
+
+    return CatalogTransform(COORDINATE_COLUMNS[source_shape], COORDINATE_COLUMNS[target_shape],
+                            function)
+
+
+def propagation_transform(epoch: float | None, target_epoch: float, gm: float = GM_SUN,
+                          degrees: bool = False) -> CatalogTransform:
+    """
+    Propagation of Keplerian elements to one epoch, giving state vectors.
+
+    Parameters
+    ----------
+    epoch : float or None
+        Epoch of every row's elements, or None to read it from a seventh input
+        column named ``epoch``.
+    target_epoch : float
+        Epoch of the output states.
+    gm : float, default GM_SUN
+        Gravitational parameter, fixing the units as in
+        :func:`~app.services.calculations.orbital_elements.propagate_elements`.
+    degrees : bool, default False
+        The angle columns (i, Ω, ω, M) are in degrees rather than radians.
+    """
+    inputs = ELEMENT_NAMES if epoch is not None else ELEMENT_NAMES + ("epoch",)
+
+    def function(chunk: np.ndarray) -> np.ndarray:
+        elements = chunk[:, :6]
+        if degrees:
+            deg_to_rad(elements[:, _ANGLE_COLUMNS], out=elements[:, _ANGLE_COLUMNS])
+        epochs = chunk[:, 6] if epoch is None else epoch
+        return parallel.propagate(elements, epochs, (target_epoch,), gm=gm)[:, 0, :]
+
+    return CatalogTransform(inputs, STATE_COLUMNS, function)
+
+
+class NpyWriter:
+    """
+    Writes rows of named float64 columns to a structured ``.npy`` file.
+
+    The header is sized for any row count up front and rewritten with the real
+    count by :meth:`close`, so rows are appended without knowing the total.
+    """
+
+    def __init__(self, path: str | Path, columns: Sequence[str]):
+        self.path = Path(path)
+        self.dtype = np.dtype([(name, "<f8") for name in columns])
+        self.rows = 0
+        # Room for the longest row count an int64 can hold.
+        self._header_size = -(-(len(_NPY_MAGIC) + 2 + len(self._header_text(2 ** 63)) + 1)
+                              // _NPY_ALIGNMENT) * _NPY_ALIGNMENT
+        self._file = open(self.path, "wb")
+        self._file.write(self._header(0))
+
+    def _header_text(self, rows: int) -> bytes:
+        return repr({"descr": np.lib.format.dtype_to_descr(self.dtype),
+                     "fortran_order": False, "shape": (rows,)}).encode("latin1")
+
+    def _header(self, rows: int) -> bytes:
+        text = self._header_text(rows)
+        length = self._header_size - len(_NPY_MAGIC) - 2
+        return _NPY_MAGIC + length.to_bytes(2, "little") + text.ljust(length - 1) + b"\n"
+
+    def write(self, chunk: np.ndarray) -> None:
+        # A C-ordered (n, k) float64 block has the byte layout of n records of k fields.
+        np.ascontiguousarray(chunk, dtype="<f8").tofile(self._file)
+        self.rows += chunk.shape[0]
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(self._header(self.rows))
+        self._file.close()
+
+
+class ParquetWriter:
+    """Writes rows of named float64 columns to a Parquet file, a row group per chunk."""
+
+    def __init__(self, path: str | Path, columns: Sequence[str]):
+        self._pa = _require_pyarrow()
+        self.columns = list(columns)
+        self.rows = 0
+        schema = self._pa.schema([(name, self._pa.float64()) for name in self.columns])
+        self._writer = self._pa.parquet.ParquetWriter(str(path), schema)
+
+    def write(self, chunk: np.ndarray) -> None:
+        self._writer.write_table(self._pa.table(
+            {name: chunk[:, index] for index, name in enumerate(self.columns)}))
+        self.rows += chunk.shape[0]
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def open_writer(path: str | Path, columns: Sequence[str]) -> NpyWriter | ParquetWriter:
+    """Open a ``.npy`` or ``.parquet`` writer for ``columns``, chosen by the suffix."""
+    path = Path(path)
+    suffix = _suffix(path)
+    if suffix == ".npy":
+        return NpyWriter(path, columns)
+    if suffix == ".parquet":
+        return ParquetWriter(path, columns)
+    raise ValueError("Output must be a .npy or .parquet file.")
+
+
+def _prefetch(chunks: Iterator[np.ndarray], depth: int) -> Iterator[np.ndarray]:
+    """Iterate ``chunks`` on a reader thread, keeping up to ``depth`` chunks ready."""
+    ready: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def read() -> None:
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+        except BaseException as error:  # re-raised on the consuming thread
+            put(error)
+            return
+        put(done)
+
+    reader = threading.Thread(target=read, name="catalog-reader", daemon=True)
+    reader.start()
+    try:
+        while (item := ready.get()) is not done:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Unblocks the reader if the consumer stops early.
+        stop.set()
+        reader.join()
+
+
+def run(source: str | Path, destination: str | Path, transform: CatalogTransform,
+        columns: Sequence[str] | None = None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        prefetch: int = DEFAULT_PREFETCH,
+        progress: Callable[[PipelineStats], None] | None = None) -> PipelineStats:
+    """
+    Transform a catalog file into an output file, a chunk at a time.
+
+    Parameters
+    ----------
+    source, destination : str or pathlib.Path
+        Input catalog and output file (``.npy`` or ``.parquet``).
+    transform : CatalogTransform
+        The computation applied to every chunk.
+    columns : sequence of str, optional
+        Input columns feeding ``transform.inputs``, in the same order; defaults to
+        columns named like the inputs.
+    chunk_rows : int
+        Rows per chunk.
+    prefetch : int
+        Chunks the reader thread may read ahead.
+    progress : callable, optional
+        Called with the running :class:`PipelineStats` after every chunk.
+
+    Returns
+    -------
+    PipelineStats
+        Rows and chunks processed and the time taken.
+    """
+    columns = list(transform.inputs if columns is None else columns)
+    if len(columns) != len(transform.inputs):
+        raise ValueError(f"Expected {len(transform.inputs)} input columns "
+                         f"({', '.join(transform.inputs)}), got {len(columns)}.")
+    if prefetch < 1:
+        raise ValueError("prefetch must be positive.")
+    if Path(source).resolve() == Path(destination).resolve():
+        raise ValueError("The output file must differ from the input file.")
+
+    chunks = read_chunks(source, columns, chunk_rows)
+    start = time.perf_counter()
+    rows = count = 0
+    waited = 0.0
+    writer = open_writer(destination, transform.outputs)
+    iterator = _prefetch(chunks, prefetch)
+    try:
+        while True:
+            wait_start = time.perf_counter()
+            chunk = next(iterator, None)
+            waited += time.perf_counter() - wait_start
+            if chunk is None:
+                break
+            writer.write(transform.function(chunk))
+            rows += chunk.shape[0]
+            count += 1
+            if progress is not None:
+                progress(PipelineStats(rows, count, time.perf_counter() - start, waited))
+    except BaseException:
+        # A failed run leaves no partial output behind.
+        iterator.close()
+        writer.close()
+        Path(destination).unlink(missing_ok=True)
+        raise
+    writer.close()
+    return PipelineStats(rows, count, time.perf_counter() - start, waited)
@@ -0,0 +1,383 @@
+"""
+Memory-mapped store of Chebyshev-compressed ephemerides.
+
+Propagated orbits are saved as per-object Chebyshev segments in one binary file
+and served straight from the page cache: a reader maps the file read-only, finds
+the segment for an epoch by binary search over the segment start times and
+evaluates its coefficients, touching only the pages it needs. Every process that
+opens the same file (e.g. several uvicorn workers) shares the cached pages, so a
+large dataset is held in memory once per host rather than once per worker.
+
+File layout (all numbers little-endian)::
+
+    b"CEF1" | uint32 header length | UTF-8 JSON header (space padded)
+    | starts   float64[segments]
+    | ends     float64[segments]
+    | coefficients float64[segments, degree + 1, components]
+
+The JSON header holds ``version``, ``degree``, ``components``, ``segments`` and
+``objects``, mapping each object name to ``[first segment, segment count]``,
+plus free-form ``metadata``. An object's segments are consecutive and sorted by
+start time. The header is padded so the arrays start on an 8-byte boundary.
+
+- :class:`EphemerisStoreWriter` – writes a store object by object
+- :func:`build_store` – propagates Keplerian elements and writes their segments
+- :class:`EphemerisStore` – the memory-mapped reader
+
+Epochs use whatever time unit the segments were built with; :func:`build_store`
+uses the unit of ``gm`` (seconds for the default SI value), like
+:func:`~app.services.calculations.orbital_elements.propagate_elements`.
+"""
+
+import json
+import struct
+from collections.abc import Mapping, Sequence
+from os import PathLike
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.services.calculations.orbital_elements import (
+    PROPAGATION_CHUNK_OBJECTS,
+    propagate_elements,
+)
+from app.services.calculations.orbital_mechanics import GM_SUN
+from app.utils import chebyshev
+
+STORE_MAGIC = b"CEF1"
+STORE_VERSION = 1
+_PREFIX = struct.Struct("<4sI")
+
+# Default polynomial degree per segment.
+DEFAULT_DEGREE = 12
+
+
+def _encode_header(header: dict) -> bytes:
+    text = json.dumps(header).encode()
+    text += b" " * (-(_PREFIX.size + len(text)) % 8)
+    return _PREFIX.pack(STORE_MAGIC, len(text)) + text
+
+
+def _read_header(path: str | PathLike) -> tuple[dict, int]:
+    """Return the JSON header of a store and the offset of its first array."""
+    with open(path, "rb") as handle:
+        prefix = handle.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError("Not an ephemeris store: the file is truncated.")
+        magic, length = _PREFIX.unpack(prefix)
+        if magic != STORE_MAGIC:
+            raise ValueError("Not an ephemeris store: bad magic bytes.")
+        try:
+            header = json.loads(handle.read(length))
+        except ValueError as exc:
+            raise ValueError(f"Corrupt ephemeris store header: {exc}") from exc
+    if header.get("version") != STORE_VERSION:
+        raise ValueError(f"Unsupported ephemeris store version {header.get('version')!r}.")
+    return header, _PREFIX.size + length
+
+
+def _layout(offset: int, segments: int, degree: int, components: int) -> dict:
+    """Offsets and shapes of the three arrays following the header."""
+    coefficient_shape = (segments, degree + 1, components)
+    return {
+        "starts": (offset, (segments,)),
+        "ends": (offset + 8 * segments, (segments,)),
+        "coefficients": (offset + 16 * segments, coefficient_shape),
+    }
+
+
+def _map(path, mode: str, layout: dict) -> dict[str, np.memmap]:
+    return {name: np.memmap(path, dtype="<f8", mode=mode, offset=offset, shape=shape)
+            for name, (offset, shape) in layout.items()}
+
+
+class EphemerisStoreWriter:
+    """
+    Writes an ephemeris store, one object at a time.
+
+    The file is sized up front from the segment counts, then each object's
+    segments are copied into place with :meth:`write`, so memory use stays at
+    one object's coefficients however large the store.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Destination file, overwritten if it exists.
+    segment_counts : Mapping[str, int]
+        Number of segments of every object, in file order.
+    degree : int
+        Polynomial degree of every segment.
+    components : int
+        Values per epoch (e.g. 3 for positions, 6 for full states).
+    metadata : dict, optional
+        JSON-serialisable description stored in the header (units, frame, ...).
+    """
+
+    def __init__(self, path: str | PathLike, segment_counts: Mapping[str, int], degree: int,
+                 components: int, metadata: dict | None = None):
+        if degree < 0 or components < 1:
+            raise ValueError("degree must be non-negative and components positive.")
+        if not segment_counts:
+            raise ValueError("A store needs at least one object.")
+        objects, first = {}, 0
+        for name, count in segment_counts.items():
+            if count < 1:
+                raise ValueError(f"Object {name!r} needs at least one segment.")
+            objects[name] = [first, count]
+            first += count
+
+        self.degree = degree
+        self.components = components
+        self._objects = objects
+        self._written: set[str] = set()
+        header = _encode_header({
+            "version": STORE_VERSION, "degree": degree, "components": components,
+            "segments": first, "objects": objects, "metadata": metadata or {},
+        })
+        layout = _layout(len(header), first, degree, components)
+        with open(path, "wb") as handle:
+            handle.write(header)
+            handle.truncate(len(header) + 8 * first * (2 + (degree + 1) * components))
+        self._arrays = _map(path, "r+", layout)
+
+    def write(self, name: str, starts: ArrayLike, ends: ArrayLike,
+              coefficients: ArrayLike) -> None:
+        """
+        Store the segments of one object.
+
+        Parameters
+        ----------
+        name : str
+            An object announced in ``segment_counts``.
+        starts, ends : array_like
+            ``(count,)`` segment boundaries; starts must be increasing and each
+            segment must end after it starts and no later than the next one starts.
+        coefficients : array_like
+            ``(count, degree + 1, components)`` coefficients, for the normalized
+            abscissa ``tau = (2 t - start - end) / (end - start)``.
+        """
+        if name not in self._objects:
+            raise ValueError(f"Unknown object {name!r}.")
+        if name in self._written:
+            raise ValueError(f"Object {name!r} has already been written.")
+        first, count = self._objects[name]
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        coefficients = np.asarray(coefficients, dtype=np.float64)
+        if starts.shape != (count,) or ends.shape != (count,):
+            raise ValueError(f"Expected {count} segment starts and ends for {name!r}.")
+        if coefficients.shape != (count, self.degree + 1, self.components):
+            raise ValueError(f"Expected coefficients of shape "
+                             f"{(count, self.degree + 1, self.components)}, "
+                             f"got {coefficients.shape}.")
+        if np.any(ends <= starts) or np.any(starts[1:] < ends[:-1]):
+            raise ValueError("Segments must be non-empty, sorted and non-overlapping.")
+
+        rows = slice(first, first + count)
+        self._arrays["starts"][rows] = starts
+        self._arrays["ends"][rows] = ends
+        self._arrays["coefficients"][rows] = coefficients
+        self._written.add(name)
+
+    def close(self) -> None:
+        """Flush the file; raises if an announced object was never written."""
+        for array in self._arrays.values():
+            array.flush()
+        self._arrays = {}
+        missing = self._objects.keys() - self._written
+        if missing:
+            raise ValueError(f"Objects never written: {', '.join(sorted(missing))}.")
+
+    def __enter__(self) -> "EphemerisStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._arrays = {}
+
+
+def build_store(path: str | PathLike, names: Sequence[str], elements: ArrayLike,
+                epoch: ArrayLike, start: float, end: float, segment_length: float,
+                degree: int = DEFAULT_DEGREE, gm: float = GM_SUN,
+                metadata: dict | None = None,
+                chunk_objects: int = PROPAGATION_CHUNK_OBJECTS) -> None:
+    """
+    Propagate two-body orbits over ``[start, end]`` and store them as Chebyshev segments.
+
+    Each object gets the same segment grid; the six state components
+    (x, y, z, vx, vy, vz) are fitted together. Segments should be short compared
+    with the orbital periods: a sixth of the shortest period at ``degree=12``
+    keeps the fit error near 1e-9 of the orbit size for moderate eccentricities.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Destination file.
+    names : sequence of str
+        One unique name per object.
+    elements : array_like
+        ``(n_objects, 6)`` elements, as for
+        :func:`~app.services.calculations.orbital_elements.propagate_elements`.
+    epoch : array_like
+        Epoch of the elements, a scalar or one value per object.
+    start, end : float
+        Time span covered by the store.
+    segment_length : float
+        Length of a segment; the last one is shortened to end at ``end``.
+    degree : int
+        Polynomial degree per segment.
+    gm : float
+        Gravitational parameter, which also fixes the length and time units.
+    metadata : dict, optional
+        Extra header entries; ``gm`` is always recorded.
+    chunk_objects : int
+        Objects propagated and fitted per block, bounding memory use.
+    """
+    elements = np.asarray(elements, dtype=np.float64)
+    epoch = np.broadcast_to(np.asarray(epoch, dtype=np.float64), (elements.shape[0],))
+    if elements.ndim != 2 or elements.shape[1] != 6:
+        raise ValueError(f"Expected (n_objects, 6) elements, got shape {elements.shape}.")
+    if len(names) != elements.shape[0] or len(set(names)) != len(names):
+        raise ValueError("Expected one unique name per object.")
+    if end <= start or segment_length <= 0:
+        raise ValueError("Expected end > start and a positive segment_length.")
+
+    edges = np.append(np.arange(start, end, segment_length), end)
+    if edges[-1] - edges[-2] < 1e-9 * segment_length:
+        edges = np.delete(edges, -2)
+    abscissae = chebyshev.segment_nodes(edges, degree)
+    segments = edges.size - 1
+
+    with EphemerisStoreWriter(path, dict.fromkeys(names, segments), degree, components=6,
+                              metadata={"gm": gm, **(metadata or {})}) as writer:
+        for first in range(0, len(names), chunk_objects):
+            block = slice(first, first + chunk_objects)
+            states = propagate_elements(elements[block], epoch[block], abscissae.ravel(), gm=gm)
+            for name, state in zip(names[block], states):
+                coefficients = chebyshev.fit_values(state.reshape(segments, degree + 1, 6))
+                writer.write(name, edges[:-1], edges[1:], coefficients)
+
+
+class EphemerisStore:
+    """
+    Read-only, memory-mapped view of an ephemeris store.
+
+    Opening a store reads only its header; segment boundaries and coefficients
+    stay on disk and are paged in on demand.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        A file written by :class:`EphemerisStoreWriter` or :func:`build_store`.
+    """
+
+    def __init__(self, path: str | PathLike):
+        header, offset = _read_header(path)
+        self.path = path
+        self.degree: int = header["degree"]
+        self.components: int = header["components"]
+        self.metadata: dict = header["metadata"]
+        self._objects: dict[str, tuple[int, int]] = {
+            name: (first, count) for name, (first, count) in header["objects"].items()
+        }
+        layout = _layout(offset, header["segments"], self.degree, self.components)
+        end = max(offset + 8 * int(np.prod(shape)) for offset, shape in layout.values())
+        with open(path, "rb") as handle:
+            if handle.seek(0, 2) < end:
+                raise ValueError("Not an ephemeris store: the file is truncated.")
+        # Plain ndarray views of the maps: same pages, without np.memmap's per-slice overhead.
+        arrays = {name: np.asarray(array) for name, array in _map(path, "r", layout).items()}
+        self._starts = arrays["starts"]
+        self._ends = arrays["ends"]
+        self._coefficients = arrays["coefficients"]
+
+    @property
+    def names(self) -> list[str]:
+        """Names of the stored objects, in file order."""
+        return list(self._objects)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._objects
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def span(self, name: str) -> tuple[float, float]:
+        """Return the first and last epoch covered for ``name``."""
+        first, count = self._object(name)
+        return float(self._starts[first]), float(self._ends[first + count - 1])
+
+    def _object(self, name: str) -> tuple[int, int]:
+        try:
+            return self._objects[name]
+        except KeyError:
+            raise ValueError(f"Unknown object {name!r}.") from None
+
+    def segment_index(self, name: str, t: ArrayLike) -> np.ndarray:
+        """
+        Locate the segments covering epochs ``t`` by binary search.
+
+        Returns
+        -------
+        numpy.ndarray
+            Indices into the store's global segment arrays, shaped like ``t``.
+
+        Raises
+        ------
+        ValueError
+            If an epoch falls outside every segment of ``name``.
+        """
+        first, count = self._object(name)
+        t = np.asarray(t, dtype=np.float64)
+        starts = self._starts[first:first + count]
+        # Epochs before the first start land on segment 0 and fail the coverage check.
+        local = np.maximum(np.searchsorted(starts, t, side="right") - 1, 0)
+        index = first + local
+        covered = (t >= self._starts[index]) & (t <= self._ends[index])
+        if not np.all(covered):
+            raise ValueError(f"Epoch {t[~covered].flat[0]!r} is outside the coverage "
+                             f"of {name!r}.")
+        return index
+
+    def evaluate(self, name: str, t: ArrayLike) -> np.ndarray:
+        """
+        Evaluate the stored series of ``name`` at epochs ``t``.
+
+        Parameters
+        ----------
+        name : str
+            A stored object.
+        t : float or array_like
+            Epochs inside the object's coverage.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(components,)`` for a scalar ``t``, ``(n, components)`` for ``(n,)`` epochs.
+        """
+        scalar = np.ndim(t) == 0
+        t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        index = self.segment_index(name, t)
+        start, end = self._starts[index], self._ends[index]
+        # Rounding can put an epoch on a segment edge just outside [-1, 1].
+        tau = np.clip(2.0 * (t - start) / (end - start) - 1.0, -1.0, 1.0)
+
+        if index.size == 1:
+            values = chebyshev.evaluate(self._coefficients[index[0]], tau)
+        else:
+            # Copy each distinct segment out of the map once.
+            segments, inverse = np.unique(index, return_inverse=True)
+            values = chebyshev.evaluate(self._coefficients[segments][inverse.ravel()], tau)
+        return values[0] if scalar else values
+
+    def close(self) -> None:
+        """Drop the memory maps; they are unmapped once no returned view refers to them."""
+        self._starts = self._ends = self._coefficients = None
+
+    def __enter__(self) -> "EphemerisStore":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
@@ -0,0 +1,395 @@
+"""
+Background jobs for calculations that outlive an HTTP request.
+
+A job is submitted with :meth:`JobManager.submit` and runs later on a bounded
+pool of threads, so the API's event loop only ever awaits it:
+
+- Scheduling – asyncio worker tasks (``JOBS_MAX_CONCURRENT`` of them) take jobs
+  from a priority queue, highest priority first and in submission order within a
+  priority, and hand each to a thread of the manager's executor. Work heavy enough
+  for several cores is further spread over :mod:`app.services.parallel`.
+- Spooling – results are written chunk by chunk into a ``.npy`` file under
+  ``JOBS_SPOOL_DIR`` through a memory map, so a job never holds its whole result
+  in memory, and are read back the same way a page of rows at a time.
+- Progress and cancellation – runners report progress after every chunk of
+  ``JOBS_CHUNK_ROWS`` rows and check for cancellation at the same points.
+  Cancelled and failed jobs leave no result behind.
+
+Finished jobs and their results are discarded ``JOBS_RETENTION_SECONDS`` after
+they end. Job kinds map to *runners* in :data:`RUNNERS`; a runner is called as
+``runner(request, context)`` with a :class:`JobContext`.
+"""
+
+import asyncio
+import itertools
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.core.config import get_settings
+from app.models.jobs import (
+    EphemerisJobRequest,
+    JobInfo,
+    JobResult,
+    JobStatus,
+    PropagationJobRequest,
+)
+from app.services import parallel
+from app.services.calculations.planetary_ephemeris import heliocentric_position
+
+_FINISHED = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobNotFoundError(LookupError):
+    """No job with the given id (it never existed or has been discarded)."""
+
+
+class JobQueueFullError(RuntimeError):
+    """Too many jobs are already waiting to run."""
+
+
+class JobStateError(ValueError):
+    """The job is not in a state that allows the operation."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a runner by :meth:`JobContext.check_cancelled`."""
+
+
+class Job:
+    """Bookkeeping of one job; mutated by the thread running it, read by the API."""
+
+    def __init__(self, kind: str, request: BaseModel, priority: int):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.request = request
+        self.priority = priority
+        self.status = JobStatus.QUEUED
+        self.progress = 0.0
+        self.created_at = datetime.now(UTC)
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.finished_monotonic: float | None = None
+        self.error: str | None = None
+        self.result: JobResult | None = None
+        self.path: Path | None = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+    def info(self) -> JobInfo:
+        return JobInfo(
+            id=self.id, kind=self.kind, status=self.status, priority=self.priority,
+            progress=self.progress, created_at=self.created_at, started_at=self.started_at,
+            finished_at=self.finished_at, error=self.error, result=self.result,
+        )
+
+
+class JobContext:
+    """
+    What a runner may do with its job: allocate the result, report progress and
+    check for cancellation.
+
+    Parameters
+    ----------
+    job : Job
+        The job being run.
+    path : pathlib.Path
+        Where the result is spooled while the job runs.
+    chunk_rows : int
+        Suggested number of result rows per unit of work.
+    """
+
+    def __init__(self, job: Job, path: Path, chunk_rows: int):
+        self.job = job
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.columns: list[str] = []
+        self.array: np.memmap | None = None
+
+    def allocate(self, shape: tuple[int, ...], columns: list[str]) -> np.memmap:
+        """Create the result as a float64 array on disk; rows are its first axis."""
+        self.columns = list(columns)
+        self.array = np.lib.format.open_memmap(self.path, mode="w+", dtype=np.float64,
+                                               shape=shape)
+        return self.array
+
+    def progress(self, done: int, total: int) -> None:
+        """Record that ``done`` of ``total`` units of work are complete."""
+        self.job.progress = done / total if total else 1.0
+
+    def check_cancelled(self) -> None:
+        """Raise :class:`JobCancelled` if cancellation was requested."""
+        if self.job.cancel_event.is_set():
+            raise JobCancelled
+
+
+Runner = Callable[[BaseModel, JobContext], None]
+
+
+def _run_propagation(request: PropagationJobRequest, context: JobContext) -> None:
+    elements = np.asarray(request.elements, dtype=np.float64)
+    epochs = np.asarray(request.epochs, dtype=np.float64)
+    epoch = np.broadcast_to(np.asarray(request.epoch, dtype=np.float64), (elements.shape[0],))
+    out = context.allocate((elements.shape[0], epochs.shape[0], 6),
+                           ["x", "y", "z", "vx", "vy", "vz"])
+    # Chunks of objects worth about chunk_rows states each.
+    step = max(1, context.chunk_rows // epochs.shape[0])
+    for start in range(0, elements.shape[0], step):
+        context.check_cancelled()
+        stop = min(start + step, elements.shape[0])
+        parallel.propagate(elements[start:stop], epoch[start:stop], epochs, gm=request.gm,
+                           out=out[start:stop])
+        context.progress(stop, elements.shape[0])
+
+
+def _run_ephemeris(request: EphemerisJobRequest, context: JobContext) -> None:
+    count = request.count
+    out = context.allocate((count, 4), ["jd", "x", "y", "z"])
+    for start in range(0, count, context.chunk_rows):
+        context.check_cancelled()
+        stop = min(start + context.chunk_rows, count)
+        jd = request.start + request.step * np.arange(start, stop, dtype=np.float64)
+        out[start:stop, 0] = jd
+        out[start:stop, 1:] = heliocentric_position(request.body, jd, request.plane)
+        context.progress(stop, count)
+
+
+RUNNERS: dict[str, Runner] = {
+    "propagation": _run_propagation,
+    "ephemeris": _run_ephemeris,
+}
+
+
+class JobManager:
+    """
+    Queue, executor and spool of the background jobs.
+
+    Worker tasks are started on the running event loop by the first
+    :meth:`submit`, so the manager can be built outside of one.
+
+    Parameters
+    ----------
+    spool_dir : str or pathlib.Path
+        Directory for job results; created if missing.
+    max_concurrent : int
+        Jobs running at the same time.
+    max_queued : int
+        Jobs allowed to wait; further submissions are refused.
+    retention_seconds : float
+        How long finished jobs and their results are kept.
+    chunk_rows : int
+        Result rows per unit of work, between progress updates and cancellation checks.
+    """
+
+    def __init__(self, spool_dir: str | Path, max_concurrent: int, max_queued: int,
+                 retention_seconds: float, chunk_rows: int):
+        if max_concurrent < 1 or max_queued < 1 or chunk_rows < 1:
+            raise ValueError("max_concurrent, max_queued and chunk_rows must be at least 1.")
+        self.spool_dir = Path(spool_dir)
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+        self.chunk_rows = chunk_rows
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._executor: ThreadPoolExecutor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.PriorityQueue | None = None
+        self._workers: list[asyncio.Task] = []
+
+    # -- scheduling ---------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # First use, or a new event loop (e.g. the app was restarted in-process):
+        # requeue whatever was waiting on the old one.
+        self._loop = loop
+        self._queue = asyncio.PriorityQueue()
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                                thread_name_prefix="job")
+        with self._lock:
+            waiting = [job for job in self._jobs.values() if job.status == JobStatus.QUEUED]
+        for job in waiting:
+            self._enqueue(job)
+        self._workers = [loop.create_task(self._work()) for _ in range(self.max_concurrent)]
+
+    def _enqueue(self, job: Job) -> None:
+        self._queue.put_nowait((-job.priority, next(self._sequence), job))
+
+    async def _work(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, job = await self._queue.get()
+            if job.status != JobStatus.QUEUED:
+                continue  # cancelled while waiting
+            await loop.run_in_executor(self._executor, self._run, job)
+
+    def _run(self, job: Job) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now(UTC)
+        path = self.spool_dir / f"{job.id}.npy"
+        partial = path.with_suffix(".part")
+        context = JobContext(job, partial, self.chunk_rows)
+        try:
+            RUNNERS[job.kind](job.request, context)
+            if context.array is None:
+                raise RuntimeError("The job produced no result.")
+            context.array.flush()
+            job.result = JobResult(shape=list(context.array.shape), columns=context.columns,
+                                   bytes=context.array.nbytes)
+            context.array = None
+            os.replace(partial, path)
+            job.path = path
+            job.progress = 1.0
+            status = JobStatus.SUCCEEDED
+        except JobCancelled:
+            status = JobStatus.CANCELLED
+        except Exception as exc:  # reported through the job's status
+            job.error = str(exc) or type(exc).__name__
+            status = JobStatus.FAILED
+        finally:
+            context.array = None
+            partial.unlink(missing_ok=True)
+        job.finished_at = datetime.now(UTC)
+        job.finished_monotonic = time.monotonic()
+        job.status = status
+
+    # -- API ----------------------------------------------------------------
+
+    async def submit(self, kind: str, request: BaseModel, priority: int = 0) -> Job:
+        """Queue a job of a kind in :data:`RUNNERS`; must be called on the event loop."""
+        if kind not in RUNNERS:
+            raise ValueError(f"Unknown job kind {kind!r}; expected one of {', '.join(RUNNERS)}.")
+        self._ensure_started()
+        self._discard_expired()
+        with self._lock:
+            waiting = sum(job.status == JobStatus.QUEUED for job in self._jobs.values())
+            if waiting >= self.max_queued:
+                raise JobQueueFullError(f"{waiting} jobs are already queued; retry later.")
+            job = Job(kind, request, priority)
+            self._jobs[job.id] = job
+        self._enqueue(job)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """Return a job by id; raises :class:`JobNotFoundError`."""
+        self._discard_expired()
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise JobNotFoundError(f"No job with id '{job_id}'.")
+        return job
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Cancel a job. A queued job is cancelled at once, a running one at its next
+        chunk boundary; finished jobs are left as they are.
+        """
+        job = self.get(job_id)
+        job.cancel_event.set()
+        with self._lock:
+            if job.status == JobStatus.QUEUED:
+                job.status = JobStatus.CANCELLED
+                job.finished_at = datetime.now(UTC)
+                job.finished_monotonic = time.monotonic()
+        return job
+
+    def delete(self, job_id: str) -> None:
+        """Discard a finished job and its result."""
+        job = self.get(job_id)
+        if not job.finished:
+            raise JobStateError(f"Job '{job_id}' is {job.status.value}; cancel it first.")
+        self._discard(job)
+
+    def read_result(self, job_id: str, offset: int, limit: int) -> np.ndarray:
+        """
+        Rows ``[offset, offset + limit)`` of a finished job's result.
+
+        Reads from disk; call it off the event loop.
+        """
+        job = self.get(job_id)
+        if job.status != JobStatus.SUCCEEDED:
+            raise JobStateError(f"Job '{job_id}' is {job.status.value}; "
+                                "results exist only for succeeded jobs.")
+        rows = job.result.shape[0]
+        if not 0 <= offset <= rows:
+            raise ValueError(f"offset must be between 0 and {rows}.")
+        array = np.load(job.path, mmap_mode="r")
+        return np.array(array[offset:offset + limit])
+
+    def stats(self) -> dict:
+        """Return the number of jobs per status."""
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {status.value: statuses.count(status) for status in JobStatus}
+
+    async def shutdown(self) -> None:
+        """Cancel every job, stop the workers and remove the spooled results."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            self.cancel(job.id)
+        for task in self._workers:
+            task.cancel()
+        self._workers = []
+        if self._executor is not None:
+            # Running jobs stop at their next chunk; do not hold the loop meanwhile.
+            await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+            self._executor = None
+        for job in jobs:
+            self._discard(job)
+        self._loop = None
+
+    # -- retention ----------------------------------------------------------
+
+    def _discard(self, job: Job) -> None:
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        if job.path is not None:
+            job.path.unlink(missing_ok=True)
+
+    def _discard_expired(self) -> None:
+        deadline = time.monotonic() - self.retention_seconds
+        with self._lock:
+            expired = [job for job in self._jobs.values()
+                       if job.finished_monotonic is not None
+                       and job.finished_monotonic < deadline]
+        for job in expired:
+            self._discard(job)
+
+
+@lru_cache
+def get_job_manager() -> JobManager:
+    """Return the process-wide :class:`JobManager`, configured from the settings."""
+    settings = get_settings()
+    return JobManager(
+        spool_dir=settings.jobs_spool_dir or Path(tempfile.gettempdir()) / "celestial-jobs",
+        max_concurrent=settings.jobs_max_concurrent,
+        max_queued=settings.jobs_max_queued,
+        retention_seconds=settings.jobs_retention_seconds,
+        chunk_rows=settings.jobs_chunk_rows,
+    )
+
+
+async def shutdown_job_manager() -> None:
+    """Shut down the process-wide manager if it was ever created."""
+    if get_job_manager.cache_info().currsize:
+        await get_job_manager().shutdown()
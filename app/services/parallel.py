@@ -0,0 +1,304 @@
+"""
+Multi-core execution layer for large batch jobs.
+
+Large coordinate transforms and orbit propagations are split into row chunks and
+dispatched to a pool of worker processes. Inputs and outputs live in
+:mod:`multiprocessing.shared_memory` blocks: workers attach to them by name and
+read/write their slice in place, so only a few bytes of task metadata are pickled
+per chunk.
+
+Jobs below ``parallel_min_rows`` (see :class:`~app.core.config.Settings`) run
+in-process, where the pool's dispatch overhead would outweigh the gain.
+
+A *kernel* is any importable top-level function called as
+``kernel(inputs, out=out, **kwargs)``, which fills ``out`` row-for-row from
+``inputs``; ``convert_celestial_coordinates_batch`` already follows this convention.
+"""
+
+import math
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, wait
+from functools import lru_cache
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.models.coordinates_systems import Origin, PhysicalState, Plane, Shape
+from app.services.calculations.coordinate_conversions import convert_celestial_coordinates_batch
+from app.services.calculations.orbital_elements import propagate_elements
+from app.services.calculations.orbital_mechanics import GM_SUN
+
+Kernel = Callable[..., object]
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to a block created by the parent process."""
+    # Spawned workers share the parent's resource tracker, where the block is
+    # already registered; the parent unlinks it once every chunk is done.
+    return SharedMemory(name=name)
+
+
+def _run_chunk(kernel: Kernel, in_spec: tuple, out_spec: tuple,
+               start: int, stop: int, kwargs: dict) -> None:
+    """Run ``kernel`` on rows ``[start, stop)`` of the shared input and output blocks."""
+    in_name, in_shape, in_dtype = in_spec
+    out_name, out_shape, out_dtype = out_spec
+    in_shm, out_shm = _attach(in_name), _attach(out_name)
+    inputs = out = None
+    try:
+        inputs = np.ndarray(in_shape, dtype=in_dtype, buffer=in_shm.buf)
+        out = np.ndarray(out_shape, dtype=out_dtype, buffer=out_shm.buf)
+        kernel(inputs[start:stop], out=out[start:stop], **kwargs)
+    finally:
+        # Drop the views before closing; exported buffers block close().
+        inputs = out = None
+        _close(in_shm, out_shm)
+
+
+def _close(*blocks: SharedMemory) -> None:
+    for shm in blocks:
+        try:
+            shm.close()
+        except BufferError:
+            # A traceback still references a view; the mapping goes with it.
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+class WorkerPool:
+    """
+    Process pool that runs row-wise kernels over shared-memory buffers.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of worker processes. ``0`` means ``os.cpu_count()``; ``1`` disables
+        the pool entirely.
+    min_rows : int
+        Jobs with fewer rows run in-process.
+    chunk_rows : int
+        Rows per dispatched task. Large jobs are split into at least one chunk
+        per worker.
+    """
+
+    def __init__(self, max_workers: int = 0, min_rows: int = 250_000,
+                 chunk_rows: int = 100_000):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_rows = min_rows
+        self.chunk_rows = chunk_rows
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Workers are spawned rather than forked: the API process runs
+                # threads (uvicorn's threadpool), which fork does not copy safely.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def start(self) -> None:
+        """Start the worker processes ahead of the first job."""
+        if self.max_workers > 1:
+            executor = self._get_executor()
+            # Spawning is lazy; one trivial task per worker brings them all up.
+            list(executor.map(abs, range(self.max_workers)))
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, waiting for running tasks."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def should_parallelize(self, work: int) -> bool:
+        """Whether a job of ``work`` rows (or work units) is worth dispatching to the pool."""
+        return self.max_workers > 1 and work >= max(self.min_rows, 2)
+
+    def map_rows(self, kernel: Kernel, inputs: np.ndarray, out_shape: tuple,
+                 out: np.ndarray | None = None, row_cost: int = 1, **kwargs) -> np.ndarray:
+        """
+        Fill an output array row-for-row by running ``kernel`` over ``inputs``.
+
+        Parameters
+        ----------
+        kernel : callable
+            Importable top-level function, called as ``kernel(rows, out=out_rows, **kwargs)``.
+        inputs : numpy.ndarray
+            Input array split along axis 0.
+        out_shape : tuple
+            Shape of the float64 output; ``out_shape[0]`` must equal ``len(inputs)``.
+        out : numpy.ndarray, optional
+            Preallocated output array of ``out_shape``.
+        row_cost : int
+            Work units per input row (e.g. epochs per object); the threshold and
+            chunk size are measured in these units.
+        **kwargs
+            Picklable keyword arguments shared by every chunk.
+
+        Returns
+        -------
+        numpy.ndarray
+            The filled output array.
+        """
+        inputs = np.ascontiguousarray(inputs)
+        rows = inputs.shape[0]
+        if out is None:
+            out = np.empty(out_shape)
+        if out.shape != tuple(out_shape) or out_shape[0] != rows:
+            raise ValueError(f"Output shape {out.shape} does not match {out_shape} "
+                             f"for {rows} input rows.")
+
+        if not self.should_parallelize(rows * row_cost):
+            kernel(inputs, out=out, **kwargs)
+            return out
+
+        chunk = max(1, min(self.chunk_rows // row_cost, math.ceil(rows / self.max_workers)))
+        in_shm = SharedMemory(create=True, size=max(inputs.nbytes, 1))
+        out_shm = SharedMemory(create=True, size=max(out.nbytes, 1))
+        shared_in = shared_out = None
+        try:
+            shared_in = np.ndarray(inputs.shape, dtype=inputs.dtype, buffer=in_shm.buf)
+            shared_in[...] = inputs
+            shared_out = np.ndarray(out.shape, dtype=np.float64, buffer=out_shm.buf)
+
+            in_spec = (in_shm.name, inputs.shape, inputs.dtype.str)
+            out_spec = (out_shm.name, out.shape, shared_out.dtype.str)
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_run_chunk, kernel, in_spec, out_spec,
+                                start, min(start + chunk, rows), kwargs)
+                for start in range(0, rows, chunk)
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                # On failure, no worker may still be touching the blocks once they
+                # are unlinked below.
+                for future in futures:
+                    future.cancel()
+                wait(futures)
+
+            out[...] = shared_out
+        finally:
+            shared_in = shared_out = None
+            _close(in_shm, out_shm)
+            in_shm.unlink()
+            out_shm.unlink()
+        return out
+
+
+@lru_cache
+def get_worker_pool() -> WorkerPool:
+    """Return the process-wide :class:`WorkerPool`, sized from the settings."""
+    settings = get_settings()
+    return WorkerPool(
+        max_workers=settings.worker_processes,
+        min_rows=settings.parallel_min_rows,
+        chunk_rows=settings.parallel_chunk_rows,
+    )
+
+
+def shutdown_worker_pool() -> None:
+    """Shut down the process-wide pool if it was ever created."""
+    if get_worker_pool.cache_info().currsize:
+        get_worker_pool().shutdown()
+
+
+# ---------------------------------------------------------------------------
+# Job entry points
+# ---------------------------------------------------------------------------
+
+def _propagate_kernel(rows: np.ndarray, out: np.ndarray, epochs: np.ndarray,
+                      gm: float) -> None:
+    # Each row is the six elements followed by their epoch.
+    propagate_elements(rows[:, :6], rows[:, 6], epochs, gm=gm, out=out)
+
+
+def _transform_kernel(rows: np.ndarray, out: np.ndarray, per_row: tuple, **kwargs) -> None:
+    # Per-row equinoxes and epochs travel as extra input columns, in the order
+    # named by ``per_row``, so they are chunked with the coordinates.
+    for column, name in enumerate(per_row, start=3):
+        kwargs[name] = rows[:, column]
+    convert_celestial_coordinates_batch(rows[:, :3], out=out, **kwargs)
+
+
+def transform_coordinates(coords: np.ndarray,
+                          source_shape: Shape, source_plane: Plane, source_origin: Origin,
+                          target_shape: Shape, target_plane: Plane, target_origin: Origin,
+                          physical_state: PhysicalState = PhysicalState.POINT,
+                          translation_vector: tuple = (0.0, 0.0, 0.0),
+                          source_equinox=None, target_equinox=None, epoch=None,
+                          out: np.ndarray | None = None,
+                          pool: WorkerPool | None = None) -> np.ndarray:
+    """
+    :func:`convert_celestial_coordinates_batch`, spread over the worker pool when large.
+
+    Takes the same arguments, plus an optional ``pool`` (defaults to
+    :func:`get_worker_pool`).
+    """
+    pool = pool or get_worker_pool()
+    coords = np.asarray(coords, dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] != 3:
+        raise ValueError(f"Expected an (N, 3) array of coordinates, got shape {coords.shape}.")
+
+    kwargs = dict(
+        source_shape=source_shape, source_plane=source_plane, source_origin=source_origin,
+        target_shape=target_shape, target_plane=target_plane, target_origin=target_origin,
+        physical_state=physical_state, translation_vector=tuple(translation_vector),
+    )
+    per_row = {}
+    for name, value in (("source_equinox", source_equinox), ("target_equinox", target_equinox),
+                        ("epoch", epoch)):
+        if value is None or np.ndim(value) == 0:
+            kwargs[name] = value
+        else:
+            per_row[name] = np.asarray(value, dtype=np.float64)
+            if per_row[name].shape != (coords.shape[0],):
+                raise ValueError(f"Expected one {name.split('_')[-1]} per row "
+                                 f"({coords.shape[0]}), got shape {per_row[name].shape}.")
+
+    if not per_row:
+        return pool.map_rows(convert_celestial_coordinates_batch, coords, coords.shape,
+                             out=out, **kwargs)
+    rows = np.column_stack([coords, *per_row.values()])
+    return pool.map_rows(_transform_kernel, rows, coords.shape, out=out,
+                         per_row=tuple(per_row), **kwargs)
+
+
+def propagate(elements: np.ndarray, epoch, epochs, gm: float = GM_SUN,
+              out: np.ndarray | None = None, pool: WorkerPool | None = None) -> np.ndarray:
+    """
+    :func:`propagate_elements`, spread over the worker pool when large.
+
+    Objects are the unit of work, but the pool threshold and chunk size are
+    applied to (object × epoch) states.
+    """
+    pool = pool or get_worker_pool()
+    elements = np.asarray(elements, dtype=np.float64)
+    if elements.ndim != 2 or elements.shape[1] != 6:
+        raise ValueError(f"Expected an (n_objects, 6) element array, got {elements.shape}.")
+    epochs = np.asarray(epochs, dtype=np.float64).reshape(-1)
+    n_objects, n_epochs = elements.shape[0], max(epochs.shape[0], 1)
+
+    rows = np.empty((n_objects, 7))
+    rows[:, :6] = elements
+    rows[:, 6] = np.broadcast_to(np.asarray(epoch, dtype=np.float64), (n_objects,))
+
+    return pool.map_rows(_propagate_kernel, rows, (n_objects, epochs.shape[0], 6), out=out,
+                         row_cost=n_epochs, epochs=epochs, gm=gm)
@@ -0,0 +1,372 @@
+"""
+Memoization of coordinate transformation responses.
+
+Identical transformation requests produce identical responses, so the encoded
+response body can be kept and replayed instead of recomputed. Requests are keyed
+on a canonical hash of their validated content (see :func:`request_key`), so two
+payloads that differ only in field order, whitespace or spelled-out defaults
+share an entry.
+
+Entries live in a pluggable :class:`CacheBackend`:
+
+- ``memory`` – :class:`MemoryBackend`, a per-process LRU bounded by entry count,
+  total bytes and a time to live.
+- ``redis`` – :class:`RedisBackend`, shared by every worker and replica; needs
+  the optional ``redis`` package.
+
+Further backends are added with :func:`register_backend`. The process-wide
+:class:`ResponseCache` returned by :func:`get_response_cache` is configured by the
+``RESULT_CACHE_*`` settings and counts hits, misses and bypasses; batches with
+more than ``RESULT_CACHE_MAX_BATCH_ROWS`` rows are never cached.
+"""
+
+import hashlib
+import importlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Protocol
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.core import metrics
+from app.core.config import Settings, get_settings
+
+
+class CacheBackend(Protocol):
+    """Storage for encoded responses, keyed by :func:`request_key`."""
+
+    def get(self, key: str) -> bytes | None:
+        """Return the stored value, or ``None`` if absent or expired."""
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store ``value`` under ``key``, evicting as the backend's bounds require."""
+
+    def stats(self) -> dict:
+        """Return at least ``entries`` and ``bytes`` (``None`` when unknown)."""
+
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    def close(self) -> None:
+        """Release connections or other resources."""
+
+
+class MemoryBackend:
+    """
+    Thread-safe in-process LRU with a time to live.
+
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of entries kept.
+    max_bytes : int
+        Maximum total size of keys and values; values larger than this are not stored.
+    ttl_seconds : float
+        Lifetime of an entry; ``0`` keeps entries until they are evicted.
+    clock : callable, default time.monotonic
+        Source of the current time in seconds.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be at least 1.")
+        if ttl_seconds < 0:
+            raise ValueError("ttl_seconds must be non-negative.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expiry time or None, value)
+        self._entries: OrderedDict[str, tuple[float | None, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _size(key: str, value: bytes) -> int:
+        return len(key) + len(value)
+
+    def _pop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= self._size(key, value)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and self._clock() >= expires:
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        size = self._size(key, value)
+        if size > self.max_bytes:
+            return
+        expires = self._clock() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (expires, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self._evictions,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._evictions = 0
+
+    def close(self) -> None:
+        self.clear()
+
+
+class RedisBackend:
+    """
+    Backend shared through a Redis server, so every worker process and replica
+    serves the others' results.
+
+    Expiry is delegated to Redis (``SET ... EX``); the size bound is the server's
+    own ``maxmemory`` policy. Connection errors degrade to cache misses rather
+    than failing the request.
+
+    Parameters
+    ----------
+    url : str
+        Connection URL, e.g. ``redis://localhost:6379/0``.
+    ttl_seconds : float
+        Lifetime of an entry; ``0`` keeps entries until Redis evicts them.
+    prefix : str, default "result-cache:"
+        Namespace of the keys written by this backend.
+    """
+
+    def __init__(self, url: str, ttl_seconds: float = 0.0, prefix: str = "result-cache:"):
+        try:
+            redis = importlib.import_module("redis")
+        except ImportError:
+            raise RuntimeError("The 'redis' package is required for the redis result cache.")
+        self._errors = redis.RedisError
+        self._client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.failures = 0
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._client.get(self.prefix + key)
+        except self._errors:
+            self.failures += 1
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        # Redis expiries are whole milliseconds.
+        ttl = max(1, round(self.ttl_seconds * 1000)) if self.ttl_seconds else None
+        try:
+            self._client.set(self.prefix + key, value, px=ttl)
+        except self._errors:
+            self.failures += 1
+
+    def stats(self) -> dict:
+        try:
+            # The keyspace may be shared: only the server-wide figures are cheap.
+            entries = self._client.dbsize()
+            used = self._client.info("memory").get("used_memory")
+        except self._errors:
+            self.failures += 1
+            entries = used = None
+        return {"entries": entries, "bytes": used, "failures": self.failures}
+
+    def clear(self) -> None:
+        try:
+            keys = list(self._client.scan_iter(match=self.prefix + "*", count=1000))
+            if keys:
+                self._client.delete(*keys)
+        except self._errors:
+            self.failures += 1
+
+    def close(self) -> None:
+        self._client.close()
+
+
+BackendFactory = Callable[[Settings], CacheBackend]
+
+_BACKENDS: dict[str, BackendFactory] = {
+    "memory": lambda settings: MemoryBackend(
+        max_entries=settings.result_cache_max_entries,
+        max_bytes=settings.result_cache_max_bytes,
+        ttl_seconds=settings.result_cache_ttl_seconds,
+    ),
+    "redis": lambda settings: RedisBackend(
+        settings.result_cache_url, ttl_seconds=settings.result_cache_ttl_seconds
+    ),
+}
+
+
+def register_backend(name: str, factory: BackendFactory) -> None:
+    """Make ``factory(settings)`` available as ``RESULT_CACHE_BACKEND=<name>``."""
+    _BACKENDS[name] = factory
+
+
+def create_backend(settings: Settings) -> CacheBackend:
+    """Instantiate the backend named by ``settings.result_cache_backend``."""
+    try:
+        factory = _BACKENDS[settings.result_cache_backend]
+    except KeyError:
+        raise ValueError(f"Unknown result cache backend '{settings.result_cache_backend}'; "
+                         f"expected one of {sorted(_BACKENDS)}.")
+    return factory(settings)
+
+
+def request_key(kind: str, request: BaseModel, *extra: bytes | str) -> str:
+    """
+    Canonical cache key of a validated request.
+
+    Parameters
+    ----------
+    kind : str
+        Namespace of the endpoint, so different endpoints never share entries.
+    request : pydantic.BaseModel
+        The validated request; every field, defaults included, is hashed in a
+        fixed order, so equivalent payloads map to the same key.
+    *extra : bytes or str
+        Further inputs the response depends on (raw coordinates, the negotiated
+        media type, ...).
+
+    Returns
+    -------
+    str
+        ``<kind>:<app version>:<digest>``; the version keeps a shared backend from
+        serving results computed by a different release.
+    """
+    canonical = json.dumps(request.model_dump(mode="json"), sort_keys=True,
+                           separators=(",", ":"))
+    digest = hashlib.blake2b(canonical.encode(), digest_size=20)
+    for part in extra:
+        digest.update(b"\0")
+        digest.update(part.encode() if isinstance(part, str) else part)
+    return f"{kind}:{get_settings().app_version}:{digest.hexdigest()}"
+
+
+def batch_key(request: BaseModel, coords: np.ndarray, media_type: str) -> str:
+    """Cache key of a decoded batch: its spec, its coordinates and the response format."""
+    return request_key("batch", request,
+                       np.ascontiguousarray(coords, dtype="<f8").tobytes(), media_type)
+
+
+class ResponseCache:
+    """
+    Hit/miss accounting in front of a :class:`CacheBackend`.
+
+    Parameters
+    ----------
+    backend : CacheBackend
+        Where encoded responses are stored.
+    max_batch_rows : int
+        Batches with more rows bypass the cache: they are unlikely to repeat,
+        and would crowd out many small entries.
+    """
+
+    def __init__(self, backend: CacheBackend, max_batch_rows: int):
+        self.backend = backend
+        self.max_batch_rows = max_batch_rows
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bypassed = 0
+
+    def accepts(self, rows: int) -> bool:
+        """Whether a batch of ``rows`` rows is cached; counts a bypass if not."""
+        if rows <= self.max_batch_rows:
+            return True
+        with self._lock:
+            self._bypassed += 1
+        return False
+
+    def get(self, key: str) -> bytes | None:
+        """Look ``key`` up, counting a hit or a miss."""
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self.backend.set(key, value)
+
+    def stats(self) -> dict:
+        """Return the counters, the hit rate and the backend's occupancy."""
+        with self._lock:
+            hits, misses, bypassed = self._hits, self._misses, self._bypassed
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "bypassed": bypassed,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            **self.backend.stats(),
+        }
+
+    def render_metrics(self) -> str:
+        """Serialise :meth:`stats` in the Prometheus text exposition format."""
+        stats = self.stats()
+        families = [
+            ("result_cache_requests_total", "counter", "Response cache lookups by outcome.",
+             [({"outcome": outcome}, stats[key]) for outcome, key in
+              (("hit", "hits"), ("miss", "misses"), ("bypass", "bypassed"))]),
+            ("result_cache_hit_ratio", "gauge", "Share of cache lookups that hit.",
+             [({}, stats["hit_rate"])]),
+            ("result_cache_entries", "gauge", "Entries held by the response cache backend.",
+             [({}, stats["entries"])]),
+            ("result_cache_bytes", "gauge", "Memory used by the response cache backend.",
+             [({}, stats["bytes"])]),
+        ]
+        return "".join(metrics.render_samples(*family) for family in families)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self.backend.clear()
+        with self._lock:
+            self._hits = self._misses = self._bypassed = 0
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache | None:
+    """Return the process-wide :class:`ResponseCache`, or ``None`` when disabled."""
+    settings = get_settings()
+    if not settings.result_cache_enabled:
+        return None
+    return ResponseCache(create_backend(settings), settings.result_cache_max_batch_rows)
+
+
+def shutdown_response_cache() -> None:
+    """Close the process-wide cache if it was ever created."""
+    if get_response_cache.cache_info().currsize:
+        cache = get_response_cache()
+        if cache is not None:
+            cache.close()
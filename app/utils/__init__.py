@@ -2,5 +2,7 @@
 Utilities package.
 
 Provides shared helper functions used across multiple application layers.
-See :mod:`app.utils.math_helpers` for angle- and unit-conversion utilities.
+See :mod:`app.utils.math_helpers` for angle- and unit-conversion utilities
+(scalar or array, with sexagesimal formatting and parsing) and
+:mod:`app.utils.chebyshev` for Chebyshev fitting and evaluation.
 """
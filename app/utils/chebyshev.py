@@ -0,0 +1,173 @@
+"""
+Chebyshev interpolation of smooth functions over fixed intervals.
+
+Used to compress expensive, smooth series (ephemerides) into short polynomials:
+:func:`fit` samples a function once at the Chebyshev nodes of an interval
+(:func:`segment_nodes` and :func:`fit_values` do the same for many consecutive
+intervals at once), and
+:func:`evaluate` evaluates many such polynomials at once from the
+three-term recurrence of the Chebyshev basis, so each later query costs a few
+multiply-adds.
+
+Coefficient arrays are laid out as ``[..., degree + 1, k]`` for a function with
+``k`` output components (e.g. ``k = 3`` for a position vector).
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+# Below this many abscissae the basis is evaluated in closed form, above it by recurrence.
+_SMALL = 64
+
+
+def nodes(degree: int) -> np.ndarray:
+    """
+    Chebyshev nodes of the first kind on ``[-1, 1]``.
+
+    Parameters
+    ----------
+    degree : int
+        Polynomial degree; ``degree + 1`` nodes are returned.
+
+    Returns
+    -------
+    numpy.ndarray
+        The nodes ``cos(π (j + ½) / (degree + 1))``, in decreasing order.
+    """
+    count = degree + 1
+    return np.cos(np.pi * (np.arange(count) + 0.5) / count)
+
+
+def segment_nodes(edges: ArrayLike, degree: int) -> np.ndarray:
+    """
+    Chebyshev nodes of consecutive intervals.
+
+    Parameters
+    ----------
+    edges : array_like
+        ``(s + 1,)`` increasing interval boundaries.
+    degree : int
+        Polynomial degree; ``degree + 1`` nodes per interval.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(s, degree + 1)`` abscissae, the nodes of :func:`nodes` mapped onto each interval.
+    """
+    edges = np.asarray(edges, dtype=np.float64)
+    if edges.ndim != 1 or edges.size < 2 or np.any(np.diff(edges) <= 0):
+        raise ValueError("Interval edges must be increasing, with at least one interval.")
+    if degree < 0:
+        raise ValueError("degree must be non-negative.")
+    middle = 0.5 * (edges[:-1] + edges[1:])
+    half = 0.5 * np.diff(edges)
+    return middle[:, np.newaxis] + half[:, np.newaxis] * nodes(degree)
+
+
+def fit_values(values: ArrayLike) -> np.ndarray:
+    """
+    Chebyshev coefficients from function values sampled at :func:`segment_nodes`.
+
+    Parameters
+    ----------
+    values : array_like
+        ``(s, degree + 1, k)`` values at the nodes of ``s`` intervals.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(s, degree + 1, k)`` coefficients.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    degree = values.shape[-2] - 1
+    # Discrete orthogonality of T_j at the nodes: c_j = 2/n Σ f(x_i) T_j(x_i).
+    polynomials = basis(nodes(degree), degree)
+    coefficients = np.einsum("ij,sik->sjk", polynomials, values) * (2.0 / (degree + 1))
+    coefficients[:, 0] *= 0.5
+    return coefficients
+
+
+def fit(fn: Callable[[np.ndarray], np.ndarray], start: float, end: float,
+        degree: int) -> np.ndarray:
+    """
+    Interpolate ``fn`` on ``[start, end]`` with a Chebyshev series.
+
+    Parameters
+    ----------
+    fn : callable
+        Vectorized function mapping an ``(n,)`` array of abscissae to ``(n, k)`` values.
+    start, end : float
+        Interval of the fit.
+    degree : int
+        Degree of the polynomial; ``fn`` is evaluated at ``degree + 1`` nodes.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(degree + 1, k)`` coefficients, for use with :func:`evaluate` on the
+        normalized abscissa ``tau = (2 t - start - end) / (end - start)``.
+    """
+    if end <= start:
+        raise ValueError("The fit interval must have end > start.")
+    abscissae = segment_nodes([start, end], degree)[0]
+    values = np.asarray(fn(abscissae), dtype=np.float64).reshape(1, degree + 1, -1)
+    return fit_values(values)[0]
+
+
+def basis(tau: ArrayLike, degree: int) -> np.ndarray:
+    """
+    Chebyshev polynomials ``T_0 .. T_degree`` at ``tau``.
+
+    Parameters
+    ----------
+    tau : array_like
+        ``(n,)`` normalized abscissae in ``[-1, 1]``; values rounded just outside
+        are treated as the interval ends.
+    degree : int
+        Highest polynomial degree.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n, degree + 1)`` array with ``T_j(tau)`` in column ``j``.
+    """
+    tau = np.asarray(tau, dtype=np.float64)
+    if tau.size <= _SMALL:
+        # T_j(cos θ) = cos(j θ): one call instead of a Python-level loop.
+        theta = np.arccos(np.clip(tau, -1.0, 1.0))
+        return np.cos(np.multiply.outer(theta, np.arange(degree + 1.0)))
+    values = np.empty(tau.shape + (degree + 1,))
+    values[:, 0] = 1.0
+    if degree:
+        values[:, 1] = tau
+    twice = 2.0 * tau
+    for j in range(2, degree + 1):
+        np.multiply(twice, values[:, j - 1], out=values[:, j])
+        values[:, j] -= values[:, j - 2]
+    return values
+
+
+def evaluate(coefficients: ArrayLike, tau: ArrayLike) -> np.ndarray:
+    """
+    Evaluate Chebyshev series at normalized abscissae.
+
+    Parameters
+    ----------
+    coefficients : array_like
+        ``(degree + 1, k)`` coefficients shared by every abscissa, or
+        ``(n, degree + 1, k)`` with one series per abscissa.
+    tau : array_like
+        ``(n,)`` normalized abscissae in ``[-1, 1]``.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n, k)`` values.
+    """
+    coefficients = np.asarray(coefficients, dtype=np.float64)
+    polynomials = basis(tau, coefficients.shape[-2] - 1)
+    if coefficients.ndim == 2:
+        return polynomials @ coefficients
+    return np.einsum("nj,njk->nk", polynomials, coefficients)
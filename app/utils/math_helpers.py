@@ -3,70 +3,305 @@ Math helper utilities for celestial mechanics calculations.
 
 This module provides common mathematical operations used throughout the
 calculation services (unit conversions, angle normalisation, etc.).
+
+Every conversion accepts a Python scalar or a NumPy array. Scalars take the
+:mod:`math` path and return a ``float``; arrays are converted element-wise and
+can be written into a preallocated ``out`` array instead of a new one, which
+keeps batch pipelines free of temporaries. For bulk catalog I/O,
+:func:`format_sexagesimal` and :func:`parse_sexagesimal` convert between
+degrees and ``HH:MM:SS.ss`` / ``±DD:MM:SS.ss`` strings a whole column at a time.
 """
 
 import math
 
+import numpy as np
+from numpy.typing import ArrayLike
+
+# Characters accepted between the fields of a sexagesimal string.
+_SEPARATORS = str.maketrans({character: " " for character in ":hmsd°'′\"″,"})
+
+
+def _is_scalar(value, out) -> bool:
+    return out is None and isinstance(value, (int, float))
 
-def deg_to_rad(degrees: float) -> float:
+
+def deg_to_rad(degrees: ArrayLike, out: np.ndarray | None = None):
     """Convert degrees to radians.
 
     Parameters
     ----------
-    degrees : float
-        Angle in degrees.
+    degrees : float or array_like
+        Angle(s) in degrees.
+    out : numpy.ndarray, optional
+        Array receiving the result; may be ``degrees`` itself.
 
     Returns
     -------
-    float
-        Equivalent angle in radians.
+    float or numpy.ndarray
+        Equivalent angle(s) in radians.
     """
-    return math.radians(degrees)
+    if _is_scalar(degrees, out):
+        return math.radians(degrees)
+    return np.radians(degrees, out=out)
 
 
-def rad_to_deg(radians: float) -> float:
+def rad_to_deg(radians: ArrayLike, out: np.ndarray | None = None):
     """Convert radians to degrees.
 
     Parameters
     ----------
-    radians : float
-        Angle in radians.
+    radians : float or array_like
+        Angle(s) in radians.
+    out : numpy.ndarray, optional
+        Array receiving the result; may be ``radians`` itself.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Equivalent angle(s) in degrees.
+    """
+    if _is_scalar(radians, out):
+        return math.degrees(radians)
+    return np.degrees(radians, out=out)
+
+
+def wrap_angle(angles: ArrayLike, lower: float, period: float,
+               out: np.ndarray | None = None):
+    """Wrap angles into the half-open interval ``[lower, lower + period)``.
+
+    Parameters
+    ----------
+    angles : float or array_like
+        Input angle(s), any magnitude.
+    lower : float
+        Start of the interval.
+    period : float
+        Length of the interval: 360 for degrees, 2π for radians.
+    out : numpy.ndarray, optional
+        Array receiving the result; may be ``angles`` itself.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Equivalent angle(s) in ``[lower, lower + period)``.
+    """
+    if _is_scalar(angles, out):
+        wrapped = (angles - lower) % period
+        # A tiny negative remainder rounds up to exactly `period`.
+        return lower + (wrapped if wrapped < period else 0.0)
+    if out is None:
+        out = np.array(angles, dtype=np.float64)
+        out -= lower
+    else:
+        np.subtract(angles, lower, out=out)
+    # x − p·floor(x/p) is several times faster than np.mod, which fixes up signs
+    # elementwise; rounding can leave it one ulp outside [0, p), hence the clean-up.
+    turns = np.floor(out * (1.0 / period))
+    turns *= period
+    out -= turns
+    out[out < 0.0] += period
+    out[out >= period] = 0.0
+    out += lower
+    return out
+
+
+def wrap_angle_deg(degrees: ArrayLike, signed: bool = False, out: np.ndarray | None = None):
+    """Wrap angles in degrees into ``[0, 360)``, or ``[-180, 180)`` when ``signed``.
+
+    Parameters
+    ----------
+    degrees : float or array_like
+        Input angle(s) in degrees.
+    signed : bool, default False
+        Wrap into ``[-180, 180)`` (longitude differences, hour angles) instead.
+    out : numpy.ndarray, optional
+        Array receiving the result; may be ``degrees`` itself.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Equivalent angle(s) in the chosen interval.
+    """
+    return wrap_angle(degrees, -180.0 if signed else 0.0, 360.0, out)
+
+
+def wrap_angle_rad(radians: ArrayLike, signed: bool = False, out: np.ndarray | None = None):
+    """Wrap angles in radians into ``[0, 2π)``, or ``[-π, π)`` when ``signed``.
+
+    Parameters
+    ----------
+    radians : float or array_like
+        Input angle(s) in radians.
+    signed : bool, default False
+        Wrap into ``[-π, π)`` instead.
+    out : numpy.ndarray, optional
+        Array receiving the result; may be ``radians`` itself.
 
     Returns
     -------
-    float
-        Equivalent angle in degrees.
+    float or numpy.ndarray
+        Equivalent angle(s) in the chosen interval.
     """
-    return math.degrees(radians)
+    return wrap_angle(radians, -math.pi if signed else 0.0, 2 * math.pi, out)
 
 
-def normalize_angle_deg(degrees: float) -> float:
+def normalize_angle_deg(degrees: ArrayLike, out: np.ndarray | None = None):
     """Normalise an angle in degrees to the range [0, 360).
 
     Parameters
     ----------
-    degrees : float
-        Input angle in degrees (may be negative or greater than 360).
+    degrees : float or array_like
+        Input angle(s) in degrees (may be negative or greater than 360).
+    out : numpy.ndarray, optional
+        Array receiving the result; may be ``degrees`` itself.
 
     Returns
     -------
-    float
-        Equivalent angle in the half-open interval ``[0, 360)``.
+    float or numpy.ndarray
+        Equivalent angle(s) in the half-open interval ``[0, 360)``.
     """
-    return degrees % 360.0
+    return wrap_angle(degrees, 0.0, 360.0, out)
 
 
-def normalize_angle_rad(radians: float) -> float:
+def normalize_angle_rad(radians: ArrayLike, out: np.ndarray | None = None):
     """Normalise an angle in radians to the range [0, 2π).
 
     Parameters
     ----------
-    radians : float
-        Input angle in radians (may be negative or greater than 2π).
+    radians : float or array_like
+        Input angle(s) in radians (may be negative or greater than 2π).
+    out : numpy.ndarray, optional
+        Array receiving the result; may be ``radians`` itself.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Equivalent angle(s) in the half-open interval ``[0, 2π)``.
+    """
+    return wrap_angle(radians, 0.0, 2 * math.pi, out)
+
+
+def _ascii_digits(values: np.ndarray, width: int) -> np.ndarray:
+    """``(n, width)`` ASCII codes of non-negative integers, zero-padded."""
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return (values[:, None] // powers % 10 + ord("0")).astype(np.uint8)
+
+
+def format_sexagesimal(degrees: ArrayLike, hours: bool = False, precision: int = 2,
+                       explicit_sign: bool = False) -> list[str]:
+    """Format angles as sexagesimal strings.
+
+    Fields are rounded as a whole, so a value just below a minute boundary
+    carries into the minutes instead of printing ``60.00`` seconds. The leading
+    field has two digits, or as many as the widest value in the column, so a
+    column of longitudes reads ``005:15:00.00``. The strings are laid out as one
+    fixed-width byte buffer and sliced, instead of formatted one by one.
+
+    Parameters
+    ----------
+    degrees : float or array_like
+        Angle(s) in degrees.
+    hours : bool, default False
+        Format as ``HH:MM:SS.ss`` hours of right ascension, wrapped into
+        ``[0, 24h)``, instead of ``DD:MM:SS.ss`` degrees.
+    precision : int, default 2
+        Decimals of the seconds field.
+    explicit_sign : bool, default False
+        Prefix positive degrees with ``+`` (declinations, latitudes). Negative
+        degrees always carry ``-``.
 
     Returns
     -------
-    float
-        Equivalent angle in the half-open interval ``[0, 2π)``.
+    list of str
+        One string per input angle, in input order.
     """
-    return radians % (2 * math.pi)
+    if precision < 0:
+        raise ValueError("precision must be non-negative.")
+    values = np.atleast_1d(np.asarray(degrees, dtype=np.float64)).ravel()
+    if not np.isfinite(values).all():
+        raise ValueError("Cannot format non-finite angles.")
+    if hours:
+        values = wrap_angle(values, 0.0, 360.0) / 15.0
+    scale = 10 ** precision
+    units = np.rint(np.abs(values) * (3600 * scale)).astype(np.int64)
+    if hours:
+        units %= 24 * 3600 * scale  # 23:59:59.999… rounds up to 00:00:00
+    whole, fraction = np.divmod(units, scale)
+    minutes, seconds = np.divmod(whole, 60)
+    leading, minutes = np.divmod(minutes, 60)
+
+    # Row layout: sign, leading field, ":MM:SS", then ".fraction".
+    width = max(2, len(str(int(leading.max(initial=0)))))
+    fields = [_ascii_digits(leading, width), _ascii_digits(minutes, 2),
+              _ascii_digits(seconds, 2)]
+    if precision:
+        fields.append(_ascii_digits(fraction, precision))
+    columns = [np.full((values.size, 1), ord("+"), dtype=np.uint8)]
+    for separator, digits in zip(("", ":", ":", "."), fields):
+        if separator:
+            columns.append(np.full((values.size, 1), ord(separator), dtype=np.uint8))
+        columns.append(digits)
+    rows = np.hstack(columns)
+    negative = (values < 0) & (units > 0)
+    rows[negative, 0] = ord("-")
+    # Rows without a sign start one byte later.
+    unsigned = np.zeros(values.size, dtype=bool) if explicit_sign and not hours else ~negative
+
+    text = rows.tobytes().decode("ascii")
+    row_width = rows.shape[1]
+    ends = np.arange(1, values.size + 1) * row_width
+    starts = ends - row_width + unsigned
+    return [text[start:end] for start, end in zip(starts.tolist(), ends.tolist())]
+
+
+def parse_sexagesimal(text: str | list[str], hours: bool = False,
+                      out: np.ndarray | None = None) -> np.ndarray:
+    """Parse sexagesimal strings into angles in degrees.
+
+    Accepts ``12:34:56.7``, ``12 34 56.7``, ``12h34m56.7s`` and
+    ``-12°34′56.7″`` (or ``-12d34'56.7"``) forms; every string needs all three
+    fields. The whole column is split in one pass, so a million strings parse
+    in well under a second.
+
+    Parameters
+    ----------
+    text : str or list of str
+        One string or a column of them.
+    hours : bool, default False
+        Read the first field as hours of right ascension instead of degrees.
+    out : numpy.ndarray, optional
+        ``(n,)`` float64 array receiving the result.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n,)`` angles in degrees.
+
+    Raises
+    ------
+    ValueError
+        If a string does not hold three numeric fields, or a minutes or seconds
+        field is outside ``[0, 60)``.
+    """
+    if isinstance(text, str):
+        text = [text]
+    # Join with a marker between strings, so a missing or extra field shows as a
+    # marker out of place instead of shifting every later field.
+    tokens = " | ".join(text).translate(_SEPARATORS).split()
+    if len(tokens) != 4 * len(text) - 1 or tokens[3::4].count("|") != len(text) - 1:
+        raise ValueError("Every sexagesimal string needs exactly three fields.")
+    del tokens[3::4]
+    try:
+        fields = np.array(tokens, dtype=np.float64).reshape(-1, 3)
+    except ValueError as error:
+        raise ValueError(f"Invalid sexagesimal field: {error}") from None
+    if ((fields[:, 1:] < 0) | (fields[:, 1:] >= 60)).any():
+        raise ValueError("Minutes and seconds must be within [0, 60).")
+
+    # The sign sits on the first field; signbit also catches "-00".
+    out = np.abs(fields[:, 0], out=out)
+    out += fields[:, 1] / 60.0 + fields[:, 2] / 3600.0
+    np.negative(out, out=out, where=np.signbit(fields[:, 0]))
+    if hours:
+        out *= 15.0
+    return out
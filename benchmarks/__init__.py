@@ -0,0 +1,6 @@
+"""
+Performance benchmarks.
+
+Each ``bench_*`` module is a standalone script, run from the project root with
+``python -m benchmarks.<module>``.
+"""
@@ -0,0 +1,100 @@
+"""
+Conjunction screening benchmark.
+
+Screens a random LEO catalog and compares the grid candidate search of one epoch
+with an all-pairs search, then reports how many pairs each pipeline stage keeps::
+
+    python -m benchmarks.bench_conjunctions [--objects 10000 100000] [--window 600]
+                                            [--threshold 5000]
+
+The all-pairs search is timed on at most ``--brute-force-limit`` objects and
+scaled quadratically beyond that.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.calculations import conjunctions
+from app.services.calculations.orbital_elements import propagate_elements
+from app.services.calculations.orbital_mechanics import GM_EARTH
+
+EARTH_RADIUS = 6_378_137.0
+
+
+def random_catalog(n: int, seed: int = 0) -> np.ndarray:
+    """LEO elements: perigees 400–2000 km up, e < 0.02, isotropic orbit planes."""
+    rng = np.random.default_rng(seed)
+    return np.column_stack([EARTH_RADIUS + rng.uniform(400e3, 2000e3, n),
+                            rng.uniform(0.0, 0.02, n),
+                            np.arccos(rng.uniform(-1.0, 1.0, n)),
+                            rng.uniform(0.0, 2 * np.pi, n),
+                            rng.uniform(0.0, 2 * np.pi, n),
+                            rng.uniform(0.0, 2 * np.pi, n)])
+
+
+def brute_force_pairs(positions: np.ndarray, radius: float, block: int = 1024) -> int:
+    """Count the pairs within ``radius`` by comparing every pair, a block of rows at a time."""
+    found = 0
+    for start in range(0, len(positions), block):
+        rows = positions[start:start + block]
+        distance = np.linalg.norm(rows[:, None] - positions[None, start:], axis=2)
+        found += int(np.count_nonzero(np.triu(distance <= radius, k=1)))
+    return found
+
+
+def run(n: int, window: float, threshold: float, brute_force_limit: int) -> dict:
+    """Screen ``n`` objects over ``window`` seconds and time one epoch's pair search."""
+    elements = random_catalog(n)
+
+    start = time.perf_counter()
+    result = conjunctions.screen(elements, 0.0, 0.0, window, threshold)
+    screen_seconds = time.perf_counter() - start
+
+    positions = propagate_elements(elements, 0.0, (0.0,), gm=GM_EARTH)[:, 0, :3]
+    radius = result.stats.cell_size
+    start = time.perf_counter()
+    grid_pairs = len(conjunctions.candidate_pairs(positions, radius))
+    grid_seconds = time.perf_counter() - start
+
+    subset = min(n, brute_force_limit)
+    start = time.perf_counter()
+    brute_pairs = brute_force_pairs(positions[:subset], radius)
+    brute_seconds = (time.perf_counter() - start) * (n / subset) ** 2
+    if subset == n and brute_pairs != grid_pairs:
+        raise AssertionError(f"grid found {grid_pairs} pairs, all-pairs search {brute_pairs}")
+
+    return {"objects": n, "screen_seconds": screen_seconds, "grid_seconds": grid_seconds,
+            "brute_seconds": brute_seconds, "extrapolated": subset < n, "stats": result.stats}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--objects", type=int, nargs="+", default=[10_000, 100_000],
+                        help="catalog sizes")
+    parser.add_argument("--window", type=float, default=600.0, help="screening window [s]")
+    parser.add_argument("--threshold", type=float, default=5e3, help="miss distance [m]")
+    parser.add_argument("--brute-force-limit", type=int, default=20_000,
+                        help="largest catalog timed with the all-pairs search")
+    args = parser.parse_args()
+
+    for n in args.objects:
+        result = run(n, args.window, args.threshold, args.brute_force_limit)
+        stats = result["stats"]
+        brute = "extrapolated" if result["extrapolated"] else "measured"
+        print(f"objects          : {n:,}")
+        print(f"window / step    : {args.window:g} s / {stats.step:.1f} s "
+              f"({stats.epochs} epochs, {stats.cell_size / 1e3:.0f} km cells)")
+        print(f"screening        : {result['screen_seconds']:.2f} s")
+        print(f"pairs, one epoch : grid {result['grid_seconds'] * 1e3:.1f} ms, "
+              f"all pairs {result['brute_seconds'] * 1e3:,.0f} ms ({brute})")
+        print(f"grid candidates  : {stats.grid_candidates:,} ({stats.pairs:,} distinct pairs)")
+        print(f"after filters    : {stats.apsis_survivors:,} apsis, "
+              f"{stats.geometry_survivors:,} geometry")
+        print(f"refined / events : {stats.refined:,} / {stats.events:,}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
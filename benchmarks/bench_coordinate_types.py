@@ -0,0 +1,93 @@
+"""
+Scalar coordinate pipeline benchmark: Pydantic models vs lean tuples.
+
+Transforms one spherical coordinate to geocentric rectangular per call, either
+through validated Pydantic models on both sides (what an internal caller holding
+models pays) or with the lean ``SphericalCoord`` / ``RectangularCoord`` tuples the
+service layer uses end to end. Reports the median latency and the memory each call
+allocates::
+
+    python -m benchmarks.bench_coordinate_types [--calls 20000]
+"""
+
+import argparse
+import tracemalloc
+
+from app.models.coordinates_systems import (
+    Origin,
+    Plane,
+    Rectangular,
+    Shape,
+    Spherical,
+    SphericalCoord,
+    as_coord,
+)
+from app.services.calculations.coordinate_conversions import convert_celestial_coordinate
+from benchmarks.harness import measure
+
+TRANSLATION = (0.3, -0.9, 0.05)
+ARGS = (Shape.RECTANGULAR, Plane.ECLIPTIC, Origin.GEOCENTRIC)
+
+
+def _pydantic_call() -> Rectangular:
+    # Validate the input model, transform, then validate the output model.
+    source = Spherical(lon_or_ra=120.0, lat_or_dec=-30.0, distance=2.0,
+                       plane=Plane.EQUATORIAL, origin=Origin.HELIOCENTRIC)
+    result = convert_celestial_coordinate(source, *ARGS, translation_vector=TRANSLATION)
+    return Rectangular(**result._asdict())
+
+
+def _lean_call() -> tuple:
+    source = SphericalCoord(120.0, -30.0, 2.0, Plane.EQUATORIAL, Origin.HELIOCENTRIC)
+    return convert_celestial_coordinate(source, *ARGS, translation_vector=TRANSLATION)
+
+
+def _allocations(fn, calls: int) -> tuple[float, float]:
+    """Return (peak transient bytes per call, retained bytes per kept result)."""
+    fn()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        before, _ = tracemalloc.get_traced_memory()
+        kept = [fn() for _ in range(calls)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return float(peak), (after - before) / calls
+
+
+def run(calls: int) -> dict:
+    """Measure both variants; return latency and allocation figures per call."""
+    results = {}
+    for name, fn in (("pydantic", _pydantic_call), ("lean", _lean_call)):
+        timing = measure(fn, min_time=0.5, warmup=100)
+        peak, retained = _allocations(fn, calls)
+        results[name] = {"p50_us": timing.p50_us, "p99_us": timing.p99_us,
+                         "peak_bytes": peak, "retained_bytes": retained}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20_000,
+                        help="calls whose results are kept to measure retained memory")
+    args = parser.parse_args()
+
+    # Sanity check: both variants compute the same thing.
+    assert tuple(_pydantic_call().model_dump().values()) == tuple(as_coord(_pydantic_call()))
+
+    results = run(args.calls)
+    print(f"{'variant':<10}{'p50 (us)':>10}{'p99 (us)':>10}{'peak B/call':>14}"
+          f"{'kept B/result':>15}")
+    for name, row in results.items():
+        print(f"{name:<10}{row['p50_us']:>10.2f}{row['p99_us']:>10.2f}"
+              f"{row['peak_bytes']:>14,.0f}{row['retained_bytes']:>15,.0f}")
+    speedup = results["pydantic"]["p50_us"] / results["lean"]["p50_us"]
+    print(f"lean tuples are {speedup:.2f}x faster per call at the median")
+
+
+if __name__ == "__main__":
+    main()
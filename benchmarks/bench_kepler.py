@@ -0,0 +1,55 @@
+"""
+Kepler solver benchmark.
+
+Solves Kepler's equation over a dense (M, e) grid with e in [0, 0.999] and reports
+the throughput and the worst-case Halley iteration count::
+
+    python -m benchmarks.bench_kepler [--size 1000] [--repeat 5]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.calculations.orbital_mechanics import eccentric_anomaly_from_mean
+
+
+def run(size: int, repeat: int) -> dict:
+    """Time the solver on a ``size`` x ``size`` elliptic grid; return the best run."""
+    mean, ecc = np.meshgrid(np.linspace(-np.pi, np.pi, size), np.linspace(0.0, 0.999, size))
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        anomaly, iterations = eccentric_anomaly_from_mean(mean, ecc, return_iterations=True)
+        best = min(best, time.perf_counter() - start)
+
+    residual = np.abs(anomaly - ecc * np.sin(anomaly) - mean)
+    return {
+        "solves": mean.size,
+        "seconds": best,
+        "solves_per_second": mean.size / best,
+        "max_iterations": int(iterations.max()),
+        "mean_iterations": float(iterations.mean()),
+        "max_residual": float(residual.max()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1000, help="grid points per axis")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions")
+    args = parser.parse_args()
+
+    result = run(args.size, args.repeat)
+    print(f"solves           : {result['solves']:,}")
+    print(f"best time        : {result['seconds'] * 1e3:.1f} ms")
+    print(f"solves / second  : {result['solves_per_second']:,.0f}")
+    print(f"max iterations   : {result['max_iterations']}")
+    print(f"mean iterations  : {result['mean_iterations']:.2f}")
+    print(f"max |residual|   : {result['max_residual']:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Angle helper throughput benchmark.
+
+Times the array paths of :mod:`app.utils.math_helpers` against a Python loop
+over the scalar path, and the sexagesimal formatting and parsing of a catalog
+column::
+
+    python -m benchmarks.bench_math_helpers [--size 1000000] [--loop-size 100000]
+
+The scalar loop runs on at most ``--loop-size`` values and is scaled linearly.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.utils import math_helpers
+
+
+def _seconds(function, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000, help="angles per column")
+    parser.add_argument("--loop-size", type=int, default=100_000,
+                        help="angles timed with the scalar loop")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    angles = rng.uniform(-720.0, 720.0, args.size)
+    declinations = rng.uniform(-90.0, 90.0, args.size)
+    out = np.empty_like(angles)
+    scalars = angles[:args.loop_size].tolist()
+    scale = args.size / len(scalars)
+
+    print(f"angles: {args.size:,}")
+    print(f"{'operation':<22} {'scalar loop':>12} {'array':>10} {'array, out=':>12} "
+          f"{'speed-up':>9}")
+    for name, function in (("deg_to_rad", math_helpers.deg_to_rad),
+                           ("normalize_angle_deg", math_helpers.normalize_angle_deg),
+                           ("wrap_angle_deg", math_helpers.wrap_angle_deg)):
+        loop = _seconds(lambda: [function(value) for value in scalars]) * scale
+        array = _seconds(lambda: function(angles))
+        in_place = _seconds(lambda: function(angles, out=out))
+        print(f"{name:<22} {loop * 1e3:10.1f} ms {array * 1e3:7.1f} ms {in_place * 1e3:9.1f} ms "
+              f"{loop / in_place:8.0f}x")
+
+    text = math_helpers.format_sexagesimal(declinations, explicit_sign=True)
+    formatting = _seconds(lambda: math_helpers.format_sexagesimal(declinations,
+                                                                  explicit_sign=True))
+    parsing = _seconds(lambda: math_helpers.parse_sexagesimal(text, out=out))
+    print(f"format_sexagesimal     {formatting:.2f} s ({args.size / formatting / 1e6:.1f} M/s)")
+    print(f"parse_sexagesimal      {parsing:.2f} s ({args.size / parsing / 1e6:.1f} M/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Orbit-determination benchmark.
+
+Fits heliocentric orbits to synthetic tracklets of random main-belt asteroids
+(light-time corrected, with Gaussian astrometric noise) in one batched call::
+
+    python -m benchmarks.bench_orbit_determination [--tracklets 1000 10000]
+                                                   [--observations 6] [--span 30] [--noise 0.5]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.core.constants import EPSILON_RAD
+from app.models.coordinates_systems import Plane
+from app.services.calculations import orbit_determination as od
+from app.services.calculations.orbital_elements import elements_to_state
+from app.services.calculations.orbital_mechanics import propagate_universal
+from app.services.calculations.planetary_ephemeris import heliocentric_position
+
+START = 2461041.5  # 2026-01-01
+
+
+def synthetic_tracklets(n: int, observations: int, span: float, noise: float, seed: int = 0):
+    """RA/Dec tracklets in degrees, and the true equatorial states at ``START``."""
+    rng = np.random.default_rng(seed)
+    elements = np.column_stack([rng.uniform(1.8, 3.5, n), rng.uniform(0.0, 0.3, n),
+                                rng.uniform(0.0, 0.5, n), rng.uniform(0.0, 2 * np.pi, (n, 3))])
+    state = elements_to_state(*elements.T, gm=od.GM_SUN_AU_DAY)
+    cos_eps, sin_eps = np.cos(EPSILON_RAD), np.sin(EPSILON_RAD)
+    rotation = np.array([[1.0, 0.0, 0.0], [0.0, cos_eps, -sin_eps], [0.0, sin_eps, cos_eps]])
+    position, velocity = state[:, :3] @ rotation.T, state[:, 3:] @ rotation.T
+
+    jd = START + np.sort(rng.uniform(0.0, span, (n, observations)), axis=1)
+    jd[:, 0], jd[:, -1] = START, START + span
+    earth = heliocentric_position("earth", jd.ravel(), Plane.EQUATORIAL).reshape(jd.shape + (3,))
+    light_time = np.zeros(jd.shape)
+    for _ in range(3):
+        rho = propagate_universal(position[:, None], velocity[:, None], jd - light_time - START,
+                                  od.GM_SUN_AU_DAY).position - earth
+        light_time = np.linalg.norm(rho, axis=-1) / od.C_AU_PER_DAY
+    dec = np.degrees(np.arcsin(rho[..., 2] / np.linalg.norm(rho, axis=-1)))
+    ra = np.degrees(np.arctan2(rho[..., 1], rho[..., 0]))
+    ra += noise / 3600.0 * rng.standard_normal(ra.shape) / np.cos(np.radians(dec))
+    dec += noise / 3600.0 * rng.standard_normal(dec.shape)
+    return jd, ra, dec, position, velocity
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tracklets", type=int, nargs="+", default=[1_000, 10_000],
+                        help="batch sizes")
+    parser.add_argument("--observations", type=int, default=6, help="observations per tracklet")
+    parser.add_argument("--span", type=float, default=30.0, help="arc length [days]")
+    parser.add_argument("--noise", type=float, default=0.5, help="astrometric noise [arcsec]")
+    args = parser.parse_args()
+
+    for n in args.tracklets:
+        jd, ra, dec, position, velocity = synthetic_tracklets(n, args.observations, args.span,
+                                                              args.noise)
+        sigma = [args.noise] * n if args.noise > 0 else None
+        start = time.perf_counter()
+        fit = od.determine_orbits(list(jd), list(ra), list(dec), sigma=sigma)
+        seconds = time.perf_counter() - start
+
+        truth = propagate_universal(position, velocity, fit.epoch - START, od.GM_SUN_AU_DAY)
+        error = np.linalg.norm(fit.state[:, :3] - truth.position, axis=1)
+        ok = fit.converged
+        print(f"tracklets        : {n:,} x {args.observations} observations over "
+              f"{args.span:g} days, {args.noise:g}\" noise")
+        print(f"elapsed          : {seconds:.2f} s ({n / seconds:,.0f} tracklets/s)")
+        print(f"converged        : {ok.mean():.1%}, {fit.iterations[ok].mean():.1f} "
+              f"iterations on average")
+        print(f"median RMS       : {np.median(fit.rms_arcsec[ok]):.3f}\"")
+        print(f"median pos. error: {np.median(error[ok]):.2e} AU")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Worker-pool scaling benchmark.
+
+Runs a large coordinate transform and a catalog propagation with 1, 2, 4, ... up
+to the core count worker processes and reports throughput and speedup::
+
+    python -m benchmarks.bench_parallel [--rows 4000000] [--objects 20000] [--epochs 200]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.models.coordinates_systems import Origin, Plane, Shape
+from app.services.parallel import WorkerPool, propagate, transform_coordinates
+
+AU = 1.495_978_707e11
+
+
+def _worker_counts(max_workers: int) -> list[int]:
+    counts, n = [], 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    return counts + [max_workers]
+
+
+def _best_of(repeat: int, job) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        job()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows: int, objects: int, epochs: int, max_workers: int, repeat: int) -> list[dict]:
+    """Time both jobs for every worker count; return one result row per count."""
+    rng = np.random.default_rng(0)
+    coords = rng.normal(size=(rows, 3))
+    elements = np.column_stack([rng.uniform(1.0, 5.0, objects) * AU, rng.uniform(0.0, 0.9, objects),
+                                rng.uniform(0.0, np.pi, (objects, 4))])
+    grid = np.linspace(0.0, 3.15e7, epochs)
+    states = np.empty((objects, epochs, 6))
+
+    results = []
+    for workers in _worker_counts(max_workers):
+        pool = WorkerPool(max_workers=workers, min_rows=0, chunk_rows=max(rows // (4 * workers), 1))
+        pool.start()
+        try:
+            transform = _best_of(repeat, lambda: transform_coordinates(
+                coords, Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+                Shape.SPHERICAL, Plane.ECLIPTIC, Origin.GEOCENTRIC,
+                translation_vector=(1.0, 0.0, 0.0), pool=pool))
+            propagation = _best_of(repeat, lambda: propagate(
+                elements, 0.0, grid, out=states, pool=pool))
+        finally:
+            pool.shutdown()
+        results.append({"workers": workers, "transform_s": transform,
+                        "propagate_s": propagation})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=4_000_000, help="coordinates to transform")
+    parser.add_argument("--objects", type=int, default=20_000, help="orbits to propagate")
+    parser.add_argument("--epochs", type=int, default=200, help="epochs per orbit")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="largest worker count to try")
+    parser.add_argument("--repeat", type=int, default=3, help="timed repetitions")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.objects, args.epochs, args.workers, args.repeat)
+    base = results[0]
+    states = args.objects * args.epochs
+    print(f"{'workers':>7} {'transform rows/s':>17} {'speedup':>8} "
+          f"{'propagate states/s':>19} {'speedup':>8}")
+    for row in results:
+        print(f"{row['workers']:>7} {args.rows / row['transform_s']:>17,.0f} "
+              f"{base['transform_s'] / row['transform_s']:>8.2f} "
+              f"{states / row['propagate_s']:>19,.0f} "
+              f"{base['propagate_s'] / row['propagate_s']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Porkchop benchmark.
+
+Solves Earth–Mars porkchop grids of growing size, then a second grid sharing
+the departure axis, which takes its planetary states from the axis cache::
+
+    python -m benchmarks.bench_porkchop [--sizes 100 316 1000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.calculations import orbital_mechanics, porkchop
+
+LAUNCH = 2461041.5  # 2026-01-01
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 316, 1000],
+                        help="epochs per axis (the grid is size x size)")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        step = 720.0 / size
+        departure = (LAUNCH, LAUNCH + step * (size - 1), step)
+        arrival = (LAUNCH + 100.0, LAUNCH + 100.0 + step * (size - 1), step)
+        start = time.perf_counter()
+        grid = porkchop.porkchop("earth", "mars", departure, arrival)
+        seconds = time.perf_counter() - start
+        cells = grid.c3.size
+        shifted = (arrival[0] + 30.0, arrival[1] + 30.0, step)
+        start = time.perf_counter()
+        porkchop.porkchop("earth", "mars", departure, shifted)
+        cached = time.perf_counter() - start
+
+        print(f"grid             : {size} x {size} ({cells:,} Lambert problems)")
+        print(f"elapsed          : {seconds:.3f} s ({cells / seconds / 1e6:.2f} M cells/s)")
+        print(f"shared departure : {cached:.3f} s")
+        print(f"min C3           : {np.nanmin(grid.c3):.2f} km²/s², "
+              f"{np.isnan(grid.c3).mean():.0%} cells without transfer")
+        print()
+
+    # Raw solver throughput on one flat array.
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    r1 = rng.normal(size=(n, 3))
+    r2 = rng.normal(size=(n, 3))
+    tof = rng.uniform(50.0, 500.0, n)
+    start = time.perf_counter()
+    orbital_mechanics.lambert(r1, r2, tof, porkchop.GM_SUN_AU_DAY)
+    seconds = time.perf_counter() - start
+    print(f"lambert          : {n:,} random transfers in {seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
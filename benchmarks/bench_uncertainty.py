@@ -0,0 +1,66 @@
+"""
+Uncertainty propagation benchmark.
+
+Carries RA/Dec/distance covariances of a catalog from the heliocentric equator
+to the geocentric ecliptic in both modes, and compares the Monte Carlo run with
+one plain batch transform of as many points as it draws::
+
+    python -m benchmarks.bench_uncertainty [--objects 10000] [--samples 1000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.models.coordinates_systems import Origin, Plane, Shape
+from app.services.calculations.coordinate_conversions import (
+    convert_celestial_coordinates_batch,
+    convert_celestial_coordinates_with_uncertainty,
+)
+from app.services.calculations.uncertainty import Uncertainty
+
+FRAMES = (Shape.SPHERICAL, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+          Shape.SPHERICAL, Plane.ECLIPTIC, Origin.GEOCENTRIC)
+TRANSLATION = (-0.18, 0.89, 0.39)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--objects", type=int, default=10_000)
+    parser.add_argument("--samples", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.objects
+    coords = np.column_stack([rng.uniform(0.0, 360.0, n), rng.uniform(-80.0, 80.0, n),
+                              rng.uniform(0.5, 5.0, n)])
+    sigma = np.column_stack([rng.uniform(1e-4, 1e-2, (n, 2)), rng.uniform(1e-4, 1e-2, n)])
+    covariance = sigma[:, :, None] * sigma[:, None, :] * np.eye(3)
+
+    start = time.perf_counter()
+    convert_celestial_coordinates_with_uncertainty(coords, covariance, *FRAMES,
+                                                   translation_vector=TRANSLATION)
+    linear = time.perf_counter() - start
+
+    start = time.perf_counter()
+    convert_celestial_coordinates_with_uncertainty(
+        coords, covariance, *FRAMES, translation_vector=TRANSLATION,
+        method=Uncertainty.MONTE_CARLO, samples=args.samples, seed=0)
+    sampled = time.perf_counter() - start
+
+    points = np.repeat(coords, args.samples, axis=0)
+    start = time.perf_counter()
+    convert_celestial_coordinates_batch(points, *FRAMES, translation_vector=TRANSLATION)
+    batch = time.perf_counter() - start
+
+    total = points.shape[0]
+    print(f"objects          : {n:,} x {args.samples:,} samples ({total:,} points)")
+    print(f"linear           : {linear:.3f} s")
+    print(f"monte carlo      : {sampled:.3f} s ({total / sampled / 1e6:.2f} M samples/s)")
+    print(f"plain batch      : {batch:.3f} s for {total:,} points "
+          f"(monte carlo / batch = {sampled / batch:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Visibility benchmark.
+
+Computes rises, sets, transits and dark-sky windows of random targets seen from
+one site over a span of nights::
+
+    python -m benchmarks.bench_visibility [--targets 1000 5000] [--days 365]
+                                          [--step 10] [--min-altitude 30]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.calculations import visibility
+from app.services.calculations.horizon import ObserverSite
+
+SITE = ObserverSite(latitude=28.76, longitude=-17.88)  # La Palma
+START = 2461041.5  # 2026-01-01
+
+
+def random_targets(n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """RA/Dec spread uniformly over the sky, in degrees."""
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0.0, 360.0, n), np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, n)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--targets", type=int, nargs="+", default=[1_000, 5_000],
+                        help="catalog sizes")
+    parser.add_argument("--days", type=float, default=365.0, help="span searched [days]")
+    parser.add_argument("--step", type=float, default=10.0, help="grid spacing [minutes]")
+    parser.add_argument("--min-altitude", type=float, default=30.0, help="threshold [deg]")
+    args = parser.parse_args()
+
+    samples = int(np.ceil(args.days * 1440.0 / args.step)) + 1
+    for n in args.targets:
+        ra, dec = random_targets(n)
+        start = time.perf_counter()
+        result = visibility.visibility(ra, dec, SITE, START, START + args.days,
+                                       min_altitude=args.min_altitude, max_sun_altitude=-18.0,
+                                       step=args.step / 1440.0)
+        seconds = time.perf_counter() - start
+        events = sum(len(events.time) for events in result[:3])
+        print(f"targets          : {n:,} over {args.days:g} days ({samples:,} samples)")
+        print(f"elapsed          : {seconds:.2f} s "
+              f"({n * samples / seconds / 1e6:.0f} M target-samples/s)")
+        print(f"events           : {len(result.rises.time):,} rises, {len(result.sets.time):,} "
+              f"sets, {len(result.transits.time):,} transits ({events / seconds / 1e3:.0f} k/s)")
+        print(f"dark windows     : {len(result.windows.start):,}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Pytest wiring for the benchmark suite.
+
+The suite is kept out of the default test run (``testpaths`` only lists
+``tests``) and is selected explicitly::
+
+    pytest benchmarks                          # compare against benchmarks/baseline.json
+    pytest benchmarks --bench-threshold 0.4    # tolerate up to 40 % slowdowns
+    pytest benchmarks --bench-update           # record the current numbers as the baseline
+"""
+
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from benchmarks import harness
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+_results_key = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-baseline", type=Path, default=DEFAULT_BASELINE,
+                    help="baseline JSON file (default: benchmarks/baseline.json)")
+    group.addoption("--bench-threshold", type=float, default=0.25,
+                    help="allowed slowdown as a fraction of the baseline (default: 0.25)")
+    group.addoption("--bench-update", action="store_true",
+                    help="write the results to the baseline file instead of comparing")
+    group.addoption("--bench-min-time", type=float, default=harness.MIN_TIME,
+                    help="minimum timed seconds per benchmark")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.stash[_results_key] = {}
+
+
+class Bench:
+    """
+    The ``bench`` fixture: times a callable, records it and checks the baseline.
+
+    ``ops`` is the number of operations one call performs (rows in a batch), so
+    scalar and batch benchmarks report comparable ops/sec.
+    """
+
+    def __init__(self, config: pytest.Config):
+        self._config = config
+        self._results = config.stash[_results_key]
+        self._baseline = harness.load_baseline(config.getoption("bench_baseline"))
+
+    def __call__(self, name: str, fn: Callable[[], object], ops: int = 1) -> harness.BenchResult:
+        result = harness.measure(fn, ops, self._config.getoption("bench_min_time"))
+        return self._record(name, result)
+
+    async def run_async(self, name: str, fn: Callable[[], Awaitable[object]],
+                        ops: int = 1) -> harness.BenchResult:
+        result = await harness.measure_async(fn, ops, self._config.getoption("bench_min_time"))
+        return self._record(name, result)
+
+    def _record(self, name: str, result: harness.BenchResult) -> harness.BenchResult:
+        self._results[name] = result
+        if not self._config.getoption("bench_update"):
+            regression = harness.compare(result, self._baseline.get(name),
+                                         self._config.getoption("bench_threshold"))
+            if regression:
+                pytest.fail(f"{name} regressed: {regression}", pytrace=False)
+        return result
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> Bench:
+    return Bench(request.config)
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[AsyncClient, None]:
+    """In-process client, as in ``tests/conftest.py``; no server or network needed."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    results = config.stash.get(_results_key, {})
+    if config.getoption("bench_update", False) and results:
+        harness.save_baseline(config.getoption("bench_baseline"), results)
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    results = config.stash.get(_results_key, {})
+    if not results:
+        return
+    write = terminalreporter.write_line
+    terminalreporter.section("benchmarks")
+    write(f"{'name':<48} {'ops/s':>14} {'p50 (us)':>12} {'p99 (us)':>12} {'rounds':>8}")
+    for name, result in sorted(results.items()):
+        write(f"{name:<48} {result.ops_per_sec:>14,.0f} {result.p50_us:>12,.1f} "
+              f"{result.p99_us:>12,.1f} {result.rounds:>8}")
+    if config.getoption("bench_update"):
+        write(f"baseline written to {config.getoption('bench_baseline')}")
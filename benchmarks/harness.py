@@ -0,0 +1,149 @@
+"""
+Timing and baseline helpers for the pytest benchmark suite.
+
+A benchmark calls the code under test repeatedly, timing every call on its own,
+and reduces the samples to throughput (operations per second) and p50/p99
+per-call latency. Results are compared against a stored baseline JSON file so a
+slowdown beyond a threshold fails the run.
+
+Baseline layout::
+
+    {
+      "machine": {"python": "3.11.9", "platform": "Linux-...", "cpus": 8},
+      "results": {
+        "<benchmark name>": {"ops_per_sec": ..., "p50_us": ..., "p99_us": ..., "rounds": ...}
+      }
+    }
+"""
+
+import json
+import os
+import platform
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+# Default minimum timed duration and round count per benchmark.
+MIN_TIME = 0.2
+MIN_ROUNDS = 5
+MAX_ROUNDS = 100_000
+
+
+class BenchResult(NamedTuple):
+    """
+    Summary of one benchmark.
+
+    Attributes
+    ----------
+    ops_per_sec : float
+        Operations per second at the median call latency; a batch call of N rows
+        counts as N operations. The median keeps one-off stalls (GC, scheduler)
+        from skewing the comparison.
+    p50_us, p99_us : float
+        Median and 99th-percentile latency of one call, in microseconds.
+    rounds : int
+        Number of timed calls.
+    """
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    rounds: int
+
+
+def summarize(samples_ns: list[int], ops_per_call: int) -> BenchResult:
+    """Reduce per-call timings in nanoseconds to a :class:`BenchResult`."""
+    samples = np.asarray(samples_ns, dtype=np.float64)
+    p50, p99 = np.percentile(samples, [50, 99]) / 1e3
+    return BenchResult(
+        ops_per_sec=float(ops_per_call / (p50 / 1e6)),
+        p50_us=float(p50),
+        p99_us=float(p99),
+        rounds=int(samples.size),
+    )
+
+
+def _keep_going(samples: list[int], elapsed_ns: int, min_time: float) -> bool:
+    if len(samples) >= MAX_ROUNDS:
+        return False
+    return len(samples) < MIN_ROUNDS or elapsed_ns < min_time * 1e9
+
+
+def measure(fn: Callable[[], object], ops_per_call: int = 1, min_time: float = MIN_TIME,
+            warmup: int = 1) -> BenchResult:
+    """
+    Time ``fn()`` until at least ``min_time`` seconds and ``MIN_ROUNDS`` calls have run.
+
+    ``warmup`` untimed calls come first, so caches, lazy imports and the frame
+    registry are populated before measuring.
+    """
+    for _ in range(warmup):
+        fn()
+    samples: list[int] = []
+    elapsed = 0
+    while _keep_going(samples, elapsed, min_time):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append(time.perf_counter_ns() - start)
+        elapsed += samples[-1]
+    return summarize(samples, ops_per_call)
+
+
+async def measure_async(fn: Callable[[], Awaitable[object]], ops_per_call: int = 1,
+                        min_time: float = MIN_TIME, warmup: int = 1) -> BenchResult:
+    """Like :func:`measure`, for a coroutine function such as an HTTP client call."""
+    for _ in range(warmup):
+        await fn()
+    samples: list[int] = []
+    elapsed = 0
+    while _keep_going(samples, elapsed, min_time):
+        start = time.perf_counter_ns()
+        await fn()
+        samples.append(time.perf_counter_ns() - start)
+        elapsed += samples[-1]
+    return summarize(samples, ops_per_call)
+
+
+def compare(result: BenchResult, baseline: dict | None, threshold: float) -> str | None:
+    """
+    Return a description of the regression against ``baseline``, or ``None``.
+
+    A benchmark regresses when its throughput falls by more than ``threshold``
+    (a fraction, e.g. ``0.25`` for 25 %) — equivalently, when its median latency
+    grows by more than ``1 / (1 - threshold)``. Benchmarks missing from the
+    baseline never regress.
+    """
+    if not baseline:
+        return None
+    floor = baseline["ops_per_sec"] * (1.0 - threshold)
+    if result.ops_per_sec >= floor:
+        return None
+    return (f"{result.ops_per_sec:,.0f} ops/s < {floor:,.0f} ops/s "
+            f"(baseline {baseline['ops_per_sec']:,.0f} ops/s, p50 {result.p50_us:,.1f} us "
+            f"vs {baseline['p50_us']:,.1f} us)")
+
+
+def machine_info() -> dict:
+    """Describe the host, stored alongside the baseline for context."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_baseline(path: Path) -> dict:
+    """Return the ``results`` mapping of a baseline file, or ``{}`` when there is none."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["results"]
+
+
+def save_baseline(path: Path, results: dict[str, BenchResult]) -> None:
+    """Merge ``results`` into the baseline file, keeping entries that were not re-run."""
+    merged = load_baseline(path)
+    merged.update({name: result._asdict() for name, result in results.items()})
+    document = {"machine": machine_info(), "results": dict(sorted(merged.items()))}
+    path.write_text(json.dumps(document, indent=2) + "\n")
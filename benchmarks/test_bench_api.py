@@ -0,0 +1,40 @@
+"""Latency of the HTTP layer, driven in-process through the ASGI app."""
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+
+SINGLE_URL = "/api/v1/coordinates/transformations"
+BATCH_URL = "/api/v1/coordinates/transformations:batch"
+
+
+@pytest.mark.asyncio
+async def test_health(bench, client: AsyncClient) -> None:
+    await bench.run_async("api.health", lambda: client.get("/api/v1/health"))
+
+
+@pytest.mark.asyncio
+async def test_single_transformation(bench, client: AsyncClient) -> None:
+    payload = {
+        "input_coords": {"x": 1.0, "y": 0.5, "z": 0.25,
+                         "plane": "equatorial", "origin": "heliocentric"},
+        "target_shape": "spherical",
+        "target_plane": "ecliptic",
+        "target_origin": "heliocentric",
+    }
+    await bench.run_async("api.transformations[scalar]",
+                          lambda: client.post(SINGLE_URL, json=payload))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1_000, 10_000])
+async def test_batch_transformation(bench, client: AsyncClient, size: int) -> None:
+    x, y, z = np.random.default_rng(0).normal(size=(3, size)).tolist()
+    payload = {
+        "input_coords": {"x": x, "y": y, "z": z, "plane": "equatorial", "origin": "heliocentric"},
+        "target_shape": "spherical",
+        "target_plane": "ecliptic",
+        "target_origin": "heliocentric",
+    }
+    await bench.run_async(f"api.transformations:batch[{size}]",
+                          lambda: client.post(BATCH_URL, json=payload), ops=size)
@@ -0,0 +1,48 @@
+"""Throughput of the calculation services, scalar and batch."""
+
+import numpy as np
+import pytest
+
+from app.models.coordinates_systems import Origin, Plane, Rectangular, Shape
+from app.services.calculations.coordinate_conversions import (
+    convert_celestial_coordinate,
+    convert_celestial_coordinates_batch,
+)
+from app.services.calculations.orbital_mechanics import (
+    eccentric_anomaly_from_mean,
+    orbital_velocity,
+)
+
+AU = 1.495978707e11
+BATCH_SIZES = [1_000, 100_000]
+
+
+def test_convert_celestial_coordinate_scalar(bench) -> None:
+    coord = Rectangular(x=1.0, y=0.5, z=0.25, plane=Plane.EQUATORIAL, origin=Origin.HELIOCENTRIC)
+    bench("convert_celestial_coordinate[scalar]", lambda: convert_celestial_coordinate(
+        coord, Shape.SPHERICAL, Plane.ECLIPTIC, Origin.HELIOCENTRIC))
+
+
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_convert_celestial_coordinates_batch(bench, size: int) -> None:
+    coords = np.random.default_rng(0).normal(size=(size, 3))
+    out = np.empty_like(coords)
+    bench(f"convert_celestial_coordinates_batch[{size}]",
+          lambda: convert_celestial_coordinates_batch(
+              coords, Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+              Shape.SPHERICAL, Plane.ECLIPTIC, Origin.GEOCENTRIC,
+              translation_vector=(1.0, 0.0, 0.0), out=out),
+          ops=size)
+
+
+def test_orbital_velocity_scalar(bench) -> None:
+    bench("orbital_velocity[scalar]", lambda: orbital_velocity(AU, 1.1 * AU))
+
+
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_eccentric_anomaly_batch(bench, size: int) -> None:
+    rng = np.random.default_rng(0)
+    mean = rng.uniform(-np.pi, np.pi, size)
+    ecc = rng.uniform(0.0, 0.99, size)
+    bench(f"eccentric_anomaly_from_mean[{size}]",
+          lambda: eccentric_anomaly_from_mean(mean, ecc), ops=size)
@@ -0,0 +1,17 @@
+"""Overhead of the service-level stage timers."""
+
+from app.core import metrics
+
+
+def test_stage_timer_overhead(bench) -> None:
+    token = metrics._current_route.set("/bench")
+    try:
+        mark = metrics.now()
+        bench("metrics.record[in route]", lambda: metrics.record("apply", mark))
+    finally:
+        metrics._current_route.reset(token)
+
+
+def test_stage_timer_outside_route(bench) -> None:
+    mark = metrics.now()
+    bench("metrics.record[no route]", lambda: metrics.record("apply", mark))
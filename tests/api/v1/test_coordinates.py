@@ -0,0 +1,454 @@
+import json
+import math
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+
+from app.api.v1 import wire_formats
+from app.core.config import get_settings
+
+SINGLE_URL = "/api/v1/coordinates/transformations"
+BATCH_URL = "/api/v1/coordinates/transformations:batch"
+
+
+def _batch_payload(**overrides) -> dict:
+    payload = {
+        "input_coords": {
+            "x": [1.0, 0.0, 0.5],
+            "y": [0.0, 1.0, 0.5],
+            "z": [0.0, 0.0, 0.5],
+            "plane": "equatorial",
+            "origin": "heliocentric",
+        },
+        "target_shape": "spherical",
+        "target_plane": "ecliptic",
+        "target_origin": "heliocentric",
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.mark.asyncio
+async def test_single_transformation_returns_target_state(client: AsyncClient) -> None:
+    response = await client.post(SINGLE_URL, json={
+        "input_coords": {"x": 1.0, "y": 0.0, "z": 0.0,
+                         "plane": "equatorial", "origin": "heliocentric"},
+        "target_shape": "spherical",
+        "target_plane": "equatorial",
+        "target_origin": "heliocentric",
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["plane"] == "equatorial"
+    assert math.isclose(body["distance"], 1.0)
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_endpoint(client: AsyncClient) -> None:
+    payload = _batch_payload()
+    response = await client.post(BATCH_URL, json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["plane"] == "ecliptic"
+    assert body["origin"] == "heliocentric"
+
+    columns = payload["input_coords"]
+    for i in range(3):
+        single = await client.post(SINGLE_URL, json={
+            "input_coords": {"x": columns["x"][i], "y": columns["y"][i], "z": columns["z"][i],
+                             "plane": "equatorial", "origin": "heliocentric"},
+            "target_shape": "spherical",
+            "target_plane": "ecliptic",
+            "target_origin": "heliocentric",
+        })
+        expected = single.json()
+        for key in ("lon_or_ra", "lat_or_dec", "distance"):
+            assert math.isclose(body[key][i], expected[key], rel_tol=1e-12, abs_tol=1e-12)
+
+
+@pytest.mark.asyncio
+async def test_batch_streams_large_payloads(client: AsyncClient) -> None:
+    n = 20_000
+    payload = _batch_payload(
+        input_coords={"lon_or_ra": [float(i % 360) for i in range(n)],
+                      "lat_or_dec": [0.0] * n,
+                      "distance": [2.0] * n,
+                      "plane": "ecliptic", "origin": "heliocentric"},
+        target_shape="rectangular",
+    )
+    response = await client.post(BATCH_URL, json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["x"]) == len(body["y"]) == len(body["z"]) == n
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_ragged_columns(client: AsyncClient) -> None:
+    payload = _batch_payload()
+    payload["input_coords"]["z"] = [0.0]
+    response = await client.post(BATCH_URL, json=payload)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_origin_point_for_spherical_output(client: AsyncClient) -> None:
+    payload = _batch_payload()
+    payload["input_coords"]["x"][0] = 0.0
+    response = await client.post(BATCH_URL, json=payload)
+    assert response.status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# Binary wire formats
+# ---------------------------------------------------------------------------
+
+SPEC = {
+    "input_shape": "rectangular",
+    "input_plane": "equatorial",
+    "input_origin": "heliocentric",
+    "target_shape": "spherical",
+    "target_plane": "ecliptic",
+    "target_origin": "heliocentric",
+}
+
+
+async def _json_reference(client: AsyncClient) -> dict:
+    response = await client.post(BATCH_URL, json=_batch_payload())
+    return response.json()
+
+
+def _float64_body(columns: np.ndarray, **header) -> bytes:
+    prefix = wire_formats.encode_float64_header({**SPEC, "count": columns.shape[1], **header})
+    return prefix + np.ascontiguousarray(columns, dtype="<f8").tobytes()
+
+
+def _decode_float64_response(content: bytes) -> tuple[dict, np.ndarray]:
+    header_length = int.from_bytes(content[4:8], "little")
+    header = json.loads(content[8:8 + header_length])
+    columns = np.frombuffer(content, dtype="<f8", offset=8 + header_length)
+    return header, columns.reshape(3, header["count"])
+
+
+def _input_columns() -> np.ndarray:
+    columns = _batch_payload()["input_coords"]
+    return np.array([columns["x"], columns["y"], columns["z"]])
+
+
+@pytest.mark.asyncio
+async def test_batch_float64_round_trip(client: AsyncClient) -> None:
+    expected = await _json_reference(client)
+    response = await client.post(
+        BATCH_URL, content=_float64_body(_input_columns()),
+        headers={"Content-Type": wire_formats.FLOAT64, "Accept": wire_formats.FLOAT64},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == wire_formats.FLOAT64
+
+    header, columns = _decode_float64_response(response.content)
+    assert header["plane"] == "ecliptic"
+    assert header["columns"] == ["lon_or_ra", "lat_or_dec", "distance"]
+    np.testing.assert_allclose(columns[0], expected["lon_or_ra"], rtol=1e-12)
+    np.testing.assert_allclose(columns[2], expected["distance"], rtol=1e-12)
+
+
+@pytest.mark.asyncio
+async def test_batch_msgpack_round_trip(client: AsyncClient) -> None:
+    msgpack = pytest.importorskip("msgpack")
+    expected = await _json_reference(client)
+    columns = _input_columns()
+    body = msgpack.packb({**SPEC, "columns": {
+        "x": columns[0].tobytes(), "y": columns[1].tobytes(), "z": columns[2].tolist(),
+    }})
+    response = await client.post(
+        BATCH_URL, content=body,
+        headers={"Content-Type": wire_formats.MSGPACK, "Accept": wire_formats.MSGPACK},
+    )
+    assert response.status_code == 200
+
+    payload = msgpack.unpackb(response.content)
+    assert payload["count"] == 3
+    lat = np.frombuffer(payload["columns"]["lat_or_dec"], dtype="<f8")
+    np.testing.assert_allclose(lat, expected["lat_or_dec"], rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.asyncio
+async def test_batch_arrow_round_trip(client: AsyncClient) -> None:
+    pa = pytest.importorskip("pyarrow")
+    expected = await _json_reference(client)
+    columns = _input_columns()
+    batch = pa.record_batch([pa.array(column) for column in columns], names=["x", "y", "z"])
+    batch = batch.replace_schema_metadata({"spec": json.dumps(SPEC)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+
+    response = await client.post(
+        BATCH_URL, content=sink.getvalue().to_pybytes(),
+        headers={"Content-Type": wire_formats.ARROW, "Accept": wire_formats.ARROW},
+    )
+    assert response.status_code == 200
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    np.testing.assert_allclose(table.column("lon_or_ra").to_numpy(), expected["lon_or_ra"],
+                               rtol=1e-12)
+
+
+@pytest.mark.asyncio
+async def test_batch_accept_honours_quality(client: AsyncClient) -> None:
+    response = await client.post(
+        BATCH_URL, json=_batch_payload(),
+        headers={"Accept": f"application/json;q=0.5, {wire_formats.FLOAT64}"},
+    )
+    assert response.headers["content-type"] == wire_formats.FLOAT64
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_unsupported_media_types(client: AsyncClient) -> None:
+    not_acceptable = await client.post(BATCH_URL, json=_batch_payload(),
+                                       headers={"Accept": "text/csv"})
+    unsupported = await client.post(BATCH_URL, content=b"x,y,z",
+                                    headers={"Content-Type": "text/csv"})
+    assert not_acceptable.status_code == 406
+    assert unsupported.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_truncated_float64(client: AsyncClient) -> None:
+    body = _float64_body(_input_columns())[:-8]
+    response = await client.post(BATCH_URL, content=body,
+                                 headers={"Content-Type": wire_formats.FLOAT64})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_batch_validates_binary_spec(client: AsyncClient) -> None:
+    body = _float64_body(_input_columns(), target_plane="galactic")
+    response = await client.post(BATCH_URL, content=body,
+                                 headers={"Content-Type": wire_formats.FLOAT64})
+    assert response.status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# NDJSON streaming
+# ---------------------------------------------------------------------------
+
+STREAM_URL = "/api/v1/coordinates/transformations:stream"
+
+
+def _ndjson_lines(response) -> list:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_stream_matches_batch_endpoint(client: AsyncClient, monkeypatch) -> None:
+    monkeypatch.setattr(get_settings(), "stream_batch_rows", 2)
+    expected = await _json_reference(client)
+    columns = _input_columns().T
+
+    async def feed():
+        yield (json.dumps(SPEC) + "\n").encode()
+        for row in columns:
+            # Split lines across chunks to exercise the reassembly.
+            text = json.dumps(row.tolist()) + "\n"
+            yield text[:3].encode()
+            yield text[3:].encode()
+
+    response = await client.post(STREAM_URL, content=feed(),
+                                 headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    header, *rows = _ndjson_lines(response)
+    assert header["columns"] == ["lon_or_ra", "lat_or_dec", "distance"]
+    np.testing.assert_allclose(np.array(rows)[:, 0], expected["lon_or_ra"], rtol=1e-12)
+
+
+@pytest.mark.asyncio
+async def test_stream_without_trailing_newline(client: AsyncClient) -> None:
+    body = json.dumps(SPEC) + "\n\n[1, 0, 0]\n[0, 2, 0]"
+    response = await client.post(STREAM_URL, content=body)
+    assert len(_ndjson_lines(response)) == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_validates_header(client: AsyncClient) -> None:
+    bad_header = await client.post(STREAM_URL, content='{"input_shape": "cubic"}\n[1, 0, 0]\n')
+    empty = await client.post(STREAM_URL, content=b"")
+    assert bad_header.status_code == 422
+    assert empty.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tail", ["\n[1, 0, 0]\n", ""])
+async def test_stream_rejects_oversized_complete_lines(client: AsyncClient, monkeypatch,
+                                                       tail: str) -> None:
+    # The long row arrives whole within one chunk, followed by more rows or EOF.
+    header = json.dumps(SPEC)
+    monkeypatch.setattr(get_settings(), "stream_max_line_bytes", len(header))
+    body = header + "\n[1, 0, 0]\n[" + "0" * len(header) + "1, 0, 0]" + tail
+    response = await client.post(STREAM_URL, content=body)
+
+    # The whole body is a single chunk, so the row fails before the first batch.
+    assert response.status_code == 400
+    assert f"exceeds {len(header)} bytes" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_bad_rows_in_band(client: AsyncClient) -> None:
+    body = json.dumps(SPEC) + "\n[1, 0, 0]\n[1, 0]\n"
+    response = await client.post(STREAM_URL, content=body)
+
+    assert response.status_code == 200
+    assert "error" in _ndjson_lines(response)[-1]
+
+
+# ---------------------------------------------------------------------------
+# Frames of date
+# ---------------------------------------------------------------------------
+
+EPOCH_2050 = 2469807.5
+
+
+@pytest.mark.asyncio
+async def test_single_transformation_to_frame_of_date(client: AsyncClient) -> None:
+    response = await client.post(SINGLE_URL, json={
+        "input_coords": {"x": 1.0, "y": 0.0, "z": 0.0,
+                         "plane": "equatorial", "origin": "heliocentric"},
+        "target_shape": "spherical",
+        "target_plane": "equatorial",
+        "target_origin": "heliocentric",
+        "target_equinox": EPOCH_2050,
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["equinox"] == EPOCH_2050
+    # The equinox moves ~0.7 degrees in right ascension over 50 years.
+    assert 0.6 < body["lon_or_ra"] < 0.8
+
+
+@pytest.mark.asyncio
+async def test_batch_accepts_per_row_equinox(client: AsyncClient) -> None:
+    epochs = [2451545.0, EPOCH_2050, EPOCH_2050]
+    response = await client.post(BATCH_URL, json=_batch_payload(target_equinox=epochs))
+    assert response.status_code == 200
+    body = response.json()
+    assert body["equinox"] == epochs
+
+    single = await client.post(SINGLE_URL, json={
+        "input_coords": {"x": 0.0, "y": 1.0, "z": 0.0,
+                         "plane": "equatorial", "origin": "heliocentric"},
+        "target_shape": "spherical",
+        "target_plane": "ecliptic",
+        "target_origin": "heliocentric",
+        "target_equinox": EPOCH_2050,
+    })
+    assert math.isclose(body["lon_or_ra"][1], single.json()["lon_or_ra"], abs_tol=1e-9)
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_equinox_length_mismatch(client: AsyncClient) -> None:
+    response = await client.post(BATCH_URL, json=_batch_payload(target_equinox=[EPOCH_2050]))
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_per_row_equinox(client: AsyncClient) -> None:
+    header = dict(SPEC, target_equinox=[EPOCH_2050])
+    response = await client.post(STREAM_URL, content=json.dumps(header) + "\n[1, 0, 0]\n")
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_single_transformation_fills_translation_from_epoch(client: AsyncClient) -> None:
+    response = await client.post(SINGLE_URL, json={
+        "input_coords": {"x": 0.0, "y": 0.0, "z": 0.0,
+                         "plane": "ecliptic", "origin": "heliocentric"},
+        "target_shape": "spherical",
+        "target_plane": "ecliptic",
+        "target_origin": "geocentric",
+        "epoch": EPOCH_2050,
+    })
+    assert response.status_code == 200
+    # The Sun seen from the Earth is about 1 AU away.
+    assert 0.98 < response.json()["distance"] < 1.02
+
+
+@pytest.mark.asyncio
+async def test_epoch_and_translation_vector_are_exclusive(client: AsyncClient) -> None:
+    single = await client.post(SINGLE_URL, json={
+        "input_coords": {"x": 1.0, "y": 0.0, "z": 0.0,
+                         "plane": "ecliptic", "origin": "heliocentric"},
+        "target_shape": "rectangular",
+        "target_plane": "ecliptic",
+        "target_origin": "geocentric",
+        "translation_vector": [1.0, 0.0, 0.0],
+        "epoch": EPOCH_2050,
+    })
+    batch = await client.post(BATCH_URL, json=_batch_payload(epoch=[EPOCH_2050]))
+    assert single.status_code == 422
+    assert batch.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_batch_accepts_per_row_epoch(client: AsyncClient) -> None:
+    payload = _batch_payload(target_origin="geocentric",
+                             epoch=[2451545.0, EPOCH_2050, EPOCH_2050])
+    response = await client.post(BATCH_URL, json=payload)
+    assert response.status_code == 200
+    assert len(response.json()["distance"]) == 3
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    from app.services import result_cache
+
+    cache = result_cache.ResponseCache(
+        result_cache.MemoryBackend(max_entries=100, max_bytes=1_000_000), max_batch_rows=3
+    )
+    monkeypatch.setattr(result_cache, "get_response_cache", lambda: cache)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_single_responses_are_cached(client: AsyncClient, response_cache) -> None:
+    payload = {
+        "input_coords": {"x": 1.0, "y": 2.0, "z": 3.0,
+                         "plane": "equatorial", "origin": "heliocentric"},
+        "target_shape": "spherical",
+        "target_plane": "ecliptic",
+        "target_origin": "heliocentric",
+    }
+    first = await client.post(SINGLE_URL, json=payload)
+    # The same request, spelled differently, is served from the cache.
+    second = await client.post(SINGLE_URL, json={**payload, "physical_state": 1})
+
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("miss", "hit")
+    assert first.json() == second.json()
+    assert set(first.json()) == {"lon_or_ra", "lat_or_dec", "distance", "plane", "origin",
+                                 "equinox"}
+    assert response_cache.stats()["hit_rate"] == 0.5
+
+    metrics = await client.get("/api/v1/metrics")
+    assert 'result_cache_requests_total{outcome="hit"} 1.0' in metrics.text
+
+
+@pytest.mark.asyncio
+async def test_small_batches_are_cached_and_large_ones_bypass(client: AsyncClient,
+                                                              response_cache) -> None:
+    first = await client.post(BATCH_URL, json=_batch_payload())
+    second = await client.post(BATCH_URL, json=_batch_payload())
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("miss", "hit")
+    assert first.content == second.content
+
+    # Another response format is another entry.
+    binary = await client.post(BATCH_URL, json=_batch_payload(),
+                               headers={"Accept": wire_formats.FLOAT64})
+    assert binary.headers["x-cache"] == "miss"
+
+    large = _batch_payload()
+    large["input_coords"].update(x=[1.0] * 4, y=[0.0] * 4, z=[0.0] * 4)
+    response = await client.post(BATCH_URL, json=large)
+    assert response.status_code == 200
+    assert "x-cache" not in response.headers
+    assert response_cache.stats()["bypassed"] == 1
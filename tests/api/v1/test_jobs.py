@@ -0,0 +1,124 @@
+import asyncio
+import json
+import time
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+
+from app.api.v1 import wire_formats
+from app.services import jobs
+from app.services.calculations.orbital_elements import propagate_elements
+
+JOBS_URL = "/api/v1/jobs"
+
+
+@pytest.fixture
+async def manager(tmp_path, monkeypatch):
+    manager = jobs.JobManager(tmp_path, max_concurrent=2, max_queued=8,
+                              retention_seconds=3600.0, chunk_rows=4)
+    monkeypatch.setattr(jobs, "get_job_manager", lambda: manager)
+    yield manager
+    await manager.shutdown()
+
+
+async def _finished(client: AsyncClient, url: str) -> dict:
+    async with asyncio.timeout(10):
+        while (info := (await client.get(url)).json())["status"] in ("queued", "running"):
+            await asyncio.sleep(0.005)
+    return info
+
+
+@pytest.mark.asyncio
+async def test_propagation_job_lifecycle(client: AsyncClient, manager) -> None:
+    elements = [[2.0, 0.2, 0.1, 0.0, 1.0, float(k)] for k in range(7)]
+    response = await client.post(JOBS_URL, json={
+        "kind": "propagation", "elements": elements, "epoch": 0.0, "epochs": [0.0, 5e5, 1e6],
+        "priority": 3,
+    })
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    url = response.headers["location"]
+    assert url == f"{JOBS_URL}/{response.json()['id']}"
+
+    info = await _finished(client, url)
+    assert (info["status"], info["progress"], info["priority"]) == ("succeeded", 1.0, 3)
+    assert info["result"]["shape"] == [7, 3, 6]
+    assert info["result"]["columns"] == ["x", "y", "z", "vx", "vy", "vz"]
+
+    expected = propagate_elements(elements, 0.0, [0.0, 5e5, 1e6])
+    rows, offset = [], 0
+    while offset is not None:
+        chunk = (await client.get(f"{url}/result", params={"offset": offset, "limit": 3})).json()
+        rows.extend(chunk["data"])
+        offset = chunk["next_offset"]
+    assert chunk["total"] == 7 and chunk["count"] == 1
+    np.testing.assert_array_equal(np.array(rows), expected)
+
+    binary = await client.get(f"{url}/result", params={"offset": 5},
+                              headers={"Accept": wire_formats.FLOAT64})
+    assert binary.headers["content-type"] == wire_formats.FLOAT64
+    header_length = int.from_bytes(binary.content[4:8], "little")
+    header = json.loads(binary.content[8:8 + header_length])
+    assert header["shape"] == [2, 3, 6] and header["next_offset"] is None
+    data = np.frombuffer(binary.content[8 + header_length:], dtype="<f8")
+    np.testing.assert_array_equal(data.reshape(header["shape"]), expected[5:])
+
+    assert (await client.delete(url)).status_code == 204
+    assert (await client.get(url)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_ephemeris_job_and_errors(client: AsyncClient, manager) -> None:
+    invalid = await client.post(JOBS_URL, json={"kind": "ephemeris", "body": "pluto",
+                                                "start": 2451545.0, "stop": 2451546.0,
+                                                "step": 1.0})
+    assert invalid.status_code == 422
+    assert (await client.get(f"{JOBS_URL}/missing")).status_code == 404
+
+    response = await client.post(JOBS_URL, json={"kind": "ephemeris", "body": "earth",
+                                                 "start": 2451545.0, "stop": 2451555.0,
+                                                 "step": 1.0, "plane": "equatorial"})
+    url = response.headers["location"]
+    info = await _finished(client, url)
+    assert info["result"]["shape"] == [11, 4]
+
+    chunk = (await client.get(f"{url}/result", params={"offset": 10})).json()
+    assert chunk["data"][0][0] == 2451555.0
+    assert (await client.get(f"{url}/result", params={"offset": 12})).status_code == 422
+    not_acceptable = await client.get(f"{url}/result",
+                                      headers={"Accept": wire_formats.MSGPACK})
+    assert not_acceptable.status_code == 406
+
+
+@pytest.mark.asyncio
+async def test_cancel_endpoint_and_queue_limit(client: AsyncClient, manager,
+                                              monkeypatch) -> None:
+    def wait_for_cancel(request, context):
+        while True:
+            context.check_cancelled()
+            time.sleep(0.005)
+
+    monkeypatch.setitem(jobs.RUNNERS, "propagation", wait_for_cancel)
+    manager.max_queued = 1
+    payload = {"kind": "propagation", "elements": [[1.0, 0.0, 0.0, 0.0, 0.0, 0.0]],
+               "epoch": 0.0, "epochs": [0.0]}
+    # Fill both workers, one job at a time so the queue limit is not hit.
+    running = []
+    for _ in range(2):
+        running.append((await client.post(JOBS_URL, json=payload)).headers["location"])
+        async with asyncio.timeout(10):
+            while (await client.get(running[-1])).json()["status"] != "running":
+                await asyncio.sleep(0.005)
+
+    queued = await client.post(JOBS_URL, json=payload)
+    full = await client.post(JOBS_URL, json=payload)
+    assert full.status_code == 503
+    assert full.headers["retry-after"] == "10"
+
+    cancelled = await client.post(f"{queued.headers['location']}:cancel")
+    assert cancelled.json()["status"] == "cancelled"
+    assert (await client.get(f"{queued.headers['location']}/result")).status_code == 409
+    for url in running:
+        await client.post(f"{url}:cancel")
+        assert (await _finished(client, url))["status"] == "cancelled"
@@ -0,0 +1,26 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core import metrics
+
+
+@pytest.mark.asyncio
+async def test_metrics_reports_request_and_stage_timings(client: AsyncClient) -> None:
+    metrics.registry.clear()
+    await client.post("/api/v1/coordinates/transformations", json={
+        "input_coords": {"x": 1.0, "y": 0.0, "z": 0.0,
+                         "plane": "equatorial", "origin": "heliocentric"},
+        "target_shape": "spherical",
+        "target_plane": "ecliptic",
+        "target_origin": "heliocentric",
+    })
+
+    response = await client.get("/api/v1/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    route = 'route="/api/v1/coordinates/transformations"'
+    text = response.text
+    assert f'{metrics.REQUEST_DURATION}_count{{method="POST",{route},status="200"}} 1' in text
+    for stage in ("parse", "normalize", "matrix", "apply", "reshape", "endpoint", "serialize"):
+        assert f'{metrics.STAGE_DURATION}_count{{{route},stage="{stage}"}} 1' in text
@@ -0,0 +1,128 @@
+import json
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+
+from app.api.v1 import wire_formats
+from app.core.constants import EPSILON_RAD
+from app.models.coordinates_systems import Plane
+from app.services.calculations.orbit_determination import C_AU_PER_DAY, GM_SUN_AU_DAY
+from app.services.calculations.orbital_elements import elements_to_state
+from app.services.calculations.orbital_mechanics import propagate_universal
+from app.services.calculations.planetary_ephemeris import heliocentric_position
+
+DETERMINATIONS_URL = "/api/v1/orbital/determinations:batch"
+PORKCHOP_URL = "/api/v1/orbital/porkchop"
+T0 = 2460000.5
+
+
+def _tracklets(count: int, observations: int, span: float):
+    """Exact astrometry of random main-belt orbits, with light time."""
+    rng = np.random.default_rng(0)
+    elements = np.column_stack([rng.uniform(1.5, 3.5, count), rng.uniform(0.0, 0.3, count),
+                                rng.uniform(0.0, 0.5, count),
+                                rng.uniform(0.0, 2 * np.pi, (count, 3))])
+    state = elements_to_state(*elements.T, gm=GM_SUN_AU_DAY)
+    cos_eps, sin_eps = np.cos(EPSILON_RAD), np.sin(EPSILON_RAD)
+    rotation = np.array([[1.0, 0.0, 0.0], [0.0, cos_eps, -sin_eps], [0.0, sin_eps, cos_eps]])
+    position, velocity = state[:, :3] @ rotation.T, state[:, 3:] @ rotation.T
+
+    jd = T0 + np.linspace(0.0, span, observations) * np.ones((count, 1))
+    earth = heliocentric_position("earth", jd.ravel(), Plane.EQUATORIAL).reshape(jd.shape + (3,))
+    light_time = np.zeros(jd.shape)
+    for _ in range(3):
+        rho = propagate_universal(position[:, None], velocity[:, None], jd - light_time - T0,
+                                  GM_SUN_AU_DAY).position - earth
+        light_time = np.linalg.norm(rho, axis=-1) / C_AU_PER_DAY
+    ra = np.degrees(np.arctan2(rho[..., 1], rho[..., 0])) % 360.0
+    dec = np.degrees(np.arcsin(rho[..., 2] / np.linalg.norm(rho, axis=-1)))
+    return jd, ra, dec, elements
+
+
+@pytest.mark.asyncio
+async def test_batch_orbit_determination(client: AsyncClient) -> None:
+    jd, ra, dec, elements = _tracklets(4, 6, 30.0)
+    tracklets = [{"jd": jd[k].tolist(), "lon_or_ra": ra[k].tolist(),
+                  "lat_or_dec": dec[k].tolist()} for k in range(4)]
+    tracklets.append({"jd": [T0, T0 + 1.0, T0 + 2.0], "lon_or_ra": [10.0] * 3,
+                      "lat_or_dec": [5.0] * 3, "sigma_arcsec": [0.5, 0.5, 1.0]})
+
+    response = await client.post(DETERMINATIONS_URL, json={"tracklets": tracklets})
+
+    assert response.status_code == 200
+    orbits = response.json()["orbits"]
+    assert len(orbits) == 5
+    for orbit, expected in zip(orbits, elements):
+        assert orbit["converged"]
+        assert orbit["rms_arcsec"] < 1e-3
+        np.testing.assert_allclose(orbit["elements"][:3], expected[:3], atol=1e-5)
+        assert np.shape(orbit["covariance"]) == (6, 6)
+    # A stationary "object" has no Gauss solution.
+    assert orbits[4]["converged"] is False
+    assert orbits[4]["state"] is None and orbits[4]["rms_arcsec"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tracklet", [
+    {"jd": [0.0, 1.0], "lon_or_ra": [0.0, 1.0], "lat_or_dec": [0.0, 1.0]},
+    {"jd": [0.0, 1.0, 2.0], "lon_or_ra": [0.0, 1.0], "lat_or_dec": [0.0, 1.0, 2.0]},
+    {"jd": [0.0, 1.0, 2.0], "lon_or_ra": [0.0, 1.0, 2.0], "lat_or_dec": [0.0, 1.0, 2.0],
+     "sigma_arcsec": 0.0},
+])
+async def test_invalid_tracklets_are_rejected(client: AsyncClient, tracklet: dict) -> None:
+    response = await client.post(DETERMINATIONS_URL, json={"tracklets": [tracklet]})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_tracklets_without_time_span_are_unprocessable(client: AsyncClient) -> None:
+    tracklet = {"jd": [T0] * 3, "lon_or_ra": [0.0, 1.0, 2.0], "lat_or_dec": [0.0] * 3}
+    response = await client.post(DETERMINATIONS_URL, json={"tracklets": [tracklet]})
+    assert response.status_code == 422
+    assert "time interval" in response.json()["detail"]
+
+
+def _porkchop_payload(**overrides) -> dict:
+    payload = {
+        "departure_body": "earth",
+        "arrival_body": "mars",
+        "departure": {"start": 2453550.5, "stop": 2453670.5, "step": 10.0},
+        "arrival": {"start": 2453550.5, "stop": 2453950.5, "step": 20.0},
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.mark.asyncio
+async def test_porkchop_json_and_float64_agree(client: AsyncClient) -> None:
+    response = await client.post(PORKCHOP_URL, json=_porkchop_payload())
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["shape"] == [13, 21]
+    assert len(body["departure"]) == 13 and len(body["arrival"]) == 21
+    c3 = np.array([np.nan if value is None else value for value in body["c3"]]).reshape(13, 21)
+    # The first arrival coincides with the first departure: no transfer.
+    assert np.isnan(c3[0, 0])
+    assert 15.0 < np.nanmin(c3) < 20.0
+
+    binary = await client.post(PORKCHOP_URL, json=_porkchop_payload(),
+                               headers={"Accept": wire_formats.FLOAT64})
+    assert binary.headers["content-type"] == wire_formats.FLOAT64
+    header_length = int.from_bytes(binary.content[4:8], "little")
+    header = json.loads(binary.content[8:8 + header_length])
+    assert header["grids"] == ["c3", "v_inf_departure", "v_inf_arrival", "delta_v"]
+    grids = np.frombuffer(binary.content, dtype="<f8", offset=8 + header_length)
+    np.testing.assert_array_equal(grids.reshape(4, 13, 21)[0], c3)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overrides", [
+    {"arrival_body": "pluto"},
+    {"departure": {"start": 2453550.5, "stop": 2453540.5, "step": 1.0}},
+    {"departure": {"start": 2453550.5, "stop": 2463550.5, "step": 0.001}},
+])
+async def test_invalid_porkchop_requests_are_rejected(client: AsyncClient, overrides) -> None:
+    response = await client.post(PORKCHOP_URL, json=_porkchop_payload(**overrides))
+    assert response.status_code == 422
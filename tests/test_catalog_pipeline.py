@@ -0,0 +1,111 @@
+"""Tests for the chunked catalog pipeline."""
+
+import numpy as np
+import pytest
+
+from app.models.coordinates_systems import Origin, Plane, Shape
+from app.services import catalog_pipeline
+from app.services.calculations.coordinate_conversions import convert_celestial_coordinates_batch
+from app.services.calculations.orbital_elements import ELEMENT_NAMES, propagate_elements
+
+
+def _stars(n: int = 1_000) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return np.column_stack([rng.uniform(0, 360, n), rng.uniform(-90, 90, n),
+                            rng.uniform(1, 10, n)])
+
+
+def _write_csv(path, stars: np.ndarray) -> None:
+    with open(path, "w") as file:
+        file.write('name,ra,dec,distance\n')
+        for index, (ra, dec, distance) in enumerate(stars.tolist()):
+            file.write(f'"star, {index}",{ra!r},{dec!r},{distance!r}\n')
+
+
+def test_csv_to_npy_matches_the_batch_conversion(tmp_path) -> None:
+    stars = _stars()
+    _write_csv(tmp_path / "stars.csv", stars)
+    transform = catalog_pipeline.coordinate_transform(
+        Shape.SPHERICAL, Plane.EQUATORIAL, Origin.GEOCENTRIC,
+        Shape.RECTANGULAR, Plane.ECLIPTIC, Origin.GEOCENTRIC, target_equinox=2461000.5)
+    reports = []
+
+    stats = catalog_pipeline.run(tmp_path / "stars.csv", tmp_path / "out.npy", transform,
+                                 columns=["ra", "dec", "distance"], chunk_rows=300,
+                                 progress=reports.append)
+
+    result = np.load(tmp_path / "out.npy", mmap_mode="r")
+    assert result.dtype.names == ("x", "y", "z")
+    expected = convert_celestial_coordinates_batch(
+        stars, Shape.SPHERICAL, Plane.EQUATORIAL, Origin.GEOCENTRIC,
+        Shape.RECTANGULAR, Plane.ECLIPTIC, Origin.GEOCENTRIC, target_equinox=2461000.5)
+    assert np.allclose(np.column_stack([result["x"], result["y"], result["z"]]), expected,
+                       rtol=0, atol=1e-12)
+    assert (stats.rows, stats.chunks) == (1_000, 4)
+    assert [report.rows for report in reports] == [300, 600, 900, 1_000]
+
+
+def test_npy_elements_to_parquet_states(tmp_path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    rng = np.random.default_rng(1)
+    elements = np.column_stack([rng.uniform(1e11, 5e11, 500), rng.uniform(0, 0.5, 500),
+                                rng.uniform(0, 180, (500, 4))])
+    epochs = rng.uniform(0, 1e7, 500)
+    catalog = np.zeros(500, dtype=[(name, "<f8") for name in ELEMENT_NAMES + ("epoch",)])
+    for index, name in enumerate(ELEMENT_NAMES):
+        catalog[name] = elements[:, index]
+    catalog["epoch"] = epochs
+    np.save(tmp_path / "elements.npy", catalog)
+    transform = catalog_pipeline.propagation_transform(None, 3e7, degrees=True)
+
+    catalog_pipeline.run(tmp_path / "elements.npy", tmp_path / "states.parquet", transform,
+                         chunk_rows=128)
+
+    table = pq.read_table(tmp_path / "states.parquet")
+    assert table.column_names == list(catalog_pipeline.STATE_COLUMNS)
+    radians = elements.copy()
+    radians[:, 2:] = np.radians(radians[:, 2:])
+    expected = np.stack([propagate_elements(row[None], epoch, (3e7,))[0, 0]
+                         for row, epoch in zip(radians, epochs)])
+    assert np.allclose(np.column_stack(list(table.to_pydict().values())), expected, rtol=1e-12)
+
+
+def test_plain_npy_columns_are_positional(tmp_path) -> None:
+    np.save(tmp_path / "plain.npy", np.arange(12.0).reshape(4, 3))
+    chunks = list(catalog_pipeline.read_chunks(tmp_path / "plain.npy", ["2", "0"], chunk_rows=3))
+    assert [chunk.tolist() for chunk in chunks] == [[[2.0, 0.0], [5.0, 3.0], [8.0, 6.0]],
+                                                    [[11.0, 9.0]]]
+
+
+def test_reader_errors_propagate_and_leave_no_output(tmp_path) -> None:
+    stars = _stars(50)
+    _write_csv(tmp_path / "stars.csv", stars)
+    with open(tmp_path / "stars.csv", "a") as file:
+        file.write('"bad",1.0,not-a-number,2.0\n')
+    transform = catalog_pipeline.coordinate_transform(
+        Shape.SPHERICAL, Plane.EQUATORIAL, Origin.GEOCENTRIC,
+        Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.GEOCENTRIC)
+
+    with pytest.raises(ValueError):
+        catalog_pipeline.run(tmp_path / "stars.csv", tmp_path / "out.npy", transform,
+                             columns=["ra", "dec", "distance"], chunk_rows=20)
+    assert not (tmp_path / "out.npy").exists()
+
+
+@pytest.mark.parametrize("columns, message", [
+    (["ra", "dec", "parallax"], "not in the catalog"),
+    (["ra", "dec"], "Expected 3 input columns"),
+])
+def test_run_rejects_bad_columns(tmp_path, columns, message) -> None:
+    _write_csv(tmp_path / "stars.csv", _stars(10))
+    transform = catalog_pipeline.coordinate_transform(
+        Shape.SPHERICAL, Plane.EQUATORIAL, Origin.GEOCENTRIC,
+        Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.GEOCENTRIC)
+    with pytest.raises(ValueError, match=message):
+        catalog_pipeline.run(tmp_path / "stars.csv", tmp_path / "out.npy", transform,
+                             columns=columns)
+
+
+def test_rejects_unknown_formats(tmp_path) -> None:
+    with pytest.raises(ValueError, match="Unsupported catalog format"):
+        catalog_pipeline.read_chunks(tmp_path / "stars.fits", ["ra"])
@@ -0,0 +1,38 @@
+"""Tests for Chebyshev fitting and evaluation."""
+
+import numpy as np
+import pytest
+
+from app.utils import chebyshev
+
+
+def test_fit_reproduces_polynomials_exactly() -> None:
+    coefficients = chebyshev.fit(lambda t: np.column_stack((t ** 3 - 2 * t, 4.0 + 0 * t)),
+                                 -3.0, 5.0, degree=3)
+    t = np.linspace(-3.0, 5.0, 11)
+    tau = (2 * t - 2.0) / 8.0
+    np.testing.assert_allclose(chebyshev.evaluate(coefficients, tau),
+                               np.column_stack((t ** 3 - 2 * t, np.full_like(t, 4.0))),
+                               atol=1e-12)
+
+
+@pytest.mark.parametrize("size", [1, 10, 1000])
+def test_basis_matches_cosine_definition(size: int) -> None:
+    tau = np.linspace(-1.0, 1.0, size)
+    expected = np.cos(np.outer(np.arccos(tau), np.arange(9)))
+    np.testing.assert_allclose(chebyshev.basis(tau, 8), expected, atol=1e-12)
+
+
+def test_evaluate_with_one_series_per_abscissa() -> None:
+    first = chebyshev.fit(np.sin, 0.0, 1.0, degree=10)
+    second = chebyshev.fit(np.cos, 0.0, 1.0, degree=10)
+    stacked = np.stack([first, second, first])
+    tau = np.array([-1.0, 0.0, 1.0])
+
+    values = chebyshev.evaluate(stacked, tau)[:, 0]
+    np.testing.assert_allclose(values, [np.sin(0.0), np.cos(0.5), np.sin(1.0)], atol=1e-12)
+
+
+def test_fit_rejects_empty_interval() -> None:
+    with pytest.raises(ValueError):
+        chebyshev.fit(np.sin, 1.0, 1.0, degree=4)
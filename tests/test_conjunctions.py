@@ -0,0 +1,111 @@
+"""Tests for conjunction screening."""
+
+import numpy as np
+import pytest
+
+from app.services.calculations import conjunctions
+from app.services.calculations.orbital_elements import propagate_elements
+from app.services.calculations.orbital_mechanics import GM_EARTH
+
+EARTH_RADIUS = 6_378_137.0
+
+
+def _catalog(n: int, seed: int, max_inclination: float = np.pi) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.column_stack([EARTH_RADIUS + rng.uniform(500e3, 900e3, n),
+                            rng.uniform(0.0, 0.03, n),
+                            rng.uniform(0.0, max_inclination, n),
+                            rng.uniform(0.0, 2 * np.pi, n),
+                            rng.uniform(0.0, 2 * np.pi, n),
+                            rng.uniform(0.0, 2 * np.pi, n)])
+
+
+def _closest(elements: np.ndarray, epochs: np.ndarray) -> np.ndarray:
+    """Smallest sampled separation of every pair, as an (n, n) upper-triangular array."""
+    positions = propagate_elements(elements, 0.0, epochs, gm=GM_EARTH)[:, :, :3]
+    closest = np.full((len(elements),) * 2, np.inf)
+    for i in range(len(elements) - 1):
+        separation = np.linalg.norm(positions[i + 1:] - positions[i], axis=2)
+        closest[i, i + 1:] = separation.min(axis=1)
+    return closest
+
+
+def test_candidate_pairs_match_brute_force() -> None:
+    positions = np.random.default_rng(1).uniform(-1.0, 1.0, size=(500, 3))
+    radius = 0.15
+
+    pairs = conjunctions.candidate_pairs(positions, radius)
+
+    distance = np.linalg.norm(positions[:, None] - positions[None], axis=2)
+    expected = set(zip(*np.nonzero(np.triu(distance <= radius, k=1))))
+    assert set(map(tuple, pairs.tolist())) == expected
+    assert len(pairs) == len(expected)
+
+
+def test_orbit_filters_keep_every_close_pair() -> None:
+    elements = _catalog(120, seed=2, max_inclination=0.5)
+    threshold = 150e3
+    closest = _closest(elements, np.arange(0.0, 12_000.0, 4.0))
+    first, second = np.nonzero(np.triu(np.isfinite(closest), k=1))
+
+    close = closest[first, second] <= threshold
+    assert close.any()
+    apsis = conjunctions.apsis_filter(elements, first, second, threshold)
+    geometry = conjunctions.geometry_filter(elements, first, second, threshold)
+    assert apsis[close].all() and geometry[close].all()
+    # The filters must also reject something, or they would be pointless.
+    assert not geometry.all()
+
+
+def test_screen_finds_the_same_pairs_as_brute_force() -> None:
+    elements = _catalog(150, seed=3)
+    threshold = 30e3
+    closest = _closest(elements, np.arange(0.0, 2_000.0 + 1.0, 1.0))
+
+    result = conjunctions.screen(elements, 0.0, 0.0, 2_000.0, threshold)
+
+    found = set(zip(result.first.tolist(), result.second.tolist()))
+    # Sampling every second overestimates minima by up to about a kilometre.
+    assert set(zip(*np.nonzero(closest <= threshold))) <= found
+    assert found <= set(zip(*np.nonzero(closest <= threshold + 1e3)))
+    assert np.all(result.miss_distance <= threshold)
+    assert np.all(np.diff(result.tca) >= 0.0)
+    assert result.stats.events == len(result.tca)
+    assert result.stats.geometry_survivors <= result.stats.apsis_survivors
+
+
+def test_screen_refines_time_of_closest_approach() -> None:
+    a = EARTH_RADIUS + 700e3
+    mean_motion = np.sqrt(GM_EARTH / a ** 3)
+    crossing = 1_234.5
+    # Two circular orbits reaching their shared node 1e-4 rad apart at `crossing`.
+    elements = np.array([[a, 0.0, 0.0, 0.0, 0.0, -mean_motion * crossing],
+                         [a, 0.0, 1.0, 0.0, 0.0, -mean_motion * crossing + 1e-4]])
+
+    result = conjunctions.screen(elements, 0.0, 0.0, 3_000.0, 5e3, step=20.0)
+
+    epochs = crossing + np.arange(-1.0, 1.0, 1e-4)
+    states = propagate_elements(elements, 0.0, epochs, gm=GM_EARTH)
+    separation = np.linalg.norm(states[1, :, :3] - states[0, :, :3], axis=1)
+    assert result.tca.tolist() == pytest.approx([epochs[np.argmin(separation)]], abs=1e-3)
+    assert result.miss_distance[0] == pytest.approx(separation.min(), rel=1e-6)
+    assert result.relative_speed[0] == pytest.approx(
+        2 * np.sqrt(GM_EARTH / a) * np.sin(0.5), rel=1e-4)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"start": 10.0, "end": 0.0},
+    {"threshold": 0.0},
+    {"step": -1.0},
+])
+def test_screen_rejects_invalid_arguments(kwargs) -> None:
+    arguments = {"start": 0.0, "end": 100.0, "threshold": 1e3} | kwargs
+    with pytest.raises(ValueError):
+        conjunctions.screen(_catalog(3, seed=4), 0.0, **arguments)
+
+
+def test_screen_rejects_hyperbolic_orbits() -> None:
+    elements = _catalog(3, seed=5)
+    elements[0, :2] = (-1e7, 1.5)
+    with pytest.raises(ValueError, match="elliptic"):
+        conjunctions.screen(elements, 0.0, 0.0, 100.0, 1e3)
@@ -0,0 +1,326 @@
+"""Tests for the coordinate conversion service."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from app.models.coordinates_systems import (
+    Origin,
+    PhysicalState,
+    Plane,
+    Rectangular,
+    RectangularCoord,
+    Shape,
+    Spherical,
+    SphericalCoord,
+    as_coord,
+    to_model,
+)
+from app.services.calculations import planetary_ephemeris
+from app.services.calculations.coordinate_conversions import (
+    convert_celestial_coordinate,
+    convert_celestial_coordinates_batch,
+    convert_celestial_coordinates_with_uncertainty,
+)
+from app.services.calculations.uncertainty import Uncertainty
+
+TRANSLATION = (0.3, -0.9, 0.05)
+
+
+def _random_coords(shape: Shape, n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    if shape == Shape.SPHERICAL:
+        return np.column_stack([
+            rng.uniform(-180.0, 360.0, n),
+            rng.uniform(-90.0, 90.0, n),
+            rng.uniform(0.1, 50.0, n),
+        ])
+    return rng.normal(scale=5.0, size=(n, 3))
+
+
+def _scalar_model(shape: Shape, row: np.ndarray, plane: Plane, origin: Origin):
+    if shape == Shape.SPHERICAL:
+        return Spherical(lon_or_ra=row[0], lat_or_dec=row[1], distance=row[2],
+                         plane=plane, origin=origin)
+    return Rectangular(x=row[0], y=row[1], z=row[2], plane=plane, origin=origin)
+
+
+def _model_values(coords) -> list[float]:
+    return list(coords[:3])
+
+
+@pytest.mark.parametrize(
+    "source_shape, target_shape, source_plane, target_plane, source_origin, target_origin, state",
+    list(itertools.product(Shape, Shape, Plane, Plane, Origin, Origin, PhysicalState)),
+)
+def test_batch_matches_scalar(source_shape, target_shape, source_plane, target_plane,
+                              source_origin, target_origin, state) -> None:
+    coords = _random_coords(source_shape, 25)
+
+    batch = convert_celestial_coordinates_batch(
+        coords, source_shape, source_plane, source_origin,
+        target_shape, target_plane, target_origin,
+        physical_state=state, translation_vector=TRANSLATION,
+    )
+
+    expected = [
+        _model_values(convert_celestial_coordinate(
+            _scalar_model(source_shape, row, source_plane, source_origin),
+            target_shape, target_plane, target_origin,
+            physical_state=state, translation_vector=TRANSLATION,
+        ))
+        for row in coords
+    ]
+    np.testing.assert_allclose(batch, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_scalar_pipeline_returns_lean_coordinates() -> None:
+    model = Spherical(lon_or_ra=30.0, lat_or_dec=10.0, distance=2.0,
+                      plane=Plane.EQUATORIAL, origin=Origin.HELIOCENTRIC)
+    lean = as_coord(model)
+
+    from_model = convert_celestial_coordinate(model, Shape.RECTANGULAR, Plane.ECLIPTIC,
+                                              Origin.HELIOCENTRIC)
+    from_lean = convert_celestial_coordinate(lean, Shape.RECTANGULAR, Plane.ECLIPTIC,
+                                             Origin.HELIOCENTRIC)
+
+    assert lean == SphericalCoord(30.0, 10.0, 2.0, Plane.EQUATORIAL, Origin.HELIOCENTRIC)
+    assert isinstance(from_lean, RectangularCoord)
+    assert from_model == from_lean
+    assert all(type(value) is float for value in from_lean[:3])
+
+
+def test_lean_coordinates_round_trip_through_models() -> None:
+    lean = RectangularCoord(1.0, -2.0, 0.5, Plane.ECLIPTIC, Origin.GEOCENTRIC, 2451545.0)
+    model = to_model(lean)
+
+    assert isinstance(model, Rectangular)
+    assert model.model_dump() == lean._asdict()
+    assert as_coord(model) == lean
+    assert as_coord(lean) is lean
+
+
+def test_batch_writes_into_out_buffer() -> None:
+    coords = _random_coords(Shape.RECTANGULAR, 10)
+    out = np.empty_like(coords)
+
+    result = convert_celestial_coordinates_batch(
+        coords, Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+        Shape.SPHERICAL, Plane.ECLIPTIC, Origin.HELIOCENTRIC, out=out,
+    )
+
+    assert result is out
+
+
+def test_batch_rejects_bad_shape() -> None:
+    with pytest.raises(ValueError):
+        convert_celestial_coordinates_batch(
+            np.zeros((4, 2)), Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+            Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+        )
+
+
+def test_batch_rejects_origin_point_for_spherical_output() -> None:
+    coords = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    with pytest.raises(ValueError):
+        convert_celestial_coordinates_batch(
+            coords, Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+            Shape.SPHERICAL, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Frames of date
+# ---------------------------------------------------------------------------
+
+EPOCH_2050 = 2469807.5
+
+
+def test_frame_of_date_round_trip() -> None:
+    point = Spherical(lon_or_ra=120.0, lat_or_dec=-30.0, distance=2.0,
+                      plane=Plane.EQUATORIAL, origin=Origin.HELIOCENTRIC)
+    of_date = convert_celestial_coordinate(point, Shape.SPHERICAL, Plane.ECLIPTIC,
+                                           Origin.HELIOCENTRIC, target_equinox=EPOCH_2050)
+    back = convert_celestial_coordinate(of_date, Shape.SPHERICAL, Plane.EQUATORIAL,
+                                        Origin.HELIOCENTRIC)
+
+    assert of_date.equinox == EPOCH_2050
+    assert back.equinox is None
+    assert back.lon_or_ra == pytest.approx(120.0, abs=1e-10)
+    assert back.lat_or_dec == pytest.approx(-30.0, abs=1e-10)
+
+
+def test_ecliptic_longitude_precesses() -> None:
+    # General precession in longitude is about 50.3" per year.
+    point = Spherical(lon_or_ra=0.0, lat_or_dec=0.0, distance=1.0,
+                      plane=Plane.ECLIPTIC, origin=Origin.HELIOCENTRIC)
+    of_date = convert_celestial_coordinate(point, Shape.SPHERICAL, Plane.ECLIPTIC,
+                                           Origin.HELIOCENTRIC, target_equinox=EPOCH_2050)
+    assert of_date.lon_or_ra == pytest.approx(50 * 50.29 / 3600.0, abs=20.0 / 3600.0)
+
+
+def test_batch_per_row_equinox_matches_scalar() -> None:
+    coords = _random_coords(Shape.SPHERICAL, 50, seed=7)
+    epochs = np.random.default_rng(7).choice([2451545.0, EPOCH_2050, 2440000.5], 50)
+
+    batch = convert_celestial_coordinates_batch(
+        coords, Shape.SPHERICAL, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+        Shape.RECTANGULAR, Plane.ECLIPTIC, Origin.GEOCENTRIC,
+        translation_vector=TRANSLATION, target_equinox=epochs,
+    )
+    for row, epoch, result in zip(coords, epochs, batch):
+        point = Spherical(lon_or_ra=row[0], lat_or_dec=row[1], distance=row[2],
+                          plane=Plane.EQUATORIAL, origin=Origin.HELIOCENTRIC)
+        scalar = convert_celestial_coordinate(point, Shape.RECTANGULAR, Plane.ECLIPTIC,
+                                              Origin.GEOCENTRIC, translation_vector=TRANSLATION,
+                                              target_equinox=epoch)
+        np.testing.assert_allclose(result, scalar.to_numpy(), rtol=1e-12, atol=1e-12)
+
+
+def test_batch_rejects_equinox_length_mismatch() -> None:
+    with pytest.raises(ValueError, match="one equinox per row"):
+        convert_celestial_coordinates_batch(
+            np.ones((4, 3)), Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+            Shape.RECTANGULAR, Plane.ECLIPTIC, Origin.HELIOCENTRIC,
+            target_equinox=np.full(3, EPOCH_2050),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Ephemeris-derived translations
+# ---------------------------------------------------------------------------
+
+def test_epoch_places_the_sun_opposite_the_earth() -> None:
+    sun = Rectangular(x=0.0, y=0.0, z=0.0, plane=Plane.ECLIPTIC, origin=Origin.HELIOCENTRIC)
+    geocentric = convert_celestial_coordinate(sun, Shape.SPHERICAL, Plane.ECLIPTIC,
+                                              Origin.GEOCENTRIC, epoch=EPOCH_2050)
+    earth = planetary_ephemeris.heliocentric_position("earth", EPOCH_2050)
+
+    assert geocentric.distance == pytest.approx(np.linalg.norm(earth))
+    expected = (np.degrees(np.arctan2(earth[1], earth[0])) + 180.0) % 360.0
+    assert geocentric.lon_or_ra % 360.0 == pytest.approx(expected, abs=1e-9)
+
+
+def test_epoch_round_trip_through_frame_of_date() -> None:
+    point = Rectangular(x=1.2, y=-0.4, z=0.3, plane=Plane.EQUATORIAL,
+                        origin=Origin.HELIOCENTRIC, equinox=EPOCH_2050)
+    geocentric = convert_celestial_coordinate(point, Shape.RECTANGULAR, Plane.ECLIPTIC,
+                                              Origin.GEOCENTRIC, epoch=EPOCH_2050)
+    back = convert_celestial_coordinate(geocentric, Shape.RECTANGULAR, Plane.EQUATORIAL,
+                                        Origin.HELIOCENTRIC, target_equinox=EPOCH_2050,
+                                        epoch=EPOCH_2050)
+    np.testing.assert_allclose(back.to_numpy(), point.to_numpy(), atol=1e-12)
+
+
+def test_batch_per_row_epoch_matches_scalar() -> None:
+    coords = _random_coords(Shape.RECTANGULAR, 40, seed=3)
+    epochs = np.linspace(2451545.0, 2460000.5, 40)
+    batch = convert_celestial_coordinates_batch(
+        coords, Shape.RECTANGULAR, Plane.ECLIPTIC, Origin.HELIOCENTRIC,
+        Shape.SPHERICAL, Plane.EQUATORIAL, Origin.GEOCENTRIC, epoch=epochs,
+    )
+    for row, epoch, result in zip(coords, epochs, batch):
+        point = Rectangular(x=row[0], y=row[1], z=row[2], plane=Plane.ECLIPTIC,
+                            origin=Origin.HELIOCENTRIC)
+        scalar = convert_celestial_coordinate(point, Shape.SPHERICAL, Plane.EQUATORIAL,
+                                              Origin.GEOCENTRIC, epoch=epoch)
+        np.testing.assert_allclose(result, [scalar.lon_or_ra, scalar.lat_or_dec,
+                                            scalar.distance], rtol=1e-10, atol=1e-10)
+
+
+def test_epoch_and_translation_are_mutually_exclusive() -> None:
+    with pytest.raises(ValueError, match="not both"):
+        convert_celestial_coordinates_batch(
+            np.ones((2, 3)), Shape.RECTANGULAR, Plane.ECLIPTIC, Origin.HELIOCENTRIC,
+            Shape.RECTANGULAR, Plane.ECLIPTIC, Origin.GEOCENTRIC,
+            translation_vector=TRANSLATION, epoch=EPOCH_2050,
+        )
+
+
+UNCERTAIN_FRAMES = (Shape.SPHERICAL, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+                    Shape.SPHERICAL, Plane.ECLIPTIC, Origin.GEOCENTRIC)
+
+
+def test_linear_covariance_matches_finite_difference_jacobian() -> None:
+    coords = _random_coords(Shape.SPHERICAL, 20, seed=4)
+    covariance = np.diag([1e-4, 4e-4, 1e-6])
+    options = dict(epoch=EPOCH_2050, target_equinox=EPOCH_2050)
+    estimate = convert_celestial_coordinates_with_uncertainty(coords, covariance,
+                                                              *UNCERTAIN_FRAMES, **options)
+
+    jacobian = np.empty((20, 3, 3))
+    for k in range(3):
+        step = np.zeros(3)
+        step[k] = 1e-6
+        plus = convert_celestial_coordinates_batch(coords + step, *UNCERTAIN_FRAMES, **options)
+        minus = convert_celestial_coordinates_batch(coords - step, *UNCERTAIN_FRAMES, **options)
+        jacobian[:, :, k] = (plus - minus) / 2e-6
+    expected = jacobian @ covariance @ jacobian.transpose(0, 2, 1)
+
+    np.testing.assert_allclose(estimate.mean, convert_celestial_coordinates_batch(
+        coords, *UNCERTAIN_FRAMES, **options))
+    np.testing.assert_allclose(estimate.covariance, expected, rtol=1e-5, atol=1e-12)
+
+
+def test_monte_carlo_agrees_with_linear_for_small_errors() -> None:
+    # Row 0 straddles the ±180° seam of the output longitude.
+    coords = np.array([[180.0, 23.44, 2.0], [10.0, -30.0, 0.5], [250.0, 60.0, 1.2]])
+    covariance = np.diag([1e-4, 1e-4, 1e-6])
+    frames = (Shape.SPHERICAL, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+              Shape.SPHERICAL, Plane.ECLIPTIC, Origin.HELIOCENTRIC)
+    linear = convert_celestial_coordinates_with_uncertainty(coords, covariance, *frames)
+    sampled = convert_celestial_coordinates_with_uncertainty(
+        coords, covariance, *frames, method=Uncertainty.MONTE_CARLO, samples=20_000, seed=7,
+        chunk_points=25_000)
+
+    np.testing.assert_allclose(sampled.mean, linear.mean, atol=1e-3)
+    np.testing.assert_allclose(sampled.covariance, linear.covariance,
+                               atol=0.05 * np.abs(linear.covariance).max())
+
+
+def test_monte_carlo_is_reproducible_and_follows_per_row_epochs() -> None:
+    coords = _random_coords(Shape.RECTANGULAR, 4, seed=5)
+    epochs = EPOCH_2050 + np.arange(4) * 90.0
+    frames = (Shape.RECTANGULAR, Plane.ECLIPTIC, Origin.HELIOCENTRIC,
+              Shape.RECTANGULAR, Plane.ECLIPTIC, Origin.GEOCENTRIC)
+    covariance = 1e-6 * np.eye(3)
+    run = [convert_celestial_coordinates_with_uncertainty(
+        coords, covariance, *frames, epoch=epochs, method="monte_carlo", samples=2000, seed=3)
+        for _ in range(2)]
+
+    np.testing.assert_array_equal(run[0].mean, run[1].mean)
+    nominal = convert_celestial_coordinates_batch(coords, *frames, epoch=epochs)
+    np.testing.assert_allclose(run[0].mean, nominal, atol=1e-4)
+    # A translation and a rotation-free frame change leave the covariance intact.
+    np.testing.assert_allclose(run[0].covariance, np.broadcast_to(covariance, (4, 3, 3)),
+                               atol=1e-7)
+
+
+def test_scalar_uncertainty_mode_returns_an_estimate() -> None:
+    coords = SphericalCoord(120.0, 40.0, 3.0, Plane.EQUATORIAL, Origin.HELIOCENTRIC)
+    covariance = np.diag([1e-6, 1e-6, 1e-4])
+    estimate = convert_celestial_coordinate(coords, Shape.RECTANGULAR, Plane.ECLIPTIC,
+                                            Origin.HELIOCENTRIC, covariance=covariance)
+
+    nominal = convert_celestial_coordinate(coords, Shape.RECTANGULAR, Plane.ECLIPTIC,
+                                           Origin.HELIOCENTRIC)
+    assert isinstance(estimate.mean, RectangularCoord)
+    assert estimate.mean[3:] == nominal[3:]
+    np.testing.assert_allclose(estimate.mean[:3], nominal[:3], rtol=1e-15)
+    # The distance variance lies entirely along the line of sight.
+    radial = np.array(nominal[:3]) / 3.0
+    assert radial @ estimate.covariance @ radial == pytest.approx(1e-4, rel=1e-9)
+
+
+@pytest.mark.parametrize("covariance, message", [
+    (np.eye(2), "covariances"),
+    (np.array([[1.0, 0.5, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]), "symmetric"),
+    (-np.eye(3), "positive semi-definite"),
+    (np.diag([1.0, -5.0, 1.0]), "positive semi-definite"),
+])
+@pytest.mark.parametrize("method", list(Uncertainty))
+def test_invalid_covariances_are_rejected(covariance, message, method) -> None:
+    with pytest.raises(ValueError, match=message):
+        convert_celestial_coordinates_with_uncertainty(
+            np.ones((2, 3)), covariance, *UNCERTAIN_FRAMES, method=method)
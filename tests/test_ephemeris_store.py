@@ -0,0 +1,116 @@
+"""Tests for the memory-mapped Chebyshev ephemeris store."""
+
+import numpy as np
+import pytest
+
+from app.services import ephemeris_store
+from app.services.calculations.orbital_elements import propagate_elements
+
+DAY = 86400.0
+
+
+@pytest.fixture(scope="module")
+def catalog() -> tuple[list[str], np.ndarray]:
+    rng = np.random.default_rng(11)
+    n = 5
+    elements = np.column_stack([
+        rng.uniform(1.5e11, 4.5e11, n), rng.uniform(0.0, 0.3, n), rng.uniform(0.0, 1.0, n),
+        rng.uniform(0.0, 2 * np.pi, n), rng.uniform(0.0, 2 * np.pi, n),
+        rng.uniform(0.0, 2 * np.pi, n),
+    ])
+    return [f"object-{i}" for i in range(n)], elements
+
+
+@pytest.fixture(scope="module")
+def store_path(tmp_path_factory, catalog) -> str:
+    names, elements = catalog
+    path = tmp_path_factory.mktemp("ephemeris") / "catalog.cef"
+    ephemeris_store.build_store(path, names, elements, epoch=0.0, start=0.0,
+                                end=1000.0 * DAY, segment_length=30.0 * DAY,
+                                metadata={"frame": "ecliptic"})
+    return path
+
+
+def test_store_reproduces_propagation(store_path, catalog) -> None:
+    names, elements = catalog
+    epochs = np.linspace(0.0, 1000.0 * DAY, 777)
+    with ephemeris_store.EphemerisStore(store_path) as store:
+        assert store.names == names
+        assert store.metadata["frame"] == "ecliptic"
+        for name, reference in zip(names, propagate_elements(elements, 0.0, epochs)):
+            values = store.evaluate(name, epochs)
+            np.testing.assert_allclose(values[:, :3], reference[:, :3],
+                                       rtol=0, atol=1e-9 * elements[:, 0].max())
+            np.testing.assert_allclose(values[:, 3:], reference[:, 3:], rtol=0, atol=1e-6)
+
+
+def test_segment_lookup_covers_edges(store_path, catalog) -> None:
+    names, _ = catalog
+    with ephemeris_store.EphemerisStore(store_path) as store:
+        start, end = store.span(names[1])
+        assert (start, end) == (0.0, 1000.0 * DAY)
+        index = store.segment_index(names[1], [0.0, 30.0 * DAY, end])
+        first = store.segment_index(names[1], 0.0)
+        assert list(index - first) == [0, 1, 33]
+        assert store.evaluate(names[1], end).shape == (6,)
+
+
+def test_irregular_segment_edges_evaluate_finitely(tmp_path) -> None:
+    # Both segment ends round tau just past 1 unless it is computed from t - start;
+    # with all-ones coefficients the series is 13 at tau = 1 and 1 at tau = -1.
+    starts = np.array([268172289.1396152, 268362413.52187005])
+    ends = np.array([268352003.7866307, 268513239.90364647])
+    path = tmp_path / "irregular.cef"
+    with ephemeris_store.EphemerisStoreWriter(path, {"x": 2}, degree=12,
+                                              components=3) as writer:
+        writer.write("x", starts, ends, np.ones((2, 13, 3)))
+    with ephemeris_store.EphemerisStore(path) as store:
+        assert store.span("x") == (starts[0], ends[-1])
+        edges = np.array([starts[0], ends[0], starts[1], ends[1]])
+        single = np.array([store.evaluate("x", t) for t in edges])
+        np.testing.assert_allclose(single[:, 0], [1.0, 13.0, 1.0, 13.0], rtol=1e-12)
+        np.testing.assert_array_equal(single, store.evaluate("x", np.repeat(edges, 30))[::30])
+
+
+def test_out_of_range_and_unknown_objects_are_rejected(store_path) -> None:
+    with ephemeris_store.EphemerisStore(store_path) as store:
+        with pytest.raises(ValueError, match="outside the coverage"):
+            store.evaluate("object-0", [10.0, -1.0])
+        with pytest.raises(ValueError, match="outside the coverage"):
+            store.evaluate("object-0", 1001.0 * DAY)
+        with pytest.raises(ValueError, match="Unknown object"):
+            store.evaluate("missing", 0.0)
+
+
+def test_store_is_memory_mapped(store_path) -> None:
+    with ephemeris_store.EphemerisStore(store_path) as store:
+        # Views over read-only maps, not copies loaded into memory.
+        assert isinstance(store._coefficients.base, np.memmap)
+        assert not store._coefficients.flags.writeable
+
+
+def test_writer_validates_segments(tmp_path) -> None:
+    path = tmp_path / "store.cef"
+    writer = ephemeris_store.EphemerisStoreWriter(path, {"a": 2, "b": 1}, degree=1,
+                                                  components=1)
+    coefficients = np.zeros((2, 2, 1))
+    with pytest.raises(ValueError, match="non-overlapping"):
+        writer.write("a", [0.0, 0.5], [1.0, 2.0], coefficients)
+    writer.write("a", [0.0, 1.0], [1.0, 2.0], coefficients)
+    with pytest.raises(ValueError, match="already been written"):
+        writer.write("a", [0.0, 1.0], [1.0, 2.0], coefficients)
+    with pytest.raises(ValueError, match="never written: b"):
+        writer.close()
+
+
+def test_rejects_files_that_are_not_stores(tmp_path) -> None:
+    path = tmp_path / "bogus.cef"
+    path.write_bytes(b"CCF1" + bytes(12))
+    with pytest.raises(ValueError, match="bad magic"):
+        ephemeris_store.EphemerisStore(path)
+
+    with ephemeris_store.EphemerisStoreWriter(path, {"a": 1}, degree=2, components=3) as writer:
+        writer.write("a", [0.0], [1.0], np.ones((1, 3, 3)))
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError, match="truncated"):
+        ephemeris_store.EphemerisStore(path)
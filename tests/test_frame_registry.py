@@ -0,0 +1,73 @@
+"""Tests for the frame-transform registry."""
+
+import numpy as np
+import pytest
+
+from app.models.coordinates_systems import Origin, Plane
+from app.services.calculations.coordinate_conversions import _build_master_matrix
+from app.services.calculations.frame_registry import FrameTransformRegistry
+
+
+def test_static_pairs_are_precomputed() -> None:
+    registry = FrameTransformRegistry(_build_master_matrix)
+
+    identity = registry.get(Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+                            Plane.EQUATORIAL, Origin.HELIOCENTRIC)
+    rotation = registry.get(Plane.EQUATORIAL, Origin.GEOCENTRIC,
+                            Plane.ECLIPTIC, Origin.GEOCENTRIC)
+
+    assert identity.is_identity
+    assert not rotation.is_identity
+    np.testing.assert_array_equal(
+        rotation.matrix,
+        _build_master_matrix(Plane.EQUATORIAL, Origin.GEOCENTRIC,
+                             Plane.ECLIPTIC, Origin.GEOCENTRIC),
+    )
+    assert registry.stats()["hits"] == 2
+    assert registry.stats()["misses"] == 0
+
+
+def test_translation_entries_are_counted_and_reused() -> None:
+    registry = FrameTransformRegistry(_build_master_matrix)
+    args = (Plane.ECLIPTIC, Origin.HELIOCENTRIC, Plane.EQUATORIAL, Origin.GEOCENTRIC)
+
+    first = registry.get(*args, (1.0, 2.0, 3.0))
+    second = registry.get(*args, (1.0, 2.0, 3.0))
+
+    assert first is second
+    np.testing.assert_array_equal(first.offset, _build_master_matrix(*args, (1.0, 2.0, 3.0))[:3, 3])
+    stats = registry.stats()
+    assert (stats["hits"], stats["misses"], stats["dynamic_entries"]) == (1, 1, 1)
+
+
+def test_translation_entries_are_lru_bounded() -> None:
+    registry = FrameTransformRegistry(_build_master_matrix, maxsize=2)
+    args = (Plane.EQUATORIAL, Origin.HELIOCENTRIC, Plane.EQUATORIAL, Origin.GEOCENTRIC)
+
+    registry.get(*args, (1.0, 0.0, 0.0))
+    registry.get(*args, (2.0, 0.0, 0.0))
+    registry.get(*args, (1.0, 0.0, 0.0))  # refresh, so (2, 0, 0) is now oldest
+    registry.get(*args, (3.0, 0.0, 0.0))
+    assert registry.stats()["dynamic_entries"] == 2
+
+    registry.get(*args, (1.0, 0.0, 0.0))
+    assert registry.stats()["misses"] == 3
+    registry.get(*args, (2.0, 0.0, 0.0))
+    assert registry.stats()["misses"] == 4
+
+
+def test_cached_matrices_are_read_only() -> None:
+    registry = FrameTransformRegistry(_build_master_matrix)
+    entry = registry.get(Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+                         Plane.ECLIPTIC, Origin.HELIOCENTRIC)
+    with pytest.raises(ValueError):
+        entry.matrix[0, 0] = 2.0
+
+
+def test_clear_resets_counters() -> None:
+    registry = FrameTransformRegistry(_build_master_matrix)
+    registry.get(Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+                 Plane.EQUATORIAL, Origin.GEOCENTRIC, (1.0, 1.0, 1.0))
+    registry.clear()
+    assert registry.stats() == {"hits": 0, "misses": 0, "static_entries": 8,
+                                "dynamic_entries": 0, "maxsize": 1024}
@@ -0,0 +1,51 @@
+"""Tests for sidereal time and horizon coordinates."""
+
+import numpy as np
+import pytest
+
+from app.models.coordinates_systems import Origin, Plane, Shape
+from app.services.calculations import horizon
+
+# Meeus, Astronomical Algorithms, examples 12.a and 13.b (ΔT = 56 s in 1987).
+MEEUS_DELTA_T = 56.0
+US_NAVAL_OBSERVATORY = horizon.ObserverSite(38.0 + 55 / 60 + 17 / 3600,
+                                            -(77.0 + 3 / 60 + 56 / 3600))
+
+
+def test_sidereal_time_matches_meeus() -> None:
+    gast = horizon.sidereal_time(2446895.5, delta_t=MEEUS_DELTA_T)
+    expected = np.radians(15.0 * (13.0 + 10 / 60 + 46.1351 / 3600))
+    assert gast == pytest.approx(expected, abs=np.radians(0.01 / 3600 * 15))
+
+
+def test_equatorial_to_horizontal_matches_meeus() -> None:
+    # Venus on 1987 April 10 at 19:21 UT; Meeus counts azimuth from the south.
+    azimuth, altitude = horizon.equatorial_to_horizontal(
+        347.3193375, -6.719891667, 2446896.30625, US_NAVAL_OBSERVATORY, MEEUS_DELTA_T)
+    assert azimuth == pytest.approx(68.0337 + 180.0, abs=2e-4)
+    assert altitude == pytest.approx(15.1249, abs=2e-4)
+
+
+def test_to_horizontal_converts_through_the_frame_of_date() -> None:
+    site = horizon.ObserverSite(-30.0, 70.0)
+    rng = np.random.default_rng(0)
+    coords = np.column_stack([rng.uniform(0, 360, 20), rng.uniform(-90, 90, 20),
+                              rng.uniform(1, 2, 20)])
+    jd = 2461000.5 + rng.uniform(0, 10, 20)
+
+    result = horizon.to_horizontal(coords, jd, site, Shape.SPHERICAL, Plane.EQUATORIAL,
+                                   Origin.GEOCENTRIC)
+
+    # The pole of date stands due north, at the site's latitude.
+    pole = horizon.to_horizontal(np.array([[0.0, 90.0, 1.0]]), 2461000.5, site,
+                                 Shape.SPHERICAL, Plane.EQUATORIAL, Origin.GEOCENTRIC,
+                                 source_equinox=2461000.5 + horizon.DELTA_T / 86_400)
+    assert pole[0, 1] == pytest.approx(site.latitude, abs=1e-9)
+    assert np.cos(np.radians(pole[0, 0])) == pytest.approx(1.0)
+    assert np.allclose(result[:, 2], coords[:, 2])
+    assert np.all((result[:, 0] >= 0.0) & (result[:, 0] < 360.0))
+
+
+def test_rejects_invalid_latitude() -> None:
+    with pytest.raises(ValueError, match="latitude"):
+        horizon.equatorial_to_horizontal(0.0, 0.0, 2461000.5, horizon.ObserverSite(91.0, 0.0))
@@ -0,0 +1,141 @@
+"""Tests for the background job manager."""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.models import jobs as job_models
+from app.models.jobs import EphemerisJobRequest, JobStatus, PropagationJobRequest
+from app.services import jobs
+from app.services.calculations.orbital_elements import propagate_elements
+from app.services.calculations.planetary_ephemeris import heliocentric_position
+
+
+@pytest.fixture
+async def manager(tmp_path):
+    manager = jobs.JobManager(tmp_path / "spool", max_concurrent=1, max_queued=4,
+                              retention_seconds=3600.0, chunk_rows=5)
+    yield manager
+    await manager.shutdown()
+
+
+async def _wait(manager: jobs.JobManager, job_id: str, timeout: float = 10.0) -> jobs.Job:
+    async with asyncio.timeout(timeout):
+        while not (job := manager.get(job_id)).finished:
+            await asyncio.sleep(0.005)
+    return job
+
+
+async def _wait_started(started: list[str], name: str, timeout: float = 10.0) -> None:
+    async with asyncio.timeout(timeout):
+        while name not in started:
+            await asyncio.sleep(0.005)
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """A ``test`` job kind that records its order of execution and waits for ``release``."""
+    release = threading.Event()
+    started: list[str] = []
+
+    def runner(request, context):
+        started.append(request)
+        while not release.wait(0.005):
+            context.check_cancelled()
+        context.allocate((2, 1), ["value"])[:] = 1.0
+        if request == "fail":
+            raise ArithmeticError("boom")
+
+    monkeypatch.setitem(jobs.RUNNERS, "test", runner)
+    return release, started
+
+
+async def test_propagation_job_spools_its_result(manager, tmp_path) -> None:
+    elements = [[1.5, 0.1, 0.2, 0.3, 0.4, 0.5 + k] for k in range(12)]
+    request = PropagationJobRequest(elements=elements, epoch=0.0, epochs=[0.0, 1e6])
+    job = await _wait(manager, (await manager.submit("propagation", request)).id)
+
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.progress == 1.0
+    assert job.result.shape == [12, 2, 6]
+    assert [path.suffix for path in (tmp_path / "spool").iterdir()] == [".npy"]
+    np.testing.assert_array_equal(manager.read_result(job.id, 10, 5),
+                                  propagate_elements(elements, 0.0, [0.0, 1e6])[10:])
+
+
+def test_propagation_jobs_are_capped_in_size(monkeypatch) -> None:
+    monkeypatch.setattr(job_models, "MAX_PROPAGATION_STATES", 6)
+    elements = [[1.5, 0.1, 0.2, 0.3, 0.4, 0.5]] * 3
+    PropagationJobRequest(elements=elements, epoch=0.0, epochs=[0.0, 1.0])
+    with pytest.raises(ValueError, match="9 states; at most 6"):
+        PropagationJobRequest(elements=elements, epoch=0.0, epochs=[0.0, 1.0, 2.0])
+
+
+async def test_ephemeris_job_tabulates_positions(manager) -> None:
+    request = EphemerisJobRequest(body="mars", start=2451545.0, stop=2451545.0 + 30, step=2.5)
+    assert request.count == 13
+    job = await _wait(manager, (await manager.submit("ephemeris", request)).id)
+
+    table = manager.read_result(job.id, 0, 100)
+    assert table.shape == (13, 4)
+    np.testing.assert_allclose(table[:, 1:], heliocentric_position("mars", table[:, 0]))
+
+
+async def test_jobs_run_by_priority(manager, gate) -> None:
+    release, started = gate
+    blocker = await manager.submit("test", "blocker")
+    await _wait_started(started, "blocker")
+    low = await manager.submit("test", "low", priority=-1)
+    first = await manager.submit("test", "first")
+    high = await manager.submit("test", "high", priority=5)
+    second = await manager.submit("test", "second")
+    release.set()
+
+    for job in (blocker, low, first, high, second):
+        await _wait(manager, job.id)
+    assert started == ["blocker", "high", "first", "second", "low"]
+
+
+async def test_cancel_failures_and_queue_bound(manager, gate) -> None:
+    release, started = gate
+    running = await manager.submit("test", "running")
+    await _wait_started(started, "running")
+    queued = [await manager.submit("test", name) for name in ("queued", "fail", "a", "b")]
+    with pytest.raises(jobs.JobQueueFullError):
+        await manager.submit("test", "overflow")
+
+    # A queued job is cancelled at once and never starts.
+    assert manager.cancel(queued[0].id).status == JobStatus.CANCELLED
+    manager.cancel(running.id)
+    assert (await _wait(manager, running.id)).status == JobStatus.CANCELLED
+    with pytest.raises(jobs.JobStateError):
+        manager.read_result(running.id, 0, 1)
+    # Unfinished jobs cannot be deleted.
+    with pytest.raises(jobs.JobStateError):
+        manager.delete(queued[2].id)
+
+    release.set()
+    failed = await _wait(manager, queued[1].id)
+    assert (failed.status, failed.error) == (JobStatus.FAILED, "boom")
+    assert "queued" not in started
+    for job in queued[2:]:
+        await _wait(manager, job.id)
+    assert list(manager.spool_dir.glob("*.part")) == []
+
+    manager.delete(failed.id)
+    with pytest.raises(jobs.JobNotFoundError):
+        manager.get(failed.id)
+
+
+async def test_finished_jobs_expire(manager, gate) -> None:
+    release, _ = gate
+    release.set()
+    job = await _wait(manager, (await manager.submit("test", "done")).id)
+    assert job.path.exists()
+
+    manager.retention_seconds = 0.0
+    with pytest.raises(jobs.JobNotFoundError):
+        manager.get(job.id)
+    assert not job.path.exists()
@@ -2,11 +2,18 @@
 
 import math
 
+import numpy as np
+import pytest
+
 from app.utils.math_helpers import (
     deg_to_rad,
+    format_sexagesimal,
     normalize_angle_deg,
     normalize_angle_rad,
+    parse_sexagesimal,
     rad_to_deg,
+    wrap_angle_deg,
+    wrap_angle_rad,
 )
 
 
@@ -29,3 +36,53 @@ def test_normalize_angle_deg() -> None:
 def test_normalize_angle_rad() -> None:
     assert math.isclose(normalize_angle_rad(2 * math.pi), 0.0)
     assert math.isclose(normalize_angle_rad(3 * math.pi), math.pi)
+
+
+def test_conversions_accept_arrays_and_write_into_out() -> None:
+    degrees = np.array([0.0, 90.0, 180.0])
+    radians = deg_to_rad(degrees)
+    assert np.allclose(radians, [0.0, math.pi / 2, math.pi])
+    assert np.allclose(rad_to_deg(radians), degrees)
+
+    buffer = degrees.copy()
+    assert deg_to_rad(buffer, out=buffer) is buffer
+    assert np.allclose(buffer, radians)
+
+
+def test_normalize_angles_stay_half_open() -> None:
+    angles = np.array([-1e-14, 360.0, 450.0, -90.0])
+    assert normalize_angle_deg(angles).tolist() == [0.0, 0.0, 90.0, 270.0]
+    assert normalize_angle_deg(-1e-14) == 0.0
+    assert np.all(normalize_angle_rad(np.array([-1e-17, 2 * math.pi])) == 0.0)
+
+
+def test_wrap_angle_signed() -> None:
+    angles = np.array([180.0, -180.0, 190.0, -190.0, 540.0])
+    out = np.empty_like(angles)
+    assert wrap_angle_deg(angles, signed=True, out=out) is out
+    assert out.tolist() == [-180.0, -180.0, -170.0, 170.0, -180.0]
+    assert math.isclose(wrap_angle_rad(1.5 * math.pi, signed=True), -0.5 * math.pi)
+
+
+def test_format_sexagesimal_rounds_fields_together() -> None:
+    assert format_sexagesimal([359.999999999, 123.456789], hours=True, precision=3) == [
+        "00:00:00.000", "08:13:49.629"]
+    assert format_sexagesimal([10.5, -0.5, -1e-9, -23.456789], explicit_sign=True) == [
+        "+10:30:00.00", "-00:30:00.00", "+00:00:00.00", "-23:27:24.44"]
+    assert format_sexagesimal(-5.25, precision=0) == ["-05:15:00"]
+
+
+def test_parse_sexagesimal_forms_and_round_trip() -> None:
+    parsed = parse_sexagesimal(["12:34:56.7", "-00 30 00", "-12°34′56.7″", "+5d0'0\""])
+    assert np.allclose(parsed, [12.58241667, -0.5, -12.58241667, 5.0])
+    assert parse_sexagesimal("01h00m00s", hours=True).tolist() == [15.0]
+
+    angles = np.random.default_rng(0).uniform(-90.0, 90.0, 1_000)
+    assert np.allclose(parse_sexagesimal(format_sexagesimal(angles, precision=4)), angles,
+                       atol=1e-4 / 3600)
+
+
+@pytest.mark.parametrize("text", [["1:2", "3:4:5:6"], ["1:2:60"], ["a:b:c"]])
+def test_parse_sexagesimal_rejects_malformed_strings(text) -> None:
+    with pytest.raises(ValueError):
+        parse_sexagesimal(text)
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from app.core import metrics
+
+
+@pytest.fixture
+def registry(monkeypatch) -> metrics.MetricsRegistry:
+    registry = metrics.MetricsRegistry(buckets=(1e-6, 1e-3))
+    monkeypatch.setattr(metrics, "registry", registry)
+    return registry
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = metrics.Histogram(buckets=(1e-6, 1e-3))
+    for elapsed_ns in (500, 1_000, 50_000, 2_000_000):
+        histogram.observe_ns(elapsed_ns)
+
+    cumulative, count, total = histogram.snapshot()
+    assert cumulative == [2, 3, 4]
+    assert count == 4
+    assert total == pytest.approx(2_051_500e-9)
+
+
+def test_histogram_merges_thread_shards() -> None:
+    histogram = metrics.Histogram()
+    threads = [threading.Thread(target=lambda: [histogram.observe_ns(10) for _ in range(1000)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert histogram.snapshot()[1] == 4000
+
+
+def test_render_prometheus_text(registry) -> None:
+    registry.histogram(metrics.STAGE_DURATION, route='/a"b', stage="apply").observe_ns(10)
+    text = registry.render()
+
+    assert f"# TYPE {metrics.STAGE_DURATION} histogram" in text
+    assert f'{metrics.STAGE_DURATION}_bucket{{route="/a\\"b",stage="apply",le="1e-06"}} 1' in text
+    assert f'{metrics.STAGE_DURATION}_bucket{{route="/a\\"b",stage="apply",le="+Inf"}} 1' in text
+    assert f'{metrics.STAGE_DURATION}_count{{route="/a\\"b",stage="apply"}} 1' in text
+
+
+def test_record_only_inside_a_route(registry) -> None:
+    metrics.record("normalize", metrics.now())
+    assert registry.render() == ""
+
+    token = metrics._current_route.set("/route")
+    try:
+        mark = metrics.record("normalize", metrics.now())
+        metrics.record("apply", mark)
+    finally:
+        metrics._current_route.reset(token)
+    assert registry.stage("/route", "normalize").snapshot()[1] == 1
+    assert registry.stage("/route", "apply").snapshot()[1] == 1
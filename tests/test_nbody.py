@@ -0,0 +1,104 @@
+"""Tests for the N-body integrator."""
+
+import numpy as np
+import pytest
+
+from app.services.calculations import nbody
+from app.services.calculations.orbital_elements import propagate_elements
+from app.services.calculations.planetary_ephemeris import GM_SUN_AU_DAY
+
+ELEMENTS = np.array([[1.5, 0.3, 0.2, 1.0, 0.5, 0.3],
+                     [0.8, 0.05, 0.1, 2.0, 4.0, 5.0]])
+
+
+def _kepler_states(epochs) -> np.ndarray:
+    return propagate_elements(ELEMENTS, 0.0, epochs, gm=GM_SUN_AU_DAY)
+
+
+def test_accelerations_match_direct_sum() -> None:
+    rng = np.random.default_rng(3)
+    positions = rng.normal(size=(20, 3))
+    gm = rng.uniform(0.1, 1.0, size=4)
+
+    expected = np.zeros_like(positions)
+    for i, position in enumerate(positions):
+        for j, body_gm in enumerate(gm):
+            if i != j:
+                offset = positions[j] - position
+                expected[i] += body_gm * offset / np.linalg.norm(offset) ** 3
+
+    np.testing.assert_allclose(nbody.accelerations(positions, gm), expected, rtol=1e-12)
+
+
+def test_test_particles_are_blocked_and_do_not_attract(monkeypatch) -> None:
+    rng = np.random.default_rng(4)
+    positions = rng.normal(size=(103, 3))
+    gm = np.array([1.0, 0.5, 0.01])
+    reference = nbody.accelerations(positions, gm)
+
+    monkeypatch.setattr(nbody, "PARTICLE_BLOCK", 7)
+    np.testing.assert_allclose(nbody.accelerations(positions, gm), reference, rtol=1e-14)
+    # Massive bodies only feel each other.
+    np.testing.assert_array_equal(nbody.accelerations(positions[:3], gm), reference[:3])
+    # Total momentum change of the massive bodies vanishes.
+    np.testing.assert_allclose(gm @ reference[:3], 0.0, atol=1e-15)
+
+
+def test_two_body_orbits_match_kepler() -> None:
+    epochs = np.linspace(0.0, 700.0, 15)
+    initial = _kepler_states([0.0])[:, 0]
+
+    solution = nbody.propagate(np.zeros((1, 6)), [GM_SUN_AU_DAY], (0.0, 700.0),
+                               test_states=initial, t_eval=epochs)
+
+    assert solution.states.shape == (15, 3, 6)
+    np.testing.assert_array_equal(solution.massive[:, 0], 0.0)
+    # Local errors of 1e-10 accumulate over a few hundred steps.
+    np.testing.assert_allclose(solution.particles.transpose(1, 0, 2), _kepler_states(epochs),
+                               rtol=0, atol=1e-7)
+    assert solution.steps > 0 and solution.evaluations >= 6 * solution.steps
+
+
+def test_dense_output_and_backward_integration() -> None:
+    initial = _kepler_states([0.0])[:, 0]
+    forward = nbody.propagate(np.zeros((1, 6)), [GM_SUN_AU_DAY], (0.0, 400.0),
+                              test_states=initial, dense_output=True)
+
+    times = np.linspace(0.0, 400.0, 81)
+    np.testing.assert_allclose(forward.dense(times)[:, 1:].transpose(1, 0, 2),
+                               _kepler_states(times), rtol=0, atol=1e-7)
+    np.testing.assert_allclose(forward.dense(400.0), forward.states[-1], atol=1e-15)
+    with pytest.raises(ValueError, match="span"):
+        forward.dense(401.0)
+
+    backward = nbody.propagate(forward.states[-1, :1], [GM_SUN_AU_DAY], (400.0, 0.0),
+                               test_states=forward.states[-1, 1:], t_eval=[400.0, 200.0, 0.0])
+    np.testing.assert_allclose(backward.states[-1], forward.states[0], rtol=0, atol=1e-7)
+    np.testing.assert_allclose(backward.states[1], forward.dense(200.0), rtol=0, atol=1e-7)
+
+
+def test_planetary_system_conserves_energy() -> None:
+    states, gm = nbody.planetary_perturbers(2451545.0, bodies=("jupiter", "saturn"))
+    assert states.shape == (3, 6) and gm[0] == GM_SUN_AU_DAY
+    assert gm[1] == pytest.approx(GM_SUN_AU_DAY / 1047.3486)
+
+    def energy(state: np.ndarray) -> float:
+        kinetic = 0.5 * np.sum(gm * np.sum(state[:, 3:] ** 2, axis=1))
+        potential = sum(-gm[i] * gm[j] / np.linalg.norm(state[i, :3] - state[j, :3])
+                        for i in range(3) for j in range(i))
+        return kinetic + potential
+
+    solution = nbody.propagate(states, gm, (0.0, 10_000.0))
+    assert abs(energy(solution.states[-1]) / energy(states) - 1.0) < 1e-8
+    # Jupiter stays near its orbit around the Sun.
+    assert 4.9 < np.linalg.norm(solution.relative_to(0)[-1, 1, :3]) < 5.5
+
+
+def test_propagate_rejects_bad_input() -> None:
+    with pytest.raises(ValueError, match="massive states"):
+        nbody.propagate(np.zeros((2, 6)), [1.0], (0.0, 1.0))
+    with pytest.raises(ValueError, match="t_eval"):
+        nbody.propagate(np.zeros((1, 6)), [1.0], (0.0, 1.0), t_eval=[0.5, 2.0])
+    with pytest.raises(RuntimeError, match="steps"):
+        nbody.propagate(np.zeros((1, 6)), [GM_SUN_AU_DAY], (0.0, 365.0),
+                        test_states=_kepler_states([0.0])[:, 0], max_steps=3)
@@ -0,0 +1,134 @@
+"""Tests for Gauss initial orbits and batched differential correction."""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from app.core.constants import EPSILON_RAD
+from app.models.coordinates_systems import Plane
+from app.services.calculations import orbit_determination as od
+from app.services.calculations.orbital_elements import elements_to_state
+from app.services.calculations.orbital_mechanics import propagate_universal
+from app.services.calculations.planetary_ephemeris import heliocentric_position
+
+GM = od.GM_SUN_AU_DAY
+T0 = 2460000.5
+
+
+def _equatorial(vectors: np.ndarray) -> np.ndarray:
+    cos_eps, sin_eps = np.cos(EPSILON_RAD), np.sin(EPSILON_RAD)
+    x, y, z = vectors[..., 0], vectors[..., 1], vectors[..., 2]
+    return np.stack([x, cos_eps * y - sin_eps * z, sin_eps * y + cos_eps * z], axis=-1)
+
+
+def _tracklets(count: int, observations: int, span: float, noise: float = 0.0, seed: int = 0):
+    """Astrometry of random main-belt orbits, light-time corrected, plus Gaussian noise."""
+    rng = np.random.default_rng(seed)
+    elements = np.column_stack([rng.uniform(1.5, 3.5, count), rng.uniform(0.0, 0.3, count),
+                                rng.uniform(0.0, 0.5, count),
+                                rng.uniform(0.0, 2 * np.pi, (count, 3))])
+    state = elements_to_state(*elements.T, gm=GM)
+    position, velocity = _equatorial(state[:, :3]), _equatorial(state[:, 3:])
+
+    jd = T0 + np.sort(rng.uniform(0.0, span, (count, observations)), axis=1)
+    jd[:, 0], jd[:, -1] = T0, T0 + span
+    earth = heliocentric_position("earth", jd.ravel(), Plane.EQUATORIAL).reshape(jd.shape + (3,))
+    light_time = np.zeros(jd.shape)
+    for _ in range(3):
+        rho = propagate_universal(position[:, None], velocity[:, None], jd - light_time - T0,
+                                  GM).position - earth
+        light_time = np.linalg.norm(rho, axis=-1) / od.C_AU_PER_DAY
+    dec = np.degrees(np.arcsin(rho[..., 2] / np.linalg.norm(rho, axis=-1)))
+    ra = np.degrees(np.arctan2(rho[..., 1], rho[..., 0])) % 360.0
+    ra += noise / 3600.0 * rng.standard_normal(ra.shape) / np.cos(np.radians(dec))
+    dec += noise / 3600.0 * rng.standard_normal(dec.shape)
+    return jd, ra, dec, elements, position, velocity
+
+
+def test_exact_astrometry_recovers_the_orbit() -> None:
+    jd, ra, dec, elements, position, velocity = _tracklets(20, 8, 60.0)
+    fit = od.determine_orbits(list(jd), list(ra), list(dec))
+
+    assert fit.converged.all()
+    truth = propagate_universal(position, velocity, fit.epoch - T0, GM)
+    np.testing.assert_allclose(fit.state[:, :3], truth.position, atol=1e-7)
+    np.testing.assert_allclose(fit.state[:, 3:], truth.velocity, atol=1e-9)
+    np.testing.assert_allclose(fit.elements[:, :3], elements[:, :3], atol=1e-6)
+    assert (fit.rms_arcsec < 1e-3).all()
+
+
+def test_noisy_batch_fits_with_consistent_covariance() -> None:
+    jd, ra, dec, _, position, velocity = _tracklets(300, 8, 40.0, noise=0.5, seed=1)
+    fit = od.determine_orbits(list(jd), list(ra), list(dec), sigma=[0.5] * 300)
+
+    assert fit.converged.mean() > 0.95
+    ok = fit.converged
+    assert 0.3 < np.median(fit.rms_arcsec[ok]) < 0.6
+    # Normalised position errors follow χ² with 3 degrees of freedom.
+    truth = propagate_universal(position, velocity, fit.epoch - T0, GM)
+    error = fit.state[ok, :3] - truth.position[ok]
+    chi2 = np.einsum("bi,bij,bj->b", error, np.linalg.inv(fit.covariance[ok, :3, :3]), error)
+    assert 1.5 < np.median(chi2) < 4.5
+
+
+def test_ragged_tracklets_are_padded_and_keep_their_order() -> None:
+    jd, ra, dec, _, position, _ = _tracklets(3, 7, 15.0, seed=2)
+    lengths = [3, 7, 5]
+    picks = [np.r_[0, 3, 6][:n] if n == 3 else np.r_[:n] for n in lengths]
+    shuffled = [p[::-1] for p in picks]
+    fit = od.determine_orbits([jd[k, p] for k, p in enumerate(shuffled)],
+                              [ra[k, p] for k, p in enumerate(shuffled)],
+                              [dec[k, p] for k, p in enumerate(shuffled)])
+
+    assert fit.converged.all()
+    distance = np.linalg.norm(fit.state[:, :3] - position, axis=1)
+    # Each fit belongs to its own object: wrong pairings would be AU apart.
+    assert (distance < 0.5).all()
+
+
+def test_long_tracklets_do_not_widen_short_ones(monkeypatch) -> None:
+    short = _tracklets(4, 3, 10.0, seed=3)
+    long = _tracklets(1, 200, 60.0, seed=4)
+    jd, ra, dec = ([*short[k][:2], *long[k], *short[k][2:]] for k in range(3))
+    widths = []
+    pack = od.pack_tracklets
+
+    def spy(*args):
+        tracklets = pack(*args)
+        widths.append(tracklets.jd.shape[1])
+        return tracklets
+
+    monkeypatch.setattr(od, "pack_tracklets", spy)
+    fit = od.determine_orbits(jd, ra, dec)
+
+    assert sorted(widths) == [3, 200]
+    assert fit.converged.all()
+    np.testing.assert_allclose(fit.state[2], od.determine_orbits(*long[:3]).state[0])
+    np.testing.assert_allclose(fit.state[[0, 1, 3, 4]],
+                               od.determine_orbits(*short[:3]).state)
+
+
+@pytest.mark.parametrize("ra, dec", [
+    ([10.0, 10.0, 10.0], [5.0, 5.0, 5.0]),  # no motion
+    ([10.0, 20.0, 30.0], [0.0, 0.0, 0.0]),  # along the equator
+])
+def test_degenerate_geometry_reports_no_orbit(ra, dec) -> None:
+    jd = [np.array([T0, T0 + 1.0, T0 + 2.0])]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        fit = od.determine_orbits(jd, [np.array(ra)], [np.array(dec)])
+
+    assert not fit.converged[0]
+    assert np.isnan(fit.state[0]).all() and np.isnan(fit.rms_arcsec[0])
+
+
+@pytest.mark.parametrize("jd, ra, dec, message", [
+    ([[T0, T0 + 1.0]], [[0.0, 1.0]], [[0.0, 1.0]], "fewer than three"),
+    ([[T0, T0, T0]], [[0.0, 1.0, 2.0]], [[0.0, 1.0, 2.0]], "time interval"),
+    ([[T0, T0 + 1.0, T0 + 2.0]], [[0.0, 1.0]], [[0.0, 1.0, 2.0]], "one value per"),
+    ([[T0, T0 + 1.0, T0 + 2.0]], [[0.0, 1.0, 2.0]], [[0.0, 91.0, 2.0]], "±90°"),
+])
+def test_invalid_tracklets_are_rejected(jd, ra, dec, message) -> None:
+    with pytest.raises(ValueError, match=message):
+        od.determine_orbits(jd, ra, dec)
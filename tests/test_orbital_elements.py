@@ -0,0 +1,141 @@
+"""Tests for the Keplerian elements ↔ state vector engine."""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.services.calculations.orbital_elements import (
+    elements_jacobian,
+    elements_to_state,
+    propagate_elements,
+    propagate_elements_with_uncertainty,
+    state_to_elements,
+)
+from app.services.calculations.orbital_mechanics import (
+    GM_SUN,
+    orbital_period,
+    propagate_universal_with_uncertainty,
+)
+
+AU = 1.495_978_707e11
+
+
+def _random_elements(n: int, hyperbolic: bool = False, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    if hyperbolic:
+        a = -rng.uniform(0.5, 5.0, n) * AU
+        e = rng.uniform(1.1, 3.0, n)
+        mean = rng.uniform(-3.0, 3.0, n)
+    else:
+        a = rng.uniform(0.5, 40.0, n) * AU
+        e = rng.uniform(0.01, 0.95, n)
+        mean = rng.uniform(0.0, 2.0 * math.pi, n)
+    return np.column_stack([
+        a, e,
+        rng.uniform(0.05, math.pi - 0.05, n),
+        rng.uniform(0.0, 2.0 * math.pi, n),
+        rng.uniform(0.0, 2.0 * math.pi, n),
+        mean,
+    ])
+
+
+@pytest.mark.parametrize("hyperbolic", [False, True])
+def test_round_trip(hyperbolic: bool) -> None:
+    elements = _random_elements(200, hyperbolic)
+    state = elements_to_state(*elements.T)
+    recovered = state_to_elements(state[:, :3], state[:, 3:])
+
+    np.testing.assert_allclose(recovered[:, :2], elements[:, :2], rtol=1e-9)
+    np.testing.assert_allclose(recovered[:, 2:5], elements[:, 2:5], atol=1e-9)
+    np.testing.assert_allclose(recovered[:, 5], elements[:, 5], atol=1e-8)
+
+
+def test_circular_equatorial_orbit() -> None:
+    state = elements_to_state(AU, 0.0, 0.0, 0.0, 0.0, math.pi / 2)
+    np.testing.assert_allclose(state[:3], [0.0, AU, 0.0], atol=1e-3)
+    np.testing.assert_allclose(state[3:], [-math.sqrt(GM_SUN / AU), 0.0, 0.0], atol=1e-9)
+
+    elements = state_to_elements(state[:3], state[3:])
+    assert elements[2] == 0.0 and elements[3] == 0.0
+    assert math.isclose(elements[4], math.pi / 2)
+    assert elements[5] == 0.0
+
+
+def test_propagation_matches_direct_conversion() -> None:
+    elements = _random_elements(50)
+    epochs = np.linspace(-1e8, 1e8, 7)
+    states = propagate_elements(elements, 0.0, epochs, chunk_objects=16)
+
+    assert states.shape == (50, 7, 6)
+    a, e, i, raan, argp, mean = elements.T
+    mean_motion = np.sqrt(GM_SUN / a**3)
+    for k, t in enumerate(epochs):
+        expected = elements_to_state(a, e, i, raan, argp, mean + mean_motion * t)
+        np.testing.assert_allclose(states[:, k], expected, rtol=1e-9, atol=1e-3)
+
+
+def test_propagation_returns_to_start_after_one_period() -> None:
+    elements = _random_elements(1)
+    epoch = 1234.5
+    period = orbital_period(elements[0, 0])
+    states = propagate_elements(elements, epoch, [epoch, epoch + period])
+
+    np.testing.assert_allclose(states[0, 1], states[0, 0], rtol=1e-8)
+
+
+def test_propagation_writes_into_out_buffer() -> None:
+    elements = _random_elements(3)
+    out = np.empty((3, 4, 6))
+    assert propagate_elements(elements, 0.0, np.arange(4.0), out=out) is out
+
+    with pytest.raises(ValueError):
+        propagate_elements(elements, 0.0, np.arange(4.0), out=np.empty((3, 5, 6)))
+
+
+def test_invalid_conics_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        elements_to_state(AU, 1.0, 0.0, 0.0, 0.0, 0.0)
+    with pytest.raises(ValueError):
+        elements_to_state(-AU, 0.5, 0.0, 0.0, 0.0, 0.0)
+
+
+@pytest.mark.parametrize("hyperbolic", [False, True])
+def test_elements_jacobian_matches_finite_differences(hyperbolic: bool) -> None:
+    elements = _random_elements(5, hyperbolic, seed=4)
+    jacobian = elements_jacobian(elements)
+
+    numeric = np.empty((5, 6, 6))
+    for k in range(6):
+        step = np.zeros(6)
+        step[k] = 1e-7 * (np.abs(elements[:, k]).max() if k == 0 else 1.0)
+        plus = elements_to_state(*(elements + step).T)
+        minus = elements_to_state(*(elements - step).T)
+        numeric[:, :, k] = (plus - minus) / (2.0 * step[k])
+
+    scale = np.abs(numeric).max(axis=1, keepdims=True)
+    np.testing.assert_allclose(jacobian / scale, numeric / scale, atol=1e-6)
+
+
+def test_element_uncertainty_matches_state_transition() -> None:
+    gm = 2.959e-4
+    elements = np.array([[1.8, 0.4, 0.2, 0.5, 1.0, 2.0], [2.5, 0.1, 0.1, 1.0, 2.0, 3.0]])
+    covariance = np.diag([1e-6, 1e-6, 1e-6, 1e-6, 1e-6, 1e-6])
+    epochs = np.array([0.0, 100.0, 1000.0])
+    linear = propagate_elements_with_uncertainty(elements, covariance, 0.0, epochs, gm)
+
+    # Mapping the covariance to the state first and propagating it there agrees.
+    jacobian = elements_jacobian(elements, gm)
+    state = elements_to_state(*elements.T, gm=gm)
+    via_state = propagate_universal_with_uncertainty(
+        state[:, None, :3], state[:, None, 3:],
+        (jacobian @ covariance @ jacobian.transpose(0, 2, 1))[:, None], epochs, gm)
+    np.testing.assert_allclose(linear.mean, propagate_elements(elements, 0.0, epochs, gm=gm))
+    np.testing.assert_allclose(via_state.covariance, linear.covariance,
+                               atol=1e-12 * np.abs(linear.covariance).max())
+
+    sampled = propagate_elements_with_uncertainty(elements, covariance, 0.0, epochs, gm,
+                                                  method="monte_carlo", samples=20_000,
+                                                  seed=5, chunk_points=30_000)
+    np.testing.assert_allclose(sampled.covariance, linear.covariance,
+                               atol=0.05 * np.abs(linear.covariance).max())
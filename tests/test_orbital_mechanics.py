@@ -0,0 +1,240 @@
+"""Tests for the orbital mechanics service."""
+
+import math
+from decimal import Decimal, localcontext
+
+import numpy as np
+import pytest
+
+from app.services.calculations.orbital_elements import elements_to_state, propagate_elements
+from app.services.calculations.orbital_mechanics import (
+    GM_SUN,
+    eccentric_anomaly_from_mean,
+    lambert,
+    mean_anomaly_from_true,
+    orbital_period,
+    orbital_velocity,
+    propagate_universal,
+    propagate_universal_with_uncertainty,
+    stumpff,
+    true_anomaly_from_eccentric,
+    true_anomaly_from_mean,
+)
+
+AU = 1.495_978_707e11
+
+
+def test_orbital_period_earth() -> None:
+    assert math.isclose(orbital_period(AU) / 86400.0, 365.25, rel_tol=1e-3)
+
+
+def test_orbital_velocity_circular() -> None:
+    assert math.isclose(orbital_velocity(AU, AU), math.sqrt(GM_SUN / AU))
+
+
+def test_elliptic_solutions_satisfy_keplers_equation() -> None:
+    mean, ecc = np.meshgrid(np.linspace(-20.0, 20.0, 201), np.linspace(0.0, 0.999, 100))
+    anomaly, iterations = eccentric_anomaly_from_mean(mean, ecc, return_iterations=True)
+
+    np.testing.assert_allclose(anomaly - ecc * np.sin(anomaly), mean, atol=1e-13)
+    assert iterations.max() <= 6
+
+
+def _reference_eccentric_anomaly(mean: float, ecc: float) -> float:
+    """Newton's method on Kepler's equation in 50-digit decimal arithmetic, for |M| ≪ 1."""
+    with localcontext() as context:
+        context.prec = 50
+        m, e = Decimal(mean), Decimal(ecc)
+        x = m / (1 - e)
+        for _ in range(50):
+            # Taylor series, term = ± x^n / n!
+            sin, cos, term = Decimal(0), Decimal(0), Decimal(1)
+            for n in range(40):
+                if n % 2:
+                    sin += term
+                    term = -term
+                else:
+                    cos += term
+                term *= x / (n + 1)
+            x -= (x - e * sin - m) / (1 - e * cos)
+        return float(x)
+
+
+@pytest.mark.parametrize("mean", [1e-14, -3e-12, 2e-9])
+def test_small_mean_anomalies_keep_full_precision(mean: float) -> None:
+    ecc = 0.999
+    anomaly = eccentric_anomaly_from_mean(mean, ecc)
+    np.testing.assert_allclose(anomaly, _reference_eccentric_anomaly(mean, ecc), rtol=1e-12)
+
+
+def test_hyperbolic_solutions_satisfy_keplers_equation() -> None:
+    mean, ecc = np.meshgrid(np.linspace(-30.0, 30.0, 121), np.linspace(1.001, 10.0, 50))
+    anomaly = eccentric_anomaly_from_mean(mean, ecc)
+
+    np.testing.assert_allclose(ecc * np.sinh(anomaly) - anomaly, mean, rtol=1e-13, atol=1e-13)
+
+
+def test_near_parabolic_hyperbolas_stop_at_roundoff() -> None:
+    mean, excess = np.meshgrid(np.logspace(-12.0, 1.0, 60), np.logspace(-12.0, -6.0, 20))
+    ecc = 1.0 + excess
+    anomaly, iterations = eccentric_anomaly_from_mean(mean, ecc, return_iterations=True)
+
+    residual = ecc * np.sinh(anomaly) - anomaly - mean
+    assert np.all(np.abs(residual) <= 1e-14 * np.maximum(1.0, mean))
+    assert iterations.max() <= 6
+
+
+def test_parabolic_solution_satisfies_barkers_equation() -> None:
+    mean = np.linspace(-10.0, 10.0, 41)
+    d = eccentric_anomaly_from_mean(mean, 1.0)
+
+    np.testing.assert_allclose(d + d**3 / 3.0, mean, atol=1e-12)
+
+
+def test_mixed_regimes_in_one_call() -> None:
+    ecc = np.array([0.0, 0.5, 1.0, 2.0])
+    nu = np.array([0.3, -1.0, 2.0, 1.5])
+
+    mean = mean_anomaly_from_true(nu, ecc)
+    np.testing.assert_allclose(true_anomaly_from_mean(mean, ecc), nu, atol=1e-12)
+
+
+def test_circular_orbit_anomalies_coincide() -> None:
+    mean = np.linspace(-math.pi, math.pi, 11)
+    np.testing.assert_allclose(true_anomaly_from_mean(mean, 0.0), mean, atol=1e-15)
+
+
+def test_true_anomaly_keeps_revolution_count() -> None:
+    anomaly = np.array([4.0 * math.pi + 0.1])
+    assert true_anomaly_from_eccentric(anomaly, 0.3)[0] > 4.0 * math.pi
+
+
+def test_scalar_inputs_return_zero_dimensional_arrays() -> None:
+    assert eccentric_anomaly_from_mean(1.0, 0.1).shape == ()
+
+
+def test_negative_eccentricity_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        eccentric_anomaly_from_mean([0.1], [-0.1])
+
+
+def test_stumpff_series_and_closed_forms_agree() -> None:
+    z = np.array([-0.1000001, -0.0999999, 0.0999999, 0.1000001, 30.0, -30.0])
+    c0, c1, c2, c3 = stumpff(z)
+
+    np.testing.assert_allclose(c2[:2], c2[0], rtol=1e-6)
+    np.testing.assert_allclose(c3[2:4], c3[2], rtol=1e-6)
+    np.testing.assert_allclose(c2[4:], [(1 - math.cos(math.sqrt(30))) / 30,
+                                        (math.cosh(math.sqrt(30)) - 1) / 30])
+    np.testing.assert_allclose(c0 + z * c2, 1.0)
+    np.testing.assert_allclose(c1 + z * c3, 1.0)
+
+
+def test_universal_propagation_without_convergence_is_nan() -> None:
+    gm = 2.959e-4
+    # A hyperbola with |a| ~ 5e-6 AU: f cancels 10¹² down to 0.1 and χ never settles.
+    tight = propagate_universal([16.397, -19.890, 1.022], [-5.08697984, 6.17064389, -0.3170637],
+                                5.839, gm, partials=True)
+    assert np.isnan(tight.position).all() and np.isnan(tight.dr_dv0).all()
+
+    # One Laguerre step is not enough for the long arc, but is for the zero one.
+    capped = propagate_universal([1.0, 0.0, 0.0], [0.0, 0.017, 0.0], [300.0, 0.0], gm,
+                                 max_iter=1)
+    assert np.isnan(capped.position[0]).all()
+    np.testing.assert_array_equal(capped.position[1], [1.0, 0.0, 0.0])
+
+
+@pytest.mark.parametrize("a, e", [(2.0, 0.1), (2.0, 0.7), (1.5, 0.99), (-2.0, 1.5), (-0.5, 3.0)])
+def test_universal_propagation_matches_kepler(a: float, e: float) -> None:
+    gm = 2.959e-4
+    elements = np.array([[a, e, 0.3, 1.0, 2.0, 0.5]])
+    state = elements_to_state(*elements.T, gm=gm)[0]
+    dt = np.array([-400.0, -3.0, 0.0, 1.0, 50.0, 1000.0])
+
+    propagated = propagate_universal(state[:3], state[3:], dt, gm)
+    expected = propagate_elements(elements, 0.0, dt, gm=gm)[0]
+
+    np.testing.assert_allclose(propagated.position, expected[:, :3], rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(propagated.velocity, expected[:, 3:], rtol=1e-12, atol=1e-14)
+
+
+def test_universal_partials_match_finite_differences() -> None:
+    gm = 2.959e-4
+    state = elements_to_state(1.8, 0.4, 0.2, 0.5, 1.0, 2.0, gm=gm)
+    dt = np.array([-30.0, 5.0, 200.0])
+
+    propagated = propagate_universal(state[:3], state[3:], dt, gm, partials=True)
+    analytic = np.concatenate([
+        np.concatenate([propagated.dr_dr0, propagated.dr_dv0], axis=-1),
+        np.concatenate([propagated.dv_dr0, propagated.dv_dv0], axis=-1),
+    ], axis=-2)
+    numeric = np.empty((dt.size, 6, 6))
+    for k in range(6):
+        step = np.zeros(6)
+        step[k] = 1e-7
+        plus = propagate_universal((state + step)[:3], (state + step)[3:], dt, gm)
+        minus = propagate_universal((state - step)[:3], (state - step)[3:], dt, gm)
+        numeric[:, :3, k] = (plus.position - minus.position) / 2e-7
+        numeric[:, 3:, k] = (plus.velocity - minus.velocity) / 2e-7
+
+    np.testing.assert_allclose(analytic[:, :3], numeric[:, :3], rtol=0,
+                               atol=1e-6 * np.abs(numeric[:, :3]).max())
+    np.testing.assert_allclose(analytic[:, 3:], numeric[:, 3:], rtol=0,
+                               atol=1e-6 * np.abs(numeric[:, 3:]).max())
+
+
+def test_universal_uncertainty_modes_agree_for_small_errors() -> None:
+    gm = 2.959e-4
+    states = elements_to_state(np.array([1.2, 2.7]), np.array([0.2, 0.6]), 0.1, 1.0, 2.0,
+                               np.array([0.0, 3.0]), gm=gm)
+    covariance = np.diag([1e-10] * 3 + [1e-14] * 3)
+    dt = np.array([10.0, 365.0])
+
+    linear = propagate_universal_with_uncertainty(states[:, :3], states[:, 3:], covariance,
+                                                  dt, gm)
+    sampled = propagate_universal_with_uncertainty(states[:, :3], states[:, 3:], covariance,
+                                                   dt, gm, method="monte_carlo",
+                                                   samples=20_000, seed=2)
+
+    assert linear.mean.shape == (2, 6) and linear.covariance.shape == (2, 6, 6)
+    expected = propagate_universal(states[:, :3], states[:, 3:], dt, gm)
+    np.testing.assert_allclose(linear.mean[:, :3], expected.position)
+    for k in range(2):
+        scale = np.sqrt(np.diag(linear.covariance[k]))
+        np.testing.assert_allclose(sampled.covariance[k] / np.outer(scale, scale),
+                                   linear.covariance[k] / np.outer(scale, scale), atol=0.05)
+        np.testing.assert_allclose(sampled.mean[k], linear.mean[k], atol=0.05 * scale.max())
+
+
+def test_lambert_matches_curtis_example_5_2() -> None:
+    v1, v2 = lambert([5000.0, 10000.0, 2100.0], [-14600.0, 2500.0, 7000.0], 3600.0, 398600.0)
+
+    np.testing.assert_allclose(v1, [-5.9925, 1.9254, 3.2456], atol=1e-4)
+    np.testing.assert_allclose(v2, [-3.3125, -4.1966, -0.38529], atol=1e-4)
+
+
+def test_lambert_grid_round_trips_through_propagation() -> None:
+    gm = 2.959e-4
+    rng = np.random.default_rng(3)
+    r1 = rng.normal(size=(40, 1, 3))
+    r1 *= rng.uniform(0.5, 3.0, (40, 1, 1)) / np.linalg.norm(r1, axis=-1, keepdims=True)
+    r2 = rng.normal(size=(1, 50, 3))
+    r2 *= rng.uniform(0.5, 3.0, (1, 50, 1)) / np.linalg.norm(r2, axis=-1, keepdims=True)
+    tof = rng.uniform(5.0, 1500.0, (40, 50))
+
+    v1, v2 = lambert(r1, r2, tof, gm)
+    assert v1.shape == v2.shape == (40, 50, 3)
+    arrival = propagate_universal(np.broadcast_to(r1, v1.shape), v1, tof, gm)
+
+    np.testing.assert_allclose(arrival.position, np.broadcast_to(r2, v1.shape),
+                               rtol=0, atol=1e-7)
+    np.testing.assert_allclose(arrival.velocity, v2, rtol=1e-6, atol=1e-9)
+    # Prograde transfers circle the +z axis.
+    assert (np.cross(np.broadcast_to(r1, v1.shape), v1)[..., 2] > 0).all()
+    retrograde, _ = lambert(r1, r2, tof, gm, prograde=False)
+    assert (np.cross(np.broadcast_to(r1, v1.shape), retrograde)[..., 2] < 0).all()
+
+
+def test_lambert_without_solution_is_nan() -> None:
+    v1, v2 = lambert([1.0, 0.0, 0.0], [[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0]], [0.0, 10.0], 1.0)
+    assert np.isnan(v1).all() and np.isnan(v2).all()
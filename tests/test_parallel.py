@@ -0,0 +1,83 @@
+"""Tests for the shared-memory worker pool."""
+
+import numpy as np
+import pytest
+
+from app.models.coordinates_systems import Origin, PhysicalState, Plane, Shape
+from app.services.calculations.coordinate_conversions import convert_celestial_coordinates_batch
+from app.services.calculations.orbital_elements import propagate_elements
+from app.services.parallel import WorkerPool, propagate, transform_coordinates
+
+AU = 1.495_978_707e11
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = WorkerPool(max_workers=2, min_rows=0, chunk_rows=40)
+    yield pool
+    pool.shutdown()
+
+
+def test_small_jobs_stay_in_process() -> None:
+    pool = WorkerPool(max_workers=4, min_rows=1000)
+    assert not pool.should_parallelize(999)
+    assert pool.should_parallelize(1000)
+    assert not WorkerPool(max_workers=1, min_rows=0).should_parallelize(10**9)
+
+
+def test_transform_matches_in_process(pool: WorkerPool) -> None:
+    coords = np.random.default_rng(3).normal(size=(257, 3))
+    args = (Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+            Shape.SPHERICAL, Plane.ECLIPTIC, Origin.GEOCENTRIC,
+            PhysicalState.POINT, (0.1, 0.2, 0.3))
+
+    expected = convert_celestial_coordinates_batch(coords, *args)
+    out = np.empty((3, 257)).T
+    result = transform_coordinates(coords, *args, out=out, pool=pool)
+
+    assert result is out
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_propagate_matches_in_process(pool: WorkerPool) -> None:
+    rng = np.random.default_rng(4)
+    elements = np.column_stack([rng.uniform(1.0, 3.0, 30) * AU, rng.uniform(0.0, 0.5, 30),
+                                rng.uniform(0.0, 1.0, (30, 4))])
+    epochs = np.linspace(0.0, 1e7, 5)
+
+    expected = propagate_elements(elements, 100.0, epochs)
+    np.testing.assert_array_equal(propagate(elements, 100.0, epochs, pool=pool), expected)
+
+
+def test_worker_errors_propagate(pool: WorkerPool) -> None:
+    coords = np.zeros((100, 3))
+    with pytest.raises(ValueError):
+        transform_coordinates(coords, Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+                              Shape.SPHERICAL, Plane.EQUATORIAL, Origin.HELIOCENTRIC, pool=pool)
+
+
+def test_transform_with_per_row_equinox(pool: WorkerPool) -> None:
+    coords = np.random.default_rng(5).normal(size=(101, 3))
+    epochs = np.linspace(2440000.5, 2470000.5, 101)
+    args = (Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.HELIOCENTRIC,
+            Shape.SPHERICAL, Plane.ECLIPTIC, Origin.HELIOCENTRIC)
+
+    expected = convert_celestial_coordinates_batch(coords, *args, source_equinox=2451545.0,
+                                                   target_equinox=epochs)
+    result = transform_coordinates(coords, *args, source_equinox=2451545.0,
+                                   target_equinox=epochs, pool=pool)
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_transform_with_per_row_epoch(pool: WorkerPool) -> None:
+    coords = np.random.default_rng(6).normal(size=(101, 3))
+    epochs = np.linspace(2451545.0, 2460000.5, 101)
+    args = (Shape.RECTANGULAR, Plane.ECLIPTIC, Origin.HELIOCENTRIC,
+            Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.GEOCENTRIC)
+
+    expected = convert_celestial_coordinates_batch(coords, *args, target_equinox=epochs,
+                                                   epoch=epochs)
+    result = transform_coordinates(coords, *args, target_equinox=epochs, epoch=epochs,
+                                   pool=pool)
+    # Small chunks evaluate the Chebyshev basis in closed form: equal to the last bit or so.
+    np.testing.assert_allclose(result, expected, rtol=1e-14, atol=1e-15)
@@ -0,0 +1,76 @@
+"""Tests for the analytic planetary ephemeris and its Chebyshev segment cache."""
+
+import numpy as np
+import pytest
+
+from app.models.coordinates_systems import Plane
+from app.services.calculations import planetary_ephemeris, precession
+
+
+def test_earth_matches_meeus_example() -> None:
+    # Meeus, Astronomical Algorithms, example 25.b: 1992 October 13.0 TD. The Earth's
+    # VSOP87 heliocentric longitude of date is 19.907372°, latitude -0.64", R = 0.99760775 AU.
+    jd = 2448908.5
+    earth = planetary_ephemeris.heliocentric_position("earth", jd, Plane.EQUATORIAL)
+    of_date = precession.rotation_matrix(Plane.ECLIPTIC, jd) @ earth
+    d_psi, _ = precession.nutation(jd)
+
+    longitude = np.degrees(np.arctan2(of_date[1], of_date[0]) - d_psi) % 360.0
+    assert longitude == pytest.approx(19.907372, abs=20.0 / 3600.0)
+    assert np.linalg.norm(of_date) == pytest.approx(0.99760775, abs=5e-5)
+
+
+def test_planet_distances_stay_within_their_orbits() -> None:
+    jd = np.linspace(2415020.5, 2488069.5, 50)
+    for body, (perihelion, aphelion) in {"mercury": (0.307, 0.467), "mars": (1.37, 1.67),
+                                         "neptune": (29.8, 30.4)}.items():
+        distance = np.linalg.norm(planetary_ephemeris.evaluate_positions(body, jd), axis=1)
+        assert np.all((distance > perihelion) & (distance < aphelion)), body
+
+
+@pytest.mark.parametrize("body", planetary_ephemeris.BODIES)
+def test_cached_segments_match_series(body: str) -> None:
+    cache = planetary_ephemeris.EphemerisCache(segment_days=16.0, maxsize=10_000)
+    jd = np.linspace(2440000.5, 2470000.5, 4001)
+    error = np.abs(cache.positions(body, jd) - planetary_ephemeris.evaluate_positions(body, jd))
+    assert error.max() < 1e-9
+
+
+def test_cache_fits_each_segment_once_and_evicts() -> None:
+    cache = planetary_ephemeris.EphemerisCache(segment_days=16.0, maxsize=2)
+    jd = planetary_ephemeris.J2000_JD + np.array([1.0, 2.0, 17.0, 18.0])
+    cache.positions("earth", jd)
+    cache.positions("earth", jd)
+    assert cache.stats() == {"hits": 2, "misses": 2, "segments": 2, "maxsize": 2}
+
+    cache.positions("earth", jd + 32.0)
+    assert cache.stats()["segments"] == 2
+
+
+def test_heliocentric_position_shapes_and_planes() -> None:
+    scalar = planetary_ephemeris.heliocentric_position("venus", 2460000.5)
+    batch = planetary_ephemeris.heliocentric_position("venus", [2460000.5, 2460100.5])
+    equatorial = planetary_ephemeris.heliocentric_position("venus", 2460000.5, Plane.EQUATORIAL)
+
+    assert scalar.shape == (3,)
+    assert batch.shape == (2, 3)
+    np.testing.assert_allclose(batch[0], scalar)
+    assert np.linalg.norm(equatorial) == pytest.approx(np.linalg.norm(scalar))
+
+
+def test_unknown_body_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown body"):
+        planetary_ephemeris.evaluate_positions("pluto", 2451545.0)
+
+
+def test_planet_states_carry_velocities() -> None:
+    jd = 2460000.5 + np.array([-0.5, 0.0, 0.5])
+    states = planetary_ephemeris.planet_states("mars", jd)
+
+    np.testing.assert_allclose(states[:, :3], planetary_ephemeris.evaluate_positions("mars", jd),
+                               atol=1e-12)
+    # Central difference of the positions over one day.
+    np.testing.assert_allclose(states[1, 3:], states[2, :3] - states[0, :3], rtol=1e-4)
+    assert planetary_ephemeris.planet_states("mars", 2460000.5).shape == (6,)
+    with pytest.raises(ValueError, match="mean elements"):
+        planetary_ephemeris.planet_states("earth", 2460000.5)
@@ -0,0 +1,58 @@
+"""Tests for porkchop grids of Lambert transfers."""
+
+import numpy as np
+import pytest
+
+from app.services.calculations import porkchop
+from app.services.calculations.orbital_mechanics import lambert
+from app.services.calculations.planetary_ephemeris import planet_states
+
+LAUNCH = 2453550.5  # 2005-06-20, ahead of the 2005 Mars window
+
+
+def test_mars_2005_window_minimum() -> None:
+    grid = porkchop.porkchop("earth", "mars", (LAUNCH, LAUNCH + 120, 2.0),
+                             (LAUNCH + 150, LAUNCH + 400, 2.0))
+
+    assert grid.c3.shape == (61, 126)
+    best = np.unravel_index(np.nanargmin(grid.c3), grid.c3.shape)
+    # Mars Reconnaissance Orbiter left on 2005-08-12 with C3 ≈ 16.4 km²/s² and arrived
+    # seven months later; the mean-element optimum sits nearby.
+    assert 15.0 < grid.c3[best] < 17.0
+    assert 30.0 < grid.departure[best[0]] - LAUNCH < 70.0
+    assert 180.0 < grid.arrival[best[1]] - grid.departure[best[0]] < 220.0
+    np.testing.assert_allclose(grid.c3, grid.v_inf_departure ** 2)
+    np.testing.assert_allclose(grid.delta_v, grid.v_inf_departure + grid.v_inf_arrival)
+
+
+def test_cells_match_single_lambert_solutions() -> None:
+    grid = porkchop.porkchop("venus", "mars", (LAUNCH, LAUNCH + 30, 10.0),
+                             (LAUNCH + 100, LAUNCH + 300, 50.0), chunk_cells=7)
+    start = planet_states("venus", grid.departure[2])
+    end = planet_states("mars", grid.arrival[3])
+
+    v1, _ = lambert(start[:3], end[:3], grid.arrival[3] - grid.departure[2],
+                    porkchop.GM_SUN_AU_DAY)
+    expected = np.linalg.norm(v1 - start[3:]) * porkchop.KM_S_PER_AU_DAY
+    assert grid.v_inf_departure[2, 3] == pytest.approx(expected, rel=1e-10)
+
+
+def test_arrivals_before_departure_are_nan() -> None:
+    grid = porkchop.porkchop("earth", "mars", (LAUNCH, LAUNCH + 10, 1.0),
+                             (LAUNCH + 5, LAUNCH + 15, 1.0))
+    tof = grid.arrival[None, :] - grid.departure[:, None]
+    assert np.isnan(grid.c3[tof <= 0]).all()
+    assert np.isfinite(grid.c3[tof > 0]).all()
+
+
+def test_axis_states_are_cached_per_axis() -> None:
+    first = porkchop.axis_states("earth", LAUNCH, 1.0, 50)
+    hits = porkchop.axis_cache_info().hits
+    assert porkchop.axis_states("earth", LAUNCH, 1.0, 50) is first
+    assert porkchop.axis_cache_info().hits == hits + 1
+    assert not first.flags.writeable
+
+
+def test_unknown_body_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown body"):
+        porkchop.porkchop("earth", "pluto", (LAUNCH, LAUNCH, 1.0), (LAUNCH + 1, LAUNCH + 2, 1.0))
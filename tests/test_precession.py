@@ -0,0 +1,88 @@
+"""Tests for precession, nutation and the rotation table."""
+
+import numpy as np
+import pytest
+
+from app.core.constants import EPSILON_RAD
+from app.models.coordinates_systems import Plane
+from app.services.calculations import precession
+
+ARCSEC = np.radians(1.0 / 3600.0)
+
+
+def test_mean_obliquity_at_j2000_matches_constant() -> None:
+    assert precession.mean_obliquity(precession.J2000_JD) == pytest.approx(EPSILON_RAD, abs=1e-12)
+
+
+def test_nutation_matches_meeus_example() -> None:
+    # Meeus, Astronomical Algorithms, example 22.a: 1987 April 10, 0h TD.
+    d_psi, d_eps = precession.nutation(2446895.5)
+    assert d_psi / ARCSEC == pytest.approx(-3.788, abs=0.005)
+    assert d_eps / ARCSEC == pytest.approx(9.443, abs=0.005)
+
+
+def test_true_place_of_date_matches_meeus_example() -> None:
+    # Meeus, examples 21.b and 23.a: θ Persei (proper motion applied) to 2028 Nov 13.19 TD,
+    # mean place of date plus the nutation terms of example 23.a.
+    ra, dec = np.radians([41.0540612, 49.2277493])
+    vector = np.array([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)])
+    x, y, z = precession.evaluate_rotations(Plane.EQUATORIAL, 2462088.69) @ vector
+
+    expected_ra = 41.547213 + 15.843 / 3600.0
+    expected_dec = 49.348483 + 6.218 / 3600.0
+    assert np.degrees(np.arctan2(y, x)) == pytest.approx(expected_ra, abs=0.15 / 3600.0)
+    assert np.degrees(np.arcsin(z)) == pytest.approx(expected_dec, abs=0.15 / 3600.0)
+
+
+def test_ecliptic_and_equator_of_date_differ_by_true_obliquity() -> None:
+    jd = 2460000.5
+    equatorial = precession.evaluate_rotations(Plane.EQUATORIAL, jd)
+    ecliptic = precession.evaluate_rotations(Plane.ECLIPTIC, jd)
+    tilt = ecliptic @ equatorial.T
+
+    obliquity = precession.mean_obliquity(jd) + precession.nutation(jd)[1]
+    assert np.arctan2(tilt[1, 2], tilt[1, 1]) == pytest.approx(obliquity, abs=1e-12)
+    np.testing.assert_allclose(equatorial @ equatorial.T, np.eye(3), atol=1e-15)
+
+
+@pytest.mark.parametrize("plane", list(Plane))
+def test_table_interpolation_matches_series(plane: Plane) -> None:
+    table = precession.RotationTable(plane, 2451000.5, 2452000.5, 1.0)
+    jd = np.concatenate([np.random.default_rng(0).uniform(2451000.5, 2452000.5, 2000),
+                         [2451000.5, 2452000.5]])
+
+    error = np.abs(table.interpolate(jd) - precession.evaluate_rotations(plane, jd))
+    assert error.max() < 5e-9
+
+
+def test_table_falls_back_to_series_outside_grid() -> None:
+    table = precession.RotationTable(Plane.EQUATORIAL, 2451000.5, 2452000.5, 1.0)
+    jd = np.array([2400000.5, 2500000.5])
+    np.testing.assert_array_equal(table.interpolate(jd),
+                                  precession.evaluate_rotations(Plane.EQUATORIAL, jd))
+
+
+def test_table_rejects_empty_grid() -> None:
+    with pytest.raises(ValueError):
+        precession.RotationTable(Plane.EQUATORIAL, 2452000.5, 2451000.5, 1.0)
+
+
+def test_rotation_matrices_look_up_each_epoch_once(monkeypatch) -> None:
+    table = precession.rotation_table(Plane.ECLIPTIC)
+    seen = []
+    original = table.interpolate
+    monkeypatch.setattr(table, "interpolate", lambda jd: seen.append(jd.size) or original(jd))
+
+    jd = np.repeat([2451545.0, 2460000.5, 2470000.25], 100)
+    matrices = precession.rotation_matrices(Plane.ECLIPTIC, jd)
+
+    assert seen == [3]
+    assert matrices.shape == (300, 3, 3)
+    np.testing.assert_array_equal(matrices[150], precession.rotation_matrix(Plane.ECLIPTIC,
+                                                                            2460000.5))
+
+
+def test_rotation_matrix_is_memoized_and_read_only() -> None:
+    first = precession.rotation_matrix(Plane.EQUATORIAL, 2460000.5)
+    assert precession.rotation_matrix(Plane.EQUATORIAL, 2460000.5) is first
+    assert not first.flags.writeable
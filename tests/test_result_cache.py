@@ -0,0 +1,121 @@
+"""Tests for the transformation response cache."""
+
+import numpy as np
+import pytest
+
+from app.core.config import Settings
+from app.models.coordinates_systems import CoordinateTransformRequest
+from app.services import result_cache
+from app.services.result_cache import MemoryBackend, ResponseCache
+
+
+def _request(**overrides) -> CoordinateTransformRequest:
+    payload = {
+        "input_coords": {"x": 1.0, "y": 2.0, "z": 3.0,
+                         "plane": "equatorial", "origin": "heliocentric"},
+        "target_shape": "spherical",
+        "target_plane": "ecliptic",
+        "target_origin": "heliocentric",
+    }
+    payload.update(overrides)
+    return CoordinateTransformRequest.model_validate(payload)
+
+
+def test_request_key_is_canonical() -> None:
+    key = result_cache.request_key("transform", _request())
+
+    # Spelling out a default, or reordering fields, does not change the key.
+    assert result_cache.request_key("transform", _request(physical_state=1)) == key
+    reordered = CoordinateTransformRequest.model_validate_json(
+        '{"target_origin": "heliocentric", "target_plane": "ecliptic", '
+        '"target_shape": "spherical", "input_coords": {"origin": "heliocentric", '
+        '"plane": "equatorial", "z": 3.0, "y": 2.0, "x": 1}}'
+    )
+    assert result_cache.request_key("transform", reordered) == key
+
+    assert result_cache.request_key("transform", _request(target_plane="equatorial")) != key
+    assert result_cache.request_key("other", _request()) != key
+    assert result_cache.request_key("transform", _request(), b"extra") != key
+
+
+def test_memory_backend_evicts_least_recently_used() -> None:
+    backend = MemoryBackend(max_entries=2, max_bytes=1_000)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    assert backend.get("a") == b"1"
+    backend.set("c", b"3")
+
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+    assert backend.get("c") == b"3"
+    stats = backend.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 4, 1)
+
+
+def test_memory_backend_bounds_bytes() -> None:
+    backend = MemoryBackend(max_entries=10, max_bytes=20)
+    backend.set("a", b"x" * 9)
+    backend.set("b", b"x" * 9)
+    assert backend.stats()["bytes"] == 20
+    backend.set("c", b"x" * 9)
+
+    assert backend.get("a") is None
+    assert backend.stats()["bytes"] == 20
+    # A value larger than the whole budget is not stored at all.
+    backend.set("d", b"x" * 100)
+    assert backend.get("d") is None
+    assert backend.stats()["entries"] == 2
+
+
+def test_memory_backend_expires_entries() -> None:
+    now = [0.0]
+    backend = MemoryBackend(max_entries=10, max_bytes=1_000, ttl_seconds=5.0,
+                            clock=lambda: now[0])
+    backend.set("a", b"1")
+    now[0] = 4.9
+    assert backend.get("a") == b"1"
+    now[0] = 5.0
+    assert backend.get("a") is None
+    assert backend.stats()["entries"] == 0
+
+
+def test_response_cache_counts_and_bypasses() -> None:
+    cache = ResponseCache(MemoryBackend(max_entries=10, max_bytes=1_000), max_batch_rows=3)
+    assert cache.get("k") is None
+    cache.set("k", b"value")
+    assert cache.get("k") == b"value"
+    assert cache.accepts(3)
+    assert not cache.accepts(4)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["bypassed"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert stats["entries"] == 1
+
+    text = cache.render_metrics()
+    assert 'result_cache_requests_total{outcome="hit"} 1.0' in text
+    assert "# TYPE result_cache_hit_ratio gauge" in text
+    assert "result_cache_bytes 6.0" in text
+
+
+def test_batch_key_covers_coordinates_and_media_type() -> None:
+    request = _request()
+    coords = np.arange(6.0).reshape(2, 3)
+    key = result_cache.batch_key(request, coords, "application/json")
+
+    assert result_cache.batch_key(request, coords.copy(), "application/json") == key
+    assert result_cache.batch_key(request, coords + 1, "application/json") != key
+    assert result_cache.batch_key(request, coords, "application/x-msgpack") != key
+
+
+def test_backends_are_pluggable() -> None:
+    settings = Settings(result_cache_backend="custom")
+    with pytest.raises(ValueError, match="Unknown result cache backend"):
+        result_cache.create_backend(settings)
+
+    backend = MemoryBackend(max_entries=1, max_bytes=10)
+    result_cache.register_backend("custom", lambda _: backend)
+    try:
+        assert result_cache.create_backend(settings) is backend
+    finally:
+        del result_cache._BACKENDS["custom"]
@@ -16,7 +16,16 @@ def teardown_function():
 def test_defaults_match_env_example(monkeypatch):
     # Ensure environment doesn't leak into the test (some CI/dev shells set
     # HOST/PORT globally which would make this test flaky).
-    for k in ("APP_NAME", "APP_VERSION", "DEBUG", "HOST", "PORT", "CORS_ORIGINS", "API_V1_PREFIX"):
+    for k in ("APP_NAME", "APP_VERSION", "DEBUG", "HOST", "PORT", "CORS_ORIGINS", "API_V1_PREFIX",
+              "WORKER_PROCESSES", "PARALLEL_MIN_ROWS", "PARALLEL_CHUNK_ROWS",
+              "STREAM_BATCH_ROWS", "STREAM_MAX_LINE_BYTES", "METRICS_ENABLED",
+              "PREWARM_ENABLED",
+              "PRECESSION_TABLE_START", "PRECESSION_TABLE_END", "PRECESSION_TABLE_STEP",
+              "EPHEMERIS_SEGMENT_DAYS", "EPHEMERIS_CACHE_SEGMENTS",
+              "RESULT_CACHE_ENABLED", "RESULT_CACHE_BACKEND", "RESULT_CACHE_URL",
+              "RESULT_CACHE_MAX_ENTRIES", "RESULT_CACHE_MAX_BYTES", "RESULT_CACHE_TTL_SECONDS",
+              "RESULT_CACHE_MAX_BATCH_ROWS", "JOBS_MAX_CONCURRENT", "JOBS_MAX_QUEUED",
+              "JOBS_SPOOL_DIR", "JOBS_RETENTION_SECONDS", "JOBS_CHUNK_ROWS", "JOBS_DOWNLOAD_ROWS"):
         monkeypatch.delenv(k, raising=False)
 
     config.get_settings.cache_clear()
@@ -29,6 +38,31 @@ def test_defaults_match_env_example(monkeypatch):
     assert s.port == 8000
     assert isinstance(s.cors_origins, list)
     assert s.api_v1_prefix == "/api/v1"
+    assert s.worker_processes == 0
+    assert s.parallel_min_rows == 250_000
+    assert s.parallel_chunk_rows == 100_000
+    assert s.stream_batch_rows == 4096
+    assert s.stream_max_line_bytes == 65_536
+    assert s.metrics_enabled is True
+    assert s.prewarm_enabled is True
+    assert s.precession_table_start == 2415020.5
+    assert s.precession_table_end == 2488069.5
+    assert s.precession_table_step == 1.0
+    assert s.ephemeris_segment_days == 16.0
+    assert s.ephemeris_cache_segments == 4096
+    assert s.result_cache_enabled is False
+    assert s.result_cache_backend == "memory"
+    assert s.result_cache_url == "redis://localhost:6379/0"
+    assert s.result_cache_max_entries == 10_000
+    assert s.result_cache_max_bytes == 64 * 1024 * 1024
+    assert s.result_cache_ttl_seconds == 3600.0
+    assert s.result_cache_max_batch_rows == 1000
+    assert s.jobs_max_concurrent == 2
+    assert s.jobs_max_queued == 64
+    assert s.jobs_spool_dir == ""
+    assert s.jobs_retention_seconds == 86_400.0
+    assert s.jobs_chunk_rows == 100_000
+    assert s.jobs_download_rows == 10_000
 
 
 def test_env_overrides_and_cors_json(monkeypatch):
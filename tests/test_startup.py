@@ -0,0 +1,56 @@
+"""Tests for deferred imports and the startup pre-warm."""
+
+import subprocess
+import sys
+
+from app.core import lazy, startup
+
+
+def test_lazy_import_loads_on_first_attribute_access(monkeypatch) -> None:
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    module = lazy.lazy_import("colorsys")
+    assert not lazy.is_loaded(module)
+    assert "colorsys" in lazy.deferred()
+
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert lazy.is_loaded(module)
+    assert "colorsys" not in lazy.deferred()
+
+    # Writes reach the real module, so patches apply through either object.
+    monkeypatch.setattr(module, "ONE_THIRD", 0.5)
+    assert sys.modules["colorsys"].ONE_THIRD == 0.5
+
+
+def test_lazy_import_returns_loaded_modules_as_is() -> None:
+    assert lazy.lazy_import("json") is sys.modules["json"]
+
+
+def test_application_import_defers_numpy_and_services() -> None:
+    code = ("import sys, app.main; "
+            "print(sorted(m for m in sys.modules if m == 'numpy' or m.startswith('app.services')))")
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                               check=True)
+    assert completed.stdout.strip() == "[]"
+
+
+def test_prewarm_loads_deferred_modules_and_reports_timings(monkeypatch) -> None:
+    calls = []
+    monkeypatch.setattr(startup, "_PREWARM_STEPS", dict(startup._PREWARM_STEPS))
+    startup.register_prewarm("custom", lambda: calls.append(True))
+
+    timings = startup.prewarm()
+
+    assert list(timings) == ["modules", "ephemeris", "precession", "custom"]
+    assert calls == [True]
+    assert lazy.deferred() == []
+    report = startup.report()
+    assert report["prewarm_seconds"] == timings
+    text = startup.render_metrics()
+    assert 'app_prewarm_step_seconds{step="precession"}' in text
+    assert "app_deferred_modules 0.0" in text
+
+
+def test_import_breakdown_totals_packages() -> None:
+    breakdown = dict(startup.import_breakdown("app.core.config"))
+    assert "pydantic" in breakdown and "app.core" in breakdown
+    assert "numpy" not in breakdown
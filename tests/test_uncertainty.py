@@ -0,0 +1,40 @@
+"""Tests for the shared uncertainty propagation helpers."""
+
+import numpy as np
+import pytest
+
+from app.services.calculations import uncertainty
+
+
+def test_singular_covariances_are_sampled_in_their_subspace() -> None:
+    direction = np.array([1.0, 2.0, 2.0]) / 3.0
+    covariance = 4.0 * np.outer(direction, direction)
+    drawn = uncertainty.draw_samples(np.zeros((1, 3)), covariance[None], 5000,
+                                     np.random.default_rng(0))
+
+    assert drawn.shape == (1, 5000, 3)
+    np.testing.assert_allclose(np.cross(drawn[0], direction), 0.0, atol=1e-6)
+    assert np.std(drawn[0] @ direction) == pytest.approx(2.0, rel=0.05)
+
+
+def test_sample_statistics_survive_a_large_offset() -> None:
+    rng = np.random.default_rng(1)
+    covariance = np.array([[4.0, 1.0], [1.0, 2.0]]) * 1e-12
+    drawn = uncertainty.draw_samples(np.array([[1e6, -3e5]]), covariance[None], 200_000, rng)
+    mean, spread = uncertainty.sample_statistics(drawn)
+
+    np.testing.assert_allclose(mean, [[1e6, -3e5]], rtol=1e-15, atol=1e-7)
+    np.testing.assert_allclose(spread[0], covariance, rtol=0.03)
+
+
+def test_covariances_broadcast_to_every_value() -> None:
+    checked = uncertainty.check_covariance(np.eye(3), (4, 3))
+    assert checked.shape == (4, 3, 3)
+    with pytest.raises(ValueError, match="finite"):
+        uncertainty.check_covariance(np.full((3, 3), np.nan), (4, 3))
+    # Round-off below zero passes; a clearly negative variance does not.
+    uncertainty.check_covariance(np.diag([1.0, -1e-12, 1.0]), (4, 3))
+    with pytest.raises(ValueError, match="positive semi-definite"):
+        uncertainty.check_covariance(np.stack([np.eye(3), np.diag([1.0, -5.0, 1.0])]), (2, 3))
+    with pytest.raises(ValueError, match="two samples"):
+        uncertainty.check_samples(1)
@@ -0,0 +1,97 @@
+"""Tests for rise, set and transit times and visibility windows."""
+
+import numpy as np
+import pytest
+
+from app.models.coordinates_systems import Origin, Plane, Shape
+from app.services.calculations import horizon, visibility
+
+SITE = horizon.ObserverSite(52.0, 5.0)
+START = 2461041.5
+
+
+def _altitude(ra: np.ndarray, dec: np.ndarray, jd: np.ndarray) -> np.ndarray:
+    coords = np.column_stack([ra, dec, np.ones_like(ra)])
+    return horizon.to_horizontal(coords, jd, SITE, Shape.SPHERICAL, Plane.EQUATORIAL,
+                                 Origin.GEOCENTRIC)[:, 1]
+
+
+@pytest.fixture(scope="module")
+def catalog() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    return rng.uniform(0, 360, 40), np.degrees(np.arcsin(rng.uniform(-1, 1, 40)))
+
+
+def test_events_sit_on_the_threshold_and_the_meridian(catalog) -> None:
+    ra, dec = catalog
+    result = visibility.visibility(ra, dec, SITE, START, START + 5.0, min_altitude=10.0)
+
+    for events in (result.rises, result.sets):
+        altitude = _altitude(ra[events.target], dec[events.target], events.time)
+        assert np.allclose(altitude, 10.0, atol=5e-3)
+        assert np.allclose(events.altitude, 10.0, atol=1e-3)
+    transits = result.transits
+    coords = np.column_stack([ra[transits.target], dec[transits.target],
+                              np.ones(transits.time.size)])
+    position = horizon.to_horizontal(coords, transits.time, SITE, Shape.SPHERICAL,
+                                     Plane.EQUATORIAL, Origin.GEOCENTRIC)
+    assert np.allclose(position[:, 1], transits.altitude, atol=5e-3)
+    # Targets culminate north of the zenith when their declination exceeds the latitude.
+    north = np.where(dec[transits.target] > SITE.latitude, 1.0, -1.0)
+    assert np.allclose(np.cos(np.radians(position[:, 0])), north, atol=1e-3)
+    # Five days hold five or six sidereal days.
+    assert set(np.bincount(transits.target, minlength=ra.size).tolist()) <= {5, 6}
+
+
+def test_windows_match_sampled_altitudes(catalog) -> None:
+    ra, dec = catalog
+    result = visibility.visibility(ra, dec, SITE, START, START + 3.0, min_altitude=20.0)
+
+    times = np.linspace(START, START + 3.0, 1_201)
+    for target in range(ra.size):
+        above = _altitude(np.full(times.size, ra[target]), np.full(times.size, dec[target]),
+                          times) >= 20.0
+        mine = result.windows.target == target
+        inside = np.zeros(times.size, dtype=bool)
+        for start, end in zip(result.windows.start[mine], result.windows.end[mine]):
+            inside |= (times >= start) & (times <= end)
+        # Samples within a couple of seconds of an event may fall either way.
+        assert np.count_nonzero(inside != above) <= 2 * np.count_nonzero(mine)
+
+
+def test_windows_are_clipped_to_the_night(catalog) -> None:
+    ra, dec = catalog
+    day = visibility.visibility(ra, dec, SITE, START, START + 2.0)
+    night = visibility.visibility(ra, dec, SITE, START, START + 2.0, max_sun_altitude=-18.0)
+
+    assert night.windows.start.size
+    assert np.all(night.windows.end > night.windows.start)
+    sun = visibility._sun_directions(np.concatenate([night.windows.start, night.windows.end]),
+                                     horizon.DELTA_T)
+    sun_ra = np.degrees(np.arctan2(sun[:, 1], sun[:, 0]))
+    sun_dec = np.degrees(np.arcsin(sun[:, 2]))
+    assert np.all(_altitude(sun_ra, sun_dec, np.concatenate([night.windows.start,
+                                                             night.windows.end])) < -18.0 + 0.01)
+    assert np.sum(night.windows.end - night.windows.start) < np.sum(day.windows.end
+                                                                    - day.windows.start)
+
+
+def test_circumpolar_and_never_rising_targets() -> None:
+    result = visibility.visibility([0.0, 0.0], [89.0, -89.0], SITE, START, START + 1.0)
+
+    assert result.rises.target.size == 0 and result.sets.target.size == 0
+    assert result.windows.target.tolist() == [0]
+    assert (result.windows.start[0], result.windows.end[0]) == (START, START + 1.0)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"end": START},
+    {"step": 0.0},
+    {"min_altitude": 90.0},
+    {"ra": [0.0, 1.0]},
+])
+def test_visibility_rejects_invalid_arguments(kwargs) -> None:
+    arguments = {"ra": [0.0], "dec": [0.0], "site": SITE, "start": START,
+                 "end": START + 1.0} | kwargs
+    with pytest.raises(ValueError):
+        visibility.visibility(**arguments)
@@ -0,0 +1,98 @@
+"""
+Transform a catalog file offline with the same math as the API.
+
+Coordinates (three columns in, three out)::
+
+    python transform_catalog.py stars.csv stars_xyz.npy coordinates \\
+        --columns ra,dec,distance --from spherical,equatorial,geocentric \\
+        --to rectangular,ecliptic,geocentric
+
+Orbits (six element columns, optionally a seventh epoch column, in; states out)::
+
+    python transform_catalog.py asteroids.parquet states.parquet propagation \\
+        --columns a,e,i,node,peri,M,epoch --degrees --target-epoch 8.0e8
+
+Inputs are ``.csv``, ``.parquet`` or ``.npy``; outputs ``.npy`` or ``.parquet``.
+Progress and throughput go to stderr.
+"""
+
+import argparse
+import sys
+
+from app.models.coordinates_systems import Origin, Plane, Shape
+from app.services import catalog_pipeline, parallel
+from app.services.calculations.orbital_mechanics import GM_SUN
+
+
+def _state(text: str) -> tuple[Shape, Plane, Origin]:
+    """Parse ``shape,plane,origin``, e.g. ``spherical,equatorial,geocentric``."""
+    try:
+        shape, plane, origin = text.split(",")
+        return Shape(shape), Plane(plane), Origin(origin)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected shape,plane,origin (e.g. spherical,equatorial,geocentric), got '{text}'")
+
+
+def _transform(args: argparse.Namespace) -> catalog_pipeline.CatalogTransform:
+    if args.kind == "coordinates":
+        return catalog_pipeline.coordinate_transform(
+            *args.from_state, *args.to_state, source_equinox=args.source_equinox,
+            target_equinox=args.target_equinox, epoch=args.epoch)
+    return catalog_pipeline.propagation_transform(args.epoch, args.target_epoch, gm=args.gm,
+                                                  degrees=args.degrees)
+
+
+def _report(stats: catalog_pipeline.PipelineStats) -> None:
+    print(f"\r{stats.rows:,} rows, {stats.rows_per_second:,.0f} rows/s", end="",
+          file=sys.stderr, flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="\n".join(__doc__.splitlines()[2:]))
+    parser.add_argument("source", help="input catalog (.csv, .parquet or .npy)")
+    parser.add_argument("destination", help="output file (.npy or .parquet)")
+    parser.add_argument("kind", choices=("coordinates", "propagation"))
+    parser.add_argument("--columns", type=lambda text: text.split(","),
+                        help="comma-separated input columns, in the transform's input order")
+    parser.add_argument("--chunk-rows", type=int, default=catalog_pipeline.DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--prefetch", type=int, default=catalog_pipeline.DEFAULT_PREFETCH,
+                        help="chunks read ahead of the computation")
+
+    coordinates = parser.add_argument_group("coordinates")
+    coordinates.add_argument("--from", dest="from_state", type=_state,
+                             default=(Shape.SPHERICAL, Plane.EQUATORIAL, Origin.GEOCENTRIC),
+                             help="shape,plane,origin of the input columns")
+    coordinates.add_argument("--to", dest="to_state", type=_state,
+                             default=(Shape.RECTANGULAR, Plane.EQUATORIAL, Origin.GEOCENTRIC),
+                             help="shape,plane,origin of the output columns")
+    coordinates.add_argument("--source-equinox", type=float, help="Julian Date (TT)")
+    coordinates.add_argument("--target-equinox", type=float, help="Julian Date (TT)")
+
+    propagation = parser.add_argument_group("propagation")
+    propagation.add_argument("--epoch", type=float,
+                             help="epoch of the elements (propagation: default is an epoch "
+                                  "column) or ephemeris epoch (coordinates, Julian Date TDB)")
+    propagation.add_argument("--target-epoch", type=float, default=0.0)
+    propagation.add_argument("--gm", type=float, default=GM_SUN)
+    propagation.add_argument("--degrees", action="store_true",
+                             help="element angles are in degrees")
+    args = parser.parse_args()
+
+    try:
+        stats = catalog_pipeline.run(args.source, args.destination, _transform(args),
+                                     columns=args.columns, chunk_rows=args.chunk_rows,
+                                     prefetch=args.prefetch, progress=_report)
+    except (OSError, ValueError) as error:
+        parser.exit(1, f"\nerror: {error}\n")
+    finally:
+        parallel.shutdown_worker_pool()
+    print(f"\n{stats.rows:,} rows in {stats.chunks} chunks, {stats.seconds:.2f} s "
+          f"({stats.rows_per_second:,.0f} rows/s; {stats.read_wait_seconds:.2f} s waiting "
+          f"for the reader)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()